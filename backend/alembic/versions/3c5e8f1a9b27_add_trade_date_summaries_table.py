@@ -0,0 +1,58 @@
+"""Add trade_date_summaries table
+
+Revision ID: 3c5e8f1a9b27
+Revises: 7a9a44f6134a
+Create Date: 2026-10-18 10:12:37.551204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.sql import func
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3c5e8f1a9b27'
+down_revision: Union[str, None] = '7a9a44f6134a'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'trade_date_summaries',
+        sa.Column('asset_id', sa.Integer(), sa.ForeignKey('assets.id'), nullable=False),
+        sa.Column('trade_date', sa.Date(), nullable=False),
+        sa.Column('has_settlement', sa.Boolean(), nullable=False),
+        sa.Column('has_volume_oi', sa.Boolean(), nullable=False),
+        sa.Column('has_futures_data', sa.Boolean(), nullable=False),
+        sa.Column('is_final', sa.Boolean(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=False, server_default=func.now()),
+        sa.PrimaryKeyConstraint('asset_id', 'trade_date')
+    )
+
+    # 既存のデータから、資産・取引日ごとのサマリーを作成する
+    op.execute("""
+        INSERT INTO trade_date_summaries (asset_id, trade_date, has_settlement, has_volume_oi, has_futures_data, is_final)
+        SELECT
+            d.asset_id,
+            d.trade_date,
+            EXISTS (SELECT 1 FROM settlements s WHERE s.asset_id = d.asset_id AND s.trade_date = d.trade_date),
+            EXISTS (SELECT 1 FROM volume_oi v WHERE v.asset_id = d.asset_id AND v.trade_date = d.trade_date),
+            EXISTS (
+                SELECT 1 FROM settlements s
+                JOIN volume_oi v ON s.asset_id = v.asset_id AND s.trade_date = v.trade_date AND s.month = v.month
+                WHERE s.asset_id = d.asset_id AND s.trade_date = d.trade_date
+            ),
+            COALESCE((SELECT MIN(v.is_final) FROM volume_oi v WHERE v.asset_id = d.asset_id AND v.trade_date = d.trade_date), 0)
+        FROM (
+            SELECT asset_id, trade_date FROM settlements
+            UNION
+            SELECT asset_id, trade_date FROM volume_oi
+        ) d
+    """)
+
+
+def downgrade() -> None:
+    op.drop_table('trade_date_summaries')
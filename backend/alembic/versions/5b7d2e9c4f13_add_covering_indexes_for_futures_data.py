@@ -0,0 +1,36 @@
+"""Add covering indexes for futures data queries
+
+Revision ID: 5b7d2e9c4f13
+Revises: 3c5e8f1a9b27
+Create Date: 2026-10-18 11:02:48.730915
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5b7d2e9c4f13'
+down_revision: Union[str, None] = '3c5e8f1a9b27'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# _asset_date_month_uc と同じ先頭のカラムに、各クエリが参照するカラムを続けたカバリングインデックス。
+# (asset_id, trade_date) での絞り込みと限月での結合をインデックスのみで処理し、テーブルの行を読まない
+# - settlements: /futures-dataの結合 (settle_value, settle)、確定判定とスクレイピング前の鮮度確認 (last_updated)
+# - volume_oi: /futures-dataの結合 (total_volume, at_close)、確定判定とスクレイピング前の確認 (is_final)
+INDEXES = [
+    ('ix_settlements_asset_date_month_covering', 'settlements', ['asset_id', 'trade_date', 'month', 'last_updated', 'settle_value', 'settle']),
+    ('ix_volume_oi_asset_date_month_covering', 'volume_oi', ['asset_id', 'trade_date', 'month', 'is_final', 'total_volume', 'at_close']),
+]
+
+
+def upgrade() -> None:
+    for name, table_name, columns in INDEXES:
+        op.create_index(name, table_name, columns, unique=False)
+
+
+def downgrade() -> None:
+    for name, table_name, _ in reversed(INDEXES):
+        op.drop_index(name, table_name=table_name)
@@ -0,0 +1,55 @@
+"""Add numeric price columns to settlements
+
+Revision ID: 7a9a44f6134a
+Revises: 8748d08fa736
+Create Date: 2026-10-18 07:45:12.418306
+
+"""
+import math
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from src.domain.logics.convert_price_columns import PRICE_COLUMNS, convert_price_series
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7a9a44f6134a'
+down_revision: Union[str, None] = '8748d08fa736'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# 1回のSELECT / UPDATEで処理する行数
+BACKFILL_BATCH_SIZE = 5000
+
+
+def upgrade() -> None:
+    for column in PRICE_COLUMNS:
+        op.add_column('settlements', sa.Column(f'{column}_value', sa.Double(), nullable=True))
+
+    # 既存の行の数値カラムを、idの順に一定件数ずつ埋める
+    bind = op.get_bind()
+    select_columns = ', '.join(f'`{column}`' for column in PRICE_COLUMNS)
+    update_columns = ', '.join(f'{column}_value = :{column}_value' for column in PRICE_COLUMNS)
+    last_id = 0
+    while True:
+        rows = bind.execute(
+            sa.text(f"SELECT id, {select_columns} FROM settlements WHERE id > :last_id ORDER BY id LIMIT :limit"),
+            {'last_id': last_id, 'limit': BACKFILL_BATCH_SIZE}
+        ).fetchall()
+        if not rows:
+            break
+        params: list[dict[str, object]] = [{'id': row[0]} for row in rows]
+        for index, column in enumerate(PRICE_COLUMNS, start=1):
+            # 変換できない値はNULLのままにする
+            prices, _ = convert_price_series([row[index] for row in rows])
+            for param, price in zip(params, prices):
+                param[f'{column}_value'] = None if math.isnan(price) else float(price)
+        bind.execute(sa.text(f"UPDATE settlements SET {update_columns} WHERE id = :id"), params)
+        last_id = rows[-1][0]
+
+
+def downgrade() -> None:
+    for column in PRICE_COLUMNS:
+        op.drop_column('settlements', f'{column}_value')
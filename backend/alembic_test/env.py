@@ -26,7 +26,7 @@ target_metadata = Base.metadata
 # my_important_option = config.get_main_option("my_important_option")
 # ... etc.
 # config.set_main_option("sqlalchemy.url", DATABASE_URL)
-engine = get_engine()
+engine = get_engine('migration')
 
 
 def run_migrations_offline() -> None:
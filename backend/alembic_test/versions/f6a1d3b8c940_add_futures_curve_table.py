@@ -0,0 +1,56 @@
+"""Add futures_curve table
+
+Revision ID: f6a1d3b8c940
+Revises: a83c6d1e5b92
+Create Date: 2026-10-18 15:21:40.912655
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f6a1d3b8c940'
+down_revision: Union[str, None] = 'a83c6d1e5b92'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'futures_curve',
+        sa.Column('asset_id', sa.Integer(), sa.ForeignKey('assets.id'), nullable=False),
+        sa.Column('trade_date', sa.Date(), nullable=False),
+        sa.Column('month_key', sa.Integer(), nullable=False),
+        sa.Column('settle', sa.Double(), nullable=True),
+        sa.Column('volume', sa.Integer(), nullable=False),
+        sa.Column('open_interest', sa.Integer(), nullable=False),
+        sa.Column('settle_spread', sa.Double(), nullable=False),
+        sa.Column('is_final', sa.Boolean(), nullable=False),
+        sa.Column('last_updated', sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint('asset_id', 'trade_date', 'month_key')
+    )
+
+    # 既存のデータから作成する。清算値の数値カラムは257115903b8aでバックフィル済み
+    # スプレッドはFuturesCurveRepositoryMysql.refreshと同じく、同じ取引日の1つ前の限月との差 (ない場合は0)
+    op.execute("""
+        INSERT INTO futures_curve (asset_id, trade_date, month_key, settle, volume, open_interest, settle_spread, is_final, last_updated)
+        SELECT
+            s.asset_id,
+            s.trade_date,
+            CAST(REPLACE(s.month, '-', '') AS UNSIGNED),
+            s.settle_value,
+            v.total_volume,
+            v.at_close,
+            COALESCE(s.settle_value - LAG(s.settle_value) OVER (PARTITION BY s.asset_id, s.trade_date ORDER BY s.month), 0),
+            v.is_final,
+            s.last_updated
+        FROM settlements s
+        JOIN volume_oi v ON s.asset_id = v.asset_id AND s.trade_date = v.trade_date AND s.month = v.month
+    """)
+
+
+def downgrade() -> None:
+    op.drop_table('futures_curve')
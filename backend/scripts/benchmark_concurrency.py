@@ -0,0 +1,138 @@
+# scripts/benchmark_concurrency.py
+# 同時リクエスト数ごとに /futures-data のスループットを計測し、非同期のDBアクセスで処理が直列化しないことを確認する
+# 既定ではDBの応答時間を模したリポジトリをアプリに組み込んで計測する。--urlを指定した場合は起動中のサーバーに対して計測する
+import argparse
+import asyncio
+import random
+import time
+from datetime import date, datetime, timedelta
+
+import httpx
+
+from src.application.web.api.dependencies import get_async_futures_data_service, get_futures_data_cache_repository
+from src.domain.repositories.asset_repository import AsyncAssetRepository
+from src.domain.repositories.futures_data_cache_repository import FuturesDataCacheEntry, FuturesDataCacheRepository
+from src.domain.repositories.futures_data_repository import AsyncFuturesDataRepository, FuturesDataRow, FuturesDataVersion
+from src.domain.services.futures_data_service import AsyncFuturesDataService
+from src.infrastructure.database.models import Asset as AssetModel
+from src.main import app
+
+
+TRADE_DATES = [date(2024, 3, 4) + timedelta(days=day) for day in range(5)]
+
+
+class _NoCache(FuturesDataCacheRepository):
+    # 全てのリクエストでDBに問い合わせるように、キャッシュを無効にする
+    def fetch(self, asset_name: str, trade_dates: list[date], response_format: str) -> FuturesDataCacheEntry | None:
+        return None
+
+    def save(self, asset_name: str, trade_dates: list[date], response_format: str, entry: FuturesDataCacheEntry) -> None:
+        pass
+
+    def invalidate(self, trade_date: date, asset_id: int | None = None) -> None:
+        pass
+
+    def fetch_stats(self) -> dict[str, int]:
+        return {"hits": 0, "misses": 0}
+
+
+class _StaticAssetRepository(AsyncAssetRepository):
+    # 資産名の解決はAssetRegistryのキャッシュから返されるため、DBの応答時間は模さない
+    async def fetch_all(self) -> list[AssetModel]:
+        return [AssetModel(id=1, name="Gold")]
+
+    async def fetch_id_by_name(self, name: str) -> int | None:
+        return 1
+
+
+class _LatencyRepository(AsyncFuturesDataRepository):
+    # クエリごとにlatency秒待機する。blocking=Trueの場合は、同期のセッションと同じくイベントループごと待機する
+    def __init__(self, rows: list[FuturesDataRow], latency: float, blocking: bool):
+        self.rows = rows
+        self.latency = latency
+        self.blocking = blocking
+
+    async def _wait(self) -> None:
+        if self.blocking:
+            time.sleep(self.latency)
+        else:
+            await asyncio.sleep(self.latency)
+
+    async def fetch_by_asset_and_dates(self, asset_id: int, trade_dates: list[date]) -> list[FuturesDataRow]:
+        await self._wait()
+        return self.rows
+
+    async def fetch_versions_by_asset_and_dates(self, asset_id: int, trade_dates: list[date]) -> list[FuturesDataVersion]:
+        await self._wait()
+        return [FuturesDataVersion(trade_date, 40, 0, datetime(2024, 3, 1), datetime(2024, 3, 1)) for trade_date in TRADE_DATES]
+
+
+def make_rows(months: int) -> list[FuturesDataRow]:
+    return [
+        (trade_date, (2024 + month // 12) * 100 + month % 12 + 1, round(random.uniform(1800, 2500), 1), random.randint(0, 300000), random.randint(0, 500000), round(random.uniform(-5, 5), 1))
+        for trade_date in TRADE_DATES for month in range(months)
+    ]
+
+
+async def run_load(client: httpx.AsyncClient, path: str, concurrency: int, requests: int) -> tuple[float, float]:
+    """
+    concurrency個のワーカーで合計requests回のリクエストを送信します。
+
+    :return: (スループット (req/s), 平均レイテンシ (ms))
+    """
+    remaining = iter(range(requests))
+    latencies: list[float] = []
+
+    async def worker() -> None:
+        for _ in remaining:
+            started = time.perf_counter()
+            response = await client.get(path)
+            response.raise_for_status()
+            latencies.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    return requests / elapsed, sum(latencies) / len(latencies) * 1000
+
+
+async def main_async(args: argparse.Namespace) -> None:
+    path = args.path or "/futures-data/Gold?" + "&".join(f"trade_dates={trade_date}" for trade_date in TRADE_DATES)
+
+    if args.url:
+        async with httpx.AsyncClient(base_url=args.url, timeout=60) as client:
+            print(f"{'concurrency':>12}{'req/s':>10}{'latency (ms)':>14}")
+            for concurrency in args.concurrency:
+                throughput, latency = await run_load(client, path, concurrency, args.requests)
+                print(f"{concurrency:>12}{throughput:>10.1f}{latency:>14.1f}")
+        return
+
+    rows = make_rows(args.months)
+    app.dependency_overrides[get_futures_data_cache_repository] = lambda: _NoCache()
+    print(f"{'pipeline':>10}{'concurrency':>12}{'req/s':>10}{'latency (ms)':>14}{'scaling':>10}")
+    for pipeline, blocking in [("blocking", True), ("async", False)]:
+        repository = _LatencyRepository(rows, args.latency / 1000, blocking)
+        app.dependency_overrides[get_async_futures_data_service] = lambda: AsyncFuturesDataService(repository, _StaticAssetRepository())
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://benchmark", timeout=60) as client:
+            base_throughput = None
+            for concurrency in args.concurrency:
+                throughput, latency = await run_load(client, path, concurrency, args.requests)
+                base_throughput = base_throughput or throughput
+                print(f"{pipeline:>10}{concurrency:>12}{throughput:>10.1f}{latency:>14.1f}{throughput / base_throughput:>9.1f}x")
+    app.dependency_overrides.clear()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="同時リクエスト数ごとのスループットのベンチマーク")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 4, 16, 64], help="同時リクエスト数")
+    parser.add_argument("--requests", type=int, default=256, help="同時リクエスト数ごとの合計リクエスト数")
+    parser.add_argument("--latency", type=float, default=20, help="模擬するDBの1クエリあたりの応答時間 (ms)")
+    parser.add_argument("--months", type=int, default=40, help="取引日ごとの限月数")
+    parser.add_argument("--url", default=None, help="起動中のサーバーのURL (例: http://localhost:8000)。指定した場合は実際のDBで計測する")
+    parser.add_argument("--path", default=None, help="--url使用時のリクエストのパス。既定は /futures-data/Gold の5取引日分")
+    args = parser.parse_args()
+    asyncio.run(main_async(args))
+
+
+if __name__ == "__main__":
+    main()
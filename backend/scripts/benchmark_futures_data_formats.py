@@ -0,0 +1,54 @@
+# scripts/benchmark_futures_data_formats.py
+# /futures-data のレスポンスのフォーマットごとに、シリアライズの処理時間とペイロードのサイズを比較する
+import argparse
+import random
+import timeit
+from datetime import date, timedelta
+
+import pandas as pd
+
+from src.application.web.api.futures_data_format import FUTURES_DATA_FORMATS, serialize_futures_data
+from src.domain.logics.convert_dataframe import to_year_month_format
+
+
+def make_dataframe(trade_dates: int, months: int) -> pd.DataFrame:
+    # 取引日ごとに限月数分の行を持つ、make_dataframe + add_settlement_spreadと同じ形のDataFrame
+    rows = [
+        (date(2024, 1, 2) + timedelta(days=day), pd.Timestamp(2024, 2, 1) + pd.DateOffset(months=month))
+        for day in range(trade_dates) for month in range(months)
+    ]
+    settles = [round(random.uniform(1800, 2500), 1) for _ in rows]
+    df = pd.DataFrame({
+        'trade_date': [trade_date for trade_date, _ in rows],
+        'month': [month for _, month in rows],
+        'settle': settles,
+        'volume': [random.randint(0, 300000) for _ in rows],
+        'open_interest': [random.randint(0, 500000) for _ in rows],
+    })
+    # 限月間のスプレッドは、取引日ごとの最初の限月のみNaNになる
+    df['settlement_spread'] = df.groupby('trade_date')['settle'].diff()
+    return to_year_month_format(df, 'month')
+
+
+def main():
+    parser = argparse.ArgumentParser(description="先物データのレスポンスフォーマットのベンチマーク")
+    parser.add_argument("--trade-dates", type=int, nargs="+", default=[1, 20, 250], help="取引日の数")
+    parser.add_argument("--months", type=int, default=40, help="取引日ごとの限月数")
+    parser.add_argument("--repeat", type=int, default=5, help="計測の繰り返し回数")
+    args = parser.parse_args()
+
+    print(f"{'rows':>8}{'format':>10}{'time (s)':>12}{'size (bytes)':>14}{'speedup':>10}{'size ratio':>12}")
+    for trade_dates in args.trade_dates:
+        df = make_dataframe(trade_dates, args.months)
+        results = {}
+        for response_format in FUTURES_DATA_FORMATS:
+            elapsed = min(timeit.repeat(lambda: serialize_futures_data(df, response_format), number=1, repeat=args.repeat))
+            results[response_format] = (elapsed, len(serialize_futures_data(df, response_format)))
+
+        records_time, records_size = results['records']
+        for response_format, (elapsed, size) in results.items():
+            print(f"{len(df):>8}{response_format:>10}{elapsed:>12.4f}{size:>14}{records_time / elapsed:>9.1f}x{records_size / size:>11.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+# scripts/benchmark_import_time.py
+# APIのワーカー (src.main) とスクレイパー (run_scraping_tasks) の起動時のインポート時間を `python -X importtime` で計測する
+# モジュールごとに新しいプロセスで計測し、中央値とインポートに時間がかかったパッケージ、読み込まれた重いパッケージを表示する
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+
+DEFAULT_MODULES = ["src.main", "src.application.background_workers.run_scraping_tasks"]
+# 起動時には読み込まず、必要な処理で初めて読み込むパッケージ
+HEAVY_PACKAGES = ["pandas", "numpy", "pyarrow", "msgpack", "selenium", "webdriver_manager", "bs4", "yaml"]
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+
+def measure_import(module: str) -> tuple[float, list[tuple[float, str]], list[str]]:
+    """
+    新しいPythonのプロセスでmoduleをインポートし、インポート時間を計測します。
+
+    :return: (moduleのインポート時間 (ms), [(累積時間 (ms), パッケージ名)], 読み込まれたHEAVY_PACKAGES)
+    """
+    code = f"import sys, json; import {module}; print(json.dumps([name for name in {HEAVY_PACKAGES!r} if name in sys.modules]))"
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=BACKEND_DIR, capture_output=True, text=True, check=True
+    )
+
+    # -X importtimeは、インポートされたモジュールを子から親の順に出力する。moduleの行より前のうち、最後のトップレベルの行以降がmoduleの配下
+    entries: list[tuple[float, str]] = []
+    total_ms = 0.0
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        _, cumulative, name = line.split("|")
+        is_top_level = len(name) - len(name.lstrip()) == 1
+        if is_top_level and name.strip() == module:
+            total_ms = int(cumulative) / 1000
+            break
+        if is_top_level:
+            entries = []
+        else:
+            entries.append((int(cumulative) / 1000, name.strip()))
+
+    # パッケージごとの累積時間 (src配下のモジュールは除く)
+    packages = [(cumulative_ms, name) for cumulative_ms, name in entries if "." not in name and name != "src"]
+    loaded = json.loads(result.stdout.strip().splitlines()[-1])
+    return total_ms, sorted(packages, reverse=True), loaded
+
+
+def main():
+    parser = argparse.ArgumentParser(description="起動時のインポート時間のベンチマーク")
+    parser.add_argument("--modules", nargs="+", default=DEFAULT_MODULES, help="計測するモジュール")
+    parser.add_argument("--repeat", type=int, default=5, help="モジュールごとの計測回数")
+    parser.add_argument("--top", type=int, default=10, help="表示するパッケージの数")
+    parser.add_argument("--output", default=None, help="結果を保存するJSONファイルのパス。変更前後の比較に使用する")
+    args = parser.parse_args()
+
+    results: dict[str, dict[str, object]] = {}
+    for module in args.modules:
+        measurements = [measure_import(module) for _ in range(args.repeat)]
+        totals = [total for total, _, _ in measurements]
+        _, packages, loaded = measurements[-1]
+        results[module] = {"median_ms": statistics.median(totals), "min_ms": min(totals), "heavy_packages": loaded}
+
+        print(f"{module}: median {statistics.median(totals):.1f} ms, min {min(totals):.1f} ms ({args.repeat} runs)")
+        print(f"  heavy packages loaded: {', '.join(loaded) or 'none'}")
+        for cumulative_ms, name in packages[:args.top]:
+            print(f"  {cumulative_ms:>9.1f} ms  {name}")
+
+    if args.output:
+        Path(args.output).write_text(json.dumps(results, indent=2), encoding="utf-8")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+# scripts/benchmark_price_conversion.py
+# validate_price_format / convert_price_formatを1要素ずつ呼び出す場合と、convert_price_seriesの処理時間を比較する
+import argparse
+import math
+import random
+import timeit
+
+import numpy as np
+
+from src.domain.logics.convert_price_columns import convert_price_series
+from src.domain.logics.convert_price_format import convert_price_format
+from src.domain.logics.validate_price_format import validate_price_format
+
+
+def _random_price() -> str:
+    kind = random.random()
+    if kind < 0.05:
+        return "-"
+    if kind < 0.35:
+        # 32分の1表記 (債券先物など)
+        return f"{random.choice(['', '-', '+'])}{random.randint(0, 150)}'{random.randint(0, 319):03d}"
+    return f"{random.choice(['', '-', '+'])}{random.randint(0, 9999):,}.{random.randint(0, 99):02d}{random.choice(['', '', 'A', 'B'])}"
+
+
+def run_scalar(values: list[str]) -> np.ndarray:
+    prices = []
+    for value in values:
+        validate_price_format(value)
+        price = convert_price_format(value)
+        prices.append(math.nan if price is None else price)
+    return np.array(prices)
+
+
+def run_vectorized(values: list[str]) -> np.ndarray:
+    prices, invalid = convert_price_series(values)
+    assert not invalid.any()
+    return prices
+
+
+def main():
+    parser = argparse.ArgumentParser(description="価格変換のベンチマーク")
+    parser.add_argument("--rows", type=int, nargs="+", default=[100, 10000, 100000], help="価格の件数")
+    parser.add_argument("--repeat", type=int, default=5, help="計測の繰り返し回数")
+    parser.add_argument("--distinct", type=int, default=None, help="価格の種類数。指定しない場合はほぼ全ての値が異なる")
+    args = parser.parse_args()
+
+    print(f"{'rows':>8}{'scalar (s)':>14}{'vectorized (s)':>16}{'speedup':>10}")
+    for rows in args.rows:
+        if args.distinct:
+            candidates = [_random_price() for _ in range(args.distinct)]
+            values = [random.choice(candidates) for _ in range(rows)]
+        else:
+            values = [_random_price() for _ in range(rows)]
+
+        # 両方の変換結果が一致することを確認してから計測する
+        np.testing.assert_array_equal(run_vectorized(values), run_scalar(values))
+        scalar_time = min(timeit.repeat(lambda: run_scalar(values), number=1, repeat=args.repeat))
+        vectorized_time = min(timeit.repeat(lambda: run_vectorized(values), number=1, repeat=args.repeat))
+        print(f"{rows:>8}{scalar_time:>14.4f}{vectorized_time:>16.4f}{scalar_time / vectorized_time:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+# scripts/benchmark_table_parser.py
+# BeautifulSoup版のパーサーとtable_parserの処理時間を、大きな合成テーブルで比較する
+import argparse
+import random
+import timeit
+from typing import Generator
+
+import pandas as pd
+from bs4 import BeautifulSoup
+from pandas.testing import assert_frame_equal
+
+from src.infrastructure.scraping.table_parser import parse_settlements_table, parse_volume_oi_table
+
+
+MONTHS = ['JAN', 'FEB', 'MAR', 'APR', 'MAY', 'JUN', 'JLY', 'AUG', 'SEP', 'OCT', 'NOV', 'DEC']
+
+
+# 比較の基準にする、table_parser導入前のBeautifulSoup版パーサー
+def soup_parse_settlements_table(soup: BeautifulSoup) -> Generator[dict[str, str], None, None]:
+    trs = soup.select('.main-table-wrapper tbody > tr')
+    for tr in trs:
+        yield {
+            'month': tr.select_one('td:first-of-type').text,
+            'open': tr.select_one('td:nth-of-type(2)').text,
+            'high': tr.select_one('td:nth-of-type(3)').text,
+            'low': tr.select_one('td:nth-of-type(4)').text,
+            'last': tr.select_one('td:nth-of-type(5)').text,
+            'change': tr.select_one('td:nth-of-type(6)').text,
+            'settle': tr.select_one('td:nth-of-type(7)').text,
+            'est_volume': tr.select_one('td:nth-of-type(8)').text,
+            'prior_day_oi': tr.select_one('td:last-of-type').text
+        }
+
+
+def soup_parse_volume_oi_table(soup: BeautifulSoup) -> Generator[dict[str, str], None, None]:
+    trs = soup.select('.multiline .main-table-wrapper tbody > tr')
+    for tr in trs:
+        yield {
+            'month': tr.select_one('td:first-of-type').text,
+            'globex': tr.select_one('td:nth-of-type(2)').text,
+            'open_outcry': tr.select_one('td:nth-of-type(3)').text,
+            'clear_port': tr.select_one('td:nth-of-type(4)').text,
+            'total_volume': tr.select_one('td:nth-of-type(5)').text,
+            'block_trades': tr.select_one('td:nth-of-type(6)').text,
+            'efp': tr.select_one('td:nth-of-type(7)').text,
+            'efr': tr.select_one('td:nth-of-type(8)').text,
+            'tas': tr.select_one('td:nth-of-type(9)').text,
+            'deliveries': tr.select_one('td:nth-of-type(10)').text,
+            'at_close': tr.select_one('td:nth-of-type(11)').text,
+            'change': tr.select_one('td:last-of-type').text
+        }
+
+
+def _random_price() -> str:
+    return f"{random.randint(1, 3000):,}.{random.randint(0, 99):02d}"
+
+
+def make_settlements_html(rows: int) -> str:
+    trs = []
+    for i in range(rows):
+        cells = [f"{MONTHS[i % 12]} {24 + i // 12}"] + [_random_price() for _ in range(4)] + ["+.25", _random_price(), f"{random.randint(0, 99999):,}", f"{random.randint(0, 999999):,}"]
+        trs.append("<tr>" + "".join(f"<td>{cell}</td>" for cell in cells) + "</tr>")
+    return f'<html><body><div class="main-table-wrapper"><table><tbody>{"".join(trs)}</tbody></table></div></body></html>'
+
+
+def make_volume_oi_html(rows: int) -> str:
+    trs = []
+    for i in range(rows):
+        cells = [f"{MONTHS[i % 12]} {24 + i // 12}"] + [f"{random.randint(0, 99999):,}" for _ in range(10)] + [f"+{random.randint(0, 999):,}"]
+        trs.append("<tr>" + "".join(f"<td>{cell}</td>" for cell in cells) + "</tr>")
+    return f'<html><body><div class="multiline"><div class="main-table-wrapper"><table><tbody>{"".join(trs)}</tbody></table></div></div></body></html>'
+
+
+def main():
+    parser = argparse.ArgumentParser(description="テーブルパーサーのベンチマーク")
+    parser.add_argument("--rows", type=int, nargs="+", default=[100, 1000, 5000], help="合成テーブルの行数")
+    parser.add_argument("--repeat", type=int, default=5, help="計測の繰り返し回数")
+    args = parser.parse_args()
+
+    cases = [
+        ("settlements", make_settlements_html, soup_parse_settlements_table, parse_settlements_table),
+        ("volume_oi", make_volume_oi_html, soup_parse_volume_oi_table, parse_volume_oi_table),
+    ]
+    print(f"{'table':<12}{'rows':>8}{'soup (s)':>12}{'lxml (s)':>12}{'speedup':>10}")
+    for name, make_html, soup_parser, columnar_parser in cases:
+        for rows in args.rows:
+            html = make_html(rows)
+
+            def run_soup() -> pd.DataFrame:
+                return pd.DataFrame(list(soup_parser(BeautifulSoup(html, 'lxml'))))
+
+            def run_columnar() -> pd.DataFrame:
+                return columnar_parser(html)
+
+            # 両パーサーの出力が一致することを確認してから計測する
+            assert_frame_equal(run_columnar(), run_soup())
+            soup_time = min(timeit.repeat(run_soup, number=1, repeat=args.repeat))
+            columnar_time = min(timeit.repeat(run_columnar, number=1, repeat=args.repeat))
+            print(f"{name:<12}{rows:>8}{soup_time:>12.4f}{columnar_time:>12.4f}{soup_time / columnar_time:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -5,13 +5,16 @@ from sqlalchemy.orm import Session
 from typing import Generator, Any
 
 from src.domain.services.asset_service import AssetService
-from src.infrastructure.database.database import db_session
+from src.infrastructure.database.database import scraper_db_session
+from src.infrastructure.cache.asset_registry import AssetRegistry
+from src.infrastructure.cache.cached_asset_repository import CachedAssetRepository
 from src.infrastructure.mysql.asset_repository_mysql import AssetRepositoryMysql
+from src.infrastructure.redis.asset_registry_version_repository_redis import AssetRegistryVersionRepositoryRedis
 
 
 
 def get_db() -> Generator[Session, Any, Any]:
-    db = db_session()
+    db = scraper_db_session()
     try:
         yield db
     finally:
@@ -25,7 +28,8 @@ def main():
 
     args = parser.parse_args()
 
-    asset_repository = AssetRepositoryMysql(next(get_db()))
+    # 資産の追加・削除後にRedisのバージョンを増やし、起動中のAPIのワーカーに資産の一覧を読み込み直させる
+    asset_repository = CachedAssetRepository(AssetRepositoryMysql(next(get_db())), AssetRegistry(AssetRegistryVersionRepositoryRedis()))
     asset_service = AssetService(asset_repository)
 
     if args.config:
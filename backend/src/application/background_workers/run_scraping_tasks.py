@@ -1,27 +1,73 @@
 # src/application/background_workers/run_scraping_tasks.py
+import os
+
 from src.domain.services.asset_service import AssetService
 from src.domain.services.settlement_service import SettlementService
 from src.domain.services.volume_oi_service import VolumeOIService
+from src.infrastructure.cache.asset_registry import AssetRegistry
+from src.infrastructure.cache.cached_asset_repository import CachedAssetRepository
 from src.infrastructure.mysql.asset_repository_mysql import AssetRepositoryMysql
+from src.infrastructure.mysql.futures_curve_repository_mysql import FuturesCurveRepositoryMysql
 from src.infrastructure.mysql.settlement_repository_mysql import SettlementRepositoryMysql
+from src.infrastructure.mysql.trade_date_summary_repository_mysql import TradeDateSummaryRepositoryMysql
 from src.infrastructure.mysql.volume_oi_repository_mysql import VolumeOIRepositoryMysql
-from src.infrastructure.database.database import db_session
+from src.infrastructure.database.database import scraper_db_session
+from src.infrastructure.redis.asset_registry_version_repository_redis import AssetRegistryVersionRepositoryRedis
+from src.infrastructure.redis.futures_data_cache_repository_redis import FuturesDataCacheRepositoryRedis
+from src.infrastructure.redis.ingest_event_repository_redis import IngestEventRepositoryRedis
 from src.infrastructure.scraping import cme_scraper
 from src.settings import logger
 
 
-def run_settlements_scraping_task():
+# 同時に起動するChromeの数。1の場合は従来通り1つのドライバーで全アセットを順番に処理する
+DEFAULT_POOL_SIZE = int(os.getenv('SCRAPING_POOL_SIZE', 1))
+
+
+# 資産ごとのidの取得で毎回DBに問い合わせないように、資産の一覧は1回だけ読み込む
+asset_registry = AssetRegistry(AssetRegistryVersionRepositoryRedis())
+
+# 書き込んだ資産・取引日の/futures-dataのキャッシュを無効化するため、APIと同じRedisに接続する
+# キャッシュは資産名で保存されるため、asset_registryでidを資産名に変換する
+# redisのクライアントはスレッドセーフなため、ワーカー間で共有する
+futures_data_cache = FuturesDataCacheRepositoryRedis(asset_registry=asset_registry)
+
+# 書き込みのたびにイベントを発行し、APIの各レプリカのプロセス内のキャッシュを無効化させる
+ingest_events = IngestEventRepositoryRedis()
+
+
+def _asset_service() -> AssetService:
+    return AssetService(CachedAssetRepository(AssetRepositoryMysql(scraper_db_session()), asset_registry))
+
+
+# NOTE: scraper_db_sessionはscoped_sessionのため、ワーカースレッド上で呼び出すとスレッドごとに独立したセッションが払い出される
+def _settlement_service_for_worker() -> SettlementService:
+    session = scraper_db_session()
+    return SettlementService(SettlementRepositoryMysql(session), futures_data_cache, TradeDateSummaryRepositoryMysql(session), ingest_events, FuturesCurveRepositoryMysql(session))
+
+
+def _volume_oi_service_for_worker() -> VolumeOIService:
+    session = scraper_db_session()
+    return VolumeOIService(VolumeOIRepositoryMysql(session), futures_data_cache, TradeDateSummaryRepositoryMysql(session), ingest_events, FuturesCurveRepositoryMysql(session))
+
+
+def run_settlements_scraping_task(pool_size: int = DEFAULT_POOL_SIZE):
     logger.info("Running settlements scraping task")
-    asset_service = AssetService(AssetRepositoryMysql(db_session()))
-    settlement_service = SettlementService(SettlementRepositoryMysql(db_session()))
-    cme_scraper.scrape_settlements(asset_service, settlement_service)
+    asset_service = _asset_service()
+    if pool_size > 1:
+        cme_scraper.scrape_settlements_with_pool(asset_service, _settlement_service_for_worker, pool_size)
+    else:
+        settlement_service = _settlement_service_for_worker()
+        cme_scraper.scrape_settlements(asset_service, settlement_service)
 
 
-def run_volume_oi_scraping_task():
+def run_volume_oi_scraping_task(pool_size: int = DEFAULT_POOL_SIZE):
     logger.info("Running volume and open interest scraping task")
-    asset_service = AssetService(AssetRepositoryMysql(db_session()))
-    volume_oi_service = VolumeOIService(VolumeOIRepositoryMysql(db_session()))
-    cme_scraper.scrape_volume_and_open_interest(asset_service, volume_oi_service)
+    asset_service = _asset_service()
+    if pool_size > 1:
+        cme_scraper.scrape_volume_and_open_interest_with_pool(asset_service, _volume_oi_service_for_worker, pool_size)
+    else:
+        volume_oi_service = _volume_oi_service_for_worker()
+        cme_scraper.scrape_volume_and_open_interest(asset_service, volume_oi_service)
 
 
 # コマンドライン引数を使って、実行するタスクを指定
@@ -30,10 +76,12 @@ def main():
 
     if len(sys.argv) > 1:
         task_name = sys.argv[1]
+        # 2番目の引数でドライバープールのサイズを指定できる (例: run_scraping_tasks.py settlement 4)
+        pool_size = int(sys.argv[2]) if len(sys.argv) > 2 else DEFAULT_POOL_SIZE
         if task_name == "settlement":
-            run_settlements_scraping_task()
+            run_settlements_scraping_task(pool_size)
         elif task_name == "volume_oi":
-            run_volume_oi_scraping_task()
+            run_volume_oi_scraping_task(pool_size)
         else:
             print(f"Unknown task: {task_name}")
     else:
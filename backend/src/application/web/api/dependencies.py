@@ -1,29 +1,47 @@
 # src/application/web/api/dependencies.py
 import os
+from functools import partial
 
 from fastapi import Depends
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from typing import Generator, Callable
+from typing import AsyncGenerator, Generator, Callable
 from typing import Any
 
 from src.settings import logger
+from src.domain.helpers.single_flight import AsyncSingleFlight, SingleFlight
 from src.domain.services.asset_service import AssetService
-from src.domain.services.auth_service import AuthService
+from src.domain.services.auth_service import AsyncAuthService, AuthService
 from src.domain.services.email_service import EmailService
-from src.domain.services.futures_data_service import FuturesDataService
-from src.domain.services.trade_date_service import TradeDateService
-from src.domain.services.user_service import UserService
-from src.domain.repositories.asset_repository import AssetRepository
+from src.domain.services.futures_data_service import AsyncFuturesDataService, FuturesDataService
+from src.domain.services.trade_date_service import AsyncTradeDateService, TradeDateService
+from src.domain.services.user_service import AsyncUserService, UserService
+from src.domain.repositories.asset_repository import AssetRepository, AsyncAssetRepository
+from src.domain.repositories.futures_data_cache_repository import FuturesDataCacheRepository
 from src.domain.repositories.futures_data_repository import FuturesDataRepository
+from src.domain.repositories.ingest_event_repository import IngestEvent
 from src.domain.repositories.temp_user_repository import TempUserRepository
-from src.domain.repositories.trade_date_repository import TradeDateRepository
+from src.domain.repositories.trade_date_repository import AsyncTradeDateRepository, TradeDateRepository
 from src.domain.repositories.user_repository import UserRepository
+from src.infrastructure.cache.asset_registry import AssetRegistry
+from src.infrastructure.cache.cached_asset_repository import AsyncCachedAssetRepository, CachedAssetRepository
+from src.infrastructure.cache.local_futures_data_cache_repository import LocalFuturesDataCacheRepository
 from src.infrastructure.mysql.asset_repository_mysql import AssetRepositoryMysql
+from src.infrastructure.mysql.async_asset_repository_mysql import AsyncAssetRepositoryMysql
+from src.infrastructure.mysql.async_futures_data_repository_mysql import AsyncFuturesDataRepositoryMysql
+from src.infrastructure.mysql.async_futures_data_trade_date_repository_mysql import AsyncFuturesDataTradeDateRepositoryMysql
+from src.infrastructure.mysql.async_user_repository_mysql import AsyncUserRepositoryMysql
 from src.infrastructure.mysql.futures_data_repository_mysql import FuturesDataRepositoryMysql
 from src.infrastructure.mysql.futures_data_trade_date_repository_mysql import FuturesDataTradeDateRepositoryMysql
 from src.infrastructure.mysql.user_repository_mysql import UserRepositoryMysql
+from src.infrastructure.redis.asset_registry_version_repository_redis import AssetRegistryVersionRepositoryRedis
+from src.infrastructure.redis.futures_data_cache_repository_redis import FuturesDataCacheRepositoryRedis
+from src.infrastructure.redis.ingest_event_repository_redis import IngestEventRepositoryRedis
+from src.infrastructure.redis.single_flight_repository_redis import SingleFlightRepositoryRedis
 from src.infrastructure.redis.temp_user_repository_redis import TempUserRepositoryRedis
-from src.infrastructure.database.database import db_session
+from src.infrastructure.database.database import async_db_session, async_session_scope, db_session, get_shared_engine
+from src.application.web.api.ingest_event_subscriber import IngestEventSubscriber
+from src.application.web.api.warm_up import WarmUpState, warm_up_once_per_pod
 
 
 def get_db() -> Generator[Session, Any, Any]:
@@ -33,6 +51,12 @@ def get_db() -> Generator[Session, Any, Any]:
     finally:
         db.close()
 
+# APIのリクエスト処理用。セッションはリクエストの終了時に閉じられ、コネクションはプールに返却される
+# 非同期の依存関係はスレッドプールを経由せずにイベントループ上で実行される
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    async with async_db_session() as db:
+        yield db
+
 def get_user_repository(db: Session = Depends(get_db)) -> UserRepository:
     logger.info("Fetching UserRepositoryMysql")
     return UserRepositoryMysql(db)
@@ -49,17 +73,78 @@ def get_temp_user_repository() -> TempUserRepository:
 def get_auth_service(user_service: UserService = Depends(get_user_service), email_service: EmailService = Depends(get_email_service), temp_user_repository: TempUserRepository = Depends(get_temp_user_repository)) -> AuthService:
     return AuthService(user_service, email_service, temp_user_repository)
 
+async def get_async_auth_service(db: AsyncSession = Depends(get_async_db)) -> AsyncAuthService:
+    return AsyncAuthService(AsyncUserService(AsyncUserRepositoryMysql(db)))
+
 def get_futures_data_repository(db: Session = Depends(get_db)) -> FuturesDataRepository:
     logger.info("Fetching FuturesDataRepositoryMysql")
-    return FuturesDataRepositoryMysql(db)
+    # エクスポートのストリーミングは、実行時間を制限しないexportプロファイルのエンジンで実行する
+    return FuturesDataRepositoryMysql(db, partial(get_shared_engine, 'export'))
+
+# 資産名とidの対応はリクエスト間で共有し、資産の追加・削除時にRedisのバージョンで全てのワーカーに読み込み直させる
+_asset_registry = AssetRegistry(AssetRegistryVersionRepositoryRedis())
+
+def get_asset_registry() -> AssetRegistry:
+    return _asset_registry
+
+def get_asset_repository(db: Session = Depends(get_db)) -> AssetRepository:
+    logger.info("Fetching CachedAssetRepository")
+    return CachedAssetRepository(AssetRepositoryMysql(db), _asset_registry)
+
+def get_async_asset_repository(db: AsyncSession) -> AsyncAssetRepository:
+    return AsyncCachedAssetRepository(AsyncAssetRepositoryMysql(db), _asset_registry)
+
+# 同じ引数の同時のリクエストを、ワーカー内で1回のクエリにまとめる
+# SINGLE_FLIGHT_ACROSS_WORKERSを有効にした場合は、Redisのロックでワーカー間でもまとめる
+_single_flight_repository = SingleFlightRepositoryRedis() if os.getenv('SINGLE_FLIGHT_ACROSS_WORKERS', 'false').lower() in ('1', 'true', 'yes', 'on') else None
+_single_flight = SingleFlight(_single_flight_repository)
+_async_single_flight = AsyncSingleFlight(_single_flight_repository)
 
 def get_futures_data_service(db: Session = Depends(get_db)) -> FuturesDataService:
     futures_data_repository = get_futures_data_repository(db)
-    return FuturesDataService(futures_data_repository)
+    return FuturesDataService(futures_data_repository, get_asset_repository(db), _single_flight)
 
-def get_asset_repository(db: Session = Depends(get_db)) -> AssetRepository:
-    logger.info("Fetching AssetRepositoryMysql")
-    return AssetRepositoryMysql(db)
+# single_flightでまとめたクエリは、最初のリクエストのキャンセル (セッションのクローズ) の影響を受けないように専用のセッションで実行する
+_shared_futures_data_repository_scope = async_session_scope(AsyncFuturesDataRepositoryMysql)
+
+async def get_async_futures_data_service(db: AsyncSession = Depends(get_async_db)) -> AsyncFuturesDataService:
+    return AsyncFuturesDataService(AsyncFuturesDataRepositoryMysql(db), get_async_asset_repository(db), _async_single_flight, _shared_futures_data_repository_scope)
+
+# Redisのコネクションプールをリクエスト間で共有するため、インスタンスは1つのみ生成する
+# スクレイパーの取り込みイベントを受信できている間は、Redisの前段のプロセス内のキャッシュからも返す
+_futures_data_cache_repository = LocalFuturesDataCacheRepository(FuturesDataCacheRepositoryRedis(asset_registry=_asset_registry))
+
+def get_futures_data_cache_repository() -> FuturesDataCacheRepository:
+    return _futures_data_cache_repository
+
+# 起動時のキャッシュのウォームアップの進捗。ワーカープロセスごとに持ち、readinessプローブに返す
+# ウォームアップはRedisのロックでPodごとに1つのワーカーのみが実行し、他のワーカーはRedisに保存された進捗を読み込む
+_warm_up_state = WarmUpState()
+_warm_up_lock_repository = SingleFlightRepositoryRedis() if os.getenv('WARM_UP_ONCE_PER_POD', 'true').lower() in ('1', 'true', 'yes', 'on') else None
+
+def get_warm_up_state() -> WarmUpState:
+    return _warm_up_state
+
+def _evict_ingested_futures_data(event: IngestEvent) -> None:
+    # 書き込まれた資産・取引日のレスポンスを、このワーカーのキャッシュから削除する。資産名が分からない場合は、取引日の全ての資産のレスポンスを削除する
+    asset_map = _asset_registry.peek()
+    asset_name = asset_map.names_by_id.get(event.asset_id) if asset_map is not None else None
+    evicted = _futures_data_cache_repository.evict(event.trade_date, asset_name)
+    logger.debug(f"Evicted {evicted} futures data cache entries for ingest event {event}")
+
+_ingest_event_subscriber = IngestEventSubscriber(
+    IngestEventRepositoryRedis(),
+    _evict_ingested_futures_data,
+    on_connect=_futures_data_cache_repository.activate,
+    on_disconnect=_futures_data_cache_repository.deactivate
+)
+
+def get_ingest_event_subscriber() -> IngestEventSubscriber:
+    return _ingest_event_subscriber
+
+async def run_warm_up() -> None:
+    # リクエストと同じAssetRegistry、キャッシュ、SingleFlightに読み込む。起動直後のリクエストとクエリが重なった場合はまとめる
+    await warm_up_once_per_pod(_warm_up_state, _warm_up_lock_repository, _asset_registry, _futures_data_cache_repository, _async_single_flight)
 
 def get_asset_service(db: Session = Depends(get_db)) -> AssetService:
     asset_repository = get_asset_repository(db)
@@ -76,5 +161,19 @@ def get_trade_date_repository(graph_type: str, db: Session = Depends(get_db)) ->
 def get_trade_date_service(db: Session = Depends(get_db)) -> Callable[[str], TradeDateService]:
     def _dependency(graph_type: str):
         trade_date_repository = get_trade_date_repository(graph_type, db)
-        return TradeDateService(trade_date_repository)
+        return TradeDateService(trade_date_repository, get_asset_repository(db), _single_flight)
+    return _dependency
+
+def get_async_trade_date_repository(graph_type: str, db: AsyncSession) -> AsyncTradeDateRepository:
+    if graph_type == "futures-data":
+        return AsyncFuturesDataTradeDateRepositoryMysql(db)
+    else:
+        logger.error(f"Unsupported graph type: {graph_type}")
+        raise ValueError("Unsupported graph type")
+
+async def get_async_trade_date_service(db: AsyncSession = Depends(get_async_db)) -> Callable[[str], AsyncTradeDateService]:
+    def _dependency(graph_type: str):
+        trade_date_repository = get_async_trade_date_repository(graph_type, db)
+        repository_scope = async_session_scope(partial(get_async_trade_date_repository, graph_type))
+        return AsyncTradeDateService(trade_date_repository, get_async_asset_repository(db), _async_single_flight, repository_scope)
     return _dependency
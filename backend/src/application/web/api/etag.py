@@ -0,0 +1,22 @@
+# src/application/web/api/etag.py
+import hashlib
+
+
+def make_etag(version: object) -> str:
+    """
+    レスポンスの内容を決める値 (リクエストのパラメータとデータのバージョン) から、強いETagを作成します。
+    versionのreprが同じであれば、同じETagになります。
+    """
+    return f'"{hashlib.sha256(repr(version).encode("utf-8")).hexdigest()[:32]}"'
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """
+    If-None-Matchヘッダーのいずれかのタグが、etagと一致するかを判定します。
+    If-None-Matchは弱い比較を行うため、nginxのgzip圧縮などで付与されたW/は無視します。
+    """
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == '*':
+        return True
+    return any(tag.strip().removeprefix('W/') == etag for tag in if_none_match.split(','))
@@ -0,0 +1,67 @@
+# src/application/web/api/futures_data_export.py
+from __future__ import annotations
+
+import zlib
+from typing import TYPE_CHECKING, Callable, Iterable, Iterator
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+
+def _dataframe_to_ndjson(df: pd.DataFrame, is_first: bool) -> bytes:
+    return df.to_json(orient='records', lines=True, date_format='iso', double_precision=15).rstrip('\n').encode('utf-8') + b'\n'
+
+
+def _dataframe_to_csv(df: pd.DataFrame, is_first: bool) -> bytes:
+    # ヘッダーは最初のチャンクのみに出力する
+    return df.to_csv(index=False, header=is_first, lineterminator='\n').encode('utf-8')
+
+
+# フォーマット名: (Content-Type, チャンクごとのシリアライズ関数)
+EXPORT_FORMATS: dict[str, tuple[str, Callable[[pd.DataFrame, bool], bytes]]] = {
+    'ndjson': ('application/x-ndjson', _dataframe_to_ndjson),
+    'csv': ('text/csv; charset=utf-8', _dataframe_to_csv),
+}
+
+
+def _trade_dates_to_iso(df: pd.DataFrame) -> pd.DataFrame:
+    # 取引日はdate型のため、どのフォーマットでも "YYYY-MM-DD" の文字列で出力する
+    return df.assign(trade_date=[trade_date.isoformat() for trade_date in df['trade_date']])
+
+
+def iter_export_chunks(frames: Iterable[pd.DataFrame], export_format: str) -> Iterator[bytes]:
+    """
+    DataFrameを1つずつ、EXPORT_FORMATSのフォーマットのバイト列に変換します。
+
+    :param frames: FuturesDataService.iter_export_framesが返すDataFrameのイテレーター
+    :param export_format: EXPORT_FORMATSのフォーマット名
+    :return: DataFrameごとのチャンクのイテレーター
+    """
+    _, serializer = EXPORT_FORMATS[export_format]
+    for index, df in enumerate(frames):
+        yield serializer(_trade_dates_to_iso(df), index == 0)
+
+
+def gzip_chunks(chunks: Iterable[bytes], level: int = 6) -> Iterator[bytes]:
+    """
+    チャンクを順にgzipで圧縮します。全体をメモリに保持せずに、1つのgzipストリームとして出力します。
+    クライアントがチャンクごとに展開できるように、各チャンクの後でフラッシュします。
+
+    :param chunks: 圧縮前のチャンクのイテレーター
+    :param level: 圧縮レベル
+    :return: 圧縮後のチャンクのイテレーター
+    """
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    for chunk in chunks:
+        yield compressor.compress(chunk) + compressor.flush(zlib.Z_SYNC_FLUSH)
+    yield compressor.flush()
+
+
+def accepts_gzip(accept_encoding: str | None) -> bool:
+    """Accept-Encodingヘッダーで、gzipがq=0以外で指定されているかを判定します"""
+    for coding in (accept_encoding or '').split(','):
+        name, *params = [part.strip() for part in coding.split(';')]
+        if name.lower() not in ('gzip', 'x-gzip'):
+            continue
+        return not any(param.replace(' ', '') in ('q=0', 'q=0.0', 'q=0.00', 'q=0.000') for param in params)
+    return False
@@ -0,0 +1,64 @@
+# src/application/web/api/futures_data_format.py
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Callable
+
+from src.domain.logics.convert_dataframe import dataframe_to_arrow_ipc, dataframe_to_columnar_json, dataframe_to_json, dataframe_to_msgpack
+from src.application.web.api.models.futures_data_model import FuturesDataResponse
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+
+def _dataframe_to_records_json(df: pd.DataFrame) -> bytes:
+    # 従来通り、行ごとのオブジェクトのリストを返す
+    return FuturesDataResponse(data=dataframe_to_json(df)['data']).model_dump_json().encode('utf-8')
+
+
+# フォーマット名: (Content-Type, シリアライズ関数)
+FUTURES_DATA_FORMATS: dict[str, tuple[str, Callable[[pd.DataFrame], bytes]]] = {
+    'records': ('application/json', _dataframe_to_records_json),
+    'columnar': ('application/vnd.futures-data.columnar+json', dataframe_to_columnar_json),
+    'arrow': ('application/vnd.apache.arrow.stream', dataframe_to_arrow_ipc),
+    'msgpack': ('application/msgpack', dataframe_to_msgpack),
+}
+
+_FORMATS_BY_MEDIA_TYPE: dict[str, str] = {
+    **{media_type: name for name, (media_type, _) in FUTURES_DATA_FORMATS.items()},
+    'application/x-msgpack': 'msgpack',
+    'application/*': 'records',
+    '*/*': 'records',
+}
+
+
+def negotiate_futures_data_format(accept: str | None) -> str | None:
+    """
+    Acceptヘッダーから、レスポンスのフォーマットを決定します。
+    qの値が大きい順に、同じ場合はヘッダー内の順に、対応しているメディアタイプを選択します。
+
+    :param accept: Acceptヘッダーの値
+    :return: FUTURES_DATA_FORMATSのフォーマット名。Acceptヘッダーがない場合は'records'、対応するフォーマットがない場合はNone
+    """
+    if not accept:
+        return 'records'
+
+    candidates: list[tuple[float, int, str]] = []
+    for index, media_range in enumerate(accept.split(',')):
+        media_type, *params = [part.strip() for part in media_range.split(';')]
+        quality = 1.0
+        for param in params:
+            name, _, value = param.partition('=')
+            if name.strip() == 'q':
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        response_format = _FORMATS_BY_MEDIA_TYPE.get(media_type.lower())
+        if response_format is not None and quality > 0:
+            candidates.append((-quality, index, response_format))
+    return min(candidates)[2] if candidates else None
+
+
+def serialize_futures_data(df: pd.DataFrame, response_format: str) -> bytes:
+    _, serializer = FUTURES_DATA_FORMATS[response_format]
+    return serializer(df)
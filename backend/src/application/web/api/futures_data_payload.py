@@ -0,0 +1,62 @@
+# src/application/web/api/futures_data_payload.py
+from __future__ import annotations
+
+import asyncio
+from datetime import date
+from typing import TYPE_CHECKING, NamedTuple
+
+from src.domain.exceptions.data_not_found_error import DataNotFoundError
+from src.domain.logics.convert_dataframe import to_year_month_format
+from src.domain.repositories.futures_data_repository import FuturesDataVersion
+from src.application.web.api.etag import make_etag
+from src.application.web.api.futures_data_format import serialize_futures_data
+from src.settings import logger
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+    from src.domain.services.futures_data_service import AsyncFuturesDataService
+
+
+def _serialize_dataframe(futures_data_service: AsyncFuturesDataService, df: pd.DataFrame, response_format: str) -> bytes:
+    # スプレッドの計算からシリアライズまでをまとめて、イベントループの外 (スレッド) で実行する
+    df = futures_data_service.add_settlement_spread(df)
+    df = to_year_month_format(df, 'month')
+    # 行ごとのオブジェクトを作らずに、DataFrameから直接シリアライズする (recordsのみ従来通り)
+    return serialize_futures_data(df, response_format)
+
+
+class FuturesDataValidators(NamedTuple):
+    etag: str
+    # 全ての取引日のデータが確定済みか
+    is_final: bool
+    # ETagの計算に使用したデータのバージョン。レスポンスの作成時に、同じバージョンの呼び出しのみをまとめるために渡す
+    versions: list[FuturesDataVersion]
+
+
+async def fetch_futures_data_validators(futures_data_service: AsyncFuturesDataService, asset_name: str, trade_dates: list[date], response_format: str) -> FuturesDataValidators:
+    """
+    /futures-data/{asset_name} のレスポンスのETagと、データが確定済みかを返します。
+    データを取得する前に呼び出すこと。取得後に判定すると、その間に確定したデータを速報値のまま期限なしでキャッシュしてしまう。
+    """
+    versions = await futures_data_service.fetch_versions(asset_name, trade_dates)
+    is_final = await futures_data_service.is_finalized(asset_name, trade_dates, versions)
+    etag = make_etag(('futures-data', response_format, asset_name, sorted(set(trade_dates)), versions))
+    return FuturesDataValidators(etag, is_final, versions)
+
+
+async def build_futures_data_payload(futures_data_service: AsyncFuturesDataService, asset_name: str, trade_dates: list[date], response_format: str, versions: list[FuturesDataVersion] | None = None) -> bytes:
+    """
+    /futures-data/{asset_name} のレスポンスの本文を作成します。APIのリクエストと起動時のウォームアップで共通。
+
+    :param versions: fetch_futures_data_validatorsで取得したバージョン。同時の呼び出しは、バージョンが同じ場合のみまとめる
+    :raises DataNotFoundError: データが見つからない場合
+    """
+    df = await futures_data_service.make_dataframe(asset_name, trade_dates, versions=versions)
+
+    if df.empty:
+        raise DataNotFoundError("No data found for the given parameters.")
+
+    payload = await asyncio.to_thread(_serialize_dataframe, futures_data_service, df, response_format)
+    logger.info(f"Futures data fetched: {len(df)} rows, format: {response_format}, {len(payload)} bytes")
+    return payload
@@ -0,0 +1,95 @@
+# src/application/web/api/ingest_event_subscriber.py
+import os
+import threading
+from typing import Callable
+
+from src.domain.repositories.ingest_event_repository import IngestEvent, IngestEventRepository
+from src.settings import logger
+
+
+def is_ingest_events_enabled() -> bool:
+    return os.getenv('INGEST_EVENTS_ENABLED', 'true').lower() in ('1', 'true', 'yes', 'on')
+
+
+class IngestEventSubscriber:
+    """
+    スクレイパーが発行した取り込みイベントを、バックグラウンドのスレッドで読み込んでhandlerに渡す。
+    読み込んだ位置から再開するため、Redisに再接続した場合も間のイベントを取りこぼさない。
+    読み込めるようになった時点でon_connect、読み込めなくなった時点でon_disconnectを呼び出す。
+    """
+    def __init__(
+        self,
+        repository: IngestEventRepository,
+        handler: Callable[[IngestEvent], None],
+        on_connect: Callable[[], None] | None = None,
+        on_disconnect: Callable[[], None] | None = None,
+        block_ms: int = int(os.getenv('INGEST_EVENTS_BLOCK_MS', 5000)),
+        retry_interval: float = float(os.getenv('INGEST_EVENTS_RETRY_INTERVAL', 1))
+    ):
+        self.repository = repository
+        self.handler = handler
+        self.on_connect = on_connect
+        self.on_disconnect = on_disconnect
+        self.block_ms = block_ms
+        self.retry_interval = retry_interval
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._connected = False
+
+
+    def start(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name='ingest-event-subscriber', daemon=True)
+        self._thread.start()
+
+
+    def stop(self, timeout: float | None = None) -> None:
+        """
+        スレッドを停止します。読み込み中の場合は、最大block_msミリ秒待ちます。
+        """
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+        self._set_connected(False)
+
+
+    def _set_connected(self, connected: bool) -> None:
+        if connected == self._connected:
+            return
+        self._connected = connected
+        callback = self.on_connect if connected else self.on_disconnect
+        if callback is not None:
+            callback()
+        logger.info(f"Ingest event subscriber {'connected' if connected else 'disconnected'}")
+
+
+    def _run(self) -> None:
+        last_id: str | None = None
+        while not self._stop.is_set():
+            if last_id is None:
+                # 起動後に発行されたイベントのみを読み込む
+                last_id = self.repository.fetch_last_id()
+                if last_id is None:
+                    self._set_connected(False)
+                    self._stop.wait(self.retry_interval)
+                    continue
+                self._set_connected(True)
+
+            result = self.repository.read(last_id, self.block_ms)
+            if self._stop.is_set():
+                break
+            if result is None:
+                # 再接続後は、読み込んだ位置から再開する
+                self._set_connected(False)
+                self._stop.wait(self.retry_interval)
+                continue
+
+            self._set_connected(True)
+            last_id, events = result
+            for event in events:
+                try:
+                    self.handler(event)
+                except Exception as e:
+                    logger.error(f"Failed to handle ingest event {event}: {e}")
@@ -0,0 +1,14 @@
+# src/application/web/api/models/db_pool_model.py
+from pydantic import BaseModel, Field
+
+
+class DbPoolStatsResponse(BaseModel):
+    profile: str = Field(..., description="エンジンのプロファイル名。非同期のエンジンは -async が付く")
+    checkouts: int = Field(..., description="コネクションの取得回数")
+    timeouts: int = Field(..., description="pool_timeout内にコネクションを取得できなかった回数")
+    avg_checkout_ms: float = Field(..., description="コネクションの取得にかかった時間の平均 (ミリ秒)")
+    max_checkout_ms: float = Field(..., description="コネクションの取得にかかった時間の最大値 (ミリ秒)")
+    checked_out: int = Field(..., description="使用中のコネクション数")
+    max_checked_out: int = Field(..., description="使用中のコネクション数の最大値")
+    capacity: int = Field(..., description="プールの上限 (pool_size + max_overflow)")
+    saturation: float = Field(..., description="使用中のコネクション数 / プールの上限")
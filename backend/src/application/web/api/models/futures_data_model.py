@@ -12,6 +12,12 @@ class FuturesDataResponse(BaseModel):
     data: list[dict[str, Any]] = Field(default_factory=list, description="取引データのリスト")
 
 
+class FuturesDataCacheStatsResponse(BaseModel):
+    hits: int = Field(..., description="キャッシュヒット数")
+    misses: int = Field(..., description="キャッシュミス数")
+    local_hits: int = Field(0, description="このワーカーのプロセス内のキャッシュのヒット数 (Redisに問い合わせなかった数)")
+
+
 class FuturesDataRequest(BaseModel):
     asset_name: str = Field(..., description="資産名", min_length=1)
     trade_dates: list[date] = Field(..., description="取引日（複数指定可）")
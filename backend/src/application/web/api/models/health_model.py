@@ -0,0 +1,11 @@
+# src/application/web/api/models/health_model.py
+from pydantic import BaseModel, Field
+
+
+class ReadinessResponse(BaseModel):
+    ready: bool = Field(..., description="起動時のキャッシュのウォームアップが終了したか")
+    assets: int = Field(..., description="ウォームアップが終了した資産の数")
+    payloads: int = Field(..., description="キャッシュに保存したレスポンスの数")
+    failures: int = Field(..., description="ウォームアップに失敗した回数")
+    timed_out: bool = Field(..., description="制限時間を超えて、ウォームアップを途中で終了したか")
+    elapsed_ms: float | None = Field(None, description="ウォームアップにかかった時間 (ミリ秒)。開始していない場合はnull")
@@ -8,6 +8,7 @@ from src.domain.logics.validate_positive_int_for_api import validate_positive_in
 
 class TradeDateResponse(BaseModel):
     trade_dates: list[date] = Field(default_factory=list, description="List of available trade dates within the specified range.")
+    next_after: date | None = Field(None, description="Value of `after` for the next page. None if this is the last page.")
 
 
 class TradeDateRequest(BaseModel):
@@ -17,6 +18,7 @@ class TradeDateRequest(BaseModel):
     end_date: date | None = Field(None, description="End date for the date range filter.")
     skip: int = Field(0, ge=0, description="Number of records to skip for pagination.")
     limit: int = Field(100, ge=1, description="Maximum number of records to return.")
+    after: date | None = Field(None, description="Return only trade dates after this date (keyset pagination).")
 
     @field_validator('start_date', 'end_date', mode='before')
     def validate_and_convert_dates(cls, value: date | None) -> date | None:
@@ -3,7 +3,7 @@ from datetime import timedelta
 from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
 
-from src.application.web.api.dependencies import get_auth_service
+from src.application.web.api.dependencies import get_async_auth_service, get_auth_service
 from src.application.web.api.error_response import ErrorResponse
 from src.application.web.api.models.auth_model import Token, LoginModel, RegisterModel, VerifyRequestModel
 from src.application.web.api.models.user_api_model import UserCreateModel
@@ -13,7 +13,7 @@ from src.domain.exceptions.repository_error import RepositoryError
 from src.domain.exceptions.user_not_found_error import UserNotFoundError
 from src.domain.exceptions.invalid_user_input_error import InvalidUserInputError
 from src.domain.helpers.convert_entity_to_model import convert_entity_to_model
-from src.domain.services.auth_service import AuthService
+from src.domain.services.auth_service import AsyncAuthService, AuthService
 from src.domain.services.user_service import UserService
 from src.infrastructure.authentication.jwt_token import oauth2_scheme
 from src.settings import logger
@@ -63,10 +63,10 @@ def login(login_model: LoginModel, auth_service: AuthService = Depends(get_auth_
     404: {"model": ErrorResponse, "description": "User not found"},
     500: {"model": ErrorResponse, "description": "Internal server error"}
 })
-async def read_users_me(token: str = Depends(oauth2_scheme), auth_service: AuthService = Depends(get_auth_service)):
+async def read_users_me(token: str = Depends(oauth2_scheme), auth_service: AsyncAuthService = Depends(get_async_auth_service)):
     try:
         logger.info(f"Fetching user with token: {token}")
-        user = auth_service.get_current_user(token)
+        user = await auth_service.get_current_user(token)
         user_read_model = convert_entity_to_model(user, UserReadModel)
         return user_read_model
     except CredentialsError as e:
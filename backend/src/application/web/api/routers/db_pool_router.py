@@ -0,0 +1,13 @@
+# src/application/web/api/routers/db_pool_router.py
+from fastapi import APIRouter
+
+from src.application.web.api.models.db_pool_model import DbPoolStatsResponse
+from src.infrastructure.database.engine_profiles import pool_metrics_snapshot
+
+db_pool_router = APIRouter()
+
+
+@db_pool_router.get("/db-pool/stats", response_model=list[DbPoolStatsResponse])
+async def get_db_pool_stats():
+    # このワーカープロセスのコネクションプールの統計。プロセスごとにプールを持つため、ワーカー間では集計しない
+    return [DbPoolStatsResponse(**stats) for stats in pool_metrics_snapshot()]
@@ -1,47 +1,89 @@
 # src/application/web/api/routers/futures_data_router.py
 
+import asyncio
 from datetime import date, datetime
-from fastapi import APIRouter, HTTPException, Depends, Query
+from fastapi import APIRouter, HTTPException, Depends, Header, Query, Response
+from fastapi.responses import StreamingResponse
+from itertools import chain
+from typing import Literal
 
 from src.domain.exceptions.data_not_found_error import DataNotFoundError
 from src.domain.exceptions.dataframe_validation_error import DataFrameValidationError
 from src.domain.exceptions.invalid_input_error import InvalidInputError
 from src.domain.exceptions.repository_error import RepositoryError
-from src.domain.services.futures_data_service import FuturesDataService
-from src.domain.logics.convert_dataframe import dataframe_to_json, to_year_month_format
-from src.application.web.api.models.futures_data_model import FuturesDataResponse, FuturesDataRequest
-from src.application.web.api.dependencies import get_futures_data_service
+from src.domain.repositories.futures_data_cache_repository import FuturesDataCacheEntry, FuturesDataCacheRepository
+from src.domain.services.futures_data_service import AsyncFuturesDataService, FuturesDataService
+from src.application.web.api.models.futures_data_model import FuturesDataCacheStatsResponse, FuturesDataResponse, FuturesDataRequest
+from src.application.web.api.dependencies import get_async_futures_data_service, get_futures_data_cache_repository, get_futures_data_service
 from src.application.web.api.error_response import ErrorResponse
+from src.application.web.api.etag import etag_matches
+from src.application.web.api.futures_data_export import EXPORT_FORMATS, accepts_gzip, gzip_chunks, iter_export_chunks
+from src.application.web.api.futures_data_format import FUTURES_DATA_FORMATS, negotiate_futures_data_format
+from src.application.web.api.futures_data_payload import build_futures_data_payload, fetch_futures_data_validators
 from src.settings import logger
 
 futures_data_router = APIRouter()
 
+# 確定済みのデータは変更されないため、ブラウザやnginxでも長期間キャッシュさせる
+FINAL_CACHE_CONTROL = "public, max-age=31536000, immutable"
+PRELIMINARY_CACHE_CONTROL = "public, max-age=60"
+
+
+def _cache_headers(etag: str, is_final: bool) -> dict[str, str]:
+    # フォーマットはAcceptヘッダーで決まるため、共有キャッシュがフォーマットごとに保存するようにVaryを指定する
+    return {"ETag": etag, "Cache-Control": FINAL_CACHE_CONTROL if is_final else PRELIMINARY_CACHE_CONTROL, "Vary": "Accept"}
+
+
+def _futures_data_response(entry: FuturesDataCacheEntry, response_format: str, if_none_match: str | None) -> Response:
+    headers = _cache_headers(entry.etag, entry.is_final)
+    if etag_matches(if_none_match, entry.etag):
+        return Response(status_code=304, headers=headers)
+    media_type, _ = FUTURES_DATA_FORMATS[response_format]
+    return Response(content=entry.payload, media_type=media_type, headers=headers)
+
+
 @futures_data_router.get("/futures-data/{asset_name}", response_model=FuturesDataResponse, responses={
+    200: {"content": {media_type: {} for media_type, _ in FUTURES_DATA_FORMATS.values()}, "description": "Futures data in the format negotiated by the Accept header"},
     400: {"model": ErrorResponse, "description": "Invalid input or data error"},
     404: {"model": ErrorResponse, "description": "Data not found"},
+    406: {"model": ErrorResponse, "description": "None of the accepted media types is supported"},
     422: {"model": ErrorResponse, "description": "Validation error for request parameters"},
     500: {"model": ErrorResponse, "description": "Internal server error"}
 })
 async def get_futures_data(
     asset_name: str,
     trade_dates: list[date] = Query(..., description="取引日（複数指定可）"),
-    futures_data_service: FuturesDataService = Depends(get_futures_data_service)
+    futures_data_service: AsyncFuturesDataService = Depends(get_async_futures_data_service),
+    futures_data_cache: FuturesDataCacheRepository = Depends(get_futures_data_cache_repository),
+    if_none_match: str | None = Header(None),
+    accept: str | None = Header(None)
 ):
+    response_format = negotiate_futures_data_format(accept)
+    if response_format is None:
+        logger.error(f"Unsupported media type requested: {accept}")
+        raise HTTPException(status_code=406, detail=f"Supported media types: {', '.join(media_type for media_type, _ in FUTURES_DATA_FORMATS.values())}")
+
     try:
         request = FuturesDataRequest(asset_name=asset_name, trade_dates=trade_dates)
         logger.info(f"Fetching futures data for asset: {request.asset_name}, trade_dates: {request.trade_dates}")
 
-        df = futures_data_service.make_dataframe(request.asset_name, request.trade_dates)
-
-        if df.empty:
-            raise DataNotFoundError("No data found for the given parameters.")
+        # データはスクレイパーの実行時にしか変わらないため、シリアライズ済みのレスポンスをそのまま返す
+        # Redisのクライアントは同期のため、イベントループをブロックしないようにスレッドで実行する
+        cached = await asyncio.to_thread(futures_data_cache.fetch, request.asset_name, request.trade_dates, response_format)
+        if cached is not None:
+            logger.info(f"Futures data cache hit for asset: {request.asset_name}, trade_dates: {request.trade_dates}, format: {response_format}")
+            return _futures_data_response(cached, response_format, if_none_match)
 
-        df = futures_data_service.add_settlement_spread(df)
-        df = to_year_month_format(df, 'month')
-        response_data = dataframe_to_json(df)
+        etag, is_final, versions = await fetch_futures_data_validators(futures_data_service, request.asset_name, request.trade_dates, response_format)
+        if etag_matches(if_none_match, etag):
+            # クライアントが同じデータを持っている場合は、レスポンスを作成しない
+            logger.info(f"Futures data not modified for asset: {request.asset_name}, trade_dates: {request.trade_dates}")
+            return Response(status_code=304, headers=_cache_headers(etag, is_final))
 
-        logger.info(f"Futures data fetched: {response_data['data']}")
-        return FuturesDataResponse(data=response_data['data'])
+        payload = await build_futures_data_payload(futures_data_service, request.asset_name, request.trade_dates, response_format, versions)
+        entry = FuturesDataCacheEntry(payload=payload, is_final=is_final, etag=etag)
+        await asyncio.to_thread(futures_data_cache.save, request.asset_name, request.trade_dates, response_format, entry)
+        return _futures_data_response(entry, response_format, None)
 
     except InvalidInputError as e:
         logger.error(f"Invalid input error: {e}")
@@ -61,3 +103,57 @@ async def get_futures_data(
     except Exception as e:
         logger.error(f"Unexpected error: {e}")
         raise HTTPException(status_code=500, detail="An unexpected error occurred.")
+
+
+@futures_data_router.get("/futures-data/{asset_name}/export", response_class=StreamingResponse, responses={
+    200: {"content": {media_type: {} for media_type, _ in EXPORT_FORMATS.values()}, "description": "All futures data in the date range, streamed in chunks"},
+    400: {"model": ErrorResponse, "description": "Invalid input"},
+    404: {"model": ErrorResponse, "description": "Data not found"},
+    500: {"model": ErrorResponse, "description": "Internal server error"}
+})
+async def export_futures_data(
+    asset_name: str,
+    start_date: date | None = Query(None, description="期間の開始日"),
+    end_date: date | None = Query(None, description="期間の終了日"),
+    export_format: Literal['ndjson', 'csv'] = Query('ndjson', alias="format", description="出力フォーマット"),
+    futures_data_service: FuturesDataService = Depends(get_futures_data_service),
+    accept_encoding: str | None = Header(None)
+):
+    try:
+        logger.info(f"Exporting futures data for asset: {asset_name}, start_date: {start_date}, end_date: {end_date}, format: {export_format}")
+        chunks = iter_export_chunks(futures_data_service.iter_export_frames(asset_name, start_date, end_date), export_format)
+        # ステータスコードを決めるため、最初のチャンクのみレスポンスの開始前に作成する
+        # エクスポートは同期のリポジトリを使用するため、イベントループをブロックしないようにスレッドで実行する
+        first_chunk = await asyncio.to_thread(next, chunks, None)
+        if first_chunk is None:
+            raise DataNotFoundError("No data found for the given parameters.")
+    except InvalidInputError as e:
+        logger.error(f"Invalid input error: {e}")
+        raise HTTPException(status_code=400, detail=str(e))
+    except DataNotFoundError as e:
+        logger.error(f"Data not found error: {e}")
+        raise HTTPException(status_code=404, detail=str(e))
+    except RepositoryError as e:
+        logger.error(f"Repository error: {e}")
+        raise HTTPException(status_code=500, detail="Error accessing data repository.")
+    except Exception as e:
+        logger.error(f"Unexpected error: {e}")
+        raise HTTPException(status_code=500, detail="An unexpected error occurred.")
+
+    body = chain([first_chunk], chunks)
+    media_type, _ = EXPORT_FORMATS[export_format]
+    headers = {
+        "Content-Disposition": f'attachment; filename="{asset_name}.{export_format}"',
+        "Vary": "Accept-Encoding",
+    }
+    if accepts_gzip(accept_encoding):
+        body = gzip_chunks(body)
+        headers["Content-Encoding"] = "gzip"
+    return StreamingResponse(body, media_type=media_type, headers=headers)
+
+
+@futures_data_router.get("/futures-data-cache/stats", response_model=FuturesDataCacheStatsResponse)
+async def get_futures_data_cache_stats(
+    futures_data_cache: FuturesDataCacheRepository = Depends(get_futures_data_cache_repository)
+):
+    return FuturesDataCacheStatsResponse(**await asyncio.to_thread(futures_data_cache.fetch_stats))
@@ -0,0 +1,26 @@
+# src/application/web/api/routers/health_router.py
+from fastapi import APIRouter, Depends
+from fastapi.responses import JSONResponse
+
+from src.application.web.api.dependencies import get_warm_up_state
+from src.application.web.api.models.health_model import ReadinessResponse
+from src.application.web.api.warm_up import WarmUpState
+
+health_router = APIRouter()
+
+
+@health_router.get("/health/live")
+async def get_liveness():
+    # ウォームアップ中もプロセスは正常なため、livenessプローブは常に成功させる
+    return {"status": "ok"}
+
+
+@health_router.get("/health/ready", response_model=ReadinessResponse, responses={
+    503: {"model": ReadinessResponse, "description": "Cache warm-up is still running"}
+})
+async def get_readiness(warm_up_state: WarmUpState = Depends(get_warm_up_state)):
+    # ウォームアップが終わるまでは503を返し、キャッシュが空のPodにトラフィックを流させない
+    response = ReadinessResponse(**warm_up_state.snapshot())
+    if not response.ready:
+        return JSONResponse(status_code=503, content=response.model_dump())
+    return response
@@ -1,15 +1,16 @@
 # src/application/web/api/routers/trade_date_router.py
 from datetime import date
-from fastapi import APIRouter, HTTPException, Depends, Query
+from fastapi import APIRouter, HTTPException, Depends, Header, Query, Response
 from typing import Callable
 
 from src.domain.exceptions.data_not_found_error import DataNotFoundError
 from src.domain.exceptions.invalid_input_error import InvalidInputError
 from src.domain.exceptions.repository_error import RepositoryError
-from src.domain.services.trade_date_service import TradeDateService
+from src.domain.services.trade_date_service import AsyncTradeDateService
 from src.application.web.api.models.trade_date_model import TradeDateResponse, TradeDateRequest
-from src.application.web.api.dependencies import get_trade_date_service
+from src.application.web.api.dependencies import get_async_trade_date_service
 from src.application.web.api.error_response import ErrorResponse
+from src.application.web.api.etag import etag_matches, make_etag
 from src.settings import logger
 
 trade_date_router = APIRouter()
@@ -21,20 +22,32 @@ trade_date_router = APIRouter()
     500: {"model": ErrorResponse, "description": "Internal server error"}
 })
 async def get_trade_dates(
+    response: Response,
     graph_type: str = Query(..., description="Type of the graph data."),
     asset_name: str = Query(..., description="Name of the asset."),
     start_date: date | None = Query(None, description="Start date for the date range filter."),
     end_date: date | None = Query(None, description="End date for the date range filter."),
     skip: int = Query(0, ge=0, description="Number of records to skip for pagination."),
     limit: int = Query(100, ge=1, description="Maximum number of records to return."),
-    trade_date_service_dependency: Callable[[str], TradeDateService] = Depends(get_trade_date_service)
+    after: date | None = Query(None, description="Return only trade dates after this date. Use next_after of the previous page for keyset pagination."),
+    trade_date_service_dependency: Callable[[str], AsyncTradeDateService] = Depends(get_async_trade_date_service),
+    if_none_match: str | None = Header(None)
 ):
     try:
-        request = TradeDateRequest(graph_type=graph_type, asset_name=asset_name, start_date=start_date, end_date=end_date, skip=skip, limit=limit)
+        request = TradeDateRequest(graph_type=graph_type, asset_name=asset_name, start_date=start_date, end_date=end_date, skip=skip, limit=limit, after=after)
         logger.info(f"Fetching trade dates for graph_type: {request.graph_type} asset: {request.asset_name}, start_date: {request.start_date}, end_date: {request.end_date}")
 
         trade_date_service = trade_date_service_dependency(request.graph_type)
-        trade_dates = trade_date_service.fetch_trade_dates(request.asset_name, request.start_date, request.end_date, request.skip, request.limit)
+
+        # 取引日のリストを取得する前に、件数と最初・最後の取引日のみでリストが変更されたかを判定する
+        version = await trade_date_service.fetch_trade_dates_version(request.asset_name, request.start_date, request.end_date)
+        etag = make_etag(('trade-dates', request.graph_type, request.asset_name, request.start_date, request.end_date, request.skip, request.limit, request.after, version))
+        headers = {"ETag": etag, "Cache-Control": "no-cache"}
+        if etag_matches(if_none_match, etag):
+            logger.info(f"Trade dates not modified for graph_type: {request.graph_type} asset: {request.asset_name}")
+            return Response(status_code=304, headers=headers)
+
+        trade_dates = await trade_date_service.fetch_trade_dates(request.asset_name, request.start_date, request.end_date, request.skip, request.limit, request.after)
 
         logger.debug(trade_dates)
         if not trade_dates:
@@ -43,7 +56,10 @@ async def get_trade_dates(
         response_data = [trade_date.trade_date for trade_date in trade_dates]
 
         logger.info(f"Trade dates fetched: {response_data}")
-        return TradeDateResponse(trade_dates=response_data)
+        response.headers.update(headers)
+        # 件数がlimitに達した場合のみ、次のページがある可能性がある
+        next_after = response_data[-1] if len(response_data) == request.limit else None
+        return TradeDateResponse(trade_dates=response_data, next_after=next_after)
 
     except InvalidInputError as e:
         logger.error(f"Invalid input error: {e}")
@@ -0,0 +1,270 @@
+# src/application/web/api/warm_up.py
+import asyncio
+import json
+import os
+import socket
+import time
+from dataclasses import dataclass, field
+from datetime import date
+from typing import Any, Callable
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.domain.exceptions.asset_not_found_error import AssetNotFoundError
+from src.domain.exceptions.data_not_found_error import DataNotFoundError
+from src.domain.helpers.single_flight import AsyncSingleFlight
+from src.domain.repositories.futures_data_cache_repository import FuturesDataCacheEntry, FuturesDataCacheRepository
+from src.domain.repositories.single_flight_repository import SingleFlightRepository
+from src.domain.services.futures_data_service import AsyncFuturesDataService
+from src.domain.services.trade_date_service import AsyncTradeDateService
+from src.infrastructure.cache.asset_registry import AssetRegistry
+from src.infrastructure.cache.cached_asset_repository import AsyncCachedAssetRepository
+from src.infrastructure.database.database import async_db_session, async_session_scope
+from src.infrastructure.mysql.async_asset_repository_mysql import AsyncAssetRepositoryMysql
+from src.infrastructure.mysql.async_futures_data_repository_mysql import AsyncFuturesDataRepositoryMysql
+from src.infrastructure.mysql.async_futures_data_trade_date_repository_mysql import AsyncFuturesDataTradeDateRepositoryMysql
+from src.application.web.api.futures_data_payload import build_futures_data_payload, fetch_futures_data_validators
+from src.settings import logger
+
+
+@dataclass
+class WarmUpState:
+    """
+    起動時のキャッシュのウォームアップの進捗。readyになるまで、readinessプローブは失敗を返す。
+    ウォームアップは失敗やタイムアウトでもreadyにする (キャッシュがなくてもリクエストは処理できるため)。
+    """
+    ready: bool = False
+    assets: int = 0
+    payloads: int = 0
+    failures: int = 0
+    timed_out: bool = False
+    started_at: float | None = None
+    finished_at: float | None = None
+
+    def start(self) -> None:
+        self.ready = False
+        self.started_at = time.monotonic()
+
+    def finish(self) -> None:
+        self.finished_at = time.monotonic()
+        self.ready = True
+
+    def load(self, snapshot: dict[str, Any]) -> None:
+        # 同じPodの他のワーカーが実行したウォームアップの結果を読み込み、readyにする
+        self.assets = snapshot['assets']
+        self.payloads = snapshot['payloads']
+        self.failures = snapshot['failures']
+        self.timed_out = snapshot['timed_out']
+        self.finish()
+
+    def snapshot(self) -> dict[str, Any]:
+        if self.started_at is None:
+            elapsed = None
+        else:
+            elapsed = (self.finished_at or time.monotonic()) - self.started_at
+        return {
+            'ready': self.ready,
+            'assets': self.assets,
+            'payloads': self.payloads,
+            'failures': self.failures,
+            'timed_out': self.timed_out,
+            'elapsed_ms': None if elapsed is None else round(elapsed * 1000, 3),
+        }
+
+
+def is_warm_up_enabled() -> bool:
+    return os.getenv('WARM_UP_ENABLED', 'true').lower() in ('1', 'true', 'yes', 'on')
+
+
+@dataclass(frozen=True)
+class WarmUpSettings:
+    # 資産ごとにウォームアップする最新の取引日の数
+    trade_dates_per_asset: int = field(default_factory=lambda: int(os.getenv('WARM_UP_TRADE_DATES', 5)))
+    # キャッシュするレスポンスのフォーマット。フロントエンドはAcceptヘッダーを指定しないため、既定はrecordsのみ
+    formats: tuple[str, ...] = field(default_factory=lambda: tuple(name.strip() for name in os.getenv('WARM_UP_FORMATS', 'records').split(',') if name.strip()))
+    # 同時にウォームアップする資産の数。APIのコネクションプールを使い切らないように、pool_sizeより小さくする
+    concurrency: int = field(default_factory=lambda: int(os.getenv('WARM_UP_CONCURRENCY', 4)))
+    # ウォームアップ全体の制限時間 (秒)。超えた場合は残りを諦めてreadyにする
+    budget: float = field(default_factory=lambda: float(os.getenv('WARM_UP_BUDGET', 30)))
+
+
+# ウォームアップの実行中のロックと結果は、制限時間にこの秒数を加えた時間で期限切れにする
+WARM_UP_LOCK_MARGIN = 10
+
+
+def warm_up_lock_key() -> str:
+    # 同じPodのワーカーは同じホスト名を持つため、Podごとのキーになる
+    return f"warm-up:{socket.gethostname()}"
+
+
+async def warm_up_once_per_pod(
+    state: WarmUpState,
+    lock_repository: SingleFlightRepository | None,
+    asset_registry: AssetRegistry,
+    futures_data_cache: FuturesDataCacheRepository,
+    single_flight: AsyncSingleFlight | None = None,
+    settings: WarmUpSettings | None = None,
+    session_factory: Callable[[], AsyncSession] = async_db_session,
+    lock_key: str | None = None,
+    poll_interval: float = 0.2
+) -> None:
+    """
+    同じPodのワーカーのうち、ロックを取得した1つのワーカーのみがウォームアップを実行し、進捗をRedisに保存します。
+    他のワーカーは保存された進捗を読み込むまでreadyにしないため、どのワーカーが応答してもreadinessプローブの結果は同じになります。
+    Redisに接続できない場合や、実行中のワーカーが進捗を保存せずに終了した場合は、このワーカーでウォームアップを実行します。
+
+    :param state: 進捗を記録するWarmUpState
+    :param lock_repository: ワーカー間のロックと進捗の保存先。Noneの場合は、このワーカーでウォームアップを実行する
+    :param lock_key: ロックのキー。指定しない場合はPodのホスト名から作成する
+    :param poll_interval: 他のワーカーの進捗を確認する間隔 (秒)
+    """
+    if lock_repository is None:
+        await warm_up(state, asset_registry, futures_data_cache, single_flight, settings, session_factory)
+        return
+
+    settings = settings or WarmUpSettings()
+    key = lock_key or warm_up_lock_key()
+    ttl_ms = int((settings.budget + WARM_UP_LOCK_MARGIN) * 1000)
+    state.start()
+    acquire_failed = False
+    while True:
+        # 先に起動したワーカーが終了している場合は、保存された進捗を読み込む (ロックの取得時に削除されるため、取得前に確認する)
+        payload, running = await asyncio.to_thread(lock_repository.poll_result, key)
+        if payload is not None:
+            state.load(json.loads(payload))
+            logger.info(f"Cache warm-up finished by another worker: {state.snapshot()}")
+            return
+        if running:
+            acquire_failed = False
+            await asyncio.sleep(poll_interval)
+            continue
+        if acquire_failed:
+            # ロックを取得できず、他のワーカーも実行していない (Redisに接続できない)
+            logger.warning("Cache warm-up lock is unavailable, warming up in this worker")
+            await warm_up(state, asset_registry, futures_data_cache, single_flight, settings, session_factory)
+            return
+
+        token = await asyncio.to_thread(lock_repository.acquire, key, ttl_ms)
+        if token is None:
+            # 他のワーカーが先にロックを取得した可能性があるため、進捗を確認し直す
+            acquire_failed = True
+            continue
+        try:
+            await warm_up(state, asset_registry, futures_data_cache, single_flight, settings, session_factory)
+            await asyncio.to_thread(lock_repository.save_result, key, json.dumps(state.snapshot()).encode('utf-8'), ttl_ms)
+        finally:
+            await asyncio.to_thread(lock_repository.release, key, token)
+        return
+
+
+async def warm_up(
+    state: WarmUpState,
+    asset_registry: AssetRegistry,
+    futures_data_cache: FuturesDataCacheRepository,
+    single_flight: AsyncSingleFlight | None = None,
+    settings: WarmUpSettings | None = None,
+    session_factory: Callable[[], AsyncSession] = async_db_session
+) -> None:
+    """
+    資産の一覧を読み込み、資産ごとの最新の取引日の先物データのレスポンスを作成してキャッシュに保存します。
+    DBに同じクエリを実行するため、MySQLのバッファプールとコネクションプールも温まります。
+    終了時 (制限時間の超過、失敗を含む) にstateをreadyにします。
+
+    :param state: 進捗を記録するWarmUpState
+    :param asset_registry: 読み込んだ資産の一覧を保存するAssetRegistry
+    :param futures_data_cache: レスポンスを保存するキャッシュ
+    :param single_flight: 指定した場合は、同時に来たリクエストとクエリをまとめる
+    :param settings: ウォームアップの設定。指定しない場合は環境変数から読み込む
+    :param session_factory: AsyncSessionを作成する関数
+    """
+    settings = settings or WarmUpSettings()
+    state.start()
+    logger.info(f"Cache warm-up started: {settings}")
+    try:
+        await asyncio.wait_for(_warm_up_assets(state, asset_registry, futures_data_cache, single_flight, settings, session_factory), timeout=settings.budget)
+    except asyncio.TimeoutError:
+        state.timed_out = True
+        logger.warning(f"Cache warm-up exceeded the budget of {settings.budget} s")
+    except Exception as e:
+        state.failures += 1
+        logger.error(f"Cache warm-up failed: {e}")
+    finally:
+        state.finish()
+        logger.info(f"Cache warm-up finished: {state.snapshot()}")
+
+
+async def _warm_up_assets(
+    state: WarmUpState,
+    asset_registry: AssetRegistry,
+    futures_data_cache: FuturesDataCacheRepository,
+    single_flight: AsyncSingleFlight | None,
+    settings: WarmUpSettings,
+    session_factory: Callable[[], AsyncSession]
+) -> None:
+    async with session_factory() as session:
+        try:
+            # AssetRegistryに資産名とidの対応を読み込む
+            assets = await AsyncCachedAssetRepository(AsyncAssetRepositoryMysql(session), asset_registry).fetch_all()
+        except AssetNotFoundError:
+            logger.info("No assets to warm up")
+            return
+
+    # AsyncSessionは同時に使用できないため、資産ごとにセッションを作成する
+    semaphore = asyncio.Semaphore(settings.concurrency)
+
+    async def warm_up_asset(asset_name: str) -> None:
+        async with semaphore:
+            async with session_factory() as session:
+                await _warm_up_asset(state, session, asset_name, asset_registry, futures_data_cache, single_flight, settings, session_factory)
+
+    await asyncio.gather(*(warm_up_asset(asset.name) for asset in assets))
+
+
+async def _warm_up_asset(
+    state: WarmUpState,
+    session: AsyncSession,
+    asset_name: str,
+    asset_registry: AssetRegistry,
+    futures_data_cache: FuturesDataCacheRepository,
+    single_flight: AsyncSingleFlight | None,
+    settings: WarmUpSettings,
+    session_factory: Callable[[], AsyncSession]
+) -> None:
+    asset_repository = AsyncCachedAssetRepository(AsyncAssetRepositoryMysql(session), asset_registry)
+    trade_date_service = AsyncTradeDateService(AsyncFuturesDataTradeDateRepositoryMysql(session), asset_repository, single_flight, async_session_scope(AsyncFuturesDataTradeDateRepositoryMysql, session_factory))
+    futures_data_service = AsyncFuturesDataService(AsyncFuturesDataRepositoryMysql(session), asset_repository, single_flight, async_session_scope(AsyncFuturesDataRepositoryMysql, session_factory))
+
+    try:
+        trade_dates = await trade_date_service.fetch_latest_trade_dates(asset_name, settings.trade_dates_per_asset)
+    except Exception as e:
+        state.failures += 1
+        logger.warning(f"Failed to fetch trade dates to warm up for asset: {asset_name}: {e}")
+        return
+
+    # フロントエンドは取引日を1日ずつ取得するため、取引日ごとのレスポンスを新しい順に作成する
+    for entity in reversed(trade_dates):
+        for response_format in settings.formats:
+            await _warm_up_payload(state, futures_data_service, futures_data_cache, asset_name, [entity.trade_date], response_format)
+    state.assets += 1
+
+
+async def _warm_up_payload(
+    state: WarmUpState,
+    futures_data_service: AsyncFuturesDataService,
+    futures_data_cache: FuturesDataCacheRepository,
+    asset_name: str,
+    trade_dates: list[date],
+    response_format: str
+) -> None:
+    try:
+        # /futures-data/{asset_name} と同じ方法で作成し、同じキーで保存する
+        etag, is_final, versions = await fetch_futures_data_validators(futures_data_service, asset_name, trade_dates, response_format)
+        payload = await build_futures_data_payload(futures_data_service, asset_name, trade_dates, response_format, versions)
+        entry = FuturesDataCacheEntry(payload=payload, is_final=is_final, etag=etag)
+        await asyncio.to_thread(futures_data_cache.save, asset_name, trade_dates, response_format, entry)
+        state.payloads += 1
+    except DataNotFoundError:
+        logger.info(f"No futures data to warm up for asset: {asset_name}, trade_dates: {trade_dates}")
+    except Exception as e:
+        state.failures += 1
+        logger.warning(f"Failed to warm up futures data for asset: {asset_name}, trade_dates: {trade_dates}, format: {response_format}: {e}")
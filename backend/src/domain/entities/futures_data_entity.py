@@ -1,9 +1,12 @@
 #src/domain/entities/futures_data_entity.py
 from __future__ import annotations
+import math
 from dataclasses import dataclass
 from datetime import date
+from typing import Sequence
 
 from src.domain.helpers.dataclass import DataClassBase
+from src.domain.logics.convert_price_columns import coalesce_price_values
 from src.domain.logics.convert_price_format import convert_price_format
 from src.domain.value_objects.trade_date import TradeDate
 from src.domain.value_objects.year_month import YearMonth
@@ -37,3 +40,26 @@ class FuturesDataEntity(DataClassBase):
             volume=volume,
             open_interest=open_interest
         )
+
+
+    @classmethod
+    def from_db_rows(cls, rows: Sequence[tuple[int, str, date, str, float | None, int, int, str | None]]) -> list[FuturesDataEntity]:
+        """
+        データベースから取得した複数の行データを元に、FuturesDataEntityのリストを生成します。
+        settleには数値カラム (settle_value) の値を使用し、数値がない行のみ最後の列の文字列をまとめて変換します。
+        :param rows: (asset_id, asset_name, trade_date, month, settle_value, volume, open_interest, settle) の行データのリスト
+        :return: FuturesDataEntityのリスト
+        """
+        settles = coalesce_price_values([row[4] for row in rows], [row[7] for row in rows])
+        return [
+            cls(
+                asset_id=asset_id,
+                asset_name=asset_name,
+                trade_date=TradeDate(trade_date),
+                month=YearMonth.from_db_format(month),
+                settle=None if math.isnan(settle) else float(settle),
+                volume=volume,
+                open_interest=open_interest
+            )
+            for (asset_id, asset_name, trade_date, month, _, volume, open_interest, _), settle in zip(rows, settles)
+        ]
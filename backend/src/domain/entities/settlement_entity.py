@@ -25,6 +25,13 @@ class SettlementEntity(DataClassBase):
     est_volume: int
     prior_day_oi: int
     last_updated: datetime
+    # DBに保存された価格の数値。DBから取得したエンティティのみ設定される
+    open_value: float | None = None
+    high_value: float | None = None
+    low_value: float | None = None
+    last_value: float | None = None
+    change_value: float | None = None
+    settle_value: float | None = None
 
     def __post_init__(self):
         self._validate_volume(self.est_volume)
@@ -81,5 +88,11 @@ class SettlementEntity(DataClassBase):
             settle=db_row.settle,
             est_volume=db_row.est_volume,
             prior_day_oi=db_row.prior_day_oi,
-            last_updated=db_row.last_updated
+            last_updated=db_row.last_updated,
+            open_value=db_row.open_value,
+            high_value=db_row.high_value,
+            low_value=db_row.low_value,
+            last_value=db_row.last_value,
+            change_value=db_row.change_value,
+            settle_value=db_row.settle_value
         )
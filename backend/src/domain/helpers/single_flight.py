@@ -0,0 +1,177 @@
+# src/domain/helpers/single_flight.py
+import asyncio
+import os
+import threading
+import time
+from dataclasses import dataclass
+from functools import partial
+from typing import Any, Awaitable, Callable, Generic, TypeVar
+
+from src.domain.repositories.single_flight_repository import SingleFlightRepository
+
+
+T = TypeVar('T')
+
+
+@dataclass(frozen=True)
+class SingleFlightCodec(Generic[T]):
+    # 他のワーカーに結果を共有するためのシリアライズ方法。指定しない場合はプロセス内でのみ共有する
+    encode: Callable[[T], bytes]
+    decode: Callable[[bytes], T]
+
+
+class _SingleFlightBase:
+    """
+    同じキーの同時呼び出しを1回の実行にまとめる。呼び出し元は全て同じ結果 (または例外) を受け取るため、結果は変更しないこと。
+    repositoryを指定した場合は、ワーカー間でもロックを取得したワーカーのみが実行し、他のワーカーは保存された結果を待つ。
+    結果を待てなかった場合 (実行したワーカーの失敗、wait_timeout秒の経過、Redisの障害) は、自分で実行する。
+    """
+    def __init__(
+        self,
+        repository: SingleFlightRepository | None = None,
+        lock_ttl_ms: int = int(os.getenv('SINGLE_FLIGHT_LOCK_TTL_MS', 30000)),
+        result_ttl_ms: int = int(os.getenv('SINGLE_FLIGHT_RESULT_TTL_MS', 5000)),
+        wait_timeout: float = float(os.getenv('SINGLE_FLIGHT_WAIT_TIMEOUT', 10)),
+        poll_interval: float = float(os.getenv('SINGLE_FLIGHT_POLL_INTERVAL', 0.05))
+    ):
+        self.repository = repository
+        self.lock_ttl_ms = lock_ttl_ms
+        self.result_ttl_ms = result_ttl_ms
+        self.wait_timeout = wait_timeout
+        self.poll_interval = poll_interval
+        # 実行した回数と、実行中の呼び出しの結果を受け取った回数 (プロセス内)
+        self.executions = 0
+        self.shared = 0
+
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: BaseException | None = None
+
+
+class SingleFlight(_SingleFlightBase):
+    """
+    スレッド用。同じキーの呼び出しは、最初の呼び出しの完了を待って結果を受け取る。
+    """
+    def __init__(self, *args: Any, **kwargs: Any):
+        super().__init__(*args, **kwargs)
+        self._calls: dict[str, _Call] = {}
+        self._lock = threading.Lock()
+
+    def do(self, key: str, func: Callable[[], T], codec: SingleFlightCodec[T] | None = None) -> T:
+        """
+        :param key: 呼び出しを識別するキー。引数が同じ呼び出しは同じキーにする
+        :param func: 実行する関数
+        :param codec: ワーカー間で結果を共有する場合のシリアライズ方法
+        :return: funcの結果
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            is_leader = call is None
+            if call is None:
+                call = self._calls[key] = _Call()
+                self.executions += 1
+            else:
+                self.shared += 1
+
+        if not is_leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = self._run(key, func, codec)
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+    def _run(self, key: str, func: Callable[[], T], codec: SingleFlightCodec[T] | None) -> T:
+        if self.repository is None or codec is None:
+            return func()
+
+        token = self.repository.acquire(key, self.lock_ttl_ms)
+        if token is None:
+            deadline = time.monotonic() + self.wait_timeout
+            while time.monotonic() < deadline:
+                payload, running = self.repository.poll_result(key)
+                if payload is not None:
+                    return codec.decode(payload)
+                if not running:
+                    break
+                time.sleep(self.poll_interval)
+            return func()
+
+        try:
+            result = func()
+            self.repository.save_result(key, codec.encode(result), self.result_ttl_ms)
+            return result
+        finally:
+            self.repository.release(key, token)
+
+
+class AsyncSingleFlight(_SingleFlightBase):
+    """
+    asyncio用。同じキーの呼び出しは、最初の呼び出しが開始したタスクの完了を待って結果を受け取る。
+    呼び出し元 (リクエスト) がキャンセルされても、同じ結果を待つ他の呼び出しのためにタスクは最後まで実行する。
+    """
+    def __init__(self, *args: Any, **kwargs: Any):
+        super().__init__(*args, **kwargs)
+        self._tasks: dict[str, asyncio.Task] = {}
+
+    async def do(self, key: str, func: Callable[[], Awaitable[T]], codec: SingleFlightCodec[T] | None = None) -> T:
+        """
+        :param key: 呼び出しを識別するキー。引数が同じ呼び出しは同じキーにする
+        :param func: 実行するコルーチン関数
+        :param codec: ワーカー間で結果を共有する場合のシリアライズ方法。シリアライズはスレッドで実行する
+        :return: funcの結果
+        """
+        task = self._tasks.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._run(key, func, codec))
+            self._tasks[key] = task
+            task.add_done_callback(partial(self._forget, key))
+            self.executions += 1
+        else:
+            self.shared += 1
+        return await asyncio.shield(task)
+
+    def _forget(self, key: str, task: asyncio.Task) -> None:
+        if self._tasks.get(key) is task:
+            del self._tasks[key]
+        # 全ての呼び出し元がキャンセルされた場合に、例外が取得されなかった警告を出さない
+        if not task.cancelled():
+            task.exception()
+
+    async def _run(self, key: str, func: Callable[[], Awaitable[T]], codec: SingleFlightCodec[T] | None) -> T:
+        repository = self.repository
+        if repository is None or codec is None:
+            return await func()
+
+        # Redisのクライアントは同期のため、イベントループをブロックしないようにスレッドで実行する
+        token = await asyncio.to_thread(repository.acquire, key, self.lock_ttl_ms)
+        if token is None:
+            deadline = time.monotonic() + self.wait_timeout
+            while time.monotonic() < deadline:
+                payload, running = await asyncio.to_thread(repository.poll_result, key)
+                if payload is not None:
+                    return await asyncio.to_thread(codec.decode, payload)
+                if not running:
+                    break
+                await asyncio.sleep(self.poll_interval)
+            return await func()
+
+        try:
+            result = await func()
+            payload = await asyncio.to_thread(codec.encode, result)
+            await asyncio.to_thread(repository.save_result, key, payload, self.result_ttl_ms)
+            return result
+        finally:
+            await asyncio.to_thread(repository.release, key, token)
@@ -1,6 +1,14 @@
 # src/domain/logics/convert_dataframe.py
-import pandas as pd
-from typing import Any
+from __future__ import annotations
+
+import json
+from datetime import date, datetime
+from typing import TYPE_CHECKING, Any
+
+# pandas, numpy, pyarrow and msgpack are imported by the functions that use them, so that importing
+# the routers does not load them before the first request that builds a DataFrame.
+if TYPE_CHECKING:
+    import pandas as pd
 
 
 def dataframe_to_json(df: pd.DataFrame) -> dict[str, Any]:
@@ -35,3 +43,111 @@ def to_year_month_format(df: pd.DataFrame, column_name: str) -> pd.DataFrame:
     """
     df[column_name] = df[column_name].dt.strftime('%Y-%m')
     return df
+
+
+def _column_values(series: pd.Series) -> pd.Series:
+    """
+    Converts date-like columns to ISO 8601 strings so that every format serializes them the same way.
+
+    Args:
+        series (pd.Series): A column of a DataFrame.
+
+    Returns:
+        pd.Series: The column with dates as strings, or the column itself for other types.
+    """
+    import numpy as np
+    import pandas as pd
+
+    if pd.api.types.is_datetime64_any_dtype(series):
+        return series.dt.strftime('%Y-%m-%dT%H:%M:%S')
+    if series.dtype == object:
+        first_index = series.first_valid_index()
+        first_value = series[first_index] if first_index is not None else None
+        if isinstance(first_value, date) and not isinstance(first_value, datetime):
+            # Trade dates repeat for every contract month, so each distinct date is formatted only once.
+            codes, uniques = pd.factorize(series)
+            formatted = np.array([value.isoformat() for value in uniques] + [None], dtype=object)
+            return pd.Series(formatted[codes], index=series.index, name=series.name)
+    return series
+
+
+def _dataframe_to_columns(df: pd.DataFrame) -> dict[str, list[Any]]:
+    """
+    Converts a DataFrame to a dict of column lists, one list per column instead of one dict per row.
+
+    Args:
+        df (pd.DataFrame): A DataFrame to convert.
+
+    Returns:
+        dict[str, list[Any]]: The column lists. NaN values are replaced with None.
+    """
+    data: dict[str, list[Any]] = {}
+    for name in df.columns:
+        values = _column_values(df[name])
+        if values.isna().any():
+            values = values.astype(object).where(values.notna(), None)
+        data[str(name)] = values.tolist()
+    return data
+
+
+def dataframe_to_columnar_json(df: pd.DataFrame) -> bytes:
+    """
+    Converts a DataFrame to a columnar JSON object: {"data": {column: [values, ...], ...}}.
+
+    Args:
+        df (pd.DataFrame): A DataFrame to convert.
+
+    Returns:
+        bytes: The UTF-8 encoded JSON. NaN values are serialized as null and floats keep their full precision.
+    """
+    return json.dumps({'data': _dataframe_to_columns(df)}, separators=(',', ':'), allow_nan=False).encode('utf-8')
+
+
+def dataframe_to_msgpack(df: pd.DataFrame) -> bytes:
+    """
+    Converts a DataFrame to the columnar layout of dataframe_to_columnar_json, encoded with MessagePack.
+
+    Args:
+        df (pd.DataFrame): A DataFrame to convert.
+
+    Returns:
+        bytes: The MessagePack payload. NaN values are encoded as nil.
+    """
+    import msgpack
+
+    return msgpack.packb({'data': _dataframe_to_columns(df)})
+
+
+def dataframe_to_arrow_ipc(df: pd.DataFrame) -> bytes:
+    """
+    Converts a DataFrame to an Apache Arrow IPC stream containing a single record batch.
+
+    Args:
+        df (pd.DataFrame): A DataFrame to convert.
+
+    Returns:
+        bytes: The Arrow IPC stream. The pandas-specific schema metadata is dropped.
+    """
+    import pyarrow as pa
+
+    table = pa.Table.from_pandas(df, preserve_index=False).replace_schema_metadata(None)
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue().to_pybytes()
+
+
+def dataframe_from_arrow_ipc(payload: bytes) -> pd.DataFrame:
+    """
+    Converts an Apache Arrow IPC stream created by dataframe_to_arrow_ipc back to a DataFrame.
+
+    Args:
+        payload (bytes): The Arrow IPC stream.
+
+    Returns:
+        pd.DataFrame: The DataFrame. Date columns are restored as datetime.date objects.
+    """
+    import pyarrow as pa
+
+    with pa.ipc.open_stream(payload) as reader:
+        return reader.read_all().to_pandas()
@@ -0,0 +1,253 @@
+# src/domain/logics/convert_price_columns.py
+from __future__ import annotations
+
+import math
+from functools import cache
+from typing import TYPE_CHECKING, Iterable, Sequence
+
+from src.domain.logics.convert_price_format import convert_price_format
+from src.domain.logics.validate_price_format import validate_price_format
+
+# numpy・pandasはインポートに時間がかかるため、エンティティやリポジトリから読み込まれても変換を実行するまでは読み込まない
+if TYPE_CHECKING:
+    import numpy as np
+    import pandas as pd
+
+
+PRICE_COLUMNS = ['open', 'high', 'low', 'last', 'change', 'settle']
+
+# 整数部・小数部の桁数の上限。15桁以下であれば、整数の演算とfloatへの変換で誤差が生じない
+_DIGIT_LIMIT = 15
+
+# 種類がこれより少ない場合は、配列演算の固定コストの方が大きいためスカラー関数で変換する
+_VECTORIZE_MIN_SIZE = 500
+
+_PLUS, _MINUS, _COMMA, _DOT, _QUOTE, _ZERO, _NINE, _A, _B = (ord(char) for char in "+-,.'09AB")
+
+
+def _convert_by_scalar(value: object) -> tuple[float, bool]:
+    # 高速化の対象外の値は、validate_price_format / convert_price_formatで1件ずつ処理する
+    try:
+        if value is not None:
+            value = value if isinstance(value, str) else str(value)
+            validate_price_format(value)
+        price = convert_price_format(value) # type: ignore
+    except ValueError:
+        return math.nan, True
+    return (math.nan if price is None else price), False
+
+
+@cache
+def _pow10() -> tuple[np.ndarray, np.ndarray]:
+    # 10のべき乗の表 (整数, float)
+    import numpy as np
+    pow10_int = 10 ** np.arange(_DIGIT_LIMIT + 1, dtype=np.int64)
+    return pow10_int, pow10_int.astype(np.float64)
+
+
+def _parse_ascii_prices(encoded: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """
+    バイト文字列の配列を先頭の文字から1文字ずつ、全件まとめて解析します。
+    validate_price_formatで有効かつconvert_price_formatと同じ値になることを確認できた要素のみを変換します。
+
+    :return: (変換後のfloat配列, 変換できた要素を示すマスク)
+    """
+    import numpy as np
+
+    pow10_int, pow10_float = _pow10()
+    count, width = len(encoded), encoded.dtype.itemsize
+    chars = encoded.view(np.uint8).reshape(count, width)
+    length = np.count_nonzero(chars, axis=1)
+    # 途中にNUL文字を含む値は、lengthより前に0が現れるため不正な文字として扱われる
+    columns = np.ascontiguousarray(chars.T)
+
+    negative = columns[0] == _MINUS
+    has_sign = negative | (columns[0] == _PLUS)
+
+    ok = np.ones(count, dtype=bool)
+    stage = np.zeros(count, dtype=np.int8)  # 0: 整数部, 1: 分数部 (' の後), 2: 小数部 (. の後)
+    whole_value, fraction_value, decimal_value = (np.zeros(count, dtype=np.int64) for _ in range(3))
+    whole_digits, fraction_digits, decimal_digits = (np.zeros(count, dtype=np.int64) for _ in range(3))
+    group_digits, first_group = (np.zeros(count, dtype=np.int64) for _ in range(2))
+    has_comma, has_quote, has_dot, leading_zero = (np.zeros(count, dtype=bool) for _ in range(4))
+
+    for position in range(width):
+        char = columns[position]
+        active = position < length
+        if position == 0:
+            active &= ~has_sign
+        digit = char - _ZERO  # uint8のため、数字以外は10以上になる
+        is_digit = active & (digit < 10)
+        digit = digit.astype(np.int64)
+
+        in_whole = is_digit & (stage == 0)
+        in_fraction = is_digit & (stage == 1)
+        in_decimal = is_digit & (stage == 2)
+        whole_value = np.where(in_whole, whole_value * 10 + digit, whole_value)
+        whole_digits += in_whole
+        group_digits += in_whole
+        leading_zero |= in_fraction & (fraction_digits == 0) & (digit == 0)
+        fraction_value = np.where(in_fraction, fraction_value * 10 + digit, fraction_value)
+        fraction_digits += in_fraction
+        decimal_value = np.where(in_decimal, decimal_value * 10 + digit, decimal_value)
+        decimal_digits += in_decimal
+
+        # カンマは整数部のみ。直前のグループは先頭なら1～3桁、それ以降は3桁
+        is_comma = active & (char == _COMMA)
+        ok &= ~is_comma | ((stage == 0) & np.where(has_comma, group_digits == 3, (group_digits >= 1) & (group_digits <= 3)))
+        first_comma = is_comma & ~has_comma
+        first_group[first_comma] = group_digits[first_comma]
+        group_digits[is_comma] = 0
+        has_comma |= is_comma
+
+        # 分数部は整数部の後、小数部は整数部または分数部の後にのみ続く
+        is_quote = active & (char == _QUOTE)
+        is_dot = active & (char == _DOT)
+        ok &= (~is_quote | (stage == 0)) & (~is_dot | (stage <= 1))
+        stage[is_quote] = 1
+        stage[is_dot] = 2
+        has_quote |= is_quote
+        has_dot |= is_dot
+
+        # 末尾のAまたはBは無視する
+        is_suffix = active & (position == length - 1) & ((char == _A) | (char == _B))
+        ok &= ~active | is_digit | is_comma | is_quote | is_dot | is_suffix
+
+    # 最後のグループは3桁。validate_price_formatは符号を含めて先頭のグループの桁数を数えるため、符号付きで先頭が3桁の値は不正になる
+    ok &= ~has_comma | ((group_digits == 3) & ~(has_sign & (first_group == 3)))
+    ok &= ~has_dot | (decimal_digits >= 1)
+    # 分数表記なし: 数字を1桁以上含む
+    ok &= has_quote | ((whole_digits + decimal_digits >= 1) & (whole_digits + decimal_digits <= _DIGIT_LIMIT))
+    # 分数表記あり: 分数部は1～3桁。符号または整数部が必要で、0始まりの分数部に小数は続かない
+    ok &= ~has_quote | (
+        (fraction_digits >= 1) & (fraction_digits <= 3)
+        & (has_sign | (whole_digits >= 1)) & ~(leading_zero & has_dot)
+        & (whole_digits <= _DIGIT_LIMIT) & (fraction_digits + decimal_digits <= _DIGIT_LIMIT)
+    )
+
+    # 15桁以下の整数を10のべき乗で割ると、float()で文字列を変換した場合と同じ値になる
+    decimal_scale = np.minimum(decimal_digits, _DIGIT_LIMIT)
+    plain = (whole_value * pow10_int[decimal_scale] + decimal_value) / pow10_float[decimal_scale]
+    plain = np.where(negative, -plain, plain)
+
+    # convert_price_formatと同じく、0始まりの分数部は "0.xxx"、それ以外は分数部と小数部を続けた値を32で割る
+    fraction_scale = np.minimum(fraction_digits, _DIGIT_LIMIT)
+    fraction_float = np.where(
+        leading_zero,
+        fraction_value / pow10_float[fraction_scale],
+        (fraction_value * pow10_int[decimal_scale] + decimal_value) / pow10_float[decimal_scale]
+    ) / 32
+    whole_float = whole_value.astype(np.float64)
+    fractional = np.where(negative, -whole_float - fraction_float, whole_float + fraction_float)
+
+    return np.where(has_quote, fractional, plain), ok
+
+
+def _encode_ascii(values: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    # ASCII文字列の配列をバイト文字列の配列に変換する。ASCII以外の文字を含む値はスカラー関数で処理する
+    import numpy as np
+
+    try:
+        return np.arange(len(values)), np.array(values.tolist(), dtype=np.bytes_)
+    except UnicodeEncodeError:
+        indices = np.flatnonzero([isinstance(value, str) and value.isascii() for value in values])
+        return indices, np.array(values[indices].tolist(), dtype=np.bytes_)
+
+
+def _convert_unique_prices(values: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    import numpy as np
+
+    prices = np.full(len(values), np.nan)
+    invalid = np.zeros(len(values), dtype=bool)
+    handled = np.zeros(len(values), dtype=bool)
+
+    if len(values) >= _VECTORIZE_MIN_SIZE:
+        ascii_indices, encoded = _encode_ascii(values)
+        parsed, parsed_ok = _parse_ascii_prices(encoded)
+        prices[ascii_indices[parsed_ok]] = parsed[parsed_ok]
+        handled[ascii_indices[parsed_ok]] = True
+
+    # "-" や空文字、不正な値などは種類が少ないため、スカラー関数で処理する
+    for index in np.flatnonzero(~handled):
+        prices[index], invalid[index] = _convert_by_scalar(values[index])
+    return prices, invalid
+
+
+def convert_price_series(values: pd.Series | Iterable[str | None]) -> tuple[np.ndarray, np.ndarray]:
+    """
+    価格の文字列をまとめて検証し、floatの配列に変換します。
+    validate_price_formatとconvert_price_formatを1要素ずつ呼び出した場合と同じ結果を返します。
+    同じ文字列は1度だけ変換し、大部分の値は1文字ずつではなく配列全体に対する演算で変換します。
+
+    :param values: 価格の文字列。None、空文字、"-" は値なしとして扱います。
+    :return: (変換後のfloat配列, 不正なフォーマットの要素を示すマスク)。値なしと不正な要素はNaNになります。
+    """
+    import numpy as np
+    import pandas as pd
+
+    values = values.tolist() if isinstance(values, pd.Series) else list(values)
+    if len(values) < _VECTORIZE_MIN_SIZE:
+        converted: dict[object, tuple[float, bool]] = {}
+        results = [converted.get(value) or converted.setdefault(value, _convert_by_scalar(value)) for value in values]
+        return np.array([price for price, _ in results], dtype=np.float64), np.array([is_invalid for _, is_invalid in results], dtype=bool)
+
+    codes, uniques = pd.factorize(np.array(values, dtype=object))
+    unique_prices, unique_invalid = _convert_unique_prices(np.asarray(uniques, dtype=object))
+
+    prices = np.full(len(values), np.nan)
+    invalid = np.zeros(len(values), dtype=bool)
+    present = codes >= 0
+    prices[present] = unique_prices[codes[present]]
+    invalid[present] = unique_invalid[codes[present]]
+    return prices, invalid
+
+
+def coalesce_price_values(values: Sequence[float | None], raw_values: Sequence[str | None]) -> np.ndarray:
+    """
+    DBの数値カラムの値を優先し、数値がない要素 (バックフィル前の行など) のみ価格の文字列から変換します。
+
+    :param values: 数値カラムの値
+    :param raw_values: valuesと同じ順序の、価格の文字列
+    :return: floatの配列。値なしの要素はNaNになります。
+    :raises ValueError: 変換が必要な文字列に不正なフォーマットが含まれる場合
+    """
+    import numpy as np
+
+    prices = np.array(values, dtype=np.float64)
+    missing = np.flatnonzero(np.isnan(prices))
+    if len(missing):
+        missing_raw_values = [raw_values[index] for index in missing]
+        converted, invalid = convert_price_series(missing_raw_values)
+        if invalid.any():
+            raise ValueError(f"Invalid price format: {missing_raw_values[int(invalid.argmax())]}")
+        prices[missing] = converted
+    return prices
+
+
+def convert_price_columns(df: pd.DataFrame, columns: list[str] = PRICE_COLUMNS) -> tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    DataFrameの価格カラムをまとめてfloatに変換します。
+
+    :param df: 価格カラムが文字列のDataFrame
+    :param columns: 変換するカラム名のリスト。DataFrameに存在しないカラムは無視します。
+    :return: (価格カラムをfloatに変換したDataFrameのコピー, 不正なフォーマットのセルを示すbool型のDataFrame)
+    """
+    import pandas as pd
+
+    converted = df.copy()
+    invalid = pd.DataFrame(index=df.index)
+    for column in columns:
+        if column not in df.columns:
+            continue
+        prices, invalid_mask = convert_price_series(df[column])
+        converted[column] = prices
+        invalid[column] = invalid_mask
+    return converted, invalid
+
+
+def raise_for_invalid_prices(df: pd.DataFrame, invalid: pd.DataFrame) -> None:
+    """convert_price_columnsで不正と判定されたセルがあれば、最初のセルを示すValueErrorを送出します"""
+    for column in invalid.columns:
+        invalid_rows = invalid.index[invalid[column]]
+        if len(invalid_rows):
+            raise ValueError(f"Invalid price format for {column}: {df.at[invalid_rows[0], column]}")
@@ -0,0 +1,16 @@
+# src/domain/repositories/asset_registry_version_repository.py
+from abc import ABC, abstractmethod
+
+
+class AssetRegistryVersionRepository(ABC):
+    """
+    資産の一覧のバージョン。資産の追加・削除のたびに増やし、各プロセスのAssetRegistryはバージョンが変わった時に資産の一覧を読み込み直す。
+    """
+    @abstractmethod
+    def fetch_version(self) -> int | None:
+        # バージョンを取得できない場合はNoneを返す
+        pass
+
+    @abstractmethod
+    def increment_version(self) -> None:
+        pass
@@ -30,3 +30,18 @@ class AssetRepository(ABC):
     @abstractmethod
     def delete(self, name: Name) -> None:
         pass
+
+    @abstractmethod
+    def fetch_id_by_name(self, name: str) -> int | None:
+        pass
+
+
+class AsyncAssetRepository(ABC):
+    # APIのリクエスト処理用。イベントループをブロックせずにDBへ問い合わせる
+    @abstractmethod
+    async def fetch_all(self) -> list[AssetModel]:
+        pass
+
+    @abstractmethod
+    async def fetch_id_by_name(self, name: str) -> int | None:
+        pass
@@ -0,0 +1,9 @@
+# src/domain/repositories/futures_curve_repository.py
+from abc import ABC, abstractmethod
+from datetime import date
+
+
+class FuturesCurveRepository(ABC):
+    @abstractmethod
+    def refresh(self, asset_id: int, trade_dates: list[date]) -> None:
+        pass
@@ -0,0 +1,30 @@
+from abc import ABC, abstractmethod
+from datetime import date
+from typing import NamedTuple
+
+
+class FuturesDataCacheEntry(NamedTuple):
+    payload: bytes
+    # 確定済みの取引日のみのレスポンスの場合はTrue。期限なしでキャッシュされる
+    is_final: bool
+    # データのバージョンから作成したETag
+    etag: str
+
+
+class FuturesDataCacheRepository(ABC):
+    @abstractmethod
+    def fetch(self, asset_name: str, trade_dates: list[date], response_format: str) -> FuturesDataCacheEntry | None:
+        pass
+
+    @abstractmethod
+    def save(self, asset_name: str, trade_dates: list[date], response_format: str, entry: FuturesDataCacheEntry) -> None:
+        pass
+
+    @abstractmethod
+    def invalidate(self, trade_date: date, asset_id: int | None = None) -> None:
+        # asset_idを指定しない場合は、取引日を含む全ての資産のキャッシュを削除する
+        pass
+
+    @abstractmethod
+    def fetch_stats(self) -> dict[str, int]:
+        pass
@@ -1,10 +1,47 @@
 from abc import ABC, abstractmethod
-from datetime import date
+from datetime import date, datetime
+from typing import Iterator, NamedTuple
 
 from src.domain.entities.futures_data_entity import FuturesDataEntity
 
 
+# futures_curveの (trade_date, month_key (YYYYMM), settle, volume, open_interest, settle_spread) の行データ
+FuturesDataRow = tuple[date, int, float | None, int, int, float]
+
+
+class FuturesDataVersion(NamedTuple):
+    # 取引日ごとのデータの状態。いずれかの値が変わらない限り、その取引日のデータは変更されていない
+    trade_date: date
+    row_count: int
+    final_count: int
+    min_last_updated: datetime
+    max_last_updated: datetime
+
+
 class FuturesDataRepository(ABC):
     @abstractmethod
     def fetch_by_asset_and_date(self, asset_name: str, trade_date: date) -> list[FuturesDataEntity]:
         pass
+
+    @abstractmethod
+    def fetch_by_asset_and_dates(self, asset_id: int, trade_dates: list[date]) -> list[FuturesDataRow]:
+        pass
+
+    @abstractmethod
+    def fetch_versions_by_asset_and_dates(self, asset_id: int, trade_dates: list[date]) -> list[FuturesDataVersion]:
+        pass
+
+    @abstractmethod
+    def stream_by_asset_and_date_range(self, asset_id: int, start_date: date | None, end_date: date | None, batch_size: int) -> Iterator[list[FuturesDataRow]]:
+        pass
+
+
+class AsyncFuturesDataRepository(ABC):
+    # APIのリクエスト処理用。イベントループをブロックせずにDBへ問い合わせる
+    @abstractmethod
+    async def fetch_by_asset_and_dates(self, asset_id: int, trade_dates: list[date]) -> list[FuturesDataRow]:
+        pass
+
+    @abstractmethod
+    async def fetch_versions_by_asset_and_dates(self, asset_id: int, trade_dates: list[date]) -> list[FuturesDataVersion]:
+        pass
@@ -0,0 +1,38 @@
+# src/domain/repositories/ingest_event_repository.py
+from abc import ABC, abstractmethod
+from datetime import date
+from typing import NamedTuple
+
+
+SETTLEMENT_KIND = 'settlement'
+VOLUME_OI_KIND = 'volume_oi'
+
+
+class IngestEvent(NamedTuple):
+    # スクレイパーがDBに書き込んだデータ。APIのプロセス内のキャッシュの無効化に使用する
+    asset_id: int
+    trade_date: date
+    # 書き込んだテーブル (SETTLEMENT_KIND または VOLUME_OI_KIND)
+    kind: str
+    # 書き込んだデータが確定値か
+    is_final: bool
+
+
+class IngestEventRepository(ABC):
+    """
+    スクレイパー (CronJob) からAPIの全てのレプリカに、書き込みを通知するためのイベントの保存先。
+    イベントは発行順のidで読み込み、読み込んだ位置から再開できる。
+    """
+    @abstractmethod
+    def publish(self, event: IngestEvent) -> None:
+        pass
+
+    @abstractmethod
+    def fetch_last_id(self) -> str | None:
+        # 最後に発行されたイベントのid (イベントがない場合は先頭を表すid) を返す。取得できない場合はNone
+        pass
+
+    @abstractmethod
+    def read(self, last_id: str, block_ms: int) -> tuple[str, list[IngestEvent]] | None:
+        # last_idより後のイベントを (次に読み込む位置のid, イベントのリスト) で返す。ない場合は最大block_msミリ秒待つ。読み込めない場合はNone
+        pass
@@ -12,11 +12,23 @@ class SettlementRepository(ABC):
     def create(self, settlement_entity: SettlementEntity) -> SettlementModel:
         raise NotImplementedError
 
+    @abstractmethod
+    def create_many(self, settlement_entities: list[SettlementEntity]) -> int:
+        raise NotImplementedError
+
+    @abstractmethod
+    def upsert_many(self, settlement_entities: list[SettlementEntity]) -> int:
+        raise NotImplementedError
+
     def update(self, settlement_entity: SettlementEntity) -> SettlementModel:
         raise NotImplementedError
 
     def check_last_updated_or_none(self, asset_id: int, trade_date: TradeDate) -> datetime | None:
         raise NotImplementedError
 
+    @abstractmethod
+    def fetch_last_updated_by_asset(self, asset_id: int) -> dict[date, datetime]:
+        raise NotImplementedError
+
     def fetch_settlements_by_name_and_date(self, asset_name: str, trade_date: date) -> list[SettlementEntity]:
         raise NotImplementedError
@@ -0,0 +1,25 @@
+# src/domain/repositories/single_flight_repository.py
+from abc import ABC, abstractmethod
+
+
+class SingleFlightRepository(ABC):
+    """
+    複数のワーカー間で同じキーの計算を1つのワーカーのみが実行し、他のワーカーに結果を共有するためのロックと結果の保存先。
+    """
+    @abstractmethod
+    def acquire(self, key: str, ttl_ms: int) -> str | None:
+        # ロックを取得できた場合は解放に使うトークンを返す。他のワーカーが実行中の場合や、ロックを取得できない場合はNone
+        pass
+
+    @abstractmethod
+    def release(self, key: str, token: str) -> None:
+        pass
+
+    @abstractmethod
+    def save_result(self, key: str, payload: bytes, ttl_ms: int) -> None:
+        pass
+
+    @abstractmethod
+    def poll_result(self, key: str) -> tuple[bytes | None, bool]:
+        # (保存された結果, 他のワーカーが実行中か) を返す。確認できない場合は (None, False)
+        pass
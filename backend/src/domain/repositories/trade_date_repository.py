@@ -1,10 +1,42 @@
 #src/domain/repositories/trade_date_repository.py
 from abc import ABC, abstractmethod
 from datetime import date
+from typing import NamedTuple
 
 from src.domain.entities.trade_date_entity import TradeDateEntity
 
+
+class TradeDatesVersion(NamedTuple):
+    # 期間内の取引日の件数と最初・最後の取引日。取引日の追加・削除を検知するために使用する
+    count: int
+    first_trade_date: date | None
+    last_trade_date: date | None
+
+
 class TradeDateRepository(ABC):
     @abstractmethod
-    def fetch_trade_dates(self, asset_name: str, start_date: date | None, end_date: date | None, skip: int, limit: int) -> list[TradeDateEntity]:
+    def fetch_trade_dates(self, asset_id: int, start_date: date | None, end_date: date | None, skip: int, limit: int, after: date | None = None) -> list[TradeDateEntity]:
+        pass
+
+    @abstractmethod
+    def fetch_trade_dates_version(self, asset_id: int, start_date: date | None, end_date: date | None) -> TradeDatesVersion:
+        pass
+
+    @abstractmethod
+    def fetch_latest_trade_dates(self, asset_id: int, limit: int) -> list[TradeDateEntity]:
+        pass
+
+
+class AsyncTradeDateRepository(ABC):
+    # APIのリクエスト処理用。イベントループをブロックせずにDBへ問い合わせる
+    @abstractmethod
+    async def fetch_trade_dates(self, asset_id: int, start_date: date | None, end_date: date | None, skip: int, limit: int, after: date | None = None) -> list[TradeDateEntity]:
+        pass
+
+    @abstractmethod
+    async def fetch_trade_dates_version(self, asset_id: int, start_date: date | None, end_date: date | None) -> TradeDatesVersion:
+        pass
+
+    @abstractmethod
+    async def fetch_latest_trade_dates(self, asset_id: int, limit: int) -> list[TradeDateEntity]:
         pass
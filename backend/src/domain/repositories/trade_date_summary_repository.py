@@ -0,0 +1,9 @@
+# src/domain/repositories/trade_date_summary_repository.py
+from abc import ABC, abstractmethod
+from datetime import date
+
+
+class TradeDateSummaryRepository(ABC):
+    @abstractmethod
+    def refresh(self, asset_id: int, trade_dates: list[date]) -> None:
+        pass
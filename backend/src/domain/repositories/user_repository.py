@@ -19,3 +19,10 @@ class UserRepository(ABC):
     @abstractmethod
     def update(self, user_entity: UserEntity) -> UserModel:
         pass
+
+
+class AsyncUserRepository(ABC):
+    # APIのリクエスト処理用。イベントループをブロックせずにDBへ問い合わせる
+    @abstractmethod
+    async def fetch_by_email(self, email: Email) -> UserModel:
+        pass
@@ -1,5 +1,6 @@
 # src/domain/repositories/volume_oi_repository.py
 from abc import ABC, abstractmethod
+from datetime import date
 
 from src.domain.entities.volume_oi_entity import VolumeOIEntity
 from src.domain.value_objects.trade_date import TradeDate
@@ -11,8 +12,16 @@ class VolumeOIRepository(ABC):
     def create(self, volume_oi_entity: VolumeOIEntity) -> VolumeOIModel:
         raise NotImplementedError
 
+    @abstractmethod
+    def upsert_many(self, volume_oi_entities: list[VolumeOIEntity]) -> int:
+        raise NotImplementedError
+
     def update(self, volume_oi_entity: VolumeOIEntity) -> VolumeOIModel:
         raise NotImplementedError
 
     def check_data_is_final_or_none(self, asset_id: int, trade_date: TradeDate) -> bool | None:
         raise NotImplementedError
+
+    @abstractmethod
+    def fetch_is_final_by_asset(self, asset_id: int) -> dict[date, bool]:
+        raise NotImplementedError
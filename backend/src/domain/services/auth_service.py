@@ -7,7 +7,7 @@ from src.domain.exceptions.credentials_error import CredentialsError
 from src.domain.exceptions.repository_error import RepositoryError
 from src.domain.exceptions.user_not_found_error import UserNotFoundError
 from src.domain.repositories.temp_user_repository import TempUserRepository
-from src.domain.services.user_service import UserService
+from src.domain.services.user_service import AsyncUserService, UserService
 from src.domain.value_objects.password import Password
 from src.infrastructure.authentication.jwt_token import create_access_token, verify_token
 from src.infrastructure.authentication.verification_token import generate_verification_token, confirm_verification_token
@@ -95,3 +95,21 @@ Please check your email to verify your account.
             raise e
         except Exception as e:
             raise Exception(f"An unexpected error occurred: {str(e)}")
+
+
+class AsyncAuthService:
+    """APIのリクエスト処理用に、トークンからのユーザーの取得をイベントループをブロックせずに行います"""
+    def __init__(self, user_service: AsyncUserService):
+        self.user_service = user_service
+
+
+    async def get_current_user(self, token: str) -> UserEntity:
+        try:
+            email = verify_token(token)
+            return await self.user_service.fetch_user_by_email(email)
+        except CredentialsError as e:
+            raise e
+        except UserNotFoundError as e:
+            raise e
+        except Exception as e:
+            raise Exception(f"An unexpected error occurred: {str(e)}")
@@ -1,55 +1,168 @@
 # src/domain/services/futures_data_service.py
-import pandas as pd
-from datetime import date
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import os
+from datetime import date, datetime, time, timedelta, timezone
+from functools import partial
 from sqlalchemy.exc import SQLAlchemyError
+from typing import TYPE_CHECKING, Callable, Iterator
 
-from src.domain.entities.futures_data_entity import FuturesDataEntity
 from src.domain.exceptions.dataframe_validation_error import DataFrameValidationError
 from src.domain.exceptions.invalid_input_error import InvalidInputError
 from src.domain.exceptions.repository_error import RepositoryError
-from src.domain.repositories.futures_data_repository import FuturesDataRepository
+from src.domain.helpers.single_flight import AsyncSingleFlight, SingleFlight, SingleFlightCodec
+from src.domain.logics.convert_dataframe import dataframe_from_arrow_ipc, dataframe_to_arrow_ipc
+from src.domain.repositories.asset_repository import AssetRepository, AsyncAssetRepository
+from src.domain.repositories.futures_data_repository import AsyncFuturesDataRepository, FuturesDataRepository, FuturesDataRow, FuturesDataVersion
 from src.settings import logger
 
+if TYPE_CHECKING:
+    from contextlib import AbstractAsyncContextManager
+
+    import numpy as np
+    import pandas as pd
+
+
+# エクスポート時に1回のfetchで取得する行数
+EXPORT_BATCH_SIZE = int(os.getenv('FUTURES_DATA_EXPORT_BATCH_SIZE', 5000))
+
+# 清算値の確定値が公表される時刻 (取引日の0時 (UTC) からの経過時間)。last_updatedがこれ以降であれば、清算値は確定済みとみなす
+FINAL_PUBLICATION_DELAY = timedelta(hours=int(os.getenv('SETTLEMENT_FINAL_PUBLICATION_HOURS', 24)))
+
+# 同時に同じリクエストを受けたワーカー間でDataFrameを共有する場合は、Arrow IPCでシリアライズする
+DATAFRAME_CODEC: SingleFlightCodec[pd.DataFrame] = SingleFlightCodec(dataframe_to_arrow_ipc, dataframe_from_arrow_ipc)
+
+
+def _dataframe_key(asset_id: int, trade_dates: list[date], versions: list[FuturesDataVersion] | None = None) -> str:
+    # 取引日の順序や重複が異なっても、取得する行は同じ
+    key = f"futures-data:{asset_id}:{','.join(sorted({trade_date.isoformat() for trade_date in trade_dates}))}"
+    if versions is None:
+        return key
+    # 取り込みの前後で確認したバージョンが異なる呼び出しはまとめない。取り込み前のデータを取り込み後のETagで返さないため
+    return f"{key}:{hashlib.sha1(repr(sorted(versions)).encode('utf-8')).hexdigest()}"
+
+
+def _empty_dataframe() -> pd.DataFrame:
+    import pandas as pd
+    return pd.DataFrame()
+
+
+def _month_keys_to_datetime(month_keys: tuple[int, ...]) -> np.ndarray:
+    # 整数 YYYYMM の限月を、月初日のdatetime64[ns]の配列に変換する
+    import numpy as np
+
+    keys = np.asarray(month_keys, dtype=np.int64)
+    return ((keys // 100 - 1970) * 12 + keys % 100 - 1).astype('datetime64[M]').astype('datetime64[ns]')
+
+
+def _rows_to_dataframe(rows: list[FuturesDataRow]) -> pd.DataFrame:
+    # pandasはインポートに時間がかかるため、DataFrameを作成する時点で読み込む
+    import numpy as np
+    import pandas as pd
+
+    # 行データからカラムごとにDataFrameを作成する。清算値は数値、スプレッドは保存時に計算済み
+    trade_date_values, month_keys, settles, volumes, open_interests, settle_spreads = zip(*rows)
+    return pd.DataFrame({
+        'trade_date': list(trade_date_values),
+        'month': _month_keys_to_datetime(month_keys),
+        # 清算値がない限月 (None) はNaNになる
+        'settle': np.array(settles, dtype=np.float64),
+        'volume': list(volumes),
+        'open_interest': list(open_interests),
+        'settle_spread': np.array(settle_spreads, dtype=np.float64)
+    })
+
+
+def is_settlement_final(trade_date: date, last_updated: datetime) -> bool:
+    # 清算値のlast_updatedが確定値の公表時刻を過ぎていれば、清算値は確定済み
+    # スクレイパーのlast_updated (parse_datetime) はUTCのaware、DBの値はUTCのnaiveのため、naiveのUTCに揃えて比較する
+    if last_updated.tzinfo is not None:
+        last_updated = last_updated.astimezone(timezone.utc).replace(tzinfo=None)
+    return last_updated >= datetime.combine(trade_date, time()) + FINAL_PUBLICATION_DELAY
+
+
+def _versions_are_final(trade_dates: list[date], versions: list[FuturesDataVersion]) -> bool:
+    # 出来高・建玉が全限月でFinalになり、清算値のlast_updatedが確定値の公表時刻を過ぎた取引日を確定済みとみなす
+    finality = {
+        version.trade_date: version.final_count == version.row_count
+        and is_settlement_final(version.trade_date, version.min_last_updated)
+        for version in versions
+    }
+    return all(finality.get(trade_date, False) for trade_date in set(trade_dates))
+
+
+def _add_settlement_spread(df: pd.DataFrame) -> pd.DataFrame:
+    required_columns = ['trade_date', 'month', 'settle']
+    if df.empty:
+        raise DataFrameValidationError("入力されたDataFrameは空です。")
+
+    # 必要なカラムのチェック
+    if not all(column in df.columns for column in required_columns):
+        missing_columns = [column for column in required_columns if column not in df.columns]
+        raise DataFrameValidationError(f"必要なカラムが不足しています: {missing_columns}")
+
+    if df['month'].dtype != 'datetime64[ns]':
+        raise DataFrameValidationError("monthカラムのデータ型がdatetime64[ns]ではありません。")
+
+    try:
+        # DataFrameをtrade_dateとmonthでソート
+        df = df.sort_values(by=['trade_date', 'month']) # type: ignore
+
+        # futures_curveから取得したDataFrameは、保存時に計算したスプレッドをそのまま使用する
+        if 'settle_spread' in df.columns:
+            return df
+
+        # 各trade_dateごとにスプレッドを計算
+        df['settle_spread'] = df.groupby('trade_date')['settle'].diff().fillna(0) # type: ignore
+
+        return df
+
+    except Exception as e:
+        # 予期せぬエラーのキャッチと処理
+        logger.error(f"DataFrameの処理中にエラーが発生しました: {e}")
+        raise DataFrameValidationError(f"DataFrameの処理中にエラーが発生しました: {e}")
+
 
 class FuturesDataService:
-    def __init__(self, futures_data_repository: FuturesDataRepository):
+    def __init__(self, futures_data_repository: FuturesDataRepository, asset_repository: AssetRepository, single_flight: SingleFlight | None = None):
         self.futures_data_repository = futures_data_repository
+        # 資産名をidに変換する。CachedAssetRepositoryの場合はDBに問い合わせない
+        self.asset_repository = asset_repository
+        # 指定した場合は、同じ引数の同時のmake_dataframeを1回の実行にまとめる
+        self.single_flight = single_flight
+
+    def _fetch_dataframe(self, asset_id: int, trade_dates: list[date]) -> pd.DataFrame:
+        rows = self.futures_data_repository.fetch_by_asset_and_dates(asset_id, list(trade_dates))
+        if not rows:
+            # データが見つからない場合は空のDataFrameを返す
+            return _empty_dataframe()
+        return _rows_to_dataframe(rows)
 
-    def make_dataframe(self, asset_name: str, trade_dates: list[date]) -> pd.DataFrame:
+    def make_dataframe(self, asset_name: str, trade_dates: list[date], versions: list[FuturesDataVersion] | None = None) -> pd.DataFrame:
         """
         指定された資産名と複数の取引日に基づいてデータを取得し、PandasのDataFrameに変換します。
-        各行には取引日（trade_date）列も追加されます。
+        全ての取引日のデータを1回のクエリで取得し、行データからカラムごとにDataFrameを作成します。
+        single_flightを指定した場合、同時の同じ引数の呼び出しには同じDataFrameを返すため、変更する場合はコピーしてください。
 
         :param asset_name: 資産名
         :param trade_dates: 取引日のリスト
-        :return: FuturesDataEntityのリストをDataFrameに変換したもの。各行には取引日も含まれます。
+        :param versions: 呼び出し前に取得したfetch_versionsの結果。single_flightでは、バージョンが同じ呼び出しのみをまとめる
+        :return: trade_date, month, settle, volume, open_interest, settle_spreadのカラムを持つDataFrame。データがない場合は空のDataFrame
         """
-        dfs = []
         try:
             if not asset_name or not trade_dates:
                 raise InvalidInputError("資産名または取引日が指定されていません。")
 
-            for trade_date in trade_dates:
-                futures_data_entities: list[FuturesDataEntity] = self.futures_data_repository.fetch_by_asset_and_date(asset_name, trade_date)
+            asset_id = self.asset_repository.fetch_id_by_name(asset_name)
+            if asset_id is None:
+                # 資産が見つからない場合は空のDataFrameを返す
+                return _empty_dataframe()
 
-                if futures_data_entities:
-                    # FuturesDataEntityのリストからDataFrameを作成
-                    temp_df = pd.DataFrame([{
-                        'trade_date': entity.trade_date.to_date(),
-                        'month': entity.month.to_datetime(),
-                        'settle': entity.settle,
-                        'volume': entity.volume,
-                        'open_interest': entity.open_interest
-                    } for entity in futures_data_entities])
-
-                    dfs.append(temp_df)
-
-            if dfs:
-                # 複数のDataFrameを結合
-                return pd.concat(dfs, ignore_index=True)
-            else:
-                # データが見つからない場合は空のDataFrameを返す
-                return pd.DataFrame()
+            if self.single_flight is None:
+                return self._fetch_dataframe(asset_id, trade_dates)
+            return self.single_flight.do(_dataframe_key(asset_id, trade_dates, versions), partial(self._fetch_dataframe, asset_id, trade_dates), DATAFRAME_CODEC)
 
         except InvalidInputError as e:
             # 特定のエラー（例: 無効な入力値）を処理
@@ -67,37 +180,194 @@ class FuturesDataService:
             raise RepositoryError("予期せぬエラーが発生しました。")
 
 
+    def iter_export_frames(self, asset_name: str, start_date: date | None = None, end_date: date | None = None, batch_size: int = EXPORT_BATCH_SIZE) -> Iterator[pd.DataFrame]:
+        """
+        指定された期間のデータを、batch_size行ずつのDataFrameとして順に返します。
+        make_dataframeと異なり全期間のデータをメモリに保持しないため、長期間のエクスポートに使用します。
+
+        :param asset_name: 資産名
+        :param start_date: 期間の開始日。Noneの場合は最初の取引日から
+        :param end_date: 期間の終了日。Noneの場合は最後の取引日まで
+        :param batch_size: 1つのDataFrameの最大行数
+        :return: trade_date, month ("YYYY-MM"), settle, volume, open_interestのカラムを持つDataFrameのイテレーター
+        """
+        if not asset_name:
+            raise InvalidInputError("資産名が指定されていません。")
+        if start_date is not None and end_date is not None and start_date > end_date:
+            raise InvalidInputError("開始日は終了日以前でなければなりません。")
+
+        import numpy as np
+        import pandas as pd
+
+        try:
+            asset_id = self.asset_repository.fetch_id_by_name(asset_name)
+            if asset_id is None:
+                return
+            for rows in self.futures_data_repository.stream_by_asset_and_date_range(asset_id, start_date, end_date, batch_size):
+                trade_date_values, month_keys, settles, volumes, open_interests, _ = zip(*rows)
+                yield pd.DataFrame({
+                    'trade_date': list(trade_date_values),
+                    'month': list(pd.DatetimeIndex(_month_keys_to_datetime(month_keys)).strftime('%Y-%m')),
+                    'settle': np.array(settles, dtype=np.float64),
+                    'volume': list(volumes),
+                    'open_interest': list(open_interests)
+                })
+        except SQLAlchemyError as e:
+            logger.error(f"データベースエラー: {e}")
+            raise RepositoryError("データベース操作中にエラーが発生しました。")
+
+
+    def fetch_versions(self, asset_name: str, trade_dates: list[date]) -> list[FuturesDataVersion]:
+        """
+        指定された取引日ごとのデータの状態を取得します。データ本体は取得しないため、make_dataframeより軽量です。
+
+        :param asset_name: 資産名
+        :param trade_dates: 取引日のリスト
+        :return: FuturesDataVersionのリスト。データがない取引日は含まれません。
+        """
+        try:
+            asset_id = self.asset_repository.fetch_id_by_name(asset_name)
+            if asset_id is None:
+                return []
+            return self.futures_data_repository.fetch_versions_by_asset_and_dates(asset_id, list(trade_dates))
+        except SQLAlchemyError as e:
+            logger.error(f"データベースエラー: {e}")
+            raise RepositoryError("データベース操作中にエラーが発生しました。")
+
+
+    def is_finalized(self, asset_name: str, trade_dates: list[date], versions: list[FuturesDataVersion] | None = None) -> bool:
+        """
+        指定された全ての取引日のデータが確定済みかを判定します。
+        出来高・建玉が全限月でFinalになり、清算値のlast_updatedが確定値の公表時刻を過ぎた取引日のデータは、以降変更されません。
+
+        :param asset_name: 資産名
+        :param trade_dates: 取引日のリスト
+        :param versions: fetch_versionsの結果。指定した場合はDBに問い合わせません。
+        :return: 全ての取引日が確定済みの場合はTrue。データがない取引日が含まれる場合はFalse
+        """
+        if versions is None:
+            versions = self.fetch_versions(asset_name, trade_dates)
+        return _versions_are_final(trade_dates, versions)
+
+
     def add_settlement_spread(self, df: pd.DataFrame) -> pd.DataFrame:
         """
         DataFrameに清算値のスプレッドを追加します。
         DataFrameはtrade_dateとmonthでソートされ、同じtrade_dateの各monthで差を取ります。
+        make_dataframeの結果のように、settle_spreadのカラムが既にある場合は計算せずにソートのみ行います。
 
         :param df: DataFrame
         :return: スプレッドを追加したDataFrame
         """
+        return _add_settlement_spread(df)
+
 
-        required_columns = ['trade_date', 'month', 'settle']
-        if df.empty:
-            raise DataFrameValidationError("入力されたDataFrameは空です。")
+class AsyncFuturesDataService:
+    """
+    APIのリクエスト処理用のFuturesDataService。DBへの問い合わせはイベントループをブロックせずに待機し、
+    DataFrameの作成はスレッドで実行します。戻り値と例外はFuturesDataServiceと同じです。
+    """
+    def __init__(
+        self,
+        futures_data_repository: AsyncFuturesDataRepository,
+        asset_repository: AsyncAssetRepository,
+        single_flight: AsyncSingleFlight | None = None,
+        repository_scope: Callable[[], AbstractAsyncContextManager[AsyncFuturesDataRepository]] | None = None
+    ):
+        self.futures_data_repository = futures_data_repository
+        self.asset_repository = asset_repository
+        self.single_flight = single_flight
+        # single_flightでまとめた取得に使用する、専用のセッションのリポジトリを作成する関数
+        # 指定しない場合は、最初の呼び出し元のリポジトリ (セッション) を使用する
+        self.repository_scope = repository_scope
 
-        # 必要なカラムのチェック
-        if not all(column in df.columns for column in required_columns):
-            missing_columns = [column for column in required_columns if column not in df.columns]
-            raise DataFrameValidationError(f"必要なカラムが不足しています: {missing_columns}")
+    async def _fetch_dataframe(self, asset_id: int, trade_dates: list[date], repository: AsyncFuturesDataRepository | None = None) -> pd.DataFrame:
+        rows = await (repository or self.futures_data_repository).fetch_by_asset_and_dates(asset_id, list(trade_dates))
+        if not rows:
+            return _empty_dataframe()
+        # DataFrameの作成はCPUを使用するため、他のリクエストを待たせないようにスレッドで実行する
+        return await asyncio.to_thread(_rows_to_dataframe, rows)
 
-        if df['month'].dtype != 'datetime64[ns]':
-            raise DataFrameValidationError("monthカラムのデータ型がdatetime64[ns]ではありません。")
+    async def _fetch_shared_dataframe(self, asset_id: int, trade_dates: list[date]) -> pd.DataFrame:
+        # まとめた取得は最初の呼び出し元がキャンセルされても続くため、そのリクエストのセッション (キャンセル時に閉じられる) は使わない
+        if self.repository_scope is None:
+            return await self._fetch_dataframe(asset_id, trade_dates)
+        async with self.repository_scope() as repository:
+            return await self._fetch_dataframe(asset_id, trade_dates, repository)
 
+    async def make_dataframe(self, asset_name: str, trade_dates: list[date], versions: list[FuturesDataVersion] | None = None) -> pd.DataFrame:
+        """
+        指定された資産名と複数の取引日に基づいてデータを取得し、PandasのDataFrameに変換します。
+        single_flightを指定した場合、同時の同じ引数の呼び出しには同じDataFrameを返すため、変更する場合はコピーしてください。
+
+        :param asset_name: 資産名
+        :param trade_dates: 取引日のリスト
+        :param versions: 呼び出し前に取得したfetch_versionsの結果。single_flightでは、バージョンが同じ呼び出しのみをまとめる
+        :return: trade_date, month, settle, volume, open_interest, settle_spreadのカラムを持つDataFrame。データがない場合は空のDataFrame
+        """
         try:
-            # DataFrameをtrade_dateとmonthでソート
-            df = df.sort_values(by=['trade_date', 'month']) # type: ignore
+            if not asset_name or not trade_dates:
+                raise InvalidInputError("資産名または取引日が指定されていません。")
 
-            # 各trade_dateごとにスプレッドを計算
-            df['settle_spread'] = df.groupby('trade_date')['settle'].diff().fillna(0) # type: ignore
+            asset_id = await self.asset_repository.fetch_id_by_name(asset_name)
+            if asset_id is None:
+                return _empty_dataframe()
 
-            return df
+            if self.single_flight is None:
+                return await self._fetch_dataframe(asset_id, trade_dates)
+            # 朝のスクレイピングの後などに同じリクエストが集中しても、クエリとDataFrameの作成は1回のみ実行する
+            return await self.single_flight.do(_dataframe_key(asset_id, trade_dates, versions), partial(self._fetch_shared_dataframe, asset_id, trade_dates), DATAFRAME_CODEC)
+
+        except InvalidInputError as e:
+            logger.error(f"エラー: {e}")
+            raise e
+
+        except SQLAlchemyError as e:
+            logger.error(f"データベースエラー: {e}")
+            raise RepositoryError("データベース操作中にエラーが発生しました。")
 
         except Exception as e:
-            # 予期せぬエラーのキャッチと処理
-            logger.error(f"DataFrameの処理中にエラーが発生しました: {e}")
-            raise DataFrameValidationError(f"DataFrameの処理中にエラーが発生しました: {e}")
+            logger.error(f"予期せぬエラー: {e}")
+            raise RepositoryError("予期せぬエラーが発生しました。")
+
+
+    async def fetch_versions(self, asset_name: str, trade_dates: list[date]) -> list[FuturesDataVersion]:
+        """
+        指定された取引日ごとのデータの状態を取得します。
+
+        :param asset_name: 資産名
+        :param trade_dates: 取引日のリスト
+        :return: FuturesDataVersionのリスト。データがない取引日は含まれません。
+        """
+        try:
+            asset_id = await self.asset_repository.fetch_id_by_name(asset_name)
+            if asset_id is None:
+                return []
+            return await self.futures_data_repository.fetch_versions_by_asset_and_dates(asset_id, list(trade_dates))
+        except SQLAlchemyError as e:
+            logger.error(f"データベースエラー: {e}")
+            raise RepositoryError("データベース操作中にエラーが発生しました。")
+
+
+    async def is_finalized(self, asset_name: str, trade_dates: list[date], versions: list[FuturesDataVersion] | None = None) -> bool:
+        """
+        指定された全ての取引日のデータが確定済みかを判定します。
+
+        :param asset_name: 資産名
+        :param trade_dates: 取引日のリスト
+        :param versions: fetch_versionsの結果。指定した場合はDBに問い合わせません。
+        :return: 全ての取引日が確定済みの場合はTrue。データがない取引日が含まれる場合はFalse
+        """
+        if versions is None:
+            versions = await self.fetch_versions(asset_name, trade_dates)
+        return _versions_are_final(trade_dates, versions)
+
+
+    def add_settlement_spread(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        DataFrameに清算値のスプレッドを追加します。DBに問い合わせないため同期メソッドです。
+
+        :param df: DataFrame
+        :return: スプレッドを追加したDataFrame
+        """
+        return _add_settlement_spread(df)
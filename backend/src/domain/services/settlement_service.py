@@ -1,22 +1,68 @@
 # src/domain/services/settlement_service.py
-import pandas as pd
+from __future__ import annotations
+
 from datetime import date, datetime
+from typing import TYPE_CHECKING
 
 from src.domain.entities.settlement_entity import SettlementEntity
-from src.domain.logics.convert_price_format import convert_price_format
+from src.domain.logics.convert_price_columns import PRICE_COLUMNS, coalesce_price_values, convert_price_columns, raise_for_invalid_prices
+from src.domain.repositories.futures_curve_repository import FuturesCurveRepository
+from src.domain.repositories.futures_data_cache_repository import FuturesDataCacheRepository
+from src.domain.repositories.ingest_event_repository import SETTLEMENT_KIND, IngestEvent, IngestEventRepository
 from src.domain.repositories.settlement_repository import SettlementRepository
+from src.domain.repositories.trade_date_summary_repository import TradeDateSummaryRepository
+from src.domain.services.futures_data_service import is_settlement_final
 from src.domain.value_objects.trade_date import TradeDate
 from src.settings import logger
 
+if TYPE_CHECKING:
+    import pandas as pd
+
 
 class SettlementService:
-    def __init__(self, settlement_repository: SettlementRepository):
+    def __init__(self, settlement_repository: SettlementRepository, futures_data_cache: FuturesDataCacheRepository | None = None, trade_date_summary_repository: TradeDateSummaryRepository | None = None, ingest_event_repository: IngestEventRepository | None = None, futures_curve_repository: FuturesCurveRepository | None = None):
         self.settlement_repository = settlement_repository
+        self.futures_data_cache = futures_data_cache
+        self.trade_date_summary_repository = trade_date_summary_repository
+        self.ingest_event_repository = ingest_event_repository
+        self.futures_curve_repository = futures_curve_repository
 
-    def save_settlements_from_dataframe(self, asset_id: int, trade_date: str, df: pd.DataFrame, last_updated: datetime):
+    def _refresh_trade_date_summary(self, asset_id: int, trade_date: str):
+        # 書き込んだ取引日の、/trade-datesが参照するサマリーを更新する
+        if self.trade_date_summary_repository is not None:
+            self.trade_date_summary_repository.refresh(asset_id, [TradeDate.from_string(trade_date).to_date()])
+
+
+    def _refresh_futures_curve(self, asset_id: int, trade_date: str):
+        # 書き込んだ取引日の、/futures-dataが参照するfutures_curveを作り直す。キャッシュの削除より前に行う
+        if self.futures_curve_repository is not None:
+            self.futures_curve_repository.refresh(asset_id, [TradeDate.from_string(trade_date).to_date()])
+
+    def _invalidate_futures_data_cache(self, asset_id: int, trade_date: str):
+        # 書き込んだ資産・取引日を含む/futures-dataのキャッシュを削除する
+        if self.futures_data_cache is not None:
+            self.futures_data_cache.invalidate(TradeDate.from_string(trade_date).to_date(), asset_id)
+
+    def _publish_ingest_event(self, asset_id: int, trade_date: str, last_updated: datetime):
+        # APIの各レプリカに、プロセス内のキャッシュから書き込んだ取引日のデータを削除させる
+        if self.ingest_event_repository is not None:
+            trade_date_value = TradeDate.from_string(trade_date).to_date()
+            self.ingest_event_repository.publish(IngestEvent(asset_id, trade_date_value, SETTLEMENT_KIND, is_settlement_final(trade_date_value, last_updated)))
+
+    def _dataframe_to_entities(self, asset_id: int, trade_date: str, df: pd.DataFrame, last_updated: datetime) -> list[SettlementEntity]:
+        """DataFrameの全行をエンティティに変換する。1行でもバリデーションエラーがあれば例外を送出する"""
+        # 価格カラムはエンティティを作成する前に、全行をまとめて検証する
+        _, invalid_prices = convert_price_columns(df)
+        try:
+            raise_for_invalid_prices(df, invalid_prices)
+        except ValueError as e:
+            logger.error(f"Validation error: {e}, asset_id: {asset_id}, trade_date: {trade_date}")
+            raise e
+
+        settlement_entities: list[SettlementEntity] = []
         for row in df.itertuples():
             try:
-                settlement_entity = SettlementEntity.new_entity_by_scraping(
+                settlement_entities.append(SettlementEntity.new_entity_by_scraping(
                     asset_id=asset_id,
                     trade_date=trade_date,
                     month=str(row.month),
@@ -29,50 +75,70 @@ class SettlementService:
                     est_volume=str(row.est_volume),
                     prior_day_oi=str(row.prior_day_oi),
                     last_updated=last_updated
-                )
-                self.settlement_repository.create(settlement_entity)
+                ))
             except ValueError as e:
                 logger.error(f"Validation error for row {row}: {e}, asset_id: {asset_id}, trade_date: {trade_date}")
                 raise e
-            except Exception as e:
-                logger.error(f"Error saving settlement for row {row}: {e}, asset_id: {asset_id}, trade_date: {trade_date}")
-                raise e
-        logger.info(f"Settlements for asset {asset_id} - {trade_date} saved successfully.")
+        return settlement_entities
+
+    def save_settlements_from_dataframe(self, asset_id: int, trade_date: str, df: pd.DataFrame, last_updated: datetime):
+        """
+        DataFrameの全行をエンティティに変換してから、1回のトランザクションでまとめて保存する。
+        1行でもバリデーションエラーがあれば、DBには何も書き込まない。
+        """
+        settlement_entities = self._dataframe_to_entities(asset_id, trade_date, df, last_updated)
+        try:
+            self.settlement_repository.create_many(settlement_entities)
+        except Exception as e:
+            logger.error(f"Error saving settlements: {e}, asset_id: {asset_id}, trade_date: {trade_date}")
+            raise e
+        self._refresh_trade_date_summary(asset_id, trade_date)
+        self._refresh_futures_curve(asset_id, trade_date)
+        self._invalidate_futures_data_cache(asset_id, trade_date)
+        self._publish_ingest_event(asset_id, trade_date, last_updated)
+        logger.info(f"Settlements for asset {asset_id} - {trade_date} saved successfully. ({len(settlement_entities)} rows)")
+
+    def ingest_settlements_from_dataframe(self, asset_id: int, trade_date: str, df: pd.DataFrame, last_updated: datetime):
+        """
+        DataFrameの全行を1回のupsertで保存する。既存の限月は更新し、存在しない限月は追加する。
+        同じデータで何度呼び出しても結果は変わらないため、新規保存と更新のどちらにも使用できる。
+        """
+        settlement_entities = self._dataframe_to_entities(asset_id, trade_date, df, last_updated)
+        try:
+            self.settlement_repository.upsert_many(settlement_entities)
+        except Exception as e:
+            logger.error(f"Error ingesting settlements: {e}, asset_id: {asset_id}, trade_date: {trade_date}")
+            raise e
+        self._refresh_trade_date_summary(asset_id, trade_date)
+        self._refresh_futures_curve(asset_id, trade_date)
+        self._invalidate_futures_data_cache(asset_id, trade_date)
+        self._publish_ingest_event(asset_id, trade_date, last_updated)
+        logger.info(f"Settlements for asset {asset_id} - {trade_date} ingested successfully. ({len(settlement_entities)} rows)")
 
     def update_settlements_from_dataframe(self, asset_id: int, trade_date: str, df: pd.DataFrame, last_updated: datetime):
-        for row in df.itertuples():
-            try:
-                settlement_entity = SettlementEntity.new_entity_by_scraping(
-                    asset_id=asset_id,
-                    trade_date=trade_date,
-                    month=str(row.month),
-                    open=str(row.open),
-                    high=str(row.high),
-                    low=str(row.low),
-                    last=str(row.last),
-                    change=str(row.change),
-                    settle=str(row.settle),
-                    est_volume=str(row.est_volume),
-                    prior_day_oi=str(row.prior_day_oi),
-                    last_updated=last_updated
-                )
-                self.settlement_repository.update(settlement_entity)
-            except ValueError as e:
-                logger.error(f"Validation error for row {row}: {e}, asset_id: {asset_id}, trade_date: {trade_date}")
-                raise e
-            except Exception as e:
-                logger.error(f"Error updating settlement for row {row}: {e}, asset_id: {asset_id}, trade_date: {trade_date}")
-                raise e
-        logger.info(f"Settlements for asset {asset_id} - {trade_date} updated successfully.")
+        """ingest_settlements_from_dataframeと同じ。Webのテーブルに新しい限月が追加されていても失敗しない"""
+        self.ingest_settlements_from_dataframe(asset_id, trade_date, df, last_updated)
+
+
+    def fetch_last_updated_map(self, asset_id: int) -> dict[date, datetime]:
+        """スクレイピング前に、資産の全取引日のlast_updatedをまとめて取得する"""
+        return self.settlement_repository.fetch_last_updated_by_asset(asset_id)
 
 
-    def check_data_is_latest_or_not_exsist(self, asset_id: int, trade_date: str, last_updated: datetime) -> bool | None:
+    def check_data_is_latest_or_not_exsist(self, asset_id: int, trade_date: str, last_updated: datetime, last_updated_map: dict[date, datetime] | None = None) -> bool | None:
+        """
+        DBのデータがWebのデータ以上に新しいかを判定する。データが存在しない場合はNoneを返す。
+        last_updated_mapを指定した場合は、DBに問い合わせずにfetch_last_updated_mapの結果を参照する。
+        """
         try:
             trade_date_obj = TradeDate.from_string(trade_date)
         except ValueError as e:
             logger.error(f"Invalid date format: {trade_date}, asset_id: {asset_id}")
             raise e
-        last_updated_or_none = self.settlement_repository.check_last_updated_or_none(asset_id, trade_date_obj)
+        if last_updated_map is not None:
+            last_updated_or_none = last_updated_map.get(trade_date_obj.to_date())
+        else:
+            last_updated_or_none = self.settlement_repository.check_last_updated_or_none(asset_id, trade_date_obj)
         web_data_msec = last_updated.timestamp() * 1000
         db_data_msec = last_updated_or_none.timestamp() * 1000 if last_updated_or_none else None
 
@@ -81,22 +147,29 @@ class SettlementService:
 
     def make_settlements_dataframe_by_name_and_date(self, asset_name: str, trade_date: date) -> pd.DataFrame:
         """指定されたasset_nameとtrade_dateに基づいて決済データを取得し、DataFrameを作成する"""
+        import pandas as pd
+
         settlements = self.settlement_repository.fetch_settlements_by_name_and_date(asset_name, trade_date)
 
-        # DataFrameの作成
+        # DataFrameの作成。価格はDBの数値カラムの値を使用する
         df = pd.DataFrame([{
             'trade_date': settlement.trade_date.value,
             'month': str(settlement.month),
-            'open': convert_price_format(settlement.open),
-            'high': convert_price_format(settlement.high),
-            'low': convert_price_format(settlement.low),
-            'last': convert_price_format(settlement.last),
-            'change': convert_price_format(settlement.change),
-            'settle': convert_price_format(settlement.settle),
+            'open': settlement.open_value,
+            'high': settlement.high_value,
+            'low': settlement.low_value,
+            'last': settlement.last_value,
+            'change': settlement.change_value,
+            'settle': settlement.settle_value,
             'est_volume': settlement.est_volume,
             'prior_day_oi': settlement.prior_day_oi,
             'last_updated': settlement.last_updated
         } for settlement in settlements])
 
-        # 数値型に変換できなかったデータはNaNになるため、必要に応じて処理を行う
+        # 数値カラムに値がない行 (バックフィル前など) は、価格の文字列をまとめて変換する
+        for column in PRICE_COLUMNS:
+            if column in df.columns:
+                df[column] = coalesce_price_values(df[column].tolist(), [getattr(settlement, column) for settlement in settlements])
+
+        # 値がないデータはNaNになるため、必要に応じて処理を行う
         return df
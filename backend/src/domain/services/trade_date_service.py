@@ -1,19 +1,56 @@
 #src/domain/services/trade_date_service.py
+import json
+from contextlib import AbstractAsyncContextManager
 from datetime import date
+from functools import partial
+from typing import Callable
 from sqlalchemy.exc import SQLAlchemyError
 
 from src.domain.entities.trade_date_entity import TradeDateEntity
 from src.domain.exceptions.invalid_input_error import InvalidInputError
 from src.domain.exceptions.repository_error import RepositoryError
-from src.domain.repositories.trade_date_repository import TradeDateRepository
+from src.domain.helpers.single_flight import AsyncSingleFlight, SingleFlight, SingleFlightCodec
+from src.domain.repositories.asset_repository import AssetRepository, AsyncAssetRepository
+from src.domain.repositories.trade_date_repository import AsyncTradeDateRepository, TradeDateRepository, TradeDatesVersion
 from src.settings import logger
 
 
+def _validate_date_range(asset_name: str, start_date: date | None, end_date: date | None) -> None:
+    if not asset_name:
+        raise InvalidInputError("資産名が指定されていません。")
+
+    if start_date and end_date and start_date > end_date:
+        raise InvalidInputError("開始日が終了日より後です。")
+
+
+# 資産が見つからない場合の取引日のバージョン
+EMPTY_TRADE_DATES_VERSION = TradeDatesVersion(0, None, None)
+
+
+def _encode_trade_dates(entities: list[TradeDateEntity]) -> bytes:
+    return json.dumps([entity.trade_date.isoformat() for entity in entities]).encode('utf-8')
+
+
+def _decode_trade_dates(payload: bytes) -> list[TradeDateEntity]:
+    return [TradeDateEntity(trade_date=date.fromisoformat(value)) for value in json.loads(payload)]
+
+
+TRADE_DATES_CODEC: SingleFlightCodec[list[TradeDateEntity]] = SingleFlightCodec(_encode_trade_dates, _decode_trade_dates)
+
+
+def _trade_dates_key(asset_id: int, start_date: date | None, end_date: date | None, skip: int, limit: int, after: date | None) -> str:
+    return f"trade-dates:{asset_id}:{start_date}:{end_date}:{skip}:{limit}:{after}"
+
+
 class TradeDateService:
-    def __init__(self, trade_date_repository: TradeDateRepository):
+    def __init__(self, trade_date_repository: TradeDateRepository, asset_repository: AssetRepository, single_flight: SingleFlight | None = None):
         self.trade_date_repository = trade_date_repository
+        # 資産名をidに変換する。CachedAssetRepositoryの場合はDBに問い合わせない
+        self.asset_repository = asset_repository
+        # 指定した場合は、同じ引数の同時のfetch_trade_datesを1回の実行にまとめる
+        self.single_flight = single_flight
 
-    def fetch_trade_dates(self, asset_name: str, start_date: date | None, end_date: date | None, skip: int, limit: int) -> list[TradeDateEntity]:
+    def fetch_trade_dates(self, asset_name: str, start_date: date | None, end_date: date | None, skip: int, limit: int, after: date | None = None) -> list[TradeDateEntity]:
         """
         指定された資産名と日付範囲に基づいて取引日を取得します。
 
@@ -22,16 +59,149 @@ class TradeDateService:
         :param end_date: 終了日
         :param skip: 取得開始位置
         :param limit: 取得件数
+        :param after: 指定した場合は、この取引日より後の取引日のみを取得します (キーセットページネーション)
         :return: TradeDateEntityのリスト
         """
         try:
-            if not asset_name:
-                raise InvalidInputError("資産名が指定されていません。")
+            _validate_date_range(asset_name, start_date, end_date)
+
+            asset_id = self.asset_repository.fetch_id_by_name(asset_name)
+            if asset_id is None:
+                return []
+            fetch = partial(self.trade_date_repository.fetch_trade_dates, asset_id, start_date, end_date, skip, limit, after)
+            if self.single_flight is None:
+                return fetch()
+            return self.single_flight.do(_trade_dates_key(asset_id, start_date, end_date, skip, limit, after), fetch, TRADE_DATES_CODEC)
+
+        except InvalidInputError as e:
+            logger.error(f"Invalid input error: {e}")
+            raise e
+
+        except SQLAlchemyError as e:
+            logger.error(f"SQLAlchemy error: {e}")
+            raise RepositoryError("Error accessing data repository.")
+
+        except Exception as e:
+            logger.error(f"Unexpected error: {e}")
+            raise RepositoryError("An unexpected error occurred.")
+
+    def fetch_trade_dates_version(self, asset_name: str, start_date: date | None, end_date: date | None) -> TradeDatesVersion:
+        """
+        指定された資産名と日付範囲の取引日の件数と、最初・最後の取引日を取得します。
+        取引日のリストを取得せずに、リストが変更されたかを判定するために使用します。
+
+        :param asset_name: 資産名
+        :param start_date: 開始日
+        :param end_date: 終了日
+        :return: TradeDatesVersion
+        """
+        try:
+            _validate_date_range(asset_name, start_date, end_date)
+
+            asset_id = self.asset_repository.fetch_id_by_name(asset_name)
+            if asset_id is None:
+                return EMPTY_TRADE_DATES_VERSION
+            return self.trade_date_repository.fetch_trade_dates_version(asset_id, start_date, end_date)
+
+        except InvalidInputError as e:
+            logger.error(f"Invalid input error: {e}")
+            raise e
 
-            if start_date and end_date and start_date > end_date:
-                raise InvalidInputError("開始日が終了日より後です。")
+        except SQLAlchemyError as e:
+            logger.error(f"SQLAlchemy error: {e}")
+            raise RepositoryError("Error accessing data repository.")
+
+        except Exception as e:
+            logger.error(f"Unexpected error: {e}")
+            raise RepositoryError("An unexpected error occurred.")
+
+
+class AsyncTradeDateService:
+    """
+    APIのリクエスト処理用のTradeDateService。DBへの問い合わせはイベントループをブロックせずに待機します。
+    引数、戻り値と例外はTradeDateServiceと同じです。
+    """
+    def __init__(
+        self,
+        trade_date_repository: AsyncTradeDateRepository,
+        asset_repository: AsyncAssetRepository,
+        single_flight: AsyncSingleFlight | None = None,
+        repository_scope: Callable[[], AbstractAsyncContextManager[AsyncTradeDateRepository]] | None = None
+    ):
+        self.trade_date_repository = trade_date_repository
+        self.asset_repository = asset_repository
+        self.single_flight = single_flight
+        # single_flightでまとめた取得に使用する、専用のセッションのリポジトリを作成する関数
+        # 指定しない場合は、最初の呼び出し元のリポジトリ (セッション) を使用する
+        self.repository_scope = repository_scope
+
+    async def _fetch_shared_trade_dates(self, asset_id: int, start_date: date | None, end_date: date | None, skip: int, limit: int, after: date | None) -> list[TradeDateEntity]:
+        # まとめた取得は最初の呼び出し元がキャンセルされても続くため、そのリクエストのセッション (キャンセル時に閉じられる) は使わない
+        if self.repository_scope is None:
+            return await self.trade_date_repository.fetch_trade_dates(asset_id, start_date, end_date, skip, limit, after)
+        async with self.repository_scope() as repository:
+            return await repository.fetch_trade_dates(asset_id, start_date, end_date, skip, limit, after)
+
+    async def fetch_trade_dates(self, asset_name: str, start_date: date | None, end_date: date | None, skip: int, limit: int, after: date | None = None) -> list[TradeDateEntity]:
+        try:
+            _validate_date_range(asset_name, start_date, end_date)
+
+            asset_id = await self.asset_repository.fetch_id_by_name(asset_name)
+            if asset_id is None:
+                return []
+            if self.single_flight is None:
+                return await self.trade_date_repository.fetch_trade_dates(asset_id, start_date, end_date, skip, limit, after)
+            fetch = partial(self._fetch_shared_trade_dates, asset_id, start_date, end_date, skip, limit, after)
+            return await self.single_flight.do(_trade_dates_key(asset_id, start_date, end_date, skip, limit, after), fetch, TRADE_DATES_CODEC)
+
+        except InvalidInputError as e:
+            logger.error(f"Invalid input error: {e}")
+            raise e
+
+        except SQLAlchemyError as e:
+            logger.error(f"SQLAlchemy error: {e}")
+            raise RepositoryError("Error accessing data repository.")
+
+        except Exception as e:
+            logger.error(f"Unexpected error: {e}")
+            raise RepositoryError("An unexpected error occurred.")
+
+    async def fetch_trade_dates_version(self, asset_name: str, start_date: date | None, end_date: date | None) -> TradeDatesVersion:
+        try:
+            _validate_date_range(asset_name, start_date, end_date)
+
+            asset_id = await self.asset_repository.fetch_id_by_name(asset_name)
+            if asset_id is None:
+                return EMPTY_TRADE_DATES_VERSION
+            return await self.trade_date_repository.fetch_trade_dates_version(asset_id, start_date, end_date)
+
+        except InvalidInputError as e:
+            logger.error(f"Invalid input error: {e}")
+            raise e
+
+        except SQLAlchemyError as e:
+            logger.error(f"SQLAlchemy error: {e}")
+            raise RepositoryError("Error accessing data repository.")
+
+        except Exception as e:
+            logger.error(f"Unexpected error: {e}")
+            raise RepositoryError("An unexpected error occurred.")
+
+    async def fetch_latest_trade_dates(self, asset_name: str, limit: int) -> list[TradeDateEntity]:
+        """
+        指定された資産の最新の取引日を、limit件まで昇順で取得します。起動時のキャッシュのウォームアップで使用します。
+
+        :param asset_name: 資産名
+        :param limit: 取得件数
+        :return: 取引日のリスト。資産が見つからない場合は空のリスト
+        """
+        try:
+            _validate_date_range(asset_name, None, None)
 
-            return self.trade_date_repository.fetch_trade_dates(asset_name, start_date, end_date, skip, limit)
+            asset_id = await self.asset_repository.fetch_id_by_name(asset_name)
+            if asset_id is None:
+                return []
+            return await self.trade_date_repository.fetch_latest_trade_dates(asset_id, limit)
 
         except InvalidInputError as e:
             logger.error(f"Invalid input error: {e}")
@@ -3,7 +3,7 @@ from sqlalchemy.exc import SQLAlchemyError
 
 from src.domain.entities.user_entity import UserEntity
 from src.domain.exceptions.repository_error import RepositoryError
-from src.domain.repositories.user_repository import UserRepository
+from src.domain.repositories.user_repository import AsyncUserRepository, UserRepository
 from src.domain.value_objects.name import Name
 from src.domain.value_objects.email import Email
 from src.domain.value_objects.password import Password
@@ -73,3 +73,17 @@ class UserService:
         except ValueError as e:
             raise InvalidUserInputError(str(e))
         return UserEntity.from_db(user_db)
+
+
+class AsyncUserService:
+    """APIのリクエスト処理用に、ユーザーの参照のみをイベントループをブロックせずに行います"""
+    def __init__(self, user_repository: AsyncUserRepository):
+        self.user_repository = user_repository
+
+
+    async def fetch_user_by_email(self, email: str) -> UserEntity:
+        try:
+            user_db: UserModel = await self.user_repository.fetch_by_email(Email(email))
+            return UserEntity.from_db(user_db)
+        except ValueError as e:
+            raise UserNotFoundError(f"User not found. email: {email}\n details: {e}")
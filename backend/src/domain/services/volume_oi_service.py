@@ -1,12 +1,21 @@
 # src/domain/services/volume_oi_service.py
-import pandas as pd
-from typing import NamedTuple
+from __future__ import annotations
+
+from datetime import date
+from typing import TYPE_CHECKING, NamedTuple
 
 from src.domain.entities.volume_oi_entity import VolumeOIEntity
+from src.domain.repositories.futures_curve_repository import FuturesCurveRepository
+from src.domain.repositories.futures_data_cache_repository import FuturesDataCacheRepository
+from src.domain.repositories.ingest_event_repository import VOLUME_OI_KIND, IngestEvent, IngestEventRepository
+from src.domain.repositories.trade_date_summary_repository import TradeDateSummaryRepository
 from src.domain.repositories.volume_oi_repository import VolumeOIRepository
 from src.domain.value_objects.trade_date import TradeDate
 from src.settings import logger
 
+if TYPE_CHECKING:
+    import pandas as pd
+
 
 _VOINamedTuple = NamedTuple('_VOINamedTuple', [
     ('month', str),
@@ -25,8 +34,36 @@ _VOINamedTuple = NamedTuple('_VOINamedTuple', [
 
 
 class VolumeOIService:
-    def __init__(self, volume_oi_repository: VolumeOIRepository):
+    def __init__(self, volume_oi_repository: VolumeOIRepository, futures_data_cache: FuturesDataCacheRepository | None = None, trade_date_summary_repository: TradeDateSummaryRepository | None = None, ingest_event_repository: IngestEventRepository | None = None, futures_curve_repository: FuturesCurveRepository | None = None):
         self.volume_oi_repository = volume_oi_repository
+        self.futures_data_cache = futures_data_cache
+        self.trade_date_summary_repository = trade_date_summary_repository
+        self.ingest_event_repository = ingest_event_repository
+        self.futures_curve_repository = futures_curve_repository
+
+
+    def _refresh_trade_date_summary(self, asset_id: int, trade_date: str):
+        # 書き込んだ取引日の、/trade-datesが参照するサマリーを更新する
+        if self.trade_date_summary_repository is not None:
+            self.trade_date_summary_repository.refresh(asset_id, [TradeDate.from_string(trade_date).to_date()])
+
+
+    def _refresh_futures_curve(self, asset_id: int, trade_date: str):
+        # 書き込んだ取引日の、/futures-dataが参照するfutures_curveを作り直す。キャッシュの削除より前に行う
+        if self.futures_curve_repository is not None:
+            self.futures_curve_repository.refresh(asset_id, [TradeDate.from_string(trade_date).to_date()])
+
+
+    def _invalidate_futures_data_cache(self, asset_id: int, trade_date: str):
+        # 書き込んだ資産・取引日を含む/futures-dataのキャッシュを削除する
+        if self.futures_data_cache is not None:
+            self.futures_data_cache.invalidate(TradeDate.from_string(trade_date).to_date(), asset_id)
+
+
+    def _publish_ingest_event(self, asset_id: int, trade_date: str, is_final: bool):
+        # APIの各レプリカに、プロセス内のキャッシュから書き込んだ取引日のデータを削除させる
+        if self.ingest_event_repository is not None:
+            self.ingest_event_repository.publish(IngestEvent(asset_id, TradeDate.from_string(trade_date).to_date(), VOLUME_OI_KIND, is_final))
 
 
     def _transform_dataframe_types(self, df: pd.DataFrame) -> pd.DataFrame:
@@ -58,46 +95,80 @@ class VolumeOIService:
         )
 
 
-    def save_volume_oi_from_dataframe(self, asset_id: int, trade_date: str, df: pd.DataFrame, is_final: bool):
+    def _dataframe_to_entities(self, asset_id: int, trade_date: str, df: pd.DataFrame, is_final: bool) -> list[VolumeOIEntity]:
         # DataFrameの各列の型を変換する
         df = self._transform_dataframe_types(df)
 
+        volume_oi_entities: list[VolumeOIEntity] = []
         for row in df.itertuples(index=False):
             try:
-                volume_oi_entity = self._row_to_entity(row, asset_id, trade_date, is_final)
-                self.volume_oi_repository.create(volume_oi_entity)
+                volume_oi_entities.append(self._row_to_entity(row, asset_id, trade_date, is_final))
             except ValueError as e:
                 logger.error(f"Validation error for row {row}: {e}, asset_id: {asset_id}, trade_date: {trade_date}")
                 raise e
-            except Exception as e:
-                logger.error(f"Error saving volume and open interest data for row {row}: {e}, asset_id: {asset_id}, trade_date: {trade_date}")
-                raise e
-        else:
-            logger.info(f"Volume and open interest data for asset {asset_id} - {trade_date} saved successfully.")
+        return volume_oi_entities
 
 
-    def update_volume_oi_from_dataframe(self, asset_id: int, trade_date: str, df: pd.DataFrame, is_final: bool):
+    def save_volume_oi_from_dataframe(self, asset_id: int, trade_date: str, df: pd.DataFrame, is_final: bool):
         # DataFrameの各列の型を変換する
         df = self._transform_dataframe_types(df)
 
         for row in df.itertuples(index=False):
             try:
                 volume_oi_entity = self._row_to_entity(row, asset_id, trade_date, is_final)
-                self.volume_oi_repository.update(volume_oi_entity)
+                self.volume_oi_repository.create(volume_oi_entity)
             except ValueError as e:
                 logger.error(f"Validation error for row {row}: {e}, asset_id: {asset_id}, trade_date: {trade_date}")
                 raise e
             except Exception as e:
-                logger.error(f"Error updating volume and open interest data for row {row}: {e}, asset_id: {asset_id}, trade_date: {trade_date}")
+                logger.error(f"Error saving volume and open interest data for row {row}: {e}, asset_id: {asset_id}, trade_date: {trade_date}")
                 raise e
         else:
-            logger.info(f"Volume and open interest data for asset {asset_id} - {trade_date} updated successfully.")
+            self._refresh_trade_date_summary(asset_id, trade_date)
+            self._refresh_futures_curve(asset_id, trade_date)
+            self._invalidate_futures_data_cache(asset_id, trade_date)
+            self._publish_ingest_event(asset_id, trade_date, is_final)
+            logger.info(f"Volume and open interest data for asset {asset_id} - {trade_date} saved successfully.")
+
+
+    def ingest_volume_oi_from_dataframe(self, asset_id: int, trade_date: str, df: pd.DataFrame, is_final: bool):
+        """
+        DataFrameの全行を1回のupsertで保存する。既存の限月は更新し、存在しない限月は追加する。
+        同じデータで何度呼び出しても結果は変わらないため、新規保存と更新のどちらにも使用できる。
+        """
+        volume_oi_entities = self._dataframe_to_entities(asset_id, trade_date, df, is_final)
+        try:
+            self.volume_oi_repository.upsert_many(volume_oi_entities)
+        except Exception as e:
+            logger.error(f"Error ingesting volume and open interest data: {e}, asset_id: {asset_id}, trade_date: {trade_date}")
+            raise e
+        self._refresh_trade_date_summary(asset_id, trade_date)
+        self._refresh_futures_curve(asset_id, trade_date)
+        self._invalidate_futures_data_cache(asset_id, trade_date)
+        self._publish_ingest_event(asset_id, trade_date, is_final)
+        logger.info(f"Volume and open interest data for asset {asset_id} - {trade_date} ingested successfully. ({len(volume_oi_entities)} rows)")
+
+
+    def update_volume_oi_from_dataframe(self, asset_id: int, trade_date: str, df: pd.DataFrame, is_final: bool):
+        """ingest_volume_oi_from_dataframeと同じ。Webのテーブルに新しい限月が追加されていても失敗しない"""
+        self.ingest_volume_oi_from_dataframe(asset_id, trade_date, df, is_final)
+
+
+    def fetch_is_final_map(self, asset_id: int) -> dict[date, bool]:
+        """スクレイピング前に、資産の全取引日のis_finalをまとめて取得する"""
+        return self.volume_oi_repository.fetch_is_final_by_asset(asset_id)
 
 
-    def check_data_is_final(self, asset_id: int, trade_date: str) -> bool | None:
+    def check_data_is_final(self, asset_id: int, trade_date: str, is_final_map: dict[date, bool] | None = None) -> bool | None:
+        """
+        DBのデータがFinalかを判定する。データが存在しない場合はNoneを返す。
+        is_final_mapを指定した場合は、DBに問い合わせずにfetch_is_final_mapの結果を参照する。
+        """
         try:
             trade_date_obj = TradeDate.from_string(trade_date)
         except ValueError as e:
             logger.error(f"Invalid date format: {trade_date}, asset_id: {asset_id}")
             raise e
+        if is_final_map is not None:
+            return is_final_map.get(trade_date_obj.to_date())
         return self.volume_oi_repository.check_data_is_final_or_none(asset_id, trade_date_obj)
@@ -58,3 +58,21 @@ class YearMonth(DataClassBase):
         変換される datetime オブジェクトは、指定された年月の最初の日 (1日) を表す。
         """
         return datetime(self.year, self.month, 1)
+
+
+    def to_month_key(self) -> int:
+        """
+        YearMonth オブジェクトを整数 YYYYMM に変換する。futures_curveテーブルの限月のキーに使用する。
+        """
+        return self.year * 100 + self.month
+
+
+    @classmethod
+    def from_month_key(cls, month_key: int) -> YearMonth:
+        """
+        整数 YYYYMM から YearMonth オブジェクトを生成する。
+        """
+        year, month = divmod(int(month_key), 100)
+        if not 1 <= month <= 12:
+            raise ValueError(f"Invalid month key: {month_key}")
+        return cls(year, month)
@@ -0,0 +1,139 @@
+# src/infrastructure/cache/asset_registry.py
+from __future__ import annotations
+
+import asyncio
+import os
+import threading
+import time
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Awaitable, Callable, Iterable, Mapping
+
+from src.domain.repositories.asset_registry_version_repository import AssetRegistryVersionRepository
+
+
+@dataclass(frozen=True)
+class AssetMap:
+    """
+    資産名とidの対応。作成後は変更しないため、ロックなしで複数のスレッドから参照できる。
+    """
+    ids_by_name: Mapping[str, int]
+    names_by_id: Mapping[int, str]
+    # 読み込み時のバージョン。バージョンを取得できなかった場合はNone
+    version: int | None
+    loaded_at: float
+
+    @classmethod
+    def build(cls, assets: Iterable[tuple[int, str]], version: int | None) -> AssetMap:
+        ids_by_name = {name: asset_id for asset_id, name in assets}
+        return cls(
+            ids_by_name=MappingProxyType(ids_by_name),
+            names_by_id=MappingProxyType({asset_id: name for name, asset_id in ids_by_name.items()}),
+            version=version,
+            loaded_at=time.monotonic()
+        )
+
+
+class AssetRegistry:
+    """
+    プロセス内で共有する、資産名とidの対応のキャッシュ。
+    バージョンの確認は最大でcheck_interval秒に1回とし、他のプロセスで資産が追加・削除されてバージョンが変わった場合に読み込み直す。
+    バージョンを取得できない場合 (Redisの停止中など) は、読み込みからmax_age秒経過した時点で読み込み直す。
+    """
+    def __init__(
+        self,
+        version_repository: AssetRegistryVersionRepository | None = None,
+        check_interval: float = float(os.getenv('ASSET_REGISTRY_CHECK_INTERVAL', 1)),
+        max_age: float = float(os.getenv('ASSET_REGISTRY_MAX_AGE', 300))
+    ):
+        self.version_repository = version_repository
+        self.check_interval = check_interval
+        self.max_age = max_age
+        self._asset_map: AssetMap | None = None
+        # invalidateのたびに増やし、無効化より前に読み込みを始めた結果を保存しないようにする
+        self._generation = 0
+        self._next_check = 0.0
+        self._lock = threading.RLock()
+
+
+    def _fetch_version(self) -> int | None:
+        if self.version_repository is None:
+            return None
+        return self.version_repository.fetch_version()
+
+
+    def _is_stale(self, asset_map: AssetMap) -> bool:
+        now = time.monotonic()
+        if now < self._next_check:
+            return False
+        self._next_check = now + self.check_interval
+        version = self._fetch_version()
+        if version is None:
+            return now - asset_map.loaded_at >= self.max_age
+        return version != asset_map.version
+
+
+    def _store(self, assets: Iterable[tuple[int, str]], version: int | None, generation: int) -> AssetMap:
+        asset_map = AssetMap.build(assets, version)
+        if generation == self._generation:
+            self._asset_map = asset_map
+            self._next_check = asset_map.loaded_at + self.check_interval
+        return asset_map
+
+
+    def get(self, load: Callable[[], Iterable[tuple[int, str]]]) -> AssetMap:
+        """
+        資産名とidの対応を返します。キャッシュがないか古い場合は、loadで読み込み直します。
+
+        :param load: DBから (id, 資産名) の一覧を読み込む関数
+        :return: AssetMap
+        """
+        current = self._asset_map
+        if current is not None and not self._is_stale(current):
+            return current
+
+        with self._lock:
+            # 待機中に他のスレッドが読み込んだ場合は、その結果を使う
+            if self._asset_map is not None and self._asset_map is not current:
+                return self._asset_map
+            generation = self._generation
+            # 読み込み中に資産が変更された場合に次の確認で読み込み直すよう、バージョンは読み込みの前に取得する
+            version = self._fetch_version()
+            return self._store(load(), version, generation)
+
+
+    async def get_async(self, load: Callable[[], Awaitable[Iterable[tuple[int, str]]]]) -> AssetMap:
+        """
+        getの非同期版。Redisへの問い合わせはスレッドで実行し、イベントループをブロックしません。
+
+        :param load: DBから (id, 資産名) の一覧を読み込むコルーチン関数
+        :return: AssetMap
+        """
+        current = self._asset_map
+        if current is not None and time.monotonic() < self._next_check:
+            return current
+        if current is not None and not await asyncio.to_thread(self._is_stale, current):
+            return current
+
+        generation = self._generation
+        version = await asyncio.to_thread(self._fetch_version)
+        return self._store(await load(), version, generation)
+
+
+    def peek(self) -> AssetMap | None:
+        """
+        読み込み済みの資産名とidの対応を、読み込みやバージョンの確認をせずに返します。読み込んでいない場合はNone。
+        """
+        return self._asset_map
+
+
+    def invalidate(self) -> None:
+        """
+        このプロセスのキャッシュを破棄し、バージョンを増やして他のプロセスにも読み込み直させます。
+        資産の追加・削除の後に呼び出します。
+        """
+        with self._lock:
+            self._generation += 1
+            self._asset_map = None
+        if self.version_repository is not None:
+            self.version_repository.increment_version()
@@ -0,0 +1,83 @@
+# src/infrastructure/cache/cached_asset_repository.py
+from src.domain.entities.asset_entity import AssetEntity
+from src.domain.exceptions.asset_not_found_error import AssetNotFoundError
+from src.domain.repositories.asset_repository import AssetRepository, AsyncAssetRepository
+from src.domain.value_objects.name import Name
+from src.infrastructure.cache.asset_registry import AssetMap, AssetRegistry
+from src.infrastructure.database.models import Asset as AssetModel
+
+
+def _to_models(asset_map: AssetMap) -> list[AssetModel]:
+    # セッションに紐付かないモデルをidの順で返す
+    assets = [AssetModel(id=asset_id, name=name) for asset_id, name in sorted(asset_map.names_by_id.items())]
+    if assets == []:
+        raise AssetNotFoundError("Assets not found")
+    return assets
+
+
+class CachedAssetRepository(AssetRepository):
+    """
+    資産の読み込みをAssetRegistryから返すAssetRepository。
+    書き込みはasset_repositoryに委譲し、完了後にAssetRegistryを無効化して全てのプロセスに読み込み直させる。
+    """
+    def __init__(self, asset_repository: AssetRepository, asset_registry: AssetRegistry):
+        self.asset_repository = asset_repository
+        self.asset_registry = asset_registry
+
+    def _load(self) -> list[tuple[int, str]]:
+        try:
+            return [(asset.id, asset.name) for asset in self.asset_repository.fetch_all()]
+        except AssetNotFoundError:
+            return []
+
+    def create(self, asset_entity: AssetEntity) -> AssetModel:
+        asset_db = self.asset_repository.create(asset_entity)
+        self.asset_registry.invalidate()
+        return asset_db
+
+    def fetch_all(self) -> list[AssetModel]:
+        return _to_models(self.asset_registry.get(self._load))
+
+    def fetch_by_name(self, name: Name) -> AssetModel:
+        asset_id = self.fetch_id_by_name(name.name)
+        if asset_id is None:
+            raise AssetNotFoundError(f"Asset with name {name.name} not found")
+        return AssetModel(id=asset_id, name=name.name)
+
+    def exists_by_name(self, name: Name) -> bool:
+        # 追加・削除の前の確認に使われるため、他のプロセスの変更が反映されていない可能性があるキャッシュではなくDBに問い合わせる
+        return self.asset_repository.exists_by_name(name)
+
+    def update(self, asset_entity: AssetEntity) -> AssetModel:
+        asset_db = self.asset_repository.update(asset_entity)
+        self.asset_registry.invalidate()
+        return asset_db
+
+    def delete(self, name: Name) -> None:
+        self.asset_repository.delete(name)
+        self.asset_registry.invalidate()
+
+    def fetch_id_by_name(self, name: str) -> int | None:
+        return self.asset_registry.get(self._load).ids_by_name.get(name)
+
+
+class AsyncCachedAssetRepository(AsyncAssetRepository):
+    """
+    CachedAssetRepositoryの非同期版。キャッシュがない場合のみ、asset_repositoryでDBから読み込む。
+    """
+    def __init__(self, asset_repository: AsyncAssetRepository, asset_registry: AssetRegistry):
+        self.asset_repository = asset_repository
+        self.asset_registry = asset_registry
+
+    async def _load(self) -> list[tuple[int, str]]:
+        try:
+            return [(asset.id, asset.name) for asset in await self.asset_repository.fetch_all()]
+        except AssetNotFoundError:
+            return []
+
+    async def fetch_all(self) -> list[AssetModel]:
+        return _to_models(await self.asset_registry.get_async(self._load))
+
+    async def fetch_id_by_name(self, name: str) -> int | None:
+        asset_map = await self.asset_registry.get_async(self._load)
+        return asset_map.ids_by_name.get(name)
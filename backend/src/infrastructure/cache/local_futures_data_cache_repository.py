@@ -0,0 +1,112 @@
+# src/infrastructure/cache/local_futures_data_cache_repository.py
+import os
+import threading
+import time
+from collections import OrderedDict
+from datetime import date
+
+from src.domain.repositories.futures_data_cache_repository import FuturesDataCacheEntry, FuturesDataCacheRepository
+
+
+_LocalKey = tuple[str, str, tuple[date, ...]]
+
+
+def _local_key(asset_name: str, trade_dates: list[date], response_format: str) -> _LocalKey:
+    # 取引日の順序や重複が異なるリクエストでも同じキーになるようにする
+    return response_format, asset_name, tuple(sorted(set(trade_dates)))
+
+
+class LocalFuturesDataCacheRepository(FuturesDataCacheRepository):
+    """
+    Redisのキャッシュ (futures_data_cache) の前段に置く、ワーカープロセス内のLRUキャッシュ。ヒットした場合はRedisに問い合わせない。
+    スクレイパーの書き込みは取り込みイベントを受け取ってevictで反映するため、イベントを受信できている間 (activate後) のみ保存する。
+    受信できなくなった場合はdeactivateで全て破棄する。確定済みのレスポンスはfinal_ttl秒、速報値を含むレスポンスはpreliminary_ttl秒保持する。
+    """
+    def __init__(
+        self,
+        futures_data_cache: FuturesDataCacheRepository,
+        max_entries: int = int(os.getenv('FUTURES_DATA_LOCAL_CACHE_SIZE', 256)),
+        final_ttl: float = float(os.getenv('FUTURES_DATA_LOCAL_CACHE_FINAL_TTL', 3600)),
+        preliminary_ttl: float = float(os.getenv('FUTURES_DATA_LOCAL_CACHE_PRELIMINARY_TTL', 60))
+    ):
+        self.futures_data_cache = futures_data_cache
+        self.max_entries = max_entries
+        self.final_ttl = final_ttl
+        self.preliminary_ttl = preliminary_ttl
+        self.local_hits = 0
+        self._active = False
+        self._entries: OrderedDict[_LocalKey, tuple[FuturesDataCacheEntry, float]] = OrderedDict()
+        self._lock = threading.Lock()
+
+
+    def _store(self, key: _LocalKey, entry: FuturesDataCacheEntry) -> None:
+        expires_at = time.monotonic() + (self.final_ttl if entry.is_final else self.preliminary_ttl)
+        with self._lock:
+            if not self._active:
+                return
+            self._entries[key] = (entry, expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+
+    def fetch(self, asset_name: str, trade_dates: list[date], response_format: str) -> FuturesDataCacheEntry | None:
+        key = _local_key(asset_name, trade_dates, response_format)
+        with self._lock:
+            cached = self._entries.get(key)
+            if cached is not None and cached[1] > time.monotonic():
+                self._entries.move_to_end(key)
+                self.local_hits += 1
+                return cached[0]
+            if cached is not None:
+                del self._entries[key]
+
+        entry = self.futures_data_cache.fetch(asset_name, trade_dates, response_format)
+        if entry is not None:
+            self._store(key, entry)
+        return entry
+
+
+    def save(self, asset_name: str, trade_dates: list[date], response_format: str, entry: FuturesDataCacheEntry) -> None:
+        self.futures_data_cache.save(asset_name, trade_dates, response_format, entry)
+        self._store(_local_key(asset_name, trade_dates, response_format), entry)
+
+
+    def invalidate(self, trade_date: date, asset_id: int | None = None) -> None:
+        # このプロセスのキャッシュは資産名で保持するため、取引日を含む全ての資産のレスポンスを削除する
+        self.futures_data_cache.invalidate(trade_date, asset_id)
+        self.evict(trade_date)
+
+
+    def evict(self, trade_date: date, asset_name: str | None = None) -> int:
+        """
+        このプロセスのキャッシュから、trade_dateを含むレスポンスを削除します。Redisのキャッシュは変更しません。
+
+        :param trade_date: 取引日
+        :param asset_name: 指定した場合は、この資産のレスポンスのみを削除します
+        :return: 削除したレスポンスの数
+        """
+        with self._lock:
+            keys = [
+                key for key in self._entries
+                if trade_date in key[2] and (asset_name is None or key[1] == asset_name)
+            ]
+            for key in keys:
+                del self._entries[key]
+        return len(keys)
+
+
+    def activate(self) -> None:
+        with self._lock:
+            self._active = True
+
+
+    def deactivate(self) -> None:
+        # 無効化のイベントを受け取れない間に古くなる可能性があるため、保存済みのレスポンスも破棄する
+        with self._lock:
+            self._active = False
+            self._entries.clear()
+
+
+    def fetch_stats(self) -> dict[str, int]:
+        return {**self.futures_data_cache.fetch_stats(), 'local_hits': self.local_hits}
@@ -1,21 +1,35 @@
 # src/infrastructure/database/database.py
 # coding: utf-8
+from __future__ import annotations
+
 import os
 import re
+import threading
+from contextlib import asynccontextmanager
+from typing import TYPE_CHECKING, Any, AsyncIterator, Callable, TypeVar
 from urllib.parse import quote_plus
 
-from sqlalchemy import create_engine
-from sqlalchemy.orm import scoped_session, sessionmaker, declarative_base
+from sqlalchemy import Engine, create_engine
+from sqlalchemy.orm import Session, scoped_session, sessionmaker, declarative_base
 
+from src.infrastructure.database.engine_profiles import apply_statement_timeout, engine_options, get_engine_profile
 from src.settings import logger
 
+if TYPE_CHECKING:
+    from contextlib import AbstractAsyncContextManager
+
+    from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker
+
+
+T = TypeVar('T')
+
 
-def get_engine():
+def get_database_url(driver: str | None) -> str:
     """
-    Get the database engine
+    Build and validate the database URL for the given driver
     """
     encoded_password = quote_plus(os.getenv('MYSQL_PASSWORD', ''))
-    database_url: str = f"{os.getenv('DIALECT')}+{os.getenv('DRIVER')}://{os.getenv('MYSQL_USER')}:{encoded_password}@{os.getenv('MYSQL_HOST')}:{os.getenv('MYSQL_PORT')}/{os.getenv('MYSQL_DATABASE')}"
+    database_url: str = f"{os.getenv('DIALECT')}+{driver}://{os.getenv('MYSQL_USER')}:{encoded_password}@{os.getenv('MYSQL_HOST')}:{os.getenv('MYSQL_PORT')}/{os.getenv('MYSQL_DATABASE')}"
 
     # Check if the database URL is valid
     pattern = r"^\w+\+\w+://\w+:.*@[\w\-\.]+(:\d+)?/[\w-]+$"
@@ -26,19 +40,117 @@ def get_engine():
         raise ValueError(f"Invalid database URL: {database_url_notice}")
 
     logger.info(f"Database URL is valid: {database_url_notice}")
-    return create_engine(
-        database_url,
-        echo=True
-    )
+    return database_url
 
 
-engine = get_engine()
-db_session = scoped_session(
-    sessionmaker(
-        autocommit=False,
-        autoflush=False,
-        bind=engine
+def get_engine(profile_name: str = 'api') -> Engine:
+    """
+    Get the database engine configured by the named engine profile (api, export, scraper or migration)
+    """
+    profile = get_engine_profile(profile_name)
+    engine = create_engine(
+        get_database_url(os.getenv('DRIVER')),
+        **engine_options(profile, profile.name)
     )
-)
+    apply_statement_timeout(engine, profile)
+    return engine
+
+
+_shared_engines: dict[str, Engine] = {}
+_shared_engines_lock = threading.Lock()
+
+
+def get_shared_engine(profile_name: str = 'api') -> Engine:
+    """
+    Get the engine shared by the sessions of this process for the named engine profile.
+    The engine is created on first use, so importing this module never touches the database settings.
+    """
+    with _shared_engines_lock:
+        if profile_name not in _shared_engines:
+            _shared_engines[profile_name] = get_engine(profile_name)
+        return _shared_engines[profile_name]
+
+
+class _LazySessionFactory:
+    """
+    Session factory for scoped_session that binds the shared engine of the profile when the first session is created
+    """
+    def __init__(self, profile_name: str):
+        self.profile_name = profile_name
+        self._sessionmaker: sessionmaker[Session] | None = None
+
+    def __call__(self, **kwargs: Any) -> Session:
+        if self._sessionmaker is None:
+            self._sessionmaker = sessionmaker(
+                autocommit=False,
+                autoflush=False,
+                bind=get_shared_engine(self.profile_name)
+            )
+        return self._sessionmaker(**kwargs)
+
+
+_async_engine: AsyncEngine | None = None
+_async_session_factory: async_sessionmaker[AsyncSession] | None = None
+
+
+def get_async_engine() -> AsyncEngine:
+    """
+    Get the asyncio database engine used by the API, configured by the api engine profile.
+    The engine is created on first use, so the scrapers and migrations never import the async driver.
+    """
+    global _async_engine
+    if _async_engine is None:
+        from sqlalchemy.ext.asyncio import create_async_engine
+
+        profile = get_engine_profile('api')
+        _async_engine = create_async_engine(
+            get_database_url(os.getenv('ASYNC_DRIVER', 'aiomysql')),
+            **engine_options(profile, f"{profile.name}-async", is_async=True)
+        )
+        apply_statement_timeout(_async_engine.sync_engine, profile)
+    return _async_engine
+
+
+def async_db_session() -> AsyncSession:
+    """
+    Create a new AsyncSession bound to the asyncio engine
+    """
+    global _async_session_factory
+    if _async_session_factory is None:
+        from sqlalchemy.ext.asyncio import async_sessionmaker
+
+        # Loaded rows are read after commit by the services, so they must not be expired
+        _async_session_factory = async_sessionmaker(
+            bind=get_async_engine(),
+            autoflush=False,
+            expire_on_commit=False
+        )
+    return _async_session_factory()
+
+
+def async_session_scope(make: Callable[[AsyncSession], T], session_factory: Callable[[], AsyncSession] = async_db_session) -> Callable[[], AbstractAsyncContextManager[T]]:
+    """
+    Return a factory of async context managers that open a new AsyncSession, yield the object built from it by `make`
+    and close the session on exit. Work shared by several requests uses it instead of the session of the request that
+    started it, which is closed when that request is cancelled.
+    """
+    @asynccontextmanager
+    async def scope() -> AsyncIterator[T]:
+        async with session_factory() as session:
+            yield make(session)
+
+    return scope
+
+
+def __getattr__(name: str) -> Any:
+    # `engine` is kept for compatibility; the api engine is created on first access
+    if name == 'engine':
+        return get_shared_engine('api')
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+db_session = scoped_session(_LazySessionFactory('api'))  # type: ignore
+# Sessions for the cron scrapers and batch scripts, backed by the scraper engine profile
+scraper_db_session = scoped_session(_LazySessionFactory('scraper'))  # type: ignore
 Base = declarative_base()
 Base.query = db_session.query_property()
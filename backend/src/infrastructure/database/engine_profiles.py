@@ -0,0 +1,192 @@
+# src/infrastructure/database/engine_profiles.py
+import os
+import threading
+import time
+import weakref
+from dataclasses import dataclass, replace
+from typing import Any
+
+from sqlalchemy import Engine, event
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import AsyncAdaptedQueuePool, Pool, QueuePool
+
+
+@dataclass(frozen=True)
+class EngineProfile:
+    """
+    用途ごとのエンジンの設定。環境変数 DB_<NAME>_<SETTING> (例: DB_API_POOL_SIZE) で上書きできます。
+    """
+    name: str
+    pool_size: int
+    max_overflow: int
+    # コネクションの最大使用秒数。MySQLのwait_timeoutより短くし、切断済みのコネクションを使わないようにする
+    pool_recycle: int
+    pool_pre_ping: bool
+    # コネクションの空きを待つ最大秒数
+    pool_timeout: int
+    echo: bool
+    # SELECT文の最大実行時間 (MySQLのmax_execution_time)。Noneの場合は制限しない
+    statement_timeout_ms: int | None
+
+
+# APIはリクエストの並列数に合わせてプールを大きくし、長時間のクエリは打ち切る
+# スクレイパーとマイグレーションは同時に使うコネクションが少なく、cronの実行間隔が長いため毎回pre-pingする
+# エクスポートはレスポンスの送信が終わるまで1つのSELECTを実行し続けるため、APIのプロファイルと分けて実行時間を制限しない
+DEFAULT_PROFILES: dict[str, EngineProfile] = {
+    'api': EngineProfile('api', pool_size=10, max_overflow=20, pool_recycle=1800, pool_pre_ping=True, pool_timeout=10, echo=False, statement_timeout_ms=5000),
+    'export': EngineProfile('export', pool_size=2, max_overflow=4, pool_recycle=1800, pool_pre_ping=True, pool_timeout=10, echo=False, statement_timeout_ms=None),
+    'scraper': EngineProfile('scraper', pool_size=4, max_overflow=4, pool_recycle=1800, pool_pre_ping=True, pool_timeout=60, echo=False, statement_timeout_ms=None),
+    'migration': EngineProfile('migration', pool_size=1, max_overflow=0, pool_recycle=1800, pool_pre_ping=True, pool_timeout=60, echo=False, statement_timeout_ms=None),
+}
+
+
+def _env_bool(value: str) -> bool:
+    return value.strip().lower() in ('1', 'true', 'yes', 'on')
+
+
+def get_engine_profile(name: str) -> EngineProfile:
+    """
+    プロファイルの既定値に、環境変数の設定を反映して返します。
+
+    :param name: プロファイル名 (api, export, scraper, migration)
+    :return: EngineProfile
+    :raises ValueError: 未定義のプロファイル名の場合
+    """
+    if name not in DEFAULT_PROFILES:
+        raise ValueError(f"Unknown engine profile: {name}")
+    profile = DEFAULT_PROFILES[name]
+    prefix = f"DB_{name.upper()}_"
+
+    overrides: dict[str, Any] = {}
+    for setting in ('pool_size', 'max_overflow', 'pool_recycle', 'pool_timeout'):
+        value = os.getenv(prefix + setting.upper())
+        if value:
+            overrides[setting] = int(value)
+    for setting in ('pool_pre_ping', 'echo'):
+        value = os.getenv(prefix + setting.upper())
+        if value:
+            overrides[setting] = _env_bool(value)
+    statement_timeout = os.getenv(prefix + 'STATEMENT_TIMEOUT_MS')
+    if statement_timeout:
+        # 0は制限なし
+        overrides['statement_timeout_ms'] = int(statement_timeout) or None
+    return replace(profile, **overrides)
+
+
+class PoolMetrics:
+    """
+    プロファイルごとのコネクションプールの統計。
+    コネクションの取得にかかった時間 (checkout latency) と、プールの使用率 (saturation) を集計します。
+    """
+    def __init__(self, name: str):
+        self.name = name
+        self._lock = threading.Lock()
+        self._pools: weakref.WeakSet[Pool] = weakref.WeakSet()
+        self.checkouts = 0
+        self.timeouts = 0
+        self.total_checkout_seconds = 0.0
+        self.max_checkout_seconds = 0.0
+        self.max_checked_out = 0
+
+    def register(self, pool: Pool) -> None:
+        self._pools.add(pool)
+
+    def record_checkout(self, seconds: float, checked_out: int) -> None:
+        with self._lock:
+            self.checkouts += 1
+            self.total_checkout_seconds += seconds
+            self.max_checkout_seconds = max(self.max_checkout_seconds, seconds)
+            self.max_checked_out = max(self.max_checked_out, checked_out)
+
+    def record_timeout(self) -> None:
+        with self._lock:
+            self.timeouts += 1
+
+    def snapshot(self) -> dict[str, Any]:
+        pools = [pool for pool in self._pools if isinstance(pool, QueuePool)]
+        checked_out = sum(pool.checkedout() for pool in pools)
+        capacity = sum(pool.size() + max(pool._max_overflow, 0) for pool in pools)
+        with self._lock:
+            return {
+                'profile': self.name,
+                'checkouts': self.checkouts,
+                'timeouts': self.timeouts,
+                'avg_checkout_ms': self.total_checkout_seconds / self.checkouts * 1000 if self.checkouts else 0.0,
+                'max_checkout_ms': self.max_checkout_seconds * 1000,
+                'checked_out': checked_out,
+                'max_checked_out': self.max_checked_out,
+                'capacity': capacity,
+                'saturation': checked_out / capacity if capacity else 0.0,
+            }
+
+
+_pool_metrics: dict[str, PoolMetrics] = {}
+_pool_metrics_lock = threading.Lock()
+
+
+def get_pool_metrics(name: str) -> PoolMetrics:
+    with _pool_metrics_lock:
+        if name not in _pool_metrics:
+            _pool_metrics[name] = PoolMetrics(name)
+        return _pool_metrics[name]
+
+
+def pool_metrics_snapshot() -> list[dict[str, Any]]:
+    """このプロセスで作成したエンジンの、プロファイルごとの統計を返します"""
+    with _pool_metrics_lock:
+        metrics = list(_pool_metrics.values())
+    return [pool_metrics.snapshot() for pool_metrics in metrics]
+
+
+def timed_pool_class(base: type[QueuePool], metrics: PoolMetrics) -> type[QueuePool]:
+    """
+    コネクションの取得時間をmetricsに記録するプールのクラスを返します。
+    dispose時などに作り直されるプールも同じクラスになるため、統計は引き継がれます。
+    """
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        base.__init__(self, *args, **kwargs)
+        metrics.register(self)
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            connection = base._do_get(self)
+        except PoolTimeoutError:
+            metrics.record_timeout()
+            raise
+        metrics.record_checkout(time.perf_counter() - started, self.checkedout())
+        return connection
+
+    return type(f"Timed{base.__name__}", (base,), {'__init__': __init__, '_do_get': _do_get})
+
+
+def engine_options(profile: EngineProfile, metrics_name: str, is_async: bool = False) -> dict[str, Any]:
+    """create_engine / create_async_engineに渡すキーワード引数を返します"""
+    base = AsyncAdaptedQueuePool if is_async else QueuePool
+    return {
+        'echo': profile.echo,
+        'poolclass': timed_pool_class(base, get_pool_metrics(metrics_name)),
+        'pool_size': profile.pool_size,
+        'max_overflow': profile.max_overflow,
+        'pool_recycle': profile.pool_recycle,
+        'pool_pre_ping': profile.pool_pre_ping,
+        'pool_timeout': profile.pool_timeout,
+    }
+
+
+def apply_statement_timeout(engine: Engine, profile: EngineProfile) -> None:
+    """
+    MySQLの場合、コネクションの作成時にセッションのmax_execution_timeを設定します。
+    非同期のエンジンの場合は、AsyncEngine.sync_engineを指定します。
+    """
+    if profile.statement_timeout_ms is None or engine.dialect.name != 'mysql':
+        return
+    statement_timeout_ms = int(profile.statement_timeout_ms)
+
+    @event.listens_for(engine, "connect")
+    def _set_max_execution_time(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            cursor.execute(f"SET SESSION max_execution_time = {statement_timeout_ms}")
+        finally:
+            cursor.close()
@@ -1,6 +1,6 @@
 # src/infrastructure/database/models.py
 
-from sqlalchemy import Column, Integer, String, DateTime, Date, ForeignKey, UniqueConstraint, Boolean
+from sqlalchemy import Column, Integer, String, DateTime, Date, ForeignKey, Index, UniqueConstraint, Boolean, Double, func
 from sqlalchemy.orm import relationship
 from .database import Base
 
@@ -35,13 +35,24 @@ class Settlement(Base):
     last = Column(String(16))
     change = Column(String(16))
     settle = Column(String(16))
+    # 価格の文字列を数値に変換した値。保存時に設定し、読み込み時の変換や範囲検索・集計に使用する
+    open_value = Column(Double)
+    high_value = Column(Double)
+    low_value = Column(Double)
+    last_value = Column(Double)
+    change_value = Column(Double)
+    settle_value = Column(Double)
     est_volume = Column(Integer, nullable=False)
     prior_day_oi = Column(Integer, nullable=False)
     last_updated = Column(DateTime, nullable=False)
 
     asset = relationship("Asset", back_populates="settlements")
 
-    __table_args__ = (UniqueConstraint('asset_id', 'trade_date', 'month', name='_asset_date_month_uc'),)
+    __table_args__ = (
+        UniqueConstraint('asset_id', 'trade_date', 'month', name='_asset_date_month_uc'),
+        # /futures-dataの結合と鮮度確認をインデックスのみで処理するためのカバリングインデックス
+        Index('ix_settlements_asset_date_month_covering', 'asset_id', 'trade_date', 'month', 'last_updated', 'settle_value', 'settle'),
+    )
 
 class VolumeOI(Base):
     __tablename__ = 'volume_oi'
@@ -65,4 +76,40 @@ class VolumeOI(Base):
 
     asset = relationship("Asset", back_populates="volume_oi_data")
 
-    __table_args__ = (UniqueConstraint('asset_id', 'trade_date', 'month', name='_asset_date_month_uc'),)
+    __table_args__ = (
+        UniqueConstraint('asset_id', 'trade_date', 'month', name='_asset_date_month_uc'),
+        # /futures-dataの結合と確定判定をインデックスのみで処理するためのカバリングインデックス
+        Index('ix_volume_oi_asset_date_month_covering', 'asset_id', 'trade_date', 'month', 'is_final', 'total_volume', 'at_close'),
+    )
+
+class TradeDateSummary(Base):
+    # 資産・取引日ごとのデータの有無と確定状態。settlements / volume_oiの保存時に更新し、/trade-datesはこのテーブルのみを参照する
+    __tablename__ = 'trade_date_summaries'
+
+    asset_id = Column(Integer, ForeignKey('assets.id'), primary_key=True)
+    trade_date = Column(Date, primary_key=True)
+    has_settlement = Column(Boolean, nullable=False)
+    has_volume_oi = Column(Boolean, nullable=False)
+    # 清算値と出来高・建玉の両方がある限月が存在する (/futures-dataでデータを返せる) 場合はTrue
+    has_futures_data = Column(Boolean, nullable=False)
+    # 出来高・建玉の全ての限月がFinalの場合はTrue
+    is_final = Column(Boolean, nullable=False)
+    updated_at = Column(DateTime, nullable=False, server_default=func.now(), onupdate=func.now())
+
+class FuturesCurve(Base):
+    # /futures-dataが参照する、資産・取引日・限月ごとの清算値と出来高・建玉を結合した読み取り用のテーブル
+    # settlements / volume_oiの保存時に取引日単位で再作成し、APIは結合や価格の変換をせずにこのテーブルのみを参照する
+    __tablename__ = 'futures_curve'
+
+    asset_id = Column(Integer, ForeignKey('assets.id'), primary_key=True)
+    trade_date = Column(Date, primary_key=True)
+    # 限月を整数 YYYYMM で表したキー
+    month_key = Column(Integer, primary_key=True)
+    settle = Column(Double)
+    volume = Column(Integer, nullable=False)
+    open_interest = Column(Integer, nullable=False)
+    # 同じ取引日の1つ前の限月との清算値の差。最初の限月と清算値がない限月は0
+    settle_spread = Column(Double, nullable=False)
+    # 出来高・建玉のis_finalと清算値のlast_updated。データが変更されたか、確定済みかの判定に使用する
+    is_final = Column(Boolean, nullable=False)
+    last_updated = Column(DateTime, nullable=False)
@@ -41,6 +41,9 @@ class AssetRepositoryMysql(AssetRepository):
         asset_db = self.session.query(AssetModel).filter(AssetModel.name == name.name).first()
         return asset_db is not None
 
+    def fetch_id_by_name(self, name: str) -> int | None:
+        return self.session.query(AssetModel.id).filter(AssetModel.name == name).scalar()
+
 # TODO: 未実装
     def update(self, asset_entity: AssetEntity) -> AssetModel:
         # FIXME: idで検索し、新しい名前で更新するように実装してください
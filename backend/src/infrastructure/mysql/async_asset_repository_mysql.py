@@ -0,0 +1,23 @@
+# src/infrastructure/mysql/async_asset_repository_mysql.py
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.domain.exceptions.asset_not_found_error import AssetNotFoundError
+from src.domain.repositories.asset_repository import AsyncAssetRepository
+from src.infrastructure.database.models import Asset as AssetModel
+
+
+class AsyncAssetRepositoryMysql(AsyncAssetRepository):
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def fetch_all(self) -> list[AssetModel]:
+        result = await self.session.execute(select(AssetModel))
+        assets = list(result.scalars().all())
+        if assets == []:
+            raise AssetNotFoundError("Assets not found")
+        return assets
+
+    async def fetch_id_by_name(self, name: str) -> int | None:
+        result = await self.session.execute(select(AssetModel.id).where(AssetModel.name == name))
+        return result.scalar()
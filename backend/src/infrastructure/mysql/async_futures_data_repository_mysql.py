@@ -0,0 +1,39 @@
+# src/infrastructure/mysql/async_futures_data_repository_mysql.py
+from datetime import date
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.domain.repositories.futures_data_repository import AsyncFuturesDataRepository, FuturesDataRow, FuturesDataVersion
+from src.infrastructure.mysql.futures_data_repository_mysql import FETCH_BY_ASSET_AND_DATES_QUERY, FETCH_VERSIONS_BY_ASSET_AND_DATES_QUERY, to_futures_data_versions
+
+
+class AsyncFuturesDataRepositoryMysql(AsyncFuturesDataRepository):
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def fetch_by_asset_and_dates(self, asset_id: int, trade_dates: list[date]) -> list[FuturesDataRow]:
+        """
+        FuturesDataRepositoryMysql.fetch_by_asset_and_datesと同じクエリを、イベントループをブロックせずに実行します。
+        """
+        if not trade_dates:
+            return []
+
+        result = await self.session.execute(
+            FETCH_BY_ASSET_AND_DATES_QUERY,
+            {'asset_id': asset_id, 'trade_dates': list(trade_dates)}
+        )
+
+        return [tuple(row) for row in result.fetchall()]
+
+    async def fetch_versions_by_asset_and_dates(self, asset_id: int, trade_dates: list[date]) -> list[FuturesDataVersion]:
+        """
+        FuturesDataRepositoryMysql.fetch_versions_by_asset_and_datesと同じクエリを、イベントループをブロックせずに実行します。
+        """
+        if not trade_dates:
+            return []
+
+        result = await self.session.execute(
+            FETCH_VERSIONS_BY_ASSET_AND_DATES_QUERY,
+            {'asset_id': asset_id, 'trade_dates': list(trade_dates)}
+        )
+
+        return to_futures_data_versions(result.fetchall())
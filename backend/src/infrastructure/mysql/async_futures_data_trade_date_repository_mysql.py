@@ -0,0 +1,29 @@
+# src/infrastructure/mysql/async_futures_data_trade_date_repository_mysql.py
+from datetime import date
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.domain.entities.trade_date_entity import TradeDateEntity
+from src.domain.repositories.trade_date_repository import AsyncTradeDateRepository, TradeDatesVersion
+from src.infrastructure.mysql.futures_data_trade_date_repository_mysql import build_latest_trade_dates_query, build_trade_dates_query, build_trade_dates_version_query
+
+
+class AsyncFuturesDataTradeDateRepositoryMysql(AsyncTradeDateRepository):
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def fetch_trade_dates(self, asset_id: int, start_date: date | None, end_date: date | None, skip: int, limit: int, after: date | None = None) -> list[TradeDateEntity]:
+        query, params = build_trade_dates_query(asset_id, start_date, end_date, skip, limit, after)
+        result = await self.session.execute(query, params)
+
+        return [TradeDateEntity.from_db_row(row) for row in result.fetchall()]
+
+    async def fetch_trade_dates_version(self, asset_id: int, start_date: date | None, end_date: date | None) -> TradeDatesVersion:
+        query, params = build_trade_dates_version_query(asset_id, start_date, end_date)
+        result = await self.session.execute(query, params)
+        return TradeDatesVersion(*result.one())
+
+    async def fetch_latest_trade_dates(self, asset_id: int, limit: int) -> list[TradeDateEntity]:
+        query, params = build_latest_trade_dates_query(asset_id, limit)
+        result = await self.session.execute(query, params)
+        # fetch_trade_datesと同じく昇順で返す
+        return [TradeDateEntity.from_db_row(row) for row in reversed(result.fetchall())]
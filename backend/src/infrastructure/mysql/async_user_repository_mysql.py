@@ -0,0 +1,19 @@
+# src/infrastructure/mysql/async_user_repository_mysql.py
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.domain.repositories.user_repository import AsyncUserRepository
+from src.domain.value_objects.email import Email
+from src.infrastructure.database.models import User as UserModel
+
+
+class AsyncUserRepositoryMysql(AsyncUserRepository):
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def fetch_by_email(self, email: Email) -> UserModel:
+        result = await self.session.execute(select(UserModel).where(UserModel.email == email.email).limit(1))
+        user_db = result.scalars().first()
+        if user_db is None:
+            raise ValueError(f"User with email {email.email} not found")
+        return user_db
@@ -0,0 +1,81 @@
+# src/infrastructure/mysql/futures_curve_repository_mysql.py
+import math
+from datetime import date
+from sqlalchemy import Boolean, Date, DateTime, bindparam, insert, text
+from sqlalchemy.orm import Session
+
+from src.domain.logics.convert_price_columns import coalesce_price_values
+from src.domain.repositories.futures_curve_repository import FuturesCurveRepository
+from src.domain.value_objects.year_month import YearMonth
+from src.infrastructure.database.models import FuturesCurve as FuturesCurveModel
+from src.settings import logger
+
+
+class FuturesCurveRepositoryMysql(FuturesCurveRepository):
+    def __init__(self, session: Session):
+        self.session = session
+
+    def refresh(self, asset_id: int, trade_dates: list[date]) -> None:
+        """
+        指定された取引日のfutures_curveの行を、settlements / volume_oiの現在のデータから作り直して保存する。
+        清算値の文字列の変換とスプレッドの計算はここで行い、/futures-dataの読み込み時には行わない。
+        何度呼び出しても同じ結果になるため、データの保存後に毎回呼び出す。
+        """
+        trade_dates = sorted(set(trade_dates))
+        if not trade_dates:
+            return
+        try:
+            rows = self.session.execute(
+                text("""
+                SELECT
+                    s.trade_date,
+                    s.month,
+                    s.settle_value,
+                    s.settle,
+                    v.total_volume,
+                    v.at_close,
+                    v.is_final,
+                    s.last_updated
+                FROM settlements s
+                JOIN volume_oi v ON s.asset_id = v.asset_id AND s.trade_date = v.trade_date AND s.month = v.month
+                WHERE s.asset_id = :asset_id AND s.trade_date IN :trade_dates
+                ORDER BY s.trade_date, s.month
+                """).bindparams(bindparam('trade_dates', expanding=True)).columns(
+                    trade_date=Date, is_final=Boolean, last_updated=DateTime
+                ),
+                {'asset_id': asset_id, 'trade_dates': trade_dates}
+            ).fetchall()
+
+            # 数値カラムに値がない行 (バックフィル前など) は、清算値の文字列から変換する
+            settles = coalesce_price_values([row.settle_value for row in rows], [row.settle for row in rows]) if rows else []
+            values = []
+            previous_trade_date, previous_settle = None, math.nan
+            for row, settle in zip(rows, settles):
+                settle = float(settle)
+                # 同じ取引日の1つ前の限月との差。最初の限月と、どちらかの清算値がない場合は0 (add_settlement_spreadと同じ)
+                spread = settle - previous_settle if row.trade_date == previous_trade_date else math.nan
+                values.append({
+                    'asset_id': asset_id,
+                    'trade_date': row.trade_date,
+                    'month_key': YearMonth.from_db_format(row.month).to_month_key(),
+                    'settle': None if math.isnan(settle) else settle,
+                    'volume': row.total_volume,
+                    'open_interest': row.at_close,
+                    'settle_spread': 0.0 if math.isnan(spread) else spread,
+                    'is_final': bool(row.is_final),
+                    'last_updated': row.last_updated
+                })
+                previous_trade_date, previous_settle = row.trade_date, settle
+
+            # 削除された限月や取引日が残らないように、取引日単位で入れ替える
+            self.session.query(FuturesCurveModel).filter(
+                FuturesCurveModel.asset_id == asset_id,
+                FuturesCurveModel.trade_date.in_(trade_dates)
+            ).delete(synchronize_session=False)
+            if values:
+                self.session.execute(insert(FuturesCurveModel), values)
+            self.session.commit()
+        except Exception as e:
+            self.session.rollback()
+            logger.error(f"Error refreshing futures curve for asset {asset_id}: {e}")
+            raise e
@@ -1,15 +1,57 @@
 # src/infrastracture/repositories/futures_data_repository_mysql.py
 from datetime import date
-from sqlalchemy import text
+from sqlalchemy import Date, DateTime, Engine, Integer, Row, bindparam, text
 from sqlalchemy.orm import Session
+from typing import Callable, Iterable, Iterator
 
 from src.domain.entities.futures_data_entity import FuturesDataEntity
-from src.domain.repositories.futures_data_repository import FuturesDataRepository
+from src.domain.repositories.futures_data_repository import FuturesDataRepository, FuturesDataRow, FuturesDataVersion
+
+
+# 同期・非同期のリポジトリで共通のクエリ。資産名からidへの変換はAssetRegistryで行い、assetsテーブルは結合しない
+# futures_curveはスクレイパーの保存時に作成した読み取り用のテーブルのため、主キーの範囲スキャンのみで取得でき、結合や価格の変換は不要
+FETCH_BY_ASSET_AND_DATES_QUERY = text("""
+    SELECT
+        trade_date,
+        month_key,
+        settle,
+        volume,
+        open_interest,
+        settle_spread
+    FROM futures_curve
+    WHERE asset_id = :asset_id AND trade_date IN :trade_dates
+    ORDER BY trade_date, month_key
+    """).bindparams(bindparam('trade_dates', expanding=True))
+
+FETCH_VERSIONS_BY_ASSET_AND_DATES_QUERY = text("""
+    SELECT
+        trade_date,
+        COUNT(*) AS row_count,
+        SUM(CASE WHEN is_final THEN 1 ELSE 0 END) AS final_count,
+        MIN(last_updated) AS min_last_updated,
+        MAX(last_updated) AS max_last_updated
+    FROM futures_curve
+    WHERE asset_id = :asset_id AND trade_date IN :trade_dates
+    GROUP BY trade_date
+    ORDER BY trade_date
+    """).bindparams(bindparam('trade_dates', expanding=True)).columns(
+        trade_date=Date, row_count=Integer, final_count=Integer, min_last_updated=DateTime, max_last_updated=DateTime
+    )
+
+
+def to_futures_data_versions(rows: Iterable[Row]) -> list[FuturesDataVersion]:
+    # MySQLのSUMはDecimalを返すため、intに変換する
+    return [
+        FuturesDataVersion(trade_date, int(row_count), int(final_count), min_last_updated, max_last_updated)
+        for trade_date, row_count, final_count, min_last_updated, max_last_updated in rows
+    ]
 
 
 class FuturesDataRepositoryMysql(FuturesDataRepository):
-    def __init__(self, session: Session):
+    def __init__(self, session: Session, export_engine: Callable[[], Engine] | None = None):
         self.session = session
+        # stream_by_asset_and_date_rangeで使用するエンジンを返す関数。指定しない場合はsessionと同じエンジンを使用する
+        self.export_engine = export_engine
 
     def fetch_by_asset_and_date(self, asset_name: str, trade_date: date) -> list[FuturesDataEntity]:
         result = self.session.execute(
@@ -19,9 +61,10 @@ class FuturesDataRepositoryMysql(FuturesDataRepository):
                 a.name AS asset_name,
                 s.trade_date,
                 s.month,
-                s.settle,
+                s.settle_value,
                 v.total_volume AS volume,
-                v.at_close AS open_interest
+                v.at_close AS open_interest,
+                s.settle
             FROM assets a
             JOIN settlements s ON a.id = s.asset_id
             JOIN volume_oi v ON a.id = v.asset_id AND s.trade_date = v.trade_date AND s.month = v.month
@@ -30,4 +73,71 @@ class FuturesDataRepositoryMysql(FuturesDataRepository):
             {'asset_name': asset_name, 'trade_date': trade_date}
         ).fetchall()
 
-        return [FuturesDataEntity.from_db_row(row) for row in result]
+        return FuturesDataEntity.from_db_rows(list(result))
+
+    def fetch_by_asset_and_dates(self, asset_id: int, trade_dates: list[date]) -> list[FuturesDataRow]:
+        """
+        複数の取引日のデータを1回のクエリでまとめて取得します。
+        エンティティは生成せず、futures_curveからDataFrameの作成に必要なカラムの行データをtrade_date, month_keyの順で返します。
+        """
+        if not trade_dates:
+            return []
+
+        result = self.session.execute(
+            FETCH_BY_ASSET_AND_DATES_QUERY,
+            {'asset_id': asset_id, 'trade_dates': list(trade_dates)}
+        ).fetchall()
+
+        return [tuple(row) for row in result]
+
+    def fetch_versions_by_asset_and_dates(self, asset_id: int, trade_dates: list[date]) -> list[FuturesDataVersion]:
+        """
+        取引日ごとに、futures_curveの行数、出来高・建玉がFinalの行数、清算値のlast_updatedの最小値と最大値を取得します。
+        データ本体を取得せずに、確定済みかの判定やデータが変更されたかの判定に使用します。データがない取引日は結果に含まれません。
+        """
+        if not trade_dates:
+            return []
+
+        result = self.session.execute(
+            FETCH_VERSIONS_BY_ASSET_AND_DATES_QUERY,
+            {'asset_id': asset_id, 'trade_dates': list(trade_dates)}
+        ).fetchall()
+
+        return to_futures_data_versions(result)
+
+    def stream_by_asset_and_date_range(self, asset_id: int, start_date: date | None, end_date: date | None, batch_size: int) -> Iterator[list[FuturesDataRow]]:
+        """
+        期間内のデータを、サーバーサイドカーソルでbatch_size行ずつ取得します。
+        全ての行をメモリに読み込まないため、期間の長さによらず使用するメモリは一定です。
+
+        FastAPIのyieldを使う依存関係はレスポンスの送信前に終了するため、リクエストのセッションではなく、
+        export_engine (指定しない場合は同じエンジン) から作成した専用のセッションを、ジェネレーターが終了するまで使用します。
+        SELECTはレスポンスの送信が終わるまで続くため、export_engineには実行時間を制限しないプロファイルを指定します。
+        """
+        conditions = ["asset_id = :asset_id"]
+        params: dict[str, object] = {'asset_id': asset_id}
+        if start_date is not None:
+            conditions.append("trade_date >= :start_date")
+            params['start_date'] = start_date
+        if end_date is not None:
+            conditions.append("trade_date <= :end_date")
+            params['end_date'] = end_date
+
+        statement = text(f"""
+            SELECT
+                trade_date,
+                month_key,
+                settle,
+                volume,
+                open_interest,
+                settle_spread
+            FROM futures_curve
+            WHERE {' AND '.join(conditions)}
+            ORDER BY trade_date, month_key
+            """).columns(trade_date=Date).execution_options(stream_results=True, yield_per=batch_size)
+
+        bind = self.export_engine() if self.export_engine is not None else self.session.get_bind()
+        with Session(bind) as session:
+            result = session.execute(statement, params)
+            for partition in result.partitions():
+                yield [tuple(row) for row in partition]
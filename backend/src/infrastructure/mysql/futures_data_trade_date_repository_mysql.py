@@ -1,42 +1,96 @@
 #src/infrastructure/mysql/futures_data_trade_date_repository_mysql.py
 from datetime import date
 
-from sqlalchemy import text
+from sqlalchemy import Date, Integer, TextClause, text
 from sqlalchemy.orm import Session
 
 from src.domain.entities.trade_date_entity import TradeDateEntity
-from src.domain.repositories.trade_date_repository import TradeDateRepository
+from src.domain.repositories.trade_date_repository import TradeDateRepository, TradeDatesVersion
+
+
+def _date_range_condition(start_date: date | None, end_date: date | None, params: dict[str, str | int | date]) -> str:
+    # 期間の条件を返し、対応するパラメータをparamsに追加する
+    if start_date and end_date:
+        params['start_date'] = start_date
+        params['end_date'] = end_date
+        return "  AND t.trade_date BETWEEN :start_date AND :end_date"
+    elif start_date:
+        params['start_date'] = start_date
+        return "  AND t.trade_date >= :start_date"
+    elif end_date:
+        params['end_date'] = end_date
+        return "  AND t.trade_date <= :end_date"
+    return ""
+
+
+def build_trade_dates_query(asset_id: int, start_date: date | None, end_date: date | None, skip: int, limit: int, after: date | None = None) -> tuple[TextClause, dict[str, str | int | date]]:
+    """
+    取引日のサマリーから、清算値と出来高・建玉の両方がある取引日を昇順に取得するクエリとパラメータを返す。
+    afterを指定した場合はその取引日より後から取得するため、主キー (asset_id, trade_date) の範囲検索のみで次のページを取得できる。
+    同期・非同期のリポジトリで共通。
+    """
+    query = """
+        SELECT t.trade_date
+        FROM trade_date_summaries t
+        WHERE t.asset_id = :asset_id
+          AND t.has_futures_data
+    """
+    params: dict[str, str | int | date] = {'asset_id': asset_id, 'limit': limit, 'skip': skip}
+    query += _date_range_condition(start_date, end_date, params)
+    if after is not None:
+        params['after'] = after
+        query += "  AND t.trade_date > :after"
+
+    query += """
+        ORDER BY t.trade_date
+        LIMIT :limit OFFSET :skip
+    """
+    return text(query).columns(trade_date=Date), params
+
+
+def build_trade_dates_version_query(asset_id: int, start_date: date | None, end_date: date | None) -> tuple[TextClause, dict[str, str | int | date]]:
+    # 期間内の取引日の件数と最初・最後の取引日を取得するクエリとパラメータを返す。同期・非同期のリポジトリで共通
+    query = """
+        SELECT COUNT(*) AS count, MIN(t.trade_date) AS first_trade_date, MAX(t.trade_date) AS last_trade_date
+        FROM trade_date_summaries t
+        WHERE t.asset_id = :asset_id
+          AND t.has_futures_data
+    """
+    params: dict[str, str | int | date] = {'asset_id': asset_id}
+    query += _date_range_condition(start_date, end_date, params)
+    return text(query).columns(count=Integer, first_trade_date=Date, last_trade_date=Date), params
+
+
+def build_latest_trade_dates_query(asset_id: int, limit: int) -> tuple[TextClause, dict[str, str | int | date]]:
+    # 最新のlimit件の取引日を降順に取得するクエリとパラメータを返す。主キー (asset_id, trade_date) を逆順に読むため、件数に関わらずソートしない
+    query = """
+        SELECT t.trade_date
+        FROM trade_date_summaries t
+        WHERE t.asset_id = :asset_id
+          AND t.has_futures_data
+        ORDER BY t.trade_date DESC
+        LIMIT :limit
+    """
+    return text(query).columns(trade_date=Date), {'asset_id': asset_id, 'limit': limit}
 
 
 class FuturesDataTradeDateRepositoryMysql(TradeDateRepository):
     def __init__(self, session: Session):
         self.session = session
 
-    def fetch_trade_dates(self, asset_name: str, start_date: date | None, end_date: date | None, skip: int, limit: int) -> list[TradeDateEntity]:
-        query = """
-            SELECT DISTINCT s.trade_date
-            FROM settlements s
-            JOIN volume_oi v ON s.asset_id = v.asset_id AND s.trade_date = v.trade_date AND s.month = v.month
-            JOIN assets a ON s.asset_id = a.id
-            WHERE a.name = :asset_name
-        """
-        params: dict[str, str | int | date] = {'asset_name': asset_name, 'limit': limit, 'skip': skip}
-
-        if start_date and end_date:
-            query += "  AND s.trade_date BETWEEN :start_date AND :end_date"
-            params['start_date'] = start_date
-            params['end_date'] = end_date
-        elif start_date:
-            query += "  AND s.trade_date >= :start_date"
-            params['start_date'] = start_date
-        elif end_date:
-            query += "  AND s.trade_date <= :end_date"
-            params['end_date'] = end_date
-
-        query += """
-            ORDER BY s.trade_date
-            LIMIT :limit OFFSET :skip
-        """
-        result = self.session.execute(text(query), params).fetchall()
+    def fetch_trade_dates(self, asset_id: int, start_date: date | None, end_date: date | None, skip: int, limit: int, after: date | None = None) -> list[TradeDateEntity]:
+        query, params = build_trade_dates_query(asset_id, start_date, end_date, skip, limit, after)
+        result = self.session.execute(query, params).fetchall()
 
         return [TradeDateEntity.from_db_row(row) for row in result]
+
+    def fetch_trade_dates_version(self, asset_id: int, start_date: date | None, end_date: date | None) -> TradeDatesVersion:
+        query, params = build_trade_dates_version_query(asset_id, start_date, end_date)
+        row = self.session.execute(query, params).one()
+        return TradeDatesVersion(*row)
+
+    def fetch_latest_trade_dates(self, asset_id: int, limit: int) -> list[TradeDateEntity]:
+        query, params = build_latest_trade_dates_query(asset_id, limit)
+        result = self.session.execute(query, params).fetchall()
+        # fetch_trade_datesと同じく昇順で返す
+        return [TradeDateEntity.from_db_row(row) for row in reversed(result)]
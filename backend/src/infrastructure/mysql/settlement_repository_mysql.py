@@ -1,8 +1,12 @@
 # src/infrastructure/repositories/settlement_repository_mysql.py
+import math
+from sqlalchemy import func, insert
+from sqlalchemy.dialects.mysql import insert as mysql_insert
 from sqlalchemy.orm import Session
 from datetime import date, datetime
 
 from src.domain.entities.settlement_entity import SettlementEntity
+from src.domain.logics.convert_price_columns import PRICE_COLUMNS, convert_price_series
 from src.domain.repositories.settlement_repository import SettlementRepository
 from src.domain.value_objects.trade_date import TradeDate
 from src.infrastructure.database.models import Asset as AssetModel
@@ -10,6 +14,44 @@ from src.infrastructure.database.models import Settlement as SettlementModel
 from src.settings import logger
 
 
+# upsert時に一意制約 (asset_id, trade_date, month) が重複した場合に更新するカラム
+_UPSERT_UPDATE_COLUMNS = [
+    'open', 'high', 'low', 'last', 'change', 'settle', 'est_volume', 'prior_day_oi', 'last_updated',
+    *(f'{column}_value' for column in PRICE_COLUMNS)
+]
+
+
+def _price_values(settlement_entities: list[SettlementEntity]) -> list[dict[str, float | None]]:
+    # 価格の文字列をカラムごとにまとめて数値に変換し、*_valueカラムの値を作成する
+    values: list[dict[str, float | None]] = [{} for _ in settlement_entities]
+    for column in PRICE_COLUMNS:
+        prices, _ = convert_price_series([getattr(settlement_entity, column) for settlement_entity in settlement_entities])
+        for row, price in zip(values, prices):
+            row[f'{column}_value'] = None if math.isnan(price) else float(price)
+    return values
+
+
+def _to_rows(settlement_entities: list[SettlementEntity]) -> list[dict[str, object]]:
+    return [
+        {
+            'asset_id': settlement_entity.asset_id,
+            'trade_date': settlement_entity.trade_date.to_date(),
+            'month': settlement_entity.month.to_db_format(),
+            'open': settlement_entity.open,
+            'high': settlement_entity.high,
+            'low': settlement_entity.low,
+            'last': settlement_entity.last,
+            'change': settlement_entity.change,
+            'settle': settlement_entity.settle,
+            'est_volume': settlement_entity.est_volume,
+            'prior_day_oi': settlement_entity.prior_day_oi,
+            'last_updated': settlement_entity.last_updated,
+            **price_values
+        }
+        for settlement_entity, price_values in zip(settlement_entities, _price_values(settlement_entities))
+    ]
+
+
 class SettlementRepositoryMysql(SettlementRepository):
     def __init__(self, session: Session):
         self.session = session
@@ -28,7 +70,8 @@ class SettlementRepositoryMysql(SettlementRepository):
                 settle=settlement_entity.settle,
                 est_volume=settlement_entity.est_volume,
                 prior_day_oi=settlement_entity.prior_day_oi,
-                last_updated=settlement_entity.last_updated
+                last_updated=settlement_entity.last_updated,
+                **_price_values([settlement_entity])[0]
             )
             self.session.add(settlement_model)
             self.session.commit()
@@ -39,6 +82,46 @@ class SettlementRepositoryMysql(SettlementRepository):
             raise e
 
 
+    def create_many(self, settlement_entities: list[SettlementEntity]) -> int:
+        """
+        複数の決済データを1回のINSERT文 (executemany) で保存し、1回だけコミットする。
+        途中でエラーが発生した場合は全件をロールバックする。
+
+        :return: 保存した件数
+        """
+        if not settlement_entities:
+            return 0
+        try:
+            self.session.execute(insert(SettlementModel), _to_rows(settlement_entities))
+            self.session.commit()
+            return len(settlement_entities)
+        except Exception as e:
+            self.session.rollback()
+            logger.error(f"Error saving settlements: {e}")
+            raise e
+
+
+    def upsert_many(self, settlement_entities: list[SettlementEntity]) -> int:
+        """
+        複数の決済データを1回の INSERT ... ON DUPLICATE KEY UPDATE で保存し、1回だけコミットする。
+        一意制約 _asset_date_month_uc に一致する行は更新し、一致しない行は追加する。
+
+        :return: 保存した件数
+        """
+        if not settlement_entities:
+            return 0
+        try:
+            stmt = mysql_insert(SettlementModel).values(_to_rows(settlement_entities))
+            stmt = stmt.on_duplicate_key_update({column: stmt.inserted[column] for column in _UPSERT_UPDATE_COLUMNS})
+            self.session.execute(stmt)
+            self.session.commit()
+            return len(settlement_entities)
+        except Exception as e:
+            self.session.rollback()
+            logger.error(f"Error upserting settlements: {e}")
+            raise e
+
+
     def update(self, settlement_entity: SettlementEntity) -> SettlementModel:
         try:
             settlement_model = self.session.query(SettlementModel).filter(
@@ -56,6 +139,8 @@ class SettlementRepositoryMysql(SettlementRepository):
                 settlement_model.est_volume = settlement_entity.est_volume
                 settlement_model.prior_day_oi = settlement_entity.prior_day_oi
                 settlement_model.last_updated = settlement_entity.last_updated
+                for column, value in _price_values([settlement_entity])[0].items():
+                    setattr(settlement_model, column, value)
                 self.session.commit()
                 logger.info(f"Updated settlement data for asset {settlement_entity.asset_id} on {settlement_entity.trade_date}.")
                 return settlement_model
@@ -80,6 +165,16 @@ class SettlementRepositoryMysql(SettlementRepository):
             return None
 
 
+    def fetch_last_updated_by_asset(self, asset_id: int) -> dict[date, datetime]:
+        """指定されたasset_idの全取引日について、last_updatedを1回のクエリで取得する"""
+        # 1つの取引日に古いlast_updatedの行が残っている場合は最新でないと判定できるよう、最小値を採用する
+        rows = self.session.query(SettlementModel.trade_date, func.min(SettlementModel.last_updated)) \
+            .filter(SettlementModel.asset_id == asset_id) \
+            .group_by(SettlementModel.trade_date) \
+            .all()
+        return {trade_date: last_updated for trade_date, last_updated in rows}
+
+
     def fetch_settlements_by_name_and_date(self, asset_name: str, trade_date: date) -> list[SettlementEntity]:
         """指定されたasset_nameとtrade_dateに一致する決済データを取得する"""
         settlements = self.session.query(SettlementModel) \
@@ -0,0 +1,71 @@
+# src/infrastructure/mysql/trade_date_summary_repository_mysql.py
+from datetime import date
+from sqlalchemy import Boolean, Date, bindparam, func, text
+from sqlalchemy.dialects.mysql import insert as mysql_insert
+from sqlalchemy.orm import Session
+
+from src.domain.repositories.trade_date_summary_repository import TradeDateSummaryRepository
+from src.infrastructure.database.models import TradeDateSummary as TradeDateSummaryModel
+from src.settings import logger
+
+_SUMMARY_COLUMNS = ['has_settlement', 'has_volume_oi', 'has_futures_data', 'is_final']
+
+
+class TradeDateSummaryRepositoryMysql(TradeDateSummaryRepository):
+    def __init__(self, session: Session):
+        self.session = session
+
+    def refresh(self, asset_id: int, trade_dates: list[date]) -> None:
+        """
+        指定された取引日のサマリーを、settlements / volume_oiの現在のデータから再計算して保存する。
+        何度呼び出しても同じ結果になるため、データの保存後に毎回呼び出す。
+        """
+        trade_dates = sorted(set(trade_dates))
+        if not trade_dates:
+            return
+        try:
+            # 指定された取引日ごとに、各テーブルのデータの有無と、出来高・建玉が全てFinalかを取得する
+            rows = self.session.execute(
+                text("""
+                SELECT
+                    d.trade_date,
+                    EXISTS (SELECT 1 FROM settlements s WHERE s.asset_id = :asset_id AND s.trade_date = d.trade_date) AS has_settlement,
+                    EXISTS (SELECT 1 FROM volume_oi v WHERE v.asset_id = :asset_id AND v.trade_date = d.trade_date) AS has_volume_oi,
+                    EXISTS (
+                        SELECT 1 FROM settlements s
+                        JOIN volume_oi v ON s.asset_id = v.asset_id AND s.trade_date = v.trade_date AND s.month = v.month
+                        WHERE s.asset_id = :asset_id AND s.trade_date = d.trade_date
+                    ) AS has_futures_data,
+                    COALESCE((SELECT MIN(v.is_final) FROM volume_oi v WHERE v.asset_id = :asset_id AND v.trade_date = d.trade_date), 0) AS is_final
+                FROM (
+                    SELECT trade_date FROM settlements WHERE asset_id = :asset_id AND trade_date IN :trade_dates
+                    UNION
+                    SELECT trade_date FROM volume_oi WHERE asset_id = :asset_id AND trade_date IN :trade_dates
+                ) d
+                """).bindparams(bindparam('trade_dates', expanding=True)).columns(
+                    trade_date=Date, has_settlement=Boolean, has_volume_oi=Boolean, has_futures_data=Boolean, is_final=Boolean
+                ),
+                {'asset_id': asset_id, 'trade_dates': trade_dates}
+            ).fetchall()
+
+            values = [
+                {'asset_id': asset_id, 'trade_date': row.trade_date, **{column: bool(getattr(row, column)) for column in _SUMMARY_COLUMNS}}
+                for row in rows
+            ]
+            # データが全て削除された取引日は、サマリーからも削除する
+            deleted_dates = set(trade_dates) - {row.trade_date for row in rows}
+            if deleted_dates:
+                self.session.query(TradeDateSummaryModel).filter(
+                    TradeDateSummaryModel.asset_id == asset_id,
+                    TradeDateSummaryModel.trade_date.in_(deleted_dates)
+                ).delete(synchronize_session=False)
+            if values:
+                stmt = mysql_insert(TradeDateSummaryModel).values(values)
+                # ON DUPLICATE KEY UPDATEではonupdateが適用されないため、updated_atも明示的に更新する
+                stmt = stmt.on_duplicate_key_update({**{column: stmt.inserted[column] for column in _SUMMARY_COLUMNS}, 'updated_at': func.now()})
+                self.session.execute(stmt)
+            self.session.commit()
+        except Exception as e:
+            self.session.rollback()
+            logger.error(f"Error refreshing trade date summary for asset {asset_id}: {e}")
+            raise e
@@ -1,4 +1,7 @@
 # src/infrastructure/repositories/volume_oi_repository_mysql.py
+from datetime import date
+from sqlalchemy import func
+from sqlalchemy.dialects.mysql import insert as mysql_insert
 from sqlalchemy.orm import Session
 
 from src.domain.entities.volume_oi_entity import VolumeOIEntity
@@ -7,6 +10,30 @@ from src.domain.value_objects.trade_date import TradeDate
 from src.infrastructure.database.models import VolumeOI as VolumeOIModel
 from src.settings import logger
 
+# upsert時に一意制約 (asset_id, trade_date, month) が重複した場合に更新するカラム
+_UPSERT_UPDATE_COLUMNS = ['globex', 'open_outcry', 'clear_port', 'total_volume', 'block_trades', 'efp', 'efr', 'tas', 'deliveries', 'at_close', 'change', 'is_final']
+
+
+def _to_row(volume_oi_entity: VolumeOIEntity) -> dict[str, object]:
+    return {
+        'asset_id': volume_oi_entity.asset_id,
+        'trade_date': volume_oi_entity.trade_date.to_date(),
+        'month': volume_oi_entity.month.to_db_format(),
+        'globex': volume_oi_entity.globex,
+        'open_outcry': volume_oi_entity.open_outcry,
+        'clear_port': volume_oi_entity.clear_port,
+        'total_volume': volume_oi_entity.total_volume,
+        'block_trades': volume_oi_entity.block_trades,
+        'efp': volume_oi_entity.efp,
+        'efr': volume_oi_entity.efr,
+        'tas': volume_oi_entity.tas,
+        'deliveries': volume_oi_entity.deliveries,
+        'at_close': volume_oi_entity.at_close,
+        'change': volume_oi_entity.change,
+        'is_final': volume_oi_entity.is_final
+    }
+
+
 class VolumeOIRepositoryMysql(VolumeOIRepository):
     def __init__(self, session: Session):
         self.session = session
@@ -38,6 +65,26 @@ class VolumeOIRepositoryMysql(VolumeOIRepository):
             logger.error(f"Error saving volume and open interest data: {e}")
             raise e
 
+    def upsert_many(self, volume_oi_entities: list[VolumeOIEntity]) -> int:
+        """
+        複数の出来高・建玉データを1回の INSERT ... ON DUPLICATE KEY UPDATE で保存し、1回だけコミットする。
+        一意制約 _asset_date_month_uc に一致する行は更新し、一致しない行は追加する。
+
+        :return: 保存した件数
+        """
+        if not volume_oi_entities:
+            return 0
+        try:
+            stmt = mysql_insert(VolumeOIModel).values([_to_row(volume_oi_entity) for volume_oi_entity in volume_oi_entities])
+            stmt = stmt.on_duplicate_key_update({column: stmt.inserted[column] for column in _UPSERT_UPDATE_COLUMNS})
+            self.session.execute(stmt)
+            self.session.commit()
+            return len(volume_oi_entities)
+        except Exception as e:
+            self.session.rollback()
+            logger.error(f"Error upserting volume and open interest data: {e}")
+            raise e
+
     def update(self, volume_oi_entity: VolumeOIEntity) -> VolumeOIModel:
         try:
             volume_oi_model = self.session.query(VolumeOIModel).filter(
@@ -78,3 +125,12 @@ class VolumeOIRepositoryMysql(VolumeOIRepository):
             return volume_oi_model.is_final
         else:
             return None
+
+    def fetch_is_final_by_asset(self, asset_id: int) -> dict[date, bool]:
+        """指定されたasset_idの全取引日について、is_finalを1回のクエリで取得する"""
+        # 全ての限月がFinalの場合のみFinalとみなす
+        rows = self.session.query(VolumeOIModel.trade_date, func.min(VolumeOIModel.is_final)) \
+            .filter(VolumeOIModel.asset_id == asset_id) \
+            .group_by(VolumeOIModel.trade_date) \
+            .all()
+        return {trade_date: bool(is_final) for trade_date, is_final in rows}
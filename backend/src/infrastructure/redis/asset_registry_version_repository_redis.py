@@ -0,0 +1,40 @@
+# src/infrastructure/redis/asset_registry_version_repository_redis.py
+import os
+import redis
+
+from src.domain.repositories.asset_registry_version_repository import AssetRegistryVersionRepository
+from src.settings import logger
+
+
+VERSION_KEY = 'assets:registry-version'
+
+
+class AssetRegistryVersionRepositoryRedis(AssetRegistryVersionRepository):
+    """
+    資産の一覧のバージョンをRedisのカウンターとして保持し、APIのワーカーやスクレイパーなどのプロセス間で共有する。
+    Redisに接続できない場合はNoneを返し、AssetRegistryは一定時間ごとの読み込み直しで代替する。
+    """
+    def __init__(
+        self,
+        redis_host: str = os.getenv('REDIS_HOST', 'localhost'),
+        redis_port: int = int(os.getenv('REDIS_PORT', 6379)),
+        redis_db: int = int(os.getenv('REDIS_DB', 0))
+    ):
+        self.redis_client = redis.StrictRedis(host=redis_host, port=redis_port, db=redis_db)
+
+
+    def fetch_version(self) -> int | None:
+        try:
+            version = self.redis_client.get(VERSION_KEY)
+        except redis.RedisError as e:
+            logger.warning(f"Failed to fetch asset registry version: {e}")
+            return None
+        # 一度も資産が変更されていない場合はキーがない
+        return int(version) if version is not None else 0 # type: ignore
+
+
+    def increment_version(self) -> None:
+        try:
+            self.redis_client.incr(VERSION_KEY)
+        except redis.RedisError as e:
+            logger.warning(f"Failed to increment asset registry version: {e}")
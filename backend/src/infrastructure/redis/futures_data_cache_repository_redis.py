@@ -0,0 +1,118 @@
+# src/infrastructure/redis/futures_data_cache_repository_redis.py
+import os
+import redis
+from datetime import date
+
+from src.domain.repositories.futures_data_cache_repository import FuturesDataCacheEntry, FuturesDataCacheRepository
+from src.infrastructure.cache.asset_registry import AssetRegistry
+from src.settings import logger
+
+
+KEY_PREFIX = 'futures-data'
+STATS_KEY = f'{KEY_PREFIX}:stats'
+
+
+def make_cache_key(asset_name: str, trade_dates: list[date], response_format: str) -> str:
+    # 取引日の順序や重複が異なるリクエストでも同じキーになるようにする
+    return f"{KEY_PREFIX}:payload:{response_format}:{asset_name}:{','.join(sorted({trade_date.isoformat() for trade_date in trade_dates}))}"
+
+
+def make_index_key(asset_name: str, trade_date: date) -> str:
+    # 資産・取引日ごとに、その取引日を含むキャッシュのキーを保持するSET
+    return f"{KEY_PREFIX}:index:{asset_name}:{trade_date.isoformat()}"
+
+
+def make_index_pattern(trade_date: date) -> str:
+    # 取引日を含む全ての資産のインデックスに一致するパターン
+    return f"{KEY_PREFIX}:index:*:{trade_date.isoformat()}"
+
+
+class FuturesDataCacheRepositoryRedis(FuturesDataCacheRepository):
+    """
+    /futures-dataのレスポンスをシリアライズ済みのバイト列のまま、フォーマットごとにRedisに保存する。
+    確定済みの取引日のみのレスポンスは期限なしで、速報値を含むレスポンスはexpiration秒で期限切れになるように保存する。
+    Redisに接続できない場合もAPIは失敗させず、キャッシュなしとして扱う。
+
+    スクレイパーはasset_idのみを扱うため、無効化時はasset_registryで資産名に変換し、その資産のキャッシュのみを削除する。
+    資産名が分からない場合は、同じ取引日を含む全ての資産のキャッシュを削除する。
+    """
+    def __init__(
+        self,
+        redis_host: str = os.getenv('REDIS_HOST', 'localhost'),
+        redis_port: int = int(os.getenv('REDIS_PORT', 6379)),
+        redis_db: int = int(os.getenv('REDIS_DB', 0)),
+        expiration: int = int(os.getenv('FUTURES_DATA_CACHE_EXPIRATION', 300)),
+        asset_registry: AssetRegistry | None = None
+    ):
+        self.redis_client = redis.StrictRedis(host=redis_host, port=redis_port, db=redis_db)
+        self.expiration = expiration
+        self.asset_registry = asset_registry
+
+
+    def fetch(self, asset_name: str, trade_dates: list[date], response_format: str) -> FuturesDataCacheEntry | None:
+        try:
+            cached: dict[bytes, bytes] = self.redis_client.hgetall(make_cache_key(asset_name, trade_dates, response_format)) # type: ignore
+            # 必要なフィールドがない古い形式のキャッシュはミスとして扱い、上書きさせる
+            is_hit = all(field in cached for field in (b'payload', b'is_final', b'etag'))
+            self.redis_client.hincrby(STATS_KEY, 'hits' if is_hit else 'misses', 1)
+        except redis.RedisError as e:
+            logger.warning(f"Failed to fetch futures data cache: {e}")
+            return None
+        if not is_hit:
+            return None
+        return FuturesDataCacheEntry(
+            payload=cached[b'payload'],
+            is_final=cached[b'is_final'] == b'1',
+            etag=cached[b'etag'].decode('utf-8')
+        )
+
+
+    def save(self, asset_name: str, trade_dates: list[date], response_format: str, entry: FuturesDataCacheEntry) -> None:
+        key = make_cache_key(asset_name, trade_dates, response_format)
+        try:
+            pipeline = self.redis_client.pipeline()
+            pipeline.delete(key)
+            pipeline.hset(key, mapping={'payload': entry.payload, 'is_final': int(entry.is_final), 'etag': entry.etag})
+            if not entry.is_final:
+                pipeline.expire(key, self.expiration)
+            # 確定済みのキャッシュも再スクレイピング時に無効化できるよう、インデックスは期限なしで保持する
+            for trade_date in set(trade_dates):
+                pipeline.sadd(make_index_key(asset_name, trade_date), key)
+            pipeline.execute()
+        except redis.RedisError as e:
+            logger.warning(f"Failed to save futures data cache: {e}")
+
+
+    def _asset_name(self, asset_id: int | None) -> str | None:
+        # 読み込み済みの資産の一覧のみを参照し、DBには問い合わせない
+        if self.asset_registry is None or asset_id is None:
+            return None
+        asset_map = self.asset_registry.peek()
+        return asset_map.names_by_id.get(asset_id) if asset_map is not None else None
+
+
+    def invalidate(self, trade_date: date, asset_id: int | None = None) -> None:
+        asset_name = self._asset_name(asset_id)
+        try:
+            if asset_name is not None:
+                index_keys: list[bytes | str] = [make_index_key(asset_name, trade_date)]
+            else:
+                index_keys = list(self.redis_client.scan_iter(match=make_index_pattern(trade_date)))
+            keys: set[bytes] = set()
+            for index_key in index_keys:
+                keys |= self.redis_client.smembers(index_key) # type: ignore
+            if index_keys:
+                self.redis_client.delete(*index_keys, *keys)
+        except redis.RedisError as e:
+            logger.warning(f"Failed to invalidate futures data cache for {trade_date}, asset: {asset_name or 'all'}: {e}")
+            return
+        logger.info(f"Futures data cache invalidated for {trade_date}, asset: {asset_name or 'all'}. ({len(keys)} keys)")
+
+
+    def fetch_stats(self) -> dict[str, int]:
+        try:
+            stats: dict[bytes, bytes] = self.redis_client.hgetall(STATS_KEY) # type: ignore
+        except redis.RedisError as e:
+            logger.warning(f"Failed to fetch futures data cache stats: {e}")
+            stats = {}
+        return {name: int(stats.get(name.encode('utf-8'), 0)) for name in ('hits', 'misses')}
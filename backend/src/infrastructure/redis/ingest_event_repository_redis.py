@@ -0,0 +1,78 @@
+# src/infrastructure/redis/ingest_event_repository_redis.py
+import os
+import redis
+from datetime import date
+
+from src.domain.repositories.ingest_event_repository import IngestEvent, IngestEventRepository
+from src.settings import logger
+
+
+STREAM_KEY = 'ingest-events'
+# イベントがない場合に、最初から読み込むためのid
+FIRST_ID = '0-0'
+
+
+def _decode_event(fields: dict[bytes, bytes]) -> IngestEvent:
+    return IngestEvent(
+        asset_id=int(fields[b'asset_id']),
+        trade_date=date.fromisoformat(fields[b'trade_date'].decode('utf-8')),
+        kind=fields[b'kind'].decode('utf-8'),
+        is_final=fields[b'is_final'] == b'1'
+    )
+
+
+class IngestEventRepositoryRedis(IngestEventRepository):
+    """
+    イベントをRedis Streamsに保存する。pub/subと異なり、購読側が再接続した場合も読み込んだ位置から再開できるため、イベントを取りこぼさない。
+    ストリームはおよそmax_length件に切り詰める。Redisに接続できない場合、発行は警告のみでスクレイピングを失敗させない。
+    """
+    def __init__(
+        self,
+        redis_host: str = os.getenv('REDIS_HOST', 'localhost'),
+        redis_port: int = int(os.getenv('REDIS_PORT', 6379)),
+        redis_db: int = int(os.getenv('REDIS_DB', 0)),
+        max_length: int = int(os.getenv('INGEST_EVENTS_MAX_LENGTH', 10000))
+    ):
+        self.redis_client = redis.StrictRedis(host=redis_host, port=redis_port, db=redis_db)
+        self.max_length = max_length
+
+
+    def publish(self, event: IngestEvent) -> None:
+        fields = {
+            'asset_id': event.asset_id,
+            'trade_date': event.trade_date.isoformat(),
+            'kind': event.kind,
+            'is_final': int(event.is_final)
+        }
+        try:
+            self.redis_client.xadd(STREAM_KEY, fields, maxlen=self.max_length, approximate=True) # type: ignore
+        except redis.RedisError as e:
+            logger.warning(f"Failed to publish ingest event {event}: {e}")
+
+
+    def fetch_last_id(self) -> str | None:
+        try:
+            entries = self.redis_client.xrevrange(STREAM_KEY, count=1)
+        except redis.RedisError as e:
+            logger.warning(f"Failed to fetch the last ingest event id: {e}")
+            return None
+        return entries[0][0].decode('utf-8') if entries else FIRST_ID # type: ignore
+
+
+    def read(self, last_id: str, block_ms: int) -> tuple[str, list[IngestEvent]] | None:
+        try:
+            streams = self.redis_client.xread({STREAM_KEY: last_id}, block=block_ms)
+        except redis.RedisError as e:
+            logger.warning(f"Failed to read ingest events: {e}")
+            return None
+
+        events: list[IngestEvent] = []
+        for _, entries in streams or []: # type: ignore
+            for event_id, fields in entries:
+                last_id = event_id.decode('utf-8')
+                try:
+                    events.append(_decode_event(fields))
+                except (KeyError, ValueError) as e:
+                    # 形式が異なるイベントは読み飛ばす。位置は進めるため、同じイベントを読み続けない
+                    logger.warning(f"Skipping malformed ingest event {last_id}: {e}")
+        return last_id, events
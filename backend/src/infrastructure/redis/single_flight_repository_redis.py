@@ -0,0 +1,81 @@
+# src/infrastructure/redis/single_flight_repository_redis.py
+import os
+import redis
+import uuid
+
+from src.domain.repositories.single_flight_repository import SingleFlightRepository
+from src.settings import logger
+
+
+KEY_PREFIX = 'single-flight'
+
+
+def _lock_key(key: str) -> str:
+    return f"{KEY_PREFIX}:lock:{key}"
+
+
+def _result_key(key: str) -> str:
+    return f"{KEY_PREFIX}:result:{key}"
+
+
+class SingleFlightRepositoryRedis(SingleFlightRepository):
+    """
+    ロックはSET NX PXで取得し、期限切れで他のワーカーに取得されたロックを解放しないように、トークンが一致する場合のみ削除する。
+    Redisに接続できない場合は、ロックなし (各ワーカーが個別に実行する) として扱う。
+    """
+    def __init__(
+        self,
+        redis_host: str = os.getenv('REDIS_HOST', 'localhost'),
+        redis_port: int = int(os.getenv('REDIS_PORT', 6379)),
+        redis_db: int = int(os.getenv('REDIS_DB', 0))
+    ):
+        self.redis_client = redis.StrictRedis(host=redis_host, port=redis_port, db=redis_db)
+
+
+    def acquire(self, key: str, ttl_ms: int) -> str | None:
+        token = uuid.uuid4().hex
+        try:
+            if not self.redis_client.set(_lock_key(key), token, nx=True, px=ttl_ms):
+                return None
+            # 前回の実行の結果を、今回の実行を待つワーカーに返さないように削除する
+            self.redis_client.delete(_result_key(key))
+        except redis.RedisError as e:
+            logger.warning(f"Failed to acquire single-flight lock: {e}")
+            return None
+        return token
+
+
+    def release(self, key: str, token: str) -> None:
+        try:
+            with self.redis_client.pipeline() as pipe:
+                pipe.watch(_lock_key(key))
+                if pipe.get(_lock_key(key)) == token.encode('utf-8'):
+                    pipe.multi()
+                    pipe.delete(_lock_key(key))
+                    pipe.execute()
+                else:
+                    pipe.unwatch()
+        except redis.WatchError:
+            # 確認から削除までの間に期限切れになり、他のワーカーがロックを取得した
+            pass
+        except redis.RedisError as e:
+            logger.warning(f"Failed to release single-flight lock: {e}")
+
+
+    def save_result(self, key: str, payload: bytes, ttl_ms: int) -> None:
+        try:
+            self.redis_client.set(_result_key(key), payload, px=ttl_ms)
+        except redis.RedisError as e:
+            logger.warning(f"Failed to save single-flight result: {e}")
+
+
+    def poll_result(self, key: str) -> tuple[bytes | None, bool]:
+        try:
+            pipe = self.redis_client.pipeline()
+            pipe.get(_result_key(key))
+            pipe.exists(_lock_key(key))
+            payload, running = pipe.execute()
+        except redis.RedisError as e:
+            logger.warning(f"Failed to poll single-flight result: {e}")
+            return None, False
+        return payload, bool(running)
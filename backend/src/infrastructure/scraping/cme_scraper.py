@@ -1,15 +1,11 @@
 # src/infrastructure/scraping/cme_scraper.py
+from __future__ import annotations
+
 import json
 import os
-import pandas as pd
-import requests
-import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
-from typing import Generator
-
-from bs4 import BeautifulSoup
-from selenium.common.exceptions import NoSuchElementException
-from selenium.webdriver.chrome.webdriver import WebDriver
+from typing import TYPE_CHECKING, Callable, TypeVar
 
 from src.domain.helpers.path import get_project_root
 from src.domain.logics.date_time_utilities import parse_datetime
@@ -17,43 +13,24 @@ from src.domain.services.asset_service import AssetService
 from src.domain.services.settlement_service import SettlementService
 from src.domain.services.volume_oi_service import VolumeOIService
 from src.infrastructure.scraping.get_element import GetElement
+from src.infrastructure.scraping.table_parser import TABLE_FRAGMENT_ROW_XPATH, parse_settlements_table, parse_volume_oi_table
+from src.infrastructure.scraping.web_driver_pool import WebDriverPool
 from src.infrastructure.scraping.web_driver_setup import WebDriverSetup
 from src.settings import logger
 
+# pandas・seleniumは型ヒントのみで使用する。実際の読み込みは、スクレイピングの処理を実行する各モジュールで行う
+if TYPE_CHECKING:
+    import pandas as pd
+    from selenium.webdriver.chrome.webdriver import WebDriver
+
 
-def _parse_settlements_table(soup: BeautifulSoup) -> Generator[dict[str, str], None, None]:
-    trs = soup.select('.main-table-wrapper tbody > tr')
-    for tr in trs:
-        yield {
-            'month': tr.select_one('td:first-of-type').text,
-            'open': tr.select_one('td:nth-of-type(2)').text,
-            'high': tr.select_one('td:nth-of-type(3)').text,
-            'low': tr.select_one('td:nth-of-type(4)').text,
-            'last': tr.select_one('td:nth-of-type(5)').text,
-            'change': tr.select_one('td:nth-of-type(6)').text,
-            'settle': tr.select_one('td:nth-of-type(7)').text,
-            'est_volume': tr.select_one('td:nth-of-type(8)').text,
-            'prior_day_oi': tr.select_one('td:last-of-type').text
-        }
-
-
-def _parse_volume_oi_table(soup: BeautifulSoup) -> Generator[dict[str, str], None, None]:
-    trs = soup.select('.multiline .main-table-wrapper tbody > tr')
-    for tr in trs:
-        yield {
-            'month': tr.select_one('td:first-of-type').text,
-            'globex': tr.select_one('td:nth-of-type(2)').text,
-            'open_outcry': tr.select_one('td:nth-of-type(3)').text,
-            'clear_port': tr.select_one('td:nth-of-type(4)').text,
-            'total_volume': tr.select_one('td:nth-of-type(5)').text,
-            'block_trades': tr.select_one('td:nth-of-type(6)').text,
-            'efp': tr.select_one('td:nth-of-type(7)').text,
-            'efr': tr.select_one('td:nth-of-type(8)').text,
-            'tas': tr.select_one('td:nth-of-type(9)').text,
-            'deliveries': tr.select_one('td:nth-of-type(10)').text,
-            'at_close': tr.select_one('td:nth-of-type(11)').text,
-            'change': tr.select_one('td:last-of-type').text
-        }
+_ServiceT = TypeVar('_ServiceT', SettlementService, VolumeOIService)
+
+_SETTLEMENT_TABLE_WRAPPER_SELECTOR = '.main-table-wrapper'
+_SETTLEMENT_TABLE_SELECTOR = f'{_SETTLEMENT_TABLE_WRAPPER_SELECTOR} tbody'
+_VOLUME_OI_TABLE_WRAPPER_SELECTOR = '.multiline .main-table-wrapper'
+_VOLUME_OI_TABLE_SELECTOR = f'{_VOLUME_OI_TABLE_WRAPPER_SELECTOR} tbody'
+_LAST_UPDATED_SELECTOR = '.data-information > .timestamp > div'
 
 
 def _fetch_asset_ids_urls(table_name: str, asset_service: AssetService) -> dict[int, str]:
@@ -74,63 +51,163 @@ def _fetch_asset_ids_urls(table_name: str, asset_service: AssetService) -> dict[
 def _get_downloadable_dates_from_settlement(driver: WebDriver, get_element: GetElement) -> list[str]:
     trade_date_button = get_element.xpath('//label[contains(text(), "Trade date")]/parent::div/div/button')
     driver.execute_script("arguments[0].click();", trade_date_button)  # type: ignore
-    trade_dates = get_element.css_all_elements('.trade-date-row .simplebar-content .link')
-    return [trade_date.text for trade_date in trade_dates]
+    texts = get_element.read_texts({'trade_dates': '.trade-date-row .simplebar-content .link'}, require='trade_dates')
+    return texts['trade_dates']
 
 
 def _get_downloadable_dates_from_volume_oi(driver: WebDriver, get_element: GetElement) -> list[str]:
     trade_date_button = get_element.xpath('//label[contains(text(), "Trade Date")]/parent::div/div/button')
     driver.execute_script("arguments[0].click();", trade_date_button)  # type: ignore
-    trade_dates = get_element.xpath_all_elements('//label[contains(text(), "Trade Date")]/parent::div//a')
-    return [trade_date.text for trade_date in trade_dates]
+    texts = get_element.read_texts({'trade_dates': '//label[contains(text(), "Trade Date")]/parent::div//a'}, require='trade_dates')
+    return texts['trade_dates']
 
 
 def _settlement_last_updated_from_web(driver: WebDriver, get_element: GetElement, trade_date: str) -> datetime:
+    previous_last_updated = get_element.content_signature(_LAST_UPDATED_SELECTOR)
     date_button = get_element.xpath(f'//a[contains(text(), "{trade_date}")]')
     driver.execute_script("arguments[0].click();", date_button)  # type: ignore
-    time.sleep(3)
+    get_element.wait_for_content_change(_LAST_UPDATED_SELECTOR, previous_last_updated)
 
-    last_updated_element = get_element.css('.data-information > .timestamp > div')
-    last_updated_text = last_updated_element.text.replace('Last Updated ', '')
+    texts = get_element.read_texts({'last_updated': _LAST_UPDATED_SELECTOR}, require='last_updated')
+    last_updated_text = texts['last_updated'][0].replace('Last Updated ', '')
     logger.info(f'last updated: {last_updated_text}')
     last_updated = parse_datetime(last_updated_text)
     return last_updated
 
 
 def _volume_oi_web_data_is_final(driver: WebDriver, get_element: GetElement) -> bool:
-    final_label_element = get_element.xpath('//h5[contains(@class, "data-type")]')
-    logger.info(f'web data is {final_label_element.text}')
-    return 'FINAL' in final_label_element.text
+    texts = get_element.read_texts({'data_type': '//h5[contains(@class, "data-type")]'}, require='data_type')
+    data_type = texts['data_type'][0]
+    logger.info(f'web data is {data_type}')
+    return 'FINAL' in data_type
 
 
-def _scrape_settlement_table(driver: WebDriver) -> pd.DataFrame:
+def _click_load_all(driver: WebDriver, get_element: GetElement, table_selector: str):
     get_element_for_load_all = GetElement(driver, retries_count=0, error_handling=False)
     try:
         load_all_button = get_element_for_load_all.xpath('//button[contains(@class, "load-all")]')
-        driver.execute_script("arguments[0].click();", load_all_button) # type: ignore
     except Exception:
         logger.debug('Load all button not found.')
+        return
+    previous_table = get_element.content_signature(table_selector)
+    driver.execute_script("arguments[0].click();", load_all_button) # type: ignore
+    get_element.wait_for_content_change(table_selector, previous_table)
+
 
-    html = driver.page_source
-    soup = BeautifulSoup(html, 'lxml')
-    return pd.DataFrame(list(_parse_settlements_table(soup)))
+def _scrape_settlement_table(driver: WebDriver, get_element: GetElement) -> pd.DataFrame:
+    _click_load_all(driver, get_element, _SETTLEMENT_TABLE_SELECTOR)
+
+    html = get_element.outer_html(_SETTLEMENT_TABLE_WRAPPER_SELECTOR)
+    return parse_settlements_table(html, TABLE_FRAGMENT_ROW_XPATH)
 
 
 def _scrape_volume_oi_table(driver: WebDriver, get_element: GetElement, trade_date: str) -> pd.DataFrame:
+    previous_table = get_element.content_signature(_VOLUME_OI_TABLE_SELECTOR)
     date_button = get_element.xpath(f'//a[contains(text(), "{trade_date}")]')
     driver.execute_script("arguments[0].click();", date_button)  # type: ignore
-    time.sleep(3)
+    get_element.wait_for_content_change(_VOLUME_OI_TABLE_SELECTOR, previous_table)
+
+    _click_load_all(driver, get_element, _VOLUME_OI_TABLE_SELECTOR)
+
+    html = get_element.outer_html(_VOLUME_OI_TABLE_WRAPPER_SELECTOR)
+    return parse_volume_oi_table(html, TABLE_FRAGMENT_ROW_XPATH)
 
-    get_element_for_load_all = GetElement(driver, retries_count=0, error_handling=False)
-    try:
-        load_all_button = get_element_for_load_all.xpath('//button[contains(@class, "load-all")]')
-        driver.execute_script("arguments[0].click();", load_all_button) # type: ignore
-    except Exception:
-        logger.debug('Load all button not found.')
 
-    html = driver.page_source
-    soup = BeautifulSoup(html, 'lxml')
-    return pd.DataFrame(list(_parse_volume_oi_table(soup)))
+def _scrape_settlements_for_asset(driver: WebDriver, get_element: GetElement, settlement_service: SettlementService, asset_id: int, url: str):
+    logger.info(f'Scraping data for asset ID: {asset_id} - URL: {url}')
+    driver.get(url)
+    get_element.wait_for_document_ready()
+    get_element.wait_for_network_idle()
+
+    downloadable_dates = _get_downloadable_dates_from_settlement(driver, get_element)
+    logger.info(downloadable_dates)
+    # 取引日ごとにDBへ問い合わせないよう、資産の全取引日のlast_updatedを先にまとめて取得しておく
+    last_updated_map = settlement_service.fetch_last_updated_map(asset_id)
+
+    for trade_date in downloadable_dates:
+        last_updated = _settlement_last_updated_from_web(driver, get_element, trade_date)
+        data_is_latest_or_not_exsist = settlement_service.check_data_is_latest_or_not_exsist(asset_id, trade_date, last_updated, last_updated_map)
+
+        if not data_is_latest_or_not_exsist:
+            if data_is_latest_or_not_exsist is None:
+                logger.info(f'No data found for asset ID: {asset_id} on {trade_date}. Scraping data...')
+            else:
+                logger.info(f'Data in Database is not latest, but web data is latest. So, scraping data for asset ID: {asset_id} on {trade_date}...')
+            df = _scrape_settlement_table(driver, get_element)
+
+            # 新規保存と更新のどちらもupsertで行う
+            settlement_service.ingest_settlements_from_dataframe(asset_id, trade_date, df, last_updated)
+            logger.debug(f'last_updated: {last_updated}')
+            logger.debug(df)
+        else:
+            logger.info(f'Data in Database is latest for asset ID: {asset_id} on {trade_date}.')
+
+    get_element.log_wait_timings()
+
+
+def _scrape_volume_oi_for_asset(driver: WebDriver, get_element: GetElement, volume_oi_service: VolumeOIService, asset_id: int, url: str):
+    logger.info(f'Scraping data for asset ID: {asset_id} - URL: {url}')
+    driver.get(url)
+    get_element.wait_for_document_ready()
+    get_element.wait_for_network_idle()
+
+    downloadable_dates = _get_downloadable_dates_from_volume_oi(driver, get_element)
+    logger.info(downloadable_dates)
+    # 取引日ごとにDBへ問い合わせないよう、資産の全取引日のis_finalを先にまとめて取得しておく
+    is_final_map = volume_oi_service.fetch_is_final_map(asset_id)
+
+    for trade_date in downloadable_dates:
+        data_is_final = volume_oi_service.check_data_is_final(asset_id, trade_date, is_final_map)
+
+        if data_is_final is None:
+            logger.info(f'No data found for asset ID: {asset_id} on {trade_date}. Scraping data...')
+            df = _scrape_volume_oi_table(driver, get_element, trade_date)
+            is_final = _volume_oi_web_data_is_final(driver, get_element)
+
+            volume_oi_service.ingest_volume_oi_from_dataframe(asset_id, trade_date, df, is_final)
+            logger.debug(f'is_final: {is_final}')
+            logger.debug(df)
+        elif not data_is_final:
+            if _volume_oi_web_data_is_final(driver, get_element):
+                logger.info(f'Data in Database is preliminary, but web data is final. So, scraping data for asset ID: {asset_id} on {trade_date}...')
+                df = _scrape_volume_oi_table(driver, get_element, trade_date)
+
+                volume_oi_service.ingest_volume_oi_from_dataframe(asset_id, trade_date, df, True)
+                logger.debug(df)
+        else:
+            logger.info(f'Data in Database is final for asset ID: {asset_id} on {trade_date}.')
+
+    get_element.log_wait_timings()
+
+
+def _run_assets_in_pool(
+    asset_ids_urls: dict[int, str],
+    scrape_for_asset: Callable[[WebDriver, GetElement, _ServiceT, int, str], None],
+    service_factory: Callable[[], _ServiceT],
+    pool_size: int
+):
+    """
+    アセットごとのスクレイピングをWebDriverPoolの空いているドライバーに割り当てて並列実行する。
+    サービス(DBセッション)はワーカースレッド上でservice_factoryから生成し、ワーカー間で共有しない。
+    1つのアセットで失敗しても他のアセットは最後まで処理し、最初に発生した例外を送出する。
+    """
+    def _worker(asset_id: int, url: str):
+        service = service_factory()
+        with pool.acquire() as driver:
+            scrape_for_asset(driver, GetElement(driver), service, asset_id, url)
+
+    errors: list[Exception] = []
+    with WebDriverPool(pool_size, headless=False) as pool, ThreadPoolExecutor(max_workers=pool_size) as executor:
+        futures = {executor.submit(_worker, asset_id, url): asset_id for asset_id, url in asset_ids_urls.items()}
+        for future in as_completed(futures):
+            try:
+                future.result()
+            except Exception as e:
+                logger.error(f'Scraping failed for asset ID: {futures[future]}: {e}')
+                errors.append(e)
+
+    if errors:
+        raise errors[0]
 
 
 def scrape_settlements(asset_service: AssetService, settlement_service: SettlementService):
@@ -144,33 +221,7 @@ def scrape_settlements(asset_service: AssetService, settlement_service: Settleme
     asset_ids_urls = _fetch_asset_ids_urls('settlements', asset_service)
     try:
         for asset_id, url in asset_ids_urls.items():
-            logger.info(f'Scraping data for asset ID: {asset_id} - URL: {url}')
-            driver.get(url)
-            time.sleep(3)
-
-            downloadable_dates = _get_downloadable_dates_from_settlement(driver, get_element)
-            logger.info(downloadable_dates)
-
-            for trade_date in downloadable_dates:
-                last_updated = _settlement_last_updated_from_web(driver, get_element, trade_date)
-                data_is_latest_or_not_exsist = settlement_service.check_data_is_latest_or_not_exsist(asset_id, trade_date, last_updated)
-
-                if data_is_latest_or_not_exsist is None:
-                    logger.info(f'No data found for asset ID: {asset_id} on {trade_date}. Scraping data...')
-                    df = _scrape_settlement_table(driver)
-
-                    settlement_service.save_settlements_from_dataframe(asset_id, trade_date, df, last_updated)
-                    logger.debug(f'last_updated: {last_updated}')
-                    logger.debug(df)
-                elif not data_is_latest_or_not_exsist:
-                    logger.info(f'Data in Database is not latest, but web data is latest. So, scraping data for asset ID: {asset_id} on {trade_date}...')
-                    df = _scrape_settlement_table(driver)
-
-                    settlement_service.update_settlements_from_dataframe(asset_id, trade_date, df, last_updated)
-                    logger.debug(f'last_updated: {last_updated}')
-                    logger.debug(df)
-                else:
-                    logger.info(f'Data in Database is latest for asset ID: {asset_id} on {trade_date}.')
+            _scrape_settlements_for_asset(driver, get_element, settlement_service, asset_id, url)
 
             # TODO: breakは開発中のみ。全てのアセットを取得する場合はコメントアウトする。
             # break
@@ -180,6 +231,14 @@ def scrape_settlements(asset_service: AssetService, settlement_service: Settleme
         driver.quit()
 
 
+def scrape_settlements_with_pool(asset_service: AssetService, settlement_service_factory: Callable[[], SettlementService], pool_size: int):
+    # scrape_settlementsのドライバープール版。pool_size個のドライバーでアセットを並列にスクレイピングする
+    logger.info(f'Scraping settlements data with {pool_size} drivers...')
+    asset_ids_urls = _fetch_asset_ids_urls('settlements', asset_service)
+    _run_assets_in_pool(asset_ids_urls, _scrape_settlements_for_asset, settlement_service_factory, pool_size)
+    logger.info(' ﾟ+｡*ﾟ+｡｡+ﾟ*｡+ﾟ settlements data is up to date. ﾟ+｡*ﾟ+｡｡+ﾟ*｡+ﾟ ')
+
+
 def scrape_volume_and_open_interest(asset_service: AssetService, volume_oi_service: VolumeOIService):
     # `volume_and_open_interest` ページからデータをスクレイピングし、DataFrameに格納するロジック
     # このページのテーブル構造は `settlements` と異なるため、異なる処理が必要
@@ -191,33 +250,7 @@ def scrape_volume_and_open_interest(asset_service: AssetService, volume_oi_servi
     asset_ids_urls = _fetch_asset_ids_urls('volume_and_open_interest', asset_service)
     try:
         for asset_id, url in asset_ids_urls.items():
-            logger.info(f'Scraping data for asset ID: {asset_id} - URL: {url}')
-            driver.get(url)
-            time.sleep(3)
-
-            downloadable_dates = _get_downloadable_dates_from_volume_oi(driver, get_element)
-            logger.info(downloadable_dates)
-
-            for trade_date in downloadable_dates:
-                data_is_final = volume_oi_service.check_data_is_final(asset_id, trade_date)
-
-                if data_is_final is None:
-                    logger.info(f'No data found for asset ID: {asset_id} on {trade_date}. Scraping data...')
-                    df = _scrape_volume_oi_table(driver, get_element, trade_date)
-                    is_final = _volume_oi_web_data_is_final(driver, get_element)
-
-                    volume_oi_service.save_volume_oi_from_dataframe(asset_id, trade_date, df, is_final)
-                    logger.debug(f'is_final: {is_final}')
-                    logger.debug(df)
-                elif not data_is_final:
-                    if _volume_oi_web_data_is_final(driver, get_element):
-                        logger.info(f'Data in Database is preliminary, but web data is final. So, scraping data for asset ID: {asset_id} on {trade_date}...')
-                        df = _scrape_volume_oi_table(driver, get_element, trade_date)
-
-                        volume_oi_service.update_volume_oi_from_dataframe(asset_id, trade_date, df, True)
-                        logger.debug(df)
-                else:
-                    logger.info(f'Data in Database is final for asset ID: {asset_id} on {trade_date}.')
+            _scrape_volume_oi_for_asset(driver, get_element, volume_oi_service, asset_id, url)
 
             # TODO: breakは開発中のみ。全てのアセットを取得する場合はコメントアウトする。
             # break
@@ -225,3 +258,11 @@ def scrape_volume_and_open_interest(asset_service: AssetService, volume_oi_servi
             logger.info(' ﾟ+｡*ﾟ+｡｡+ﾟ*｡+ﾟ volume and open interest data is up to date. ﾟ+｡*ﾟ+｡｡+ﾟ*｡+ﾟ ')
     finally:
         driver.quit()
+
+
+def scrape_volume_and_open_interest_with_pool(asset_service: AssetService, volume_oi_service_factory: Callable[[], VolumeOIService], pool_size: int):
+    # scrape_volume_and_open_interestのドライバープール版。pool_size個のドライバーでアセットを並列にスクレイピングする
+    logger.info(f'Scraping volume and open interest data with {pool_size} drivers...')
+    asset_ids_urls = _fetch_asset_ids_urls('volume_and_open_interest', asset_service)
+    _run_assets_in_pool(asset_ids_urls, _scrape_volume_oi_for_asset, volume_oi_service_factory, pool_size)
+    logger.info(' ﾟ+｡*ﾟ+｡｡+ﾟ*｡+ﾟ volume and open interest data is up to date. ﾟ+｡*ﾟ+｡｡+ﾟ*｡+ﾟ ')
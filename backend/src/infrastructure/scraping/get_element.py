@@ -1,20 +1,53 @@
 # src/infrastructure/scraping/get_element.py
+from __future__ import annotations
+
 import os
+import time
 import traceback
 from datetime import datetime
-
-from selenium import webdriver
-from selenium.common.exceptions import TimeoutException
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.remote.webelement import WebElement
-from typing import Literal
+from typing import TYPE_CHECKING, Callable, Literal
 
 from src.domain.exceptions.element_not_found_error import ElementNotFoundError
 from src.domain.helpers.path import get_project_root
 from src.settings import logger
 
+# seleniumはインポートに時間がかかるため、要素の取得や待機を行うメソッドの中で読み込む
+if TYPE_CHECKING:
+    from selenium import webdriver
+    from selenium.common.exceptions import TimeoutException
+    from selenium.webdriver.remote.webelement import WebElement
+
+
+# 要素のテキストから変化検知用のシグネチャを作成する。テーブルの場合は行数と先頭・末尾の行で判定する
+_CONTENT_SIGNATURE_SCRIPT = """
+const element = document.querySelector(arguments[0]);
+if (element === null) { return null; }
+const rows = element.querySelectorAll('tr');
+if (rows.length === 0) { return element.textContent; }
+return rows.length + '|' + rows[0].textContent + '|' + rows[rows.length - 1].textContent;
+"""
+_RESOURCE_COUNT_SCRIPT = "return performance.getEntriesByType('resource').length;"
+_OUTER_HTML_SCRIPT = """
+const element = document.querySelector(arguments[0]);
+return element === null ? '' : element.outerHTML;
+"""
+# {キー: セレクタ} を受け取り、キーごとに一致した要素のテキストのリストを1回の呼び出しで返す。'/'または'('で始まるセレクタはXPathとして扱う
+_READ_TEXTS_SCRIPT = """
+const result = {};
+for (const [key, query] of Object.entries(arguments[0])) {
+  let nodes = [];
+  if (query.startsWith('/') || query.startsWith('(')) {
+    const snapshot = document.evaluate(query, document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+    for (let i = 0; i < snapshot.snapshotLength; i++) { nodes.push(snapshot.snapshotItem(i)); }
+  } else {
+    nodes = Array.from(document.querySelectorAll(query));
+  }
+  result[key] = nodes.map(node => (node.innerText ?? node.textContent).trim());
+}
+return result;
+"""
+_READY_STATE_SCRIPT = "return document.readyState;"
+
 
 class GetElement:
     """
@@ -42,6 +75,20 @@ class GetElement:
         xpathで要素を指定する。
     xpath_all_elements(selector: str) -> list[WebElement]
         xpathで複数の要素を指定する。
+    outer_html(selector: str) -> str
+        cssセレクタで指定した要素のouterHTMLのみを取得する。
+    read_texts(queries: dict[str, str], require: str | None) -> dict[str, list[str]]
+        複数のセレクタに一致する要素のテキストを1回のスクリプト実行でまとめて取得する。
+    content_signature(selector: str) -> str | None
+        要素の内容の変化を検知するためのシグネチャを取得する。
+    wait_for_document_ready() -> float
+        ページの読み込みが完了するまで待機する。
+    wait_for_network_idle(idle_ms: int) -> float
+        新しい通信がidle_msの間発生しなくなるまで待機する。
+    wait_for_content_change(selector: str, previous: str | None, idle_ms: int) -> float
+        要素の内容がpreviousから変化するまで待機する。
+    log_wait_timings(reset: bool)
+        待機時間の集計をログに出力する。
     _logging_error(error: TimeoutException | Literal[''], selector: str)
         エラーメッセージを記録する。
     _get_element(method: str, selector: str) -> WebElement
@@ -110,6 +157,8 @@ class GetElement:
         self.wait_second = wait_second
         self.retries_count = retries_count
         self.error_handling = error_handling
+        # 待機の種類ごとの経過時間(秒)。固定のtime.sleepと比較してどれだけ短縮できたかを確認するために記録する
+        self.wait_timings: list[tuple[str, float]] = []
 
 
     def css(self, selector: str) -> WebElement:
@@ -126,6 +175,8 @@ class GetElement:
         WebElement
             The web element found using the CSS selector.
         """
+        from selenium.webdriver.common.by import By
+
         method = By.CSS_SELECTOR
         return self._get_element(method, selector)
 
@@ -144,6 +195,8 @@ class GetElement:
         list[WebElement]
             The web elements found using the CSS selector.
         """
+        from selenium.webdriver.common.by import By
+
         method = By.CSS_SELECTOR
         return self._get_elements(method, selector)
 
@@ -162,6 +215,8 @@ class GetElement:
         WebElement
             The web element found using the XPath.
         """
+        from selenium.webdriver.common.by import By
+
         method = By.XPATH
         return self._get_element(method, selector)
 
@@ -180,10 +235,222 @@ class GetElement:
         list[WebElement]
             The web elements found using the XPath.
         """
+        from selenium.webdriver.common.by import By
+
         method = By.XPATH
         return self._get_elements(method, selector)
 
 
+    def outer_html(self, selector: str) -> str:
+        """
+        Return only the outerHTML of the element instead of the whole page source.
+
+        Parameters
+        ----------
+        selector : str
+            The CSS selector of the element.
+
+        Returns
+        -------
+        str
+            The outerHTML of the first matching element, or an empty string if not found.
+        """
+        return self.driver.execute_script(_OUTER_HTML_SCRIPT, selector) or '' # type: ignore
+
+
+    def read_texts(self, queries: dict[str, str], require: str | None = None) -> dict[str, list[str]]:
+        """
+        Read the texts of the elements matching each selector in a single script call.
+
+        Parameters
+        ----------
+        queries : dict[str, str]
+            The mapping of keys to CSS selectors or XPaths (starting with '/' or '(').
+        require : str | None, default None
+            The key that must have at least one element. The call waits and retries
+            like css_all_elements until it is found.
+
+        Returns
+        -------
+        dict[str, list[str]]
+            The stripped texts of the matching elements for each key.
+
+        Raises
+        ------
+        ElementNotFoundError
+            If the required elements cannot be located and error_handling is True.
+        """
+        from selenium.common.exceptions import TimeoutException
+        from selenium.webdriver.support.ui import WebDriverWait
+
+        def _read(driver: webdriver.Chrome) -> dict[str, list[str]] | Literal[False]:
+            texts: dict[str, list[str]] = driver.execute_script(_READ_TEXTS_SCRIPT, queries)
+            if require is not None and not texts.get(require):
+                return False
+            return texts
+
+        error: Exception = Exception('')
+        for _ in range(self.retries_count + 1):
+            try:
+                return WebDriverWait(self.driver, self.wait_second).until(_read)
+            except TimeoutException as e:
+                error = e
+                continue # タイムアウトした場合は、リトライする
+            except Exception as e:
+                # タイムアウト以外のエラーの場合はループを抜けてエラー処理
+                error = e
+                break
+
+        selector = queries[require] if require is not None else str(queries)
+        if self.error_handling:
+            self._logging_error(error, selector)
+            self.driver.quit()
+            logger.error('要素が見つかりませんでした。')
+            raise ElementNotFoundError(f'要素が見つかりませんでした: {selector}')
+        raise error
+
+
+    def content_signature(self, selector: str) -> str | None:
+        """
+        Return a signature of the element content used to detect changes.
+
+        Parameters
+        ----------
+        selector : str
+            The CSS selector of the element. For tables, the row count and the
+            first and last rows are used instead of the whole text.
+
+        Returns
+        -------
+        str | None
+            The signature, or None if the element does not exist.
+        """
+        return self.driver.execute_script(_CONTENT_SIGNATURE_SCRIPT, selector) # type: ignore
+
+
+    def wait_for_document_ready(self) -> float:
+        """
+        Wait until document.readyState becomes 'complete'.
+
+        Returns
+        -------
+        float
+            The elapsed seconds.
+        """
+        return self._wait_until(
+            'document_ready',
+            lambda driver: driver.execute_script(_READY_STATE_SCRIPT) == 'complete'
+        )
+
+
+    def wait_for_network_idle(self, idle_ms: int = 500) -> float:
+        """
+        Wait until no new network resource has been loaded for idle_ms.
+
+        Parameters
+        ----------
+        idle_ms : int, default 500
+            The quiet period in milliseconds regarded as idle.
+
+        Returns
+        -------
+        float
+            The elapsed seconds.
+        """
+        state = {'count': -1, 'since': time.monotonic()}
+
+        def _is_idle(driver: webdriver.Chrome) -> bool:
+            count = driver.execute_script(_RESOURCE_COUNT_SCRIPT)
+            now = time.monotonic()
+            if count != state['count']:
+                state['count'], state['since'] = count, now
+                return False
+            return (now - state['since']) * 1000 >= idle_ms
+
+        return self._wait_until('network_idle', _is_idle)
+
+
+    def wait_for_content_change(self, selector: str, previous: str | None, idle_ms: int = 1000) -> float:
+        """
+        Wait until the signature of the element differs from previous.
+
+        When the content does not change (e.g. the selected date was already
+        displayed), the wait ends once the network has been idle for idle_ms.
+
+        Parameters
+        ----------
+        selector : str
+            The CSS selector of the element to watch.
+        previous : str | None
+            The signature taken by content_signature before the operation.
+        idle_ms : int, default 1000
+            The quiet period in milliseconds after which an unchanged content is accepted.
+
+        Returns
+        -------
+        float
+            The elapsed seconds.
+        """
+        state = {'count': -1, 'since': time.monotonic()}
+
+        def _is_changed_or_idle(driver: webdriver.Chrome) -> bool:
+            current = driver.execute_script(_CONTENT_SIGNATURE_SCRIPT, selector)
+            if current is not None and current != previous:
+                return True
+            count = driver.execute_script(_RESOURCE_COUNT_SCRIPT)
+            now = time.monotonic()
+            if count != state['count']:
+                state['count'], state['since'] = count, now
+                return False
+            return current is not None and (now - state['since']) * 1000 >= idle_ms
+
+        return self._wait_until('content_change', _is_changed_or_idle)
+
+
+    def log_wait_timings(self, reset: bool = True, baseline_second: float = 3.0):
+        """
+        Log the number and total of elapsed seconds per wait type.
+
+        Parameters
+        ----------
+        reset : bool, default True
+            Whether to clear the recorded timings after logging.
+        baseline_second : float, default 3.0
+            The fixed sleep previously used for each wait, to estimate the saved time.
+        """
+        summary: dict[str, list[float]] = {}
+        for name, elapsed in self.wait_timings:
+            summary.setdefault(name, []).append(elapsed)
+        for name, elapsed_list in summary.items():
+            total = sum(elapsed_list)
+            saved = baseline_second * len(elapsed_list) - total
+            logger.info(
+                f'wait {name}: count={len(elapsed_list)}, total={total:.2f}s, '
+                f'avg={total / len(elapsed_list):.2f}s, saved={saved:.2f}s'
+            )
+        if reset:
+            self.wait_timings.clear()
+
+
+    def _wait_until(self, name: str, condition: Callable[[webdriver.Chrome], bool]) -> float:
+        """
+        Poll the condition until it returns True and record the elapsed time.
+        A timeout is not treated as an error because the page is usable in most cases.
+        """
+        from selenium.common.exceptions import TimeoutException
+        from selenium.webdriver.support.ui import WebDriverWait
+
+        started = time.monotonic()
+        try:
+            WebDriverWait(self.driver, self.wait_second, poll_frequency=0.1).until(condition)
+        except TimeoutException:
+            logger.warning(f'wait {name} timed out after {self.wait_second} seconds.')
+        elapsed = time.monotonic() - started
+        self.wait_timings.append((name, elapsed))
+        logger.debug(f'wait {name}: {elapsed:.2f}s')
+        return elapsed
+
+
     def _logging_error(self, error: TimeoutException | Exception, selector: str):
         """
         Log the error details and save a screenshot.
@@ -249,6 +516,10 @@ class GetElement:
             If all retry attempts fail and the program needs to be forcefully terminated.
 
         """
+        from selenium.common.exceptions import TimeoutException
+        from selenium.webdriver.support import expected_conditions as EC
+        from selenium.webdriver.support.ui import WebDriverWait
+
         error = Exception('')
         element = None
         for _ in range(self.retries_count + 1):
@@ -302,6 +573,10 @@ class GetElement:
             If all retry attempts fail and the program needs to be forcefully terminated.
 
         """
+        from selenium.common.exceptions import TimeoutException
+        from selenium.webdriver.support import expected_conditions as EC
+        from selenium.webdriver.support.ui import WebDriverWait
+
         error = Exception('')
         elements = None
         for _ in range(self.retries_count + 1):
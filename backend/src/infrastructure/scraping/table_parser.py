@@ -0,0 +1,85 @@
+# src/infrastructure/scraping/table_parser.py
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from lxml import html as lxml_html
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+
+def _class_xpath(class_name: str) -> str:
+    # CSSの `.class_name` に相当するXPath条件 (cssselectに依存しないようにXPathで記述する)
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {class_name} ')"
+
+
+# `.main-table-wrapper tbody > tr`
+SETTLEMENTS_ROW_XPATH = f"//*[{_class_xpath('main-table-wrapper')}]//tbody/tr"
+# `.multiline .main-table-wrapper tbody > tr`
+VOLUME_OI_ROW_XPATH = f"//*[{_class_xpath('multiline')}]//*[{_class_xpath('main-table-wrapper')}]//tbody/tr"
+# GetElement.outer_htmlで取得したテーブル部分のみのHTMLを解析する場合
+TABLE_FRAGMENT_ROW_XPATH = "//tbody/tr"
+
+# (カラム名, tr内のtdの位置)。-1は最後のtdを表す
+SETTLEMENTS_COLUMNS: list[tuple[str, int]] = [
+    ('month', 0),
+    ('open', 1),
+    ('high', 2),
+    ('low', 3),
+    ('last', 4),
+    ('change', 5),
+    ('settle', 6),
+    ('est_volume', 7),
+    ('prior_day_oi', -1),
+]
+VOLUME_OI_COLUMNS: list[tuple[str, int]] = [
+    ('month', 0),
+    ('globex', 1),
+    ('open_outcry', 2),
+    ('clear_port', 3),
+    ('total_volume', 4),
+    ('block_trades', 5),
+    ('efp', 6),
+    ('efr', 7),
+    ('tas', 8),
+    ('deliveries', 9),
+    ('at_close', 10),
+    ('change', -1),
+]
+
+
+def parse_table_columns(html: str, row_xpath: str, columns: list[tuple[str, int]]) -> pd.DataFrame:
+    """
+    HTMLのテーブルを1回の走査でカラムごとの配列に変換し、DataFrameを作成します。
+    行ごとの辞書は作成せず、各trのtdを1度だけ取得してカラムの配列に直接追加します。
+
+    :param html: ページ全体、またはテーブル部分のみのHTML
+    :param row_xpath: 対象となるtrを指定するXPath
+    :param columns: (カラム名, tdの位置) のリスト
+    :return: 全てのカラムが文字列のDataFrame。行がない場合は空のDataFrame
+    """
+    import pandas as pd
+
+    if not html.strip():
+        return pd.DataFrame()
+    root = lxml_html.fromstring(html)
+    column_values: list[list[str]] = [[] for _ in columns]
+    positions = [position for _, position in columns]
+
+    for tr in root.xpath(row_xpath):
+        cells = tr.findall('td')
+        for values, position in zip(column_values, positions):
+            values.append(cells[position].text_content())
+
+    if not column_values[0]:
+        return pd.DataFrame()
+    return pd.DataFrame({name: values for (name, _), values in zip(columns, column_values)}, dtype=object)
+
+
+def parse_settlements_table(html: str, row_xpath: str = SETTLEMENTS_ROW_XPATH) -> pd.DataFrame:
+    return parse_table_columns(html, row_xpath, SETTLEMENTS_COLUMNS)
+
+
+def parse_volume_oi_table(html: str, row_xpath: str = VOLUME_OI_ROW_XPATH) -> pd.DataFrame:
+    return parse_table_columns(html, row_xpath, VOLUME_OI_COLUMNS)
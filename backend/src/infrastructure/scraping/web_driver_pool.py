@@ -0,0 +1,98 @@
+# src/infrastructure/scraping/web_driver_pool.py
+from __future__ import annotations
+
+import queue
+import threading
+from contextlib import contextmanager
+from typing import TYPE_CHECKING, Iterator
+
+from src.infrastructure.scraping.web_driver_setup import WebDriverSetup
+from src.settings import logger
+
+if TYPE_CHECKING:
+    from selenium.webdriver.chrome.webdriver import WebDriver
+
+
+class WebDriverPool:
+    """
+    WebDriverSetupで生成したドライバーを最大pool_size個まで保持するプール。
+    ドライバーは必要になった時点で生成し、利用後はプールに戻して再利用する。
+
+    Examples
+    --------
+    >>> with WebDriverPool(pool_size=3) as pool:
+    ...     with pool.acquire() as driver:
+    ...         driver.get(url)
+    """
+    def __init__(self, pool_size: int, headless: bool = False):
+        if pool_size < 1:
+            raise ValueError("pool_size must be greater than or equal to 1.")
+        self.pool_size = pool_size
+        self.headless = headless
+        self._idle_drivers: queue.LifoQueue[WebDriver] = queue.LifoQueue()
+        self._all_drivers: list[WebDriver] = []
+        self._lock = threading.Lock()
+        self._closed = False
+
+    def __enter__(self) -> 'WebDriverPool':
+        return self
+
+    def __exit__(self, *args: object) -> None:
+        self.close()
+
+    @contextmanager
+    def acquire(self) -> Iterator[WebDriver]:
+        """
+        空いているドライバーを1つ貸し出す。全て使用中の場合は返却されるまで待機する。
+        処理中に例外が発生したドライバーは状態が不明なため破棄し、次回の貸し出し時に作り直す。
+        """
+        driver = self._checkout()
+        try:
+            yield driver
+        except Exception:
+            self._discard(driver)
+            raise
+        else:
+            self._idle_drivers.put(driver)
+
+    def close(self) -> None:
+        with self._lock:
+            self._closed = True
+            drivers, self._all_drivers = self._all_drivers, []
+        for driver in drivers:
+            try:
+                driver.quit()
+            except Exception as e:
+                logger.warning(f'Failed to quit WebDriver: {e}')
+        logger.info(f'WebDriver pool closed. ({len(drivers)} drivers)')
+
+    def _checkout(self) -> WebDriver:
+        while True:
+            with self._lock:
+                if self._closed:
+                    raise RuntimeError("WebDriver pool is already closed.")
+                try:
+                    return self._idle_drivers.get_nowait()
+                except queue.Empty:
+                    pass
+                if len(self._all_drivers) < self.pool_size:
+                    # webdriver_managerのインストール処理が競合しないよう、ドライバーの生成はロック内で行う
+                    driver = WebDriverSetup(headless=self.headless).get_driver()
+                    self._all_drivers.append(driver)
+                    logger.info(f'WebDriver created. ({len(self._all_drivers)}/{self.pool_size})')
+                    return driver
+            # 破棄されたドライバーの枠が空いた場合に備え、一定時間ごとに再確認する
+            try:
+                return self._idle_drivers.get(timeout=1)
+            except queue.Empty:
+                continue
+
+    def _discard(self, driver: WebDriver) -> None:
+        with self._lock:
+            if driver in self._all_drivers:
+                self._all_drivers.remove(driver)
+        try:
+            driver.quit()
+        except Exception as e:
+            logger.debug(f'WebDriver was already closed: {e}')
+        logger.warning(f'WebDriver discarded. ({len(self._all_drivers)}/{self.pool_size})')
@@ -1,11 +1,10 @@
 # src/infrastructure/scraping/web_driver_setup.py
-from selenium import webdriver
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.chrome.options import Options
-from webdriver_manager.chrome import ChromeDriverManager
 
+# seleniumとwebdriver_managerはインポートに時間がかかるため、ドライバーを作成する時点で読み込む
 class WebDriverSetup:
     def __init__(self, headless: bool=False):
+        from selenium.webdriver.chrome.options import Options
+
         self.options = Options()
         if headless:
             self.options.add_argument('--headless') # type: ignore
@@ -31,6 +30,10 @@ class WebDriverSetup:
         self.options.add_experimental_option("prefs",prefs) # type: ignore
 
     def get_driver(self):
+        from selenium import webdriver
+        from selenium.webdriver.chrome.service import Service
+        from webdriver_manager.chrome import ChromeDriverManager
+
         service = Service(ChromeDriverManager().install())
         driver = webdriver.Chrome(service=service, options=self.options)
         driver.implicitly_wait(3)  # 指定したドライバーが見つかるまでの待ち時間を設定
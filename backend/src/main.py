@@ -1,17 +1,53 @@
 #src/main.py
+import asyncio
+from contextlib import asynccontextmanager, suppress
+from typing import AsyncIterator
+
 from fastapi import FastAPI
 
 from src.application.web.api.routers.asset_router import asset_router
 from src.application.web.api.routers.auth_router import auth_router
+from src.application.web.api.routers.db_pool_router import db_pool_router
 from src.application.web.api.routers.futures_data_router import futures_data_router
+from src.application.web.api.routers.health_router import health_router
 from src.application.web.api.routers.trade_date_router import trade_date_router
 from src.application.web.api.routers.user_router import user_router
+from src.application.web.api.dependencies import get_ingest_event_subscriber, get_warm_up_state, run_warm_up
+from src.application.web.api.ingest_event_subscriber import is_ingest_events_enabled
+from src.application.web.api.warm_up import is_warm_up_enabled
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    # スクレイパーの取り込みイベントの受信を開始する。受信できている間のみ、プロセス内のキャッシュを使用する
+    subscriber = get_ingest_event_subscriber() if is_ingest_events_enabled() else None
+    if subscriber is not None:
+        subscriber.start()
+
+    # キャッシュのウォームアップはバックグラウンドで実行し、終わるまで/health/readyは503を返す
+    # 起動を待たせるとlivenessプローブも失敗するため、リクエストの受付は先に開始する
+    task = asyncio.create_task(run_warm_up()) if is_warm_up_enabled() else None
+    if task is None:
+        get_warm_up_state().finish()
+
+    try:
+        yield
+    finally:
+        if task is not None:
+            task.cancel()
+            with suppress(asyncio.CancelledError):
+                await task
+        if subscriber is not None:
+            # 読み込み中の場合は最大INGEST_EVENTS_BLOCK_MSミリ秒待つため、イベントループをブロックしないようにスレッドで待つ
+            await asyncio.to_thread(subscriber.stop)
 
 
-app = FastAPI()
+app = FastAPI(lifespan=lifespan)
 app.include_router(asset_router)
 app.include_router(auth_router)
+app.include_router(db_pool_router)
 app.include_router(futures_data_router)
+app.include_router(health_router)
 app.include_router(trade_date_router)
 app.include_router(user_router)
 
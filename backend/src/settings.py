@@ -2,15 +2,21 @@
 
 import logging.config
 import os
-import yaml
+import threading
 from pathlib import Path
 
 
 CWD: Path = Path(__file__).resolve().parent
 LOG_CONFIG_PATH: str = os.path.normpath(os.path.join(CWD, "log/log_config.yaml"))
 
+_logging_configured = False
+_logging_lock = threading.Lock()
+
 
 def setup_logging() -> None:
+    global _logging_configured
+    import yaml
+
     with open(LOG_CONFIG_PATH, 'r', encoding='utf-8') as f:
         log_config = yaml.safe_load(f)
 
@@ -22,7 +28,26 @@ def setup_logging() -> None:
                 logger['handlers'] = [handler for handler in logger['handlers'] if handler != 'file']
 
         logging.config.dictConfig(log_config)  # type: ignore
+    _logging_configured = True
+
+
+def _ensure_logging() -> None:
+    # ログの設定は、最初にログを出力する時点で1回だけ読み込む
+    if _logging_configured:
+        return
+    with _logging_lock:
+        if not _logging_configured:
+            setup_logging()
+
+
+class _LazyConfiguredLogger(logging.LoggerAdapter):
+    """
+    インポート時にYAMLを読み込まないように、最初のログの出力時にsetup_loggingを実行するロガー。
+    debug/info/warning/errorなどは全てisEnabledForを経由するため、ここで設定を読み込む。
+    """
+    def isEnabledFor(self, level: int) -> bool:
+        _ensure_logging()
+        return super().isEnabledFor(level)
 
 
-setup_logging()
-logger = logging.getLogger(__name__)
+logger = _LazyConfiguredLogger(logging.getLogger(__name__), {})
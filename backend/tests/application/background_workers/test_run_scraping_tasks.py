@@ -70,3 +70,35 @@ def test_main_volume_oi_task_with_argv():
     with mock.patch('src.application.background_workers.run_scraping_tasks.run_volume_oi_scraping_task') as mock_task:
         run_scraping_tasks.main()
         mock_task.assert_called_once()
+
+
+@patch('src.application.background_workers.run_scraping_tasks.AssetService')
+@patch('src.application.background_workers.run_scraping_tasks.cme_scraper')
+def test_run_settlements_scraping_task_with_pool(cme_scraper_mock: MagicMock, AssetServiceMock: MagicMock):
+    mock_asset_service = MagicMock()
+    AssetServiceMock.return_value = mock_asset_service
+
+    run_scraping_tasks.run_settlements_scraping_task(pool_size=3)
+
+    # プールサイズが2以上の場合は、ワーカーごとのサービス生成関数とともにプール版が呼び出されることを確認
+    cme_scraper_mock.scrape_settlements_with_pool.assert_called_once_with(mock_asset_service, run_scraping_tasks._settlement_service_for_worker, 3)
+    cme_scraper_mock.scrape_settlements.assert_not_called()
+
+
+@patch('src.application.background_workers.run_scraping_tasks.AssetService')
+@patch('src.application.background_workers.run_scraping_tasks.cme_scraper')
+def test_run_volume_oi_scraping_task_with_pool(cme_scraper_mock: MagicMock, AssetServiceMock: MagicMock):
+    mock_asset_service = MagicMock()
+    AssetServiceMock.return_value = mock_asset_service
+
+    run_scraping_tasks.run_volume_oi_scraping_task(pool_size=2)
+
+    cme_scraper_mock.scrape_volume_and_open_interest_with_pool.assert_called_once_with(mock_asset_service, run_scraping_tasks._volume_oi_service_for_worker, 2)
+    cme_scraper_mock.scrape_volume_and_open_interest.assert_not_called()
+
+
+@mock.patch('sys.argv', ['run_scraping_tasks.py', 'settlement', '4'])
+def test_main_settlement_task_with_pool_size_argv():
+    with mock.patch('src.application.background_workers.run_scraping_tasks.run_settlements_scraping_task') as mock_task:
+        run_scraping_tasks.main()
+        mock_task.assert_called_once_with(4)
@@ -5,13 +5,13 @@ from fastapi.testclient import TestClient
 from unittest.mock import Mock
 
 from src.main import app
-from src.application.web.api.dependencies import get_auth_service
+from src.application.web.api.dependencies import get_async_auth_service, get_auth_service
 from src.domain.entities.user_entity import UserEntity
 from src.domain.exceptions.credentials_error import CredentialsError
 from src.domain.exceptions.invalid_user_input_error import InvalidUserInputError
 from src.domain.exceptions.repository_error import RepositoryError
 from src.domain.exceptions.user_not_found_error import UserNotFoundError
-from src.domain.services.auth_service import AuthService
+from src.domain.services.auth_service import AsyncAuthService, AuthService
 from src.infrastructure.authentication.jwt_token import create_access_token
 from src.infrastructure.database.models import User as UserModel
 # モックされた認証サービスとユーザーサービス
@@ -19,10 +19,16 @@ from src.infrastructure.database.models import User as UserModel
 def auth_service_mock():
     return Mock(spec=AuthService)
 
+# /users/me は非同期のサービスを使用する
+@pytest.fixture
+def async_auth_service_mock():
+    return Mock(spec=AsyncAuthService)
+
 # テストクライアントのセットアップ
 @pytest.fixture
-def client(auth_service_mock: Mock):
+def client(auth_service_mock: Mock, async_auth_service_mock: Mock):
     app.dependency_overrides[get_auth_service] = lambda: auth_service_mock
+    app.dependency_overrides[get_async_auth_service] = lambda: async_auth_service_mock
     return TestClient(app)
 
 
@@ -80,7 +86,7 @@ def test_login_unexpected_error(auth_service_mock: Mock, client: TestClient):
     assert "InternalServerError" in detail['error_type']
 
 
-def test_read_users_me_success(client: TestClient, auth_service_mock: Mock):
+def test_read_users_me_success(client: TestClient, async_auth_service_mock: Mock):
     email = "test@example.com"
     token = create_access_token({"sub": email})
     user_entity = UserEntity.from_db(
@@ -91,7 +97,7 @@ def test_read_users_me_success(client: TestClient, auth_service_mock: Mock):
             name="Test User"
         )
     )
-    auth_service_mock.get_current_user.return_value = user_entity
+    async_auth_service_mock.get_current_user.return_value = user_entity
 
     headers = {"Authorization": f"Bearer {token}"}
     response = client.get("/users/me", headers=headers)
@@ -102,9 +108,9 @@ def test_read_users_me_success(client: TestClient, auth_service_mock: Mock):
     assert user_data["name"] == "Test User"
 
 
-def test_read_users_me_invalid_token(client: TestClient, auth_service_mock: Mock):
+def test_read_users_me_invalid_token(client: TestClient, async_auth_service_mock: Mock):
     token = "invalid_token"
-    auth_service_mock.get_current_user.side_effect = CredentialsError("Could not validate credentials")
+    async_auth_service_mock.get_current_user.side_effect = CredentialsError("Could not validate credentials")
 
     headers = {"Authorization": f"Bearer {token}"}
     response = client.get("/users/me", headers=headers)
@@ -114,10 +120,10 @@ def test_read_users_me_invalid_token(client: TestClient, auth_service_mock: Mock
     assert "CredentialsError" in detail['error_type']
 
 
-def test_read_users_me_user_not_found(client: TestClient, auth_service_mock: Mock):
+def test_read_users_me_user_not_found(client: TestClient, async_auth_service_mock: Mock):
     email = "nonexistent@example.com"
     token = create_access_token({"sub": email})
-    auth_service_mock.get_current_user.side_effect = UserNotFoundError("User not found")
+    async_auth_service_mock.get_current_user.side_effect = UserNotFoundError("User not found")
 
     headers = {"Authorization": f"Bearer {token}"}
     response = client.get("/users/me", headers=headers)
@@ -127,9 +133,9 @@ def test_read_users_me_user_not_found(client: TestClient, auth_service_mock: Moc
     assert "UserNotFoundError" in detail['error_type']
 
 
-def test_read_users_me_unexpected_error(client: TestClient, auth_service_mock: Mock):
+def test_read_users_me_unexpected_error(client: TestClient, async_auth_service_mock: Mock):
     token = create_access_token({"sub": "test@example.com"})
-    auth_service_mock.get_current_user.side_effect = Exception("Unexpected error")
+    async_auth_service_mock.get_current_user.side_effect = Exception("Unexpected error")
 
     headers = {"Authorization": f"Bearer {token}"}
     response = client.get("/users/me", headers=headers)
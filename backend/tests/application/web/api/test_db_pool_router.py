@@ -0,0 +1,24 @@
+# tests/application/web/api/test_db_pool_router.py
+from fastapi.testclient import TestClient
+
+from src.infrastructure.database.database import get_shared_engine
+from src.infrastructure.database.engine_profiles import get_pool_metrics
+from src.main import app
+
+
+client = TestClient(app)
+
+
+def test_get_db_pool_stats():
+    get_shared_engine('api')
+    get_pool_metrics('test-router').record_checkout(0.002, 1)
+
+    response = client.get("/db-pool/stats")
+
+    assert response.status_code == 200
+    stats = {entry['profile']: entry for entry in response.json()}
+    # 作成済みのエンジンのプール
+    assert 'api' in stats
+    assert stats['api']['capacity'] > 0
+    assert stats['test-router']['checkouts'] == 1
+    assert stats['test-router']['max_checkout_ms'] == 2.0
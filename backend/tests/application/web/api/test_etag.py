@@ -0,0 +1,26 @@
+# tests/application/web/api/test_etag.py
+import pytest
+from datetime import date
+
+from src.application.web.api.etag import etag_matches, make_etag
+
+
+def test_make_etag():
+    etag = make_etag(('trade-dates', 'Gold', date(2023, 1, 1)))
+
+    assert etag.startswith('"') and etag.endswith('"')
+    assert etag == make_etag(('trade-dates', 'Gold', date(2023, 1, 1)))
+    assert etag != make_etag(('trade-dates', 'Gold', date(2023, 1, 2)))
+
+
+@pytest.mark.parametrize("if_none_match,expected", [
+    (None, False),
+    ('', False),
+    ('"abc"', True),
+    ('W/"abc"', True),
+    ('"xyz", "abc"', True),
+    ('"xyz"', False),
+    ('*', True),
+])
+def test_etag_matches(if_none_match: str | None, expected: bool):
+    assert etag_matches(if_none_match, '"abc"') is expected
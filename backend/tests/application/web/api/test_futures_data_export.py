@@ -0,0 +1,62 @@
+# tests/application/web/api/test_futures_data_export.py
+import gzip
+import json
+import pandas as pd
+import pytest
+from datetime import date
+
+from src.application.web.api.futures_data_export import accepts_gzip, gzip_chunks, iter_export_chunks
+
+
+def _make_frames() -> list[pd.DataFrame]:
+    return [
+        pd.DataFrame({'trade_date': [date(2024, 3, 8), date(2024, 3, 8)], 'month': ['2024-04', '2024-05'], 'settle': [2165.3, float('nan')], 'volume': [100, 200]}),
+        pd.DataFrame({'trade_date': [date(2024, 3, 11)], 'month': ['2024-04'], 'settle': [2170.1], 'volume': [300]}),
+    ]
+
+
+def test_iter_export_chunks_ndjson():
+    chunks = list(iter_export_chunks(_make_frames(), 'ndjson'))
+
+    # DataFrameごとに1チャンク、各行が1行のJSONになる
+    assert len(chunks) == 2
+    lines = b''.join(chunks).decode('utf-8').splitlines()
+    assert [json.loads(line) for line in lines] == [
+        {'trade_date': '2024-03-08', 'month': '2024-04', 'settle': 2165.3, 'volume': 100},
+        {'trade_date': '2024-03-08', 'month': '2024-05', 'settle': None, 'volume': 200},
+        {'trade_date': '2024-03-11', 'month': '2024-04', 'settle': 2170.1, 'volume': 300},
+    ]
+
+
+def test_iter_export_chunks_csv():
+    chunks = list(iter_export_chunks(_make_frames(), 'csv'))
+
+    # ヘッダーは最初のチャンクのみ
+    assert b''.join(chunks).decode('utf-8') == (
+        "trade_date,month,settle,volume\n"
+        "2024-03-08,2024-04,2165.3,100\n"
+        "2024-03-08,2024-05,,200\n"
+        "2024-03-11,2024-04,2170.1,300\n"
+    )
+
+
+def test_gzip_chunks():
+    chunks = [b'{"a":1}\n' * 1000, b'{"b":2}\n' * 1000]
+    compressed = list(gzip_chunks(iter(chunks)))
+
+    # 入力のチャンクごとに出力され、全体で1つのgzipストリームになる
+    assert len(compressed) == 3
+    assert gzip.decompress(b''.join(compressed)) == b''.join(chunks)
+
+
+@pytest.mark.parametrize("accept_encoding,expected", [
+    (None, False),
+    ("", False),
+    ("gzip", True),
+    ("deflate, gzip;q=0.8, br", True),
+    ("GZIP", True),
+    ("gzip;q=0", False),
+    ("br", False),
+])
+def test_accepts_gzip(accept_encoding: str | None, expected: bool):
+    assert accepts_gzip(accept_encoding) is expected
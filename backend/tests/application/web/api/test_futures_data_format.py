@@ -0,0 +1,35 @@
+# tests/application/web/api/test_futures_data_format.py
+import json
+import pandas as pd
+import pytest
+
+from src.application.web.api.futures_data_format import negotiate_futures_data_format, serialize_futures_data
+
+
+@pytest.mark.parametrize("accept,expected", [
+    (None, "records"),
+    ("", "records"),
+    ("*/*", "records"),
+    ("application/json", "records"),
+    ("application/vnd.futures-data.columnar+json", "columnar"),
+    ("application/x-msgpack", "msgpack"),
+    ("APPLICATION/MSGPACK", "msgpack"),
+    # qの値が大きいものを優先し、同じ場合は先に指定されたものを選択する
+    ("application/json;q=0.5, application/vnd.apache.arrow.stream", "arrow"),
+    ("application/msgpack, application/vnd.apache.arrow.stream", "msgpack"),
+    ("text/html, application/msgpack;q=0.9, */*;q=0.1", "msgpack"),
+    # q=0は受け付けないことを示す
+    ("application/msgpack;q=0, application/json", "records"),
+    ("text/html", None),
+    ("application/json;q=0", None),
+    ("application/json;q=invalid", None),
+])
+def test_negotiate_futures_data_format(accept: str | None, expected: str | None):
+    assert negotiate_futures_data_format(accept) == expected
+
+
+def test_serialize_futures_data_records():
+    df = pd.DataFrame({'month': ['2024-04'], 'settle': [2165.3]})
+
+    # 従来のレスポンスと同じ、行ごとのオブジェクトのリストになる
+    assert json.loads(serialize_futures_data(df, 'records')) == {'data': [{'month': '2024-04', 'settle': 2165.3}]}
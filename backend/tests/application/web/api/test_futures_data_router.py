@@ -1,18 +1,33 @@
 # tests/application/web/api/test_futures_data_router.py
+import fakeredis
+import json
+import msgpack
 import pandas as pd
+import pyarrow as pa
 import pytest
 from datetime import datetime
 from fastapi.testclient import TestClient
 from unittest.mock import MagicMock, patch
 
-from src.application.web.api.dependencies import get_futures_data_service
+from src.application.web.api.dependencies import get_async_futures_data_service, get_futures_data_cache_repository, get_futures_data_service
+from src.infrastructure.redis.futures_data_cache_repository_redis import FuturesDataCacheRepositoryRedis
 from src.main import app  # FastAPIアプリケーションのインスタンス
-from src.domain.services.futures_data_service import FuturesDataService
+from src.domain.exceptions.invalid_input_error import InvalidInputError
+from src.domain.services.futures_data_service import AsyncFuturesDataService, FuturesDataService
 
 
 # FastAPIアプリケーションのTestClientを作成
 client = TestClient(app, raise_server_exceptions=False)
 
+# テストごとに空のキャッシュを使用する
+@pytest.fixture(autouse=True)
+def futures_data_cache():
+    cache = FuturesDataCacheRepositoryRedis()
+    cache.redis_client = fakeredis.FakeStrictRedis(server=fakeredis.FakeServer())
+    app.dependency_overrides[get_futures_data_cache_repository] = lambda: cache
+    yield cache
+    app.dependency_overrides.pop(get_futures_data_cache_repository, None)
+
 # モックを使用するためのフィクスチャ
 @pytest.fixture
 def futures_data_service_mock(monkeypatch: pytest.MonkeyPatch):
@@ -20,6 +35,11 @@ def futures_data_service_mock(monkeypatch: pytest.MonkeyPatch):
     monkeypatch.setattr("src.application.web.api.dependencies.get_futures_data_service", lambda: service_mock)
     return service_mock
 
+# /futures-data/{asset_name} は非同期のサービスを使用する。非同期メソッドはAsyncMockになる
+@pytest.fixture
+def async_futures_data_service_mock():
+    return MagicMock(spec=AsyncFuturesDataService)
+
 # モック用のテストデータ
 test_data = pd.DataFrame({
     "trade_date": [datetime(2023, 1, 1).date(), datetime(2023, 1, 2).date()],
@@ -50,10 +70,10 @@ expected_response_data = {
 }
 
 
-def test_get_futures_data_success(futures_data_service_mock: MagicMock):
-    app.dependency_overrides[get_futures_data_service] = lambda: futures_data_service_mock
-    futures_data_service_mock.make_dataframe.return_value = test_data
-    futures_data_service_mock.add_settlement_spread.return_value = test_data
+def test_get_futures_data_success(async_futures_data_service_mock: MagicMock):
+    app.dependency_overrides[get_async_futures_data_service] = lambda: async_futures_data_service_mock
+    async_futures_data_service_mock.make_dataframe.return_value = test_data
+    async_futures_data_service_mock.add_settlement_spread.return_value = test_data
 
     # APIエンドポイントのテスト実行
     response = client.get("/futures-data/gold?trade_dates=2023-01-01&trade_dates=2023-01-02")
@@ -64,8 +84,215 @@ def test_get_futures_data_success(futures_data_service_mock: MagicMock):
     assert response.json() == expected_response_data
 
     # モックが呼び出されたことを確認
-    futures_data_service_mock.make_dataframe.assert_called_once_with('gold', [datetime(2023, 1, 1).date(), datetime(2023, 1, 2).date()])
-    futures_data_service_mock.add_settlement_spread.assert_called_once()
+    # 同時のリクエストは、ETagの計算に使用したバージョンが同じ場合のみまとめる
+    async_futures_data_service_mock.make_dataframe.assert_called_once_with('gold', [datetime(2023, 1, 1).date(), datetime(2023, 1, 2).date()], versions=async_futures_data_service_mock.fetch_versions.return_value)
+    async_futures_data_service_mock.add_settlement_spread.assert_called_once()
+
+
+def test_get_futures_data_cache_hit(async_futures_data_service_mock: MagicMock, futures_data_cache: FuturesDataCacheRepositoryRedis):
+    app.dependency_overrides[get_async_futures_data_service] = lambda: async_futures_data_service_mock
+    app.dependency_overrides[get_futures_data_cache_repository] = lambda: futures_data_cache
+    # test_dataは他のテストでmonthが文字列に変換されているため、新しく作成する
+    async_futures_data_service_mock.make_dataframe.return_value = pd.DataFrame({
+        "trade_date": [datetime(2023, 1, 1).date(), datetime(2023, 1, 2).date()],
+        "month": [datetime(2023, 2, 1), datetime(2023, 3, 1)],
+        "settle": [1500, 1600],
+        "volume": [100, 200],
+        "open_interest": [10, 20]
+    })
+    async_futures_data_service_mock.add_settlement_spread.side_effect = lambda df: df
+    async_futures_data_service_mock.fetch_versions.return_value = []
+    async_futures_data_service_mock.is_finalized.return_value = False
+
+    first_response = client.get("/futures-data/gold?trade_dates=2023-01-01&trade_dates=2023-01-02")
+    # 取引日の順序が異なっても同じキャッシュを使用する
+    second_response = client.get("/futures-data/gold?trade_dates=2023-01-02&trade_dates=2023-01-01")
+    stats_response = client.get("/futures-data-cache/stats")
+    app.dependency_overrides.clear()
+
+    assert first_response.status_code == 200
+    assert second_response.status_code == 200
+    assert second_response.json() == first_response.json() == expected_response_data
+    async_futures_data_service_mock.make_dataframe.assert_called_once()
+    assert stats_response.json() == {"hits": 1, "misses": 1, "local_hits": 0}
+    # 速報値を含むレスポンスは短時間のみキャッシュさせる
+    assert first_response.headers["Cache-Control"] == second_response.headers["Cache-Control"] == "public, max-age=60"
+
+
+def test_get_futures_data_finalized(async_futures_data_service_mock: MagicMock, futures_data_cache: FuturesDataCacheRepositoryRedis):
+    app.dependency_overrides[get_async_futures_data_service] = lambda: async_futures_data_service_mock
+    async_futures_data_service_mock.make_dataframe.return_value = pd.DataFrame({
+        "trade_date": [datetime(2023, 1, 1).date()],
+        "month": [datetime(2023, 2, 1)],
+        "settle": [1500],
+        "volume": [100],
+        "open_interest": [10]
+    })
+    async_futures_data_service_mock.add_settlement_spread.side_effect = lambda df: df
+    async_futures_data_service_mock.fetch_versions.return_value = []
+    async_futures_data_service_mock.is_finalized.return_value = True
+
+    response = client.get("/futures-data/gold?trade_dates=2023-01-01")
+    cached_response = client.get("/futures-data/gold?trade_dates=2023-01-01")
+    app.dependency_overrides.clear()
+
+    assert response.status_code == 200
+    assert response.headers["Cache-Control"] == cached_response.headers["Cache-Control"] == "public, max-age=31536000, immutable"
+    async_futures_data_service_mock.is_finalized.assert_called_once_with('gold', [datetime(2023, 1, 1).date()], [])
+    # 確定済みのレスポンスは期限なしでキャッシュされる
+    assert futures_data_cache.redis_client.ttl("futures-data:payload:records:gold:2023-01-01") == -1
+
+
+def test_get_futures_data_not_modified(async_futures_data_service_mock: MagicMock, futures_data_cache: FuturesDataCacheRepositoryRedis):
+    app.dependency_overrides[get_async_futures_data_service] = lambda: async_futures_data_service_mock
+    # monthはレスポンスの作成時に文字列に変換されるため、呼び出しごとに新しいDataFrameを返す
+    async_futures_data_service_mock.make_dataframe.side_effect = lambda asset_name, trade_dates, versions=None: pd.DataFrame({
+        "trade_date": [datetime(2023, 1, 1).date()],
+        "month": [datetime(2023, 2, 1)],
+        "settle": [1500],
+        "volume": [100],
+        "open_interest": [10]
+    })
+    async_futures_data_service_mock.add_settlement_spread.side_effect = lambda df: df
+    async_futures_data_service_mock.fetch_versions.return_value = []
+    async_futures_data_service_mock.is_finalized.return_value = False
+
+    response = client.get("/futures-data/gold?trade_dates=2023-01-01")
+    etag = response.headers["ETag"]
+    # キャッシュにあるETagと一致する場合
+    cached_response = client.get("/futures-data/gold?trade_dates=2023-01-01", headers={"If-None-Match": etag})
+    # キャッシュがない場合も、データのバージョンが同じであればレスポンスを作成しない
+    futures_data_cache.redis_client.flushall()
+    uncached_response = client.get("/futures-data/gold?trade_dates=2023-01-01", headers={"If-None-Match": f"W/{etag}"})
+    modified_response = client.get("/futures-data/gold?trade_dates=2023-01-01", headers={"If-None-Match": '"outdated"'})
+    app.dependency_overrides.clear()
+
+    assert response.status_code == 200
+    assert cached_response.status_code == 304
+    assert cached_response.content == b""
+    assert cached_response.headers["ETag"] == etag
+    assert uncached_response.status_code == 304
+    assert uncached_response.headers["ETag"] == etag
+    assert modified_response.status_code == 200
+    assert modified_response.headers["ETag"] == etag
+    assert async_futures_data_service_mock.make_dataframe.call_count == 2
+
+
+@pytest.mark.parametrize("accept,media_type", [
+    ("application/vnd.futures-data.columnar+json", "application/vnd.futures-data.columnar+json"),
+    ("application/msgpack", "application/msgpack"),
+    ("application/vnd.apache.arrow.stream, application/json;q=0.5", "application/vnd.apache.arrow.stream"),
+])
+def test_get_futures_data_formats(async_futures_data_service_mock: MagicMock, futures_data_cache: FuturesDataCacheRepositoryRedis, accept: str, media_type: str):
+    app.dependency_overrides[get_async_futures_data_service] = lambda: async_futures_data_service_mock
+    async_futures_data_service_mock.make_dataframe.side_effect = lambda asset_name, trade_dates, versions=None: pd.DataFrame({
+        "trade_date": [datetime(2023, 1, 1).date(), datetime(2023, 1, 2).date()],
+        "month": [datetime(2023, 2, 1), datetime(2023, 3, 1)],
+        "settle": [1500.5, None],
+        "volume": [100, 200],
+        "open_interest": [10, 20]
+    })
+    async_futures_data_service_mock.add_settlement_spread.side_effect = lambda df: df
+    async_futures_data_service_mock.fetch_versions.return_value = []
+    async_futures_data_service_mock.is_finalized.return_value = False
+
+    response = client.get("/futures-data/gold?trade_dates=2023-01-01&trade_dates=2023-01-02", headers={"Accept": accept})
+    records_response = client.get("/futures-data/gold?trade_dates=2023-01-01&trade_dates=2023-01-02")
+    cached_response = client.get("/futures-data/gold?trade_dates=2023-01-01&trade_dates=2023-01-02", headers={"Accept": accept})
+    app.dependency_overrides.clear()
+
+    assert response.status_code == 200
+    assert response.headers["Content-Type"] == media_type
+    assert response.headers["Vary"] == "Accept"
+    # フォーマットごとにキャッシュとETagが分かれる
+    assert cached_response.content == response.content
+    assert records_response.headers["Content-Type"] == "application/json"
+    assert records_response.headers["ETag"] != response.headers["ETag"]
+    assert async_futures_data_service_mock.make_dataframe.call_count == 2
+
+    expected_columns = {
+        "trade_date": ["2023-01-01", "2023-01-02"],
+        "month": ["2023-02", "2023-03"],
+        "settle": [1500.5, None],
+        "volume": [100, 200],
+        "open_interest": [10, 20]
+    }
+    if media_type == "application/vnd.apache.arrow.stream":
+        # Arrowでは取引日は文字列ではなくdate32型になる
+        assert pa.ipc.open_stream(response.content).read_all().to_pydict() == {**expected_columns, "trade_date": [datetime(2023, 1, 1).date(), datetime(2023, 1, 2).date()]}
+    elif media_type == "application/msgpack":
+        assert msgpack.unpackb(response.content) == {"data": expected_columns}
+    else:
+        assert response.json() == {"data": expected_columns}
+
+
+def test_get_futures_data_not_acceptable(async_futures_data_service_mock: MagicMock):
+    app.dependency_overrides[get_async_futures_data_service] = lambda: async_futures_data_service_mock
+
+    response = client.get("/futures-data/gold?trade_dates=2023-01-01", headers={"Accept": "text/html, application/json;q=0"})
+    app.dependency_overrides.clear()
+
+    assert response.status_code == 406
+    assert "application/msgpack" in response.json()["detail"]
+    async_futures_data_service_mock.make_dataframe.assert_not_called()
+
+
+def _make_export_frames(asset_name: str, start_date, end_date):
+    yield pd.DataFrame({"trade_date": [datetime(2023, 1, 1).date()], "month": ["2023-02"], "settle": [1500.0], "volume": [100], "open_interest": [10]})
+    yield pd.DataFrame({"trade_date": [datetime(2023, 1, 2).date()], "month": ["2023-03"], "settle": [1600.0], "volume": [200], "open_interest": [20]})
+
+
+def test_export_futures_data_ndjson(futures_data_service_mock: MagicMock):
+    app.dependency_overrides[get_futures_data_service] = lambda: futures_data_service_mock
+    futures_data_service_mock.iter_export_frames.side_effect = _make_export_frames
+
+    response = client.get("/futures-data/gold/export?start_date=2023-01-01&end_date=2023-01-31", headers={"Accept-Encoding": "identity"})
+    app.dependency_overrides.clear()
+
+    assert response.status_code == 200
+    assert response.headers["Content-Type"] == "application/x-ndjson"
+    assert "Content-Encoding" not in response.headers
+    assert [json.loads(line) for line in response.text.splitlines()] == expected_response_data["data"]
+    futures_data_service_mock.iter_export_frames.assert_called_once_with('gold', datetime(2023, 1, 1).date(), datetime(2023, 1, 31).date())
+
+
+def test_export_futures_data_csv_gzip(futures_data_service_mock: MagicMock):
+    app.dependency_overrides[get_futures_data_service] = lambda: futures_data_service_mock
+    futures_data_service_mock.iter_export_frames.side_effect = _make_export_frames
+
+    response = client.get("/futures-data/gold/export?format=csv", headers={"Accept-Encoding": "gzip"})
+    app.dependency_overrides.clear()
+
+    assert response.status_code == 200
+    assert response.headers["Content-Type"] == "text/csv; charset=utf-8"
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert response.headers["Content-Disposition"] == 'attachment; filename="gold.csv"'
+    # TestClientはgzipを展開してから返す
+    assert response.text == "trade_date,month,settle,volume,open_interest\n2023-01-01,2023-02,1500.0,100,10\n2023-01-02,2023-03,1600.0,200,20\n"
+    futures_data_service_mock.iter_export_frames.assert_called_once_with('gold', None, None)
+
+
+def test_export_futures_data_no_data_found(futures_data_service_mock: MagicMock):
+    app.dependency_overrides[get_futures_data_service] = lambda: futures_data_service_mock
+    futures_data_service_mock.iter_export_frames.return_value = iter([])
+
+    response = client.get("/futures-data/gold/export")
+    app.dependency_overrides.clear()
+
+    assert response.status_code == 404
+    assert "No data found for the given parameters." in response.json()["detail"]
+
+
+def test_export_futures_data_invalid_input(futures_data_service_mock: MagicMock):
+    app.dependency_overrides[get_futures_data_service] = lambda: futures_data_service_mock
+    futures_data_service_mock.iter_export_frames.side_effect = InvalidInputError("開始日は終了日以前でなければなりません。")
+
+    response = client.get("/futures-data/gold/export?start_date=2023-01-31&end_date=2023-01-01")
+    invalid_format_response = client.get("/futures-data/gold/export?format=xml")
+    app.dependency_overrides.clear()
+
+    assert response.status_code == 400
+    assert invalid_format_response.status_code == 422
 
 
 def test_get_futures_data_invalid_input_date_format():
@@ -86,12 +313,16 @@ def test_get_futures_data_missing_asset_name():
     assert response.status_code == 404  # 資産名がURLパスに含まれていないため、404 Not Foundが適切
 
 
-def test_get_futures_data_no_data_found(futures_data_service_mock: MagicMock):
+def test_get_futures_data_no_data_found(async_futures_data_service_mock: MagicMock):
     # データが見つからない場合のテスト
-    futures_data_service_mock.make_dataframe.return_value = pd.DataFrame()
+    app.dependency_overrides[get_async_futures_data_service] = lambda: async_futures_data_service_mock
+    async_futures_data_service_mock.fetch_versions.return_value = []
+    async_futures_data_service_mock.is_finalized.return_value = False
+    async_futures_data_service_mock.make_dataframe.return_value = pd.DataFrame()
 
     # APIエンドポイントのテスト実行
     response = client.get("/futures-data/gold?trade_dates=2023-01-01")
+    app.dependency_overrides.clear()
 
     # レスポンスの検証
     assert response.status_code == 404  # 404 Not Foundが適切
@@ -110,11 +341,11 @@ def test_get_futures_data_future_trade_date():
     assert "取引日は過去または今日でなければなりません。" in response.json().get("detail")
 
 
-def test_get_futures_data_server_error(futures_data_service_mock: MagicMock):
-    app.dependency_overrides[get_futures_data_service] = lambda: futures_data_service_mock
-    futures_data_service_mock.make_dataframe.return_value = test_data
+def test_get_futures_data_server_error(async_futures_data_service_mock: MagicMock):
+    app.dependency_overrides[get_async_futures_data_service] = lambda: async_futures_data_service_mock
+    async_futures_data_service_mock.make_dataframe.return_value = test_data
     # 内部サーバーエラーをシミュレートするために、エラーを発生させる
-    futures_data_service_mock.make_dataframe.side_effect = Exception("Unexpected error")
+    async_futures_data_service_mock.make_dataframe.side_effect = Exception("Unexpected error")
 
     # エンドポイントへのリクエストを実行
     response = client.get("/futures-data/gold?trade_dates=2023-01-01")
@@ -0,0 +1,75 @@
+# tests/application/web/api/test_health_router.py
+import asyncio
+import pytest
+from fastapi.testclient import TestClient
+
+import src.main
+from src.application.web.api.dependencies import get_warm_up_state
+from src.application.web.api.warm_up import WarmUpState
+from src.main import app
+
+
+client = TestClient(app)
+
+
+@pytest.fixture
+def warm_up_state(monkeypatch: pytest.MonkeyPatch):
+    # 取り込みイベントの受信はtest_ingest_event_subscriber.pyでテストする
+    monkeypatch.setenv("INGEST_EVENTS_ENABLED", "false")
+    state = WarmUpState()
+    app.dependency_overrides[get_warm_up_state] = lambda: state
+    monkeypatch.setattr(src.main, "get_warm_up_state", lambda: state)
+    yield state
+    app.dependency_overrides.pop(get_warm_up_state, None)
+
+
+def test_get_liveness():
+    response = client.get("/health/live")
+
+    assert response.status_code == 200
+    assert response.json() == {"status": "ok"}
+
+
+def test_get_readiness(warm_up_state: WarmUpState):
+    # ウォームアップが終わるまでは503
+    warm_up_state.start()
+    response = client.get("/health/ready")
+    assert response.status_code == 503
+    assert response.json()["ready"] is False
+
+    warm_up_state.payloads = 3
+    warm_up_state.finish()
+    response = client.get("/health/ready")
+    assert response.status_code == 200
+    assert response.json()["ready"] is True
+    assert response.json()["payloads"] == 3
+    assert response.json()["elapsed_ms"] >= 0
+
+
+def test_lifespan_runs_warm_up_in_background(monkeypatch: pytest.MonkeyPatch, warm_up_state: WarmUpState):
+    monkeypatch.setenv("WARM_UP_ENABLED", "true")
+    cancelled = []
+
+    async def run_warm_up():
+        warm_up_state.start()
+        try:
+            await asyncio.sleep(60)
+        except asyncio.CancelledError:
+            cancelled.append(True)
+            raise
+    monkeypatch.setattr(src.main, "run_warm_up", run_warm_up)
+
+    # ウォームアップ中もリクエストを受け付け、readinessのみ失敗させる
+    with TestClient(app) as lifespan_client:
+        assert lifespan_client.get("/health/live").status_code == 200
+        assert lifespan_client.get("/health/ready").status_code == 503
+
+    # 終了時に実行中のウォームアップをキャンセルする
+    assert cancelled == [True]
+
+
+def test_lifespan_without_warm_up(monkeypatch: pytest.MonkeyPatch, warm_up_state: WarmUpState):
+    monkeypatch.setenv("WARM_UP_ENABLED", "false")
+
+    with TestClient(app) as lifespan_client:
+        assert lifespan_client.get("/health/ready").status_code == 200
@@ -0,0 +1,105 @@
+# tests/application/web/api/test_ingest_event_subscriber.py
+import fakeredis
+import threading
+import time
+from datetime import date
+from unittest.mock import MagicMock
+
+from src.application.web.api import dependencies
+from src.application.web.api.ingest_event_subscriber import IngestEventSubscriber
+from src.domain.repositories.futures_data_cache_repository import FuturesDataCacheEntry, FuturesDataCacheRepository
+from src.domain.repositories.ingest_event_repository import SETTLEMENT_KIND, VOLUME_OI_KIND, IngestEvent
+from src.infrastructure.cache.asset_registry import AssetRegistry
+from src.infrastructure.cache.local_futures_data_cache_repository import LocalFuturesDataCacheRepository
+from src.infrastructure.redis.ingest_event_repository_redis import IngestEventRepositoryRedis
+
+
+class _BlockingIngestEventRepository(IngestEventRepositoryRedis):
+    # fakeredisのXREADはBLOCKで待たないため、イベントがない場合はblock_msだけ待つ
+    def read(self, last_id: str, block_ms: int):
+        result = super().read(last_id, block_ms)
+        if result is not None and not result[1]:
+            time.sleep(block_ms / 1000)
+        return result
+
+
+def _wait_until(condition, timeout: float = 2.0) -> None:
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert condition()
+
+
+def _repository(server: fakeredis.FakeServer) -> IngestEventRepositoryRedis:
+    repo = _BlockingIngestEventRepository()
+    repo.redis_client = fakeredis.FakeStrictRedis(server=server)
+    return repo
+
+
+def test_subscriber_handles_events_published_after_start():
+    server = fakeredis.FakeServer()
+    publisher = _repository(server)
+    publisher.publish(IngestEvent(1, date(2024, 3, 7), SETTLEMENT_KIND, True))
+    received: list[IngestEvent] = []
+    connected = threading.Event()
+    subscriber = IngestEventSubscriber(_repository(server), received.append, on_connect=connected.set, block_ms=10, retry_interval=0.01)
+
+    subscriber.start()
+    try:
+        assert connected.wait(2)
+        event = IngestEvent(1, date(2024, 3, 8), VOLUME_OI_KIND, False)
+        publisher.publish(event)
+        _wait_until(lambda: received == [event])
+    finally:
+        subscriber.stop()
+
+    # 起動前に発行されたイベントは読み込まない
+    assert received == [IngestEvent(1, date(2024, 3, 8), VOLUME_OI_KIND, False)]
+
+
+def test_subscriber_reconnects_without_missing_events():
+    server = fakeredis.FakeServer()
+    publisher = _repository(server)
+    handler = MagicMock(side_effect=[Exception("handler error"), None])
+    on_disconnect = MagicMock()
+    subscriber = IngestEventSubscriber(_repository(server), handler, on_disconnect=on_disconnect, block_ms=10, retry_interval=0.01)
+
+    subscriber.start()
+    try:
+        _wait_until(lambda: subscriber._connected)
+        server.connected = False
+        _wait_until(lambda: on_disconnect.call_count == 1)
+        # 切断中に発行されたイベントも、再接続後に読み込む
+        server.connected = True
+        publisher.publish(IngestEvent(1, date(2024, 3, 8), SETTLEMENT_KIND, True))
+        publisher.publish(IngestEvent(2, date(2024, 3, 8), SETTLEMENT_KIND, True))
+        # handlerの例外で、後続のイベントの処理を止めない
+        _wait_until(lambda: handler.call_count == 2)
+    finally:
+        subscriber.stop()
+
+    assert handler.call_args.args[0].asset_id == 2
+
+
+def test_evict_ingested_futures_data(monkeypatch):
+    redis_cache = MagicMock(spec=FuturesDataCacheRepository)
+    redis_cache.fetch.return_value = None
+    local_cache = LocalFuturesDataCacheRepository(redis_cache, final_ttl=60, preliminary_ttl=60)
+    local_cache.activate()
+    entry = FuturesDataCacheEntry(payload=b'payload', is_final=True, etag='"etag"')
+    for asset_name in ("Gold", "Silver"):
+        local_cache.save(asset_name, [date(2024, 3, 8)], 'records', entry)
+    asset_registry = AssetRegistry(check_interval=60)
+    monkeypatch.setattr(dependencies, "_futures_data_cache_repository", local_cache)
+    monkeypatch.setattr(dependencies, "_asset_registry", asset_registry)
+
+    # 資産の一覧を読み込む前は、資産名が分からないため取引日の全ての資産を削除する
+    dependencies._evict_ingested_futures_data(IngestEvent(1, date(2024, 3, 8), SETTLEMENT_KIND, True))
+    assert local_cache.fetch("Silver", [date(2024, 3, 8)], 'records') is None
+
+    local_cache.save("Silver", [date(2024, 3, 8)], 'records', entry)
+    local_cache.save("Gold", [date(2024, 3, 8)], 'records', entry)
+    asset_registry.get(lambda: [(1, "Gold"), (2, "Silver")])
+    dependencies._evict_ingested_futures_data(IngestEvent(1, date(2024, 3, 8), SETTLEMENT_KIND, True))
+    assert local_cache.fetch("Gold", [date(2024, 3, 8)], 'records') is None
+    assert local_cache.fetch("Silver", [date(2024, 3, 8)], 'records') == entry
@@ -4,32 +4,33 @@ from unittest.mock import MagicMock, patch
 from datetime import date
 import pytest
 
-from src.application.web.api.dependencies import get_trade_date_service
+from src.application.web.api.dependencies import get_async_trade_date_service
 from src.main import app  # Your FastAPI application instance
 from src.domain.entities.trade_date_entity import TradeDateEntity
 from src.domain.exceptions.invalid_input_error import InvalidInputError
 from src.domain.exceptions.repository_error import RepositoryError
-from src.domain.services.trade_date_service import TradeDateService
+from src.domain.repositories.trade_date_repository import TradeDatesVersion
+from src.domain.services.trade_date_service import AsyncTradeDateService
 
 client = TestClient(app)
 
-# Fixture to mock TradeDateService
+# Fixture to mock AsyncTradeDateService
 @pytest.fixture
 def trade_date_service_mock():
-    service_mock = MagicMock(spec=TradeDateService)
+    service_mock = MagicMock(spec=AsyncTradeDateService)
     return service_mock
 
 @pytest.fixture
 def get_trade_date_service_mock(trade_date_service_mock: MagicMock):
-    # get_trade_date_service が返すべき関数をモックする
+    # get_async_trade_date_service が返すべき関数をモックする
     def _mock_dependency(graph_type: str):
         return trade_date_service_mock
     return _mock_dependency
 
 @pytest.fixture(autouse=True)
 def override_get_trade_date_service(get_trade_date_service_mock: MagicMock):
-    # get_trade_date_service 依存関係をモックに置き換える
-    app.dependency_overrides[get_trade_date_service] = lambda: get_trade_date_service_mock
+    # get_async_trade_date_service 依存関係をモックに置き換える
+    app.dependency_overrides[get_async_trade_date_service] = lambda: get_trade_date_service_mock
     yield
     app.dependency_overrides.clear()
 
@@ -42,8 +43,47 @@ def test_get_trade_dates_success(trade_date_service_mock: MagicMock):
     response = client.get("/trade-dates/?graph_type=futures&asset_name=Gold&start_date=2023-01-01&end_date=2023-01-01&skip=0&limit=10")
 
     assert response.status_code == 200
-    assert response.json() == {"trade_dates": ["2023-01-01"]}
-    trade_date_service_mock.fetch_trade_dates.assert_called_once_with("Gold", date(2023, 1, 1), date(2023, 1, 1), 0, 10)
+    assert response.json() == {"trade_dates": ["2023-01-01"], "next_after": None}
+    trade_date_service_mock.fetch_trade_dates.assert_called_once_with("Gold", date(2023, 1, 1), date(2023, 1, 1), 0, 10, None)
+    assert response.headers["Cache-Control"] == "no-cache"
+    assert "ETag" in response.headers
+
+def test_get_trade_dates_not_modified(trade_date_service_mock: MagicMock):
+    trade_date_service_mock.fetch_trade_dates.return_value = [TradeDateEntity(date(2023, 1, 1))]
+    trade_date_service_mock.fetch_trade_dates_version.return_value = TradeDatesVersion(1, date(2023, 1, 1), date(2023, 1, 1))
+    url = "/trade-dates/?graph_type=futures&asset_name=Gold&start_date=2023-01-01&end_date=2023-01-01"
+
+    etag = client.get(url).headers["ETag"]
+    response = client.get(url, headers={"If-None-Match": etag})
+
+    assert response.status_code == 304
+    assert response.headers["ETag"] == etag
+    # 取引日のリストは再取得しない
+    trade_date_service_mock.fetch_trade_dates.assert_called_once()
+
+    # 取引日が追加された場合は、新しいリストを返す
+    trade_date_service_mock.fetch_trade_dates_version.return_value = TradeDatesVersion(2, date(2023, 1, 1), date(2023, 1, 2))
+    response = client.get(url, headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
+
+def test_get_trade_dates_keyset_pagination(trade_date_service_mock: MagicMock):
+    trade_date_service_mock.fetch_trade_dates.return_value = [TradeDateEntity(date(2023, 1, 3)), TradeDateEntity(date(2023, 1, 4))]
+    trade_date_service_mock.fetch_trade_dates_version.return_value = TradeDatesVersion(4, date(2023, 1, 1), date(2023, 1, 4))
+
+    response = client.get("/trade-dates/?graph_type=futures&asset_name=Gold&after=2023-01-02&limit=2")
+    first_page_response = client.get("/trade-dates/?graph_type=futures&asset_name=Gold&limit=2")
+
+    assert response.status_code == 200
+    # 件数がlimitに達した場合は、次のページのafterを返す
+    assert response.json() == {"trade_dates": ["2023-01-03", "2023-01-04"], "next_after": "2023-01-04"}
+    trade_date_service_mock.fetch_trade_dates.assert_any_call("Gold", None, None, 0, 2, date(2023, 1, 2))
+    # afterが異なるページは異なるETagになる
+    assert first_page_response.headers["ETag"] != response.headers["ETag"]
+
+    trade_date_service_mock.fetch_trade_dates.return_value = [TradeDateEntity(date(2023, 1, 5))]
+    last_page_response = client.get("/trade-dates/?graph_type=futures&asset_name=Gold&after=2023-01-04&limit=2")
+    assert last_page_response.json() == {"trade_dates": ["2023-01-05"], "next_after": None}
 
 def test_get_trade_dates_invalid_input(trade_date_service_mock: MagicMock):
     trade_date_service_mock.fetch_trade_dates.side_effect = InvalidInputError("Invalid asset name.")
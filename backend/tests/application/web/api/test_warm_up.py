@@ -0,0 +1,187 @@
+# tests/application/web/api/test_warm_up.py
+import asyncio
+import fakeredis
+import pandas as pd
+import pytest
+from contextlib import asynccontextmanager
+from datetime import date, datetime
+from fastapi.testclient import TestClient
+from unittest.mock import AsyncMock, MagicMock
+
+from src.application.web.api import warm_up as warm_up_module
+from src.application.web.api.dependencies import get_async_futures_data_service, get_futures_data_cache_repository
+from src.application.web.api.warm_up import WarmUpSettings, WarmUpState, warm_up, warm_up_once_per_pod
+from src.domain.entities.trade_date_entity import TradeDateEntity
+from src.domain.services.futures_data_service import AsyncFuturesDataService
+from src.domain.services.trade_date_service import AsyncTradeDateService
+from src.infrastructure.cache.asset_registry import AssetRegistry
+from src.infrastructure.database.models import Asset as AssetModel
+from src.infrastructure.redis.futures_data_cache_repository_redis import FuturesDataCacheRepositoryRedis
+from src.infrastructure.redis.single_flight_repository_redis import SingleFlightRepositoryRedis
+from src.main import app
+
+
+TRADE_DATES = [date(2023, 1, 2), date(2023, 1, 3)]
+
+test_data = pd.DataFrame({
+    "trade_date": [datetime(2023, 1, 3).date()],
+    "month": [datetime(2023, 2, 1)],
+    "settle": [1500],
+    "volume": [100],
+    "open_interest": [10]
+})
+
+
+@asynccontextmanager
+async def _session():
+    yield MagicMock()
+
+
+@pytest.fixture
+def futures_data_cache():
+    cache = FuturesDataCacheRepositoryRedis()
+    cache.redis_client = fakeredis.FakeStrictRedis(server=fakeredis.FakeServer())
+    return cache
+
+
+@pytest.fixture
+def futures_data_service():
+    service = MagicMock(spec=AsyncFuturesDataService)
+    service.fetch_versions.return_value = [(date(2023, 1, 3), datetime(2023, 1, 4, 12, 0, 0), True)]
+    service.is_finalized.return_value = True
+    # 月の列は変換時に書き換えられるため、呼び出しごとに新しいDataFrameを返す
+    service.make_dataframe.side_effect = lambda *args, **kwargs: test_data.copy()
+    service.add_settlement_spread.side_effect = lambda df: df
+    return service
+
+
+@pytest.fixture
+def trade_date_service():
+    service = MagicMock(spec=AsyncTradeDateService)
+    service.fetch_latest_trade_dates.return_value = [TradeDateEntity(trade_date=trade_date) for trade_date in TRADE_DATES]
+    return service
+
+
+@pytest.fixture
+def asset_repository():
+    repository = AsyncMock()
+    repository.fetch_all.return_value = [AssetModel(id=1, name="Gold"), AssetModel(id=2, name="Silver")]
+    return repository
+
+
+@pytest.fixture(autouse=True)
+def patch_services(monkeypatch: pytest.MonkeyPatch, futures_data_service: MagicMock, trade_date_service: MagicMock, asset_repository: AsyncMock):
+    monkeypatch.setattr(warm_up_module, "AsyncAssetRepositoryMysql", lambda session: asset_repository)
+    monkeypatch.setattr(warm_up_module, "AsyncFuturesDataService", lambda *args: futures_data_service)
+    monkeypatch.setattr(warm_up_module, "AsyncTradeDateService", lambda *args: trade_date_service)
+
+
+def _run_warm_up(state: WarmUpState, asset_registry: AssetRegistry, futures_data_cache: FuturesDataCacheRepositoryRedis, **settings) -> None:
+    settings = WarmUpSettings(**{'trade_dates_per_asset': 2, 'formats': ('records',), 'concurrency': 2, 'budget': 5, **settings})
+    asyncio.run(warm_up(state, asset_registry, futures_data_cache, settings=settings, session_factory=_session))
+
+
+def test_warm_up_caches_latest_trade_dates(futures_data_cache: FuturesDataCacheRepositoryRedis, futures_data_service: MagicMock, trade_date_service: MagicMock):
+    state = WarmUpState()
+    asset_registry = AssetRegistry(max_age=60)
+
+    _run_warm_up(state, asset_registry, futures_data_cache, formats=('records', 'msgpack'))
+
+    snapshot = state.snapshot()
+    assert snapshot['ready'] and not snapshot['timed_out']
+    # 2資産 x 2取引日 x 2フォーマット
+    assert (snapshot['assets'], snapshot['payloads'], snapshot['failures']) == (2, 8, 0)
+    assert asset_registry.get(lambda: []).ids_by_name == {"Gold": 1, "Silver": 2}
+    trade_date_service.fetch_latest_trade_dates.assert_any_await("Gold", 2)
+    for trade_date in TRADE_DATES:
+        assert futures_data_cache.fetch("Silver", [trade_date], 'msgpack') is not None
+
+    # APIは、ウォームアップで保存したレスポンスをDBに問い合わせずに返す
+    futures_data_service.make_dataframe.reset_mock()
+    app.dependency_overrides[get_async_futures_data_service] = lambda: futures_data_service
+    app.dependency_overrides[get_futures_data_cache_repository] = lambda: futures_data_cache
+    try:
+        response = TestClient(app).get("/futures-data/Gold?trade_dates=2023-01-03")
+    finally:
+        app.dependency_overrides.clear()
+
+    assert response.status_code == 200
+    assert response.headers["ETag"] == futures_data_cache.fetch("Gold", [date(2023, 1, 3)], 'records').etag
+    assert response.json()["data"][0]["month"] == "2023-02"
+    futures_data_service.make_dataframe.assert_not_awaited()
+
+
+def test_warm_up_stops_at_budget(futures_data_cache: FuturesDataCacheRepositoryRedis, futures_data_service: MagicMock):
+    async def make_dataframe(*args, **kwargs):
+        await asyncio.sleep(10)
+    futures_data_service.make_dataframe.side_effect = make_dataframe
+    state = WarmUpState()
+
+    _run_warm_up(state, AssetRegistry(max_age=60), futures_data_cache, budget=0.05)
+
+    # 制限時間を超えた場合も、readyにする
+    snapshot = state.snapshot()
+    assert snapshot['ready'] and snapshot['timed_out']
+    assert snapshot['payloads'] == 0
+    assert snapshot['elapsed_ms'] < 5000
+
+
+def test_warm_up_continues_after_failures(futures_data_cache: FuturesDataCacheRepositoryRedis, trade_date_service: MagicMock, asset_repository: AsyncMock):
+    asset_repository.fetch_all.return_value = [AssetModel(id=1, name="Gold"), AssetModel(id=2, name="Silver"), AssetModel(id=3, name="Copper")]
+    trade_date_service.fetch_latest_trade_dates.side_effect = [[], [TradeDateEntity(trade_date=TRADE_DATES[0])], Exception("DB Error")]
+    state = WarmUpState()
+
+    _run_warm_up(state, AssetRegistry(max_age=60), futures_data_cache, concurrency=1)
+
+    snapshot = state.snapshot()
+    assert snapshot['ready']
+    assert (snapshot['assets'], snapshot['payloads'], snapshot['failures']) == (2, 1, 1)
+
+
+def test_warm_up_without_assets(futures_data_cache: FuturesDataCacheRepositoryRedis, asset_repository: AsyncMock, trade_date_service: MagicMock):
+    asset_repository.fetch_all.return_value = []
+    state = WarmUpState()
+
+    _run_warm_up(state, AssetRegistry(max_age=60), futures_data_cache)
+
+    assert state.ready
+    trade_date_service.fetch_latest_trade_dates.assert_not_awaited()
+
+
+def test_warm_up_once_per_pod(futures_data_cache: FuturesDataCacheRepositoryRedis, trade_date_service: MagicMock):
+    lock_repository = SingleFlightRepositoryRedis()
+    lock_repository.redis_client = fakeredis.FakeStrictRedis(server=fakeredis.FakeServer())
+    settings = WarmUpSettings(trade_dates_per_asset=2, formats=('records',), concurrency=2, budget=5)
+    states = [WarmUpState() for _ in range(3)]
+
+    async def run_workers():
+        await asyncio.gather(*(
+            warm_up_once_per_pod(state, lock_repository, AssetRegistry(max_age=60), futures_data_cache, settings=settings, session_factory=_session, lock_key="warm-up:pod-1", poll_interval=0.01)
+            for state in states
+        ))
+
+    asyncio.run(run_workers())
+
+    # 同じPodの3ワーカーのうち1つのみがウォームアップを実行し、全てのワーカーが同じ進捗でreadyになる
+    assert trade_date_service.fetch_latest_trade_dates.await_count == 2
+    for state in states:
+        snapshot = state.snapshot()
+        assert snapshot['ready']
+        assert (snapshot['assets'], snapshot['payloads'], snapshot['failures']) == (2, 4, 0)
+    assert not lock_repository.redis_client.exists("single-flight:lock:warm-up:pod-1")
+
+
+def test_warm_up_once_per_pod_without_redis(futures_data_cache: FuturesDataCacheRepositoryRedis, trade_date_service: MagicMock):
+    # Redisに接続できない場合は、ロックを取得できず他のワーカーの実行も確認できないため、このワーカーで実行する
+    lock_repository = MagicMock(spec=SingleFlightRepositoryRedis)
+    lock_repository.acquire.return_value = None
+    lock_repository.poll_result.return_value = (None, False)
+    settings = WarmUpSettings(trade_dates_per_asset=2, formats=('records',), concurrency=2, budget=5)
+    state = WarmUpState()
+
+    asyncio.run(warm_up_once_per_pod(state, lock_repository, AssetRegistry(max_age=60), futures_data_cache, settings=settings, session_factory=_session))
+
+    assert state.snapshot()['ready']
+    assert state.payloads == 4
+    assert trade_date_service.fetch_latest_trade_dates.await_count == 2
+    lock_repository.save_result.assert_not_called()
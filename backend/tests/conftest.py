@@ -1,11 +1,13 @@
 # tests/conftest.py
+import asyncio
 import os
 import pytest
 from alembic.config import Config
 from alembic import command
 from sqlalchemy import Engine, create_engine
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
 from sqlalchemy.orm import sessionmaker, scoped_session, Session
-from typing import Callable
+from typing import Any, Awaitable, Callable
 from _pytest.monkeypatch import MonkeyPatch
 
 from src.domain.helpers.path import get_project_root
@@ -15,7 +17,7 @@ from src.domain.value_objects.password import Password
 from src.domain.value_objects.name import Name
 from src.infrastructure.mock.mock_user_repository import MockUserRepository
 from src.infrastructure.mock.mock_service import MockUserService
-from src.infrastructure.database.database import get_engine, Base
+from src.infrastructure.database.database import get_database_url, get_engine, Base
 from src.settings import setup_logging
 
 
@@ -86,6 +88,20 @@ def db_session(test_session_factory: sessionmaker[Session]):
         session.close()
         SessionLocal.remove()
 
+@pytest.fixture(scope="function")
+def run_with_async_session(test_engine: Engine) -> Callable[[Callable[[AsyncSession], Awaitable[Any]]], Any]:
+    # 非同期のリポジトリのテスト用。aiomysqlのコネクションはイベントループごとに作成する必要があるため、呼び出しごとにエンジンを作成する
+    def _run(query: Callable[[AsyncSession], Awaitable[Any]]) -> Any:
+        async def _main() -> Any:
+            engine = create_async_engine(get_database_url(os.getenv('ASYNC_DRIVER', 'aiomysql')))
+            try:
+                async with AsyncSession(engine) as session:
+                    return await query(session)
+            finally:
+                await engine.dispose()
+        return asyncio.run(_main())
+    return _run
+
 @pytest.fixture(scope="function")
 def test_session():
     # インメモリSQLiteデータベースを作成
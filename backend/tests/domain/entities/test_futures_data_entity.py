@@ -0,0 +1,44 @@
+# tests/domain/entities/test_futures_data_entity.py
+import pytest
+from datetime import date
+
+from src.domain.entities.futures_data_entity import FuturesDataEntity
+from src.domain.value_objects.trade_date import TradeDate
+from src.domain.value_objects.year_month import YearMonth
+
+
+def test_from_db_rows():
+    rows = [
+        (1, "Asset1", date(2024, 3, 8), "2024-04", 1000.5, 100, 1000, "1,000'16"),
+        (1, "Asset1", date(2024, 3, 8), "2024-05", None, 200, 2000, "-"),
+        (1, "Asset1", date(2024, 3, 8), "2024-06", 99.5, 300, 3000, "99.5A"),
+    ]
+
+    entities = FuturesDataEntity.from_db_rows(rows)
+
+    assert entities == [FuturesDataEntity.from_db_row((*row[:4], row[7], *row[5:7])) for row in rows]
+    assert entities[0].trade_date == TradeDate(date(2024, 3, 8))
+    assert entities[0].month == YearMonth(2024, 4)
+    assert entities[0].settle == 1000.5
+    assert entities[1].settle is None
+
+
+def test_from_db_rows_without_settle_value():
+    # 数値カラムが未設定の行は、文字列から変換される
+    rows = [(1, "Asset1", date(2024, 3, 8), "2024-04", None, 100, 1000, "2,468'16A")]
+
+    entities = FuturesDataEntity.from_db_rows(rows)
+
+    assert entities[0].settle == 2468 + 16/32
+
+
+def test_from_db_rows_with_invalid_settle():
+    rows = [(1, "Asset1", date(2024, 3, 8), "2024-04", None, 100, 1000, "abc")]
+
+    with pytest.raises(ValueError) as excinfo:
+        FuturesDataEntity.from_db_rows(rows)
+    assert "Invalid price format: abc" in str(excinfo.value)
+
+
+def test_from_db_rows_empty():
+    assert FuturesDataEntity.from_db_rows([]) == []
@@ -0,0 +1,168 @@
+# tests/domain/helpers/test_single_flight.py
+import asyncio
+import fakeredis
+import pytest
+import threading
+import time
+
+from src.domain.helpers.single_flight import AsyncSingleFlight, SingleFlight, SingleFlightCodec
+from src.infrastructure.redis.single_flight_repository_redis import SingleFlightRepositoryRedis
+
+
+INT_CODEC: SingleFlightCodec[int] = SingleFlightCodec(lambda value: str(value).encode(), lambda payload: int(payload))
+
+
+@pytest.fixture
+def single_flight_repository():
+    repo = SingleFlightRepositoryRedis()
+    repo.redis_client = fakeredis.FakeStrictRedis(server=fakeredis.FakeServer())
+    return repo
+
+
+def test_async_concurrent_calls_share_one_execution():
+    single_flight = AsyncSingleFlight()
+    calls: list[str] = []
+
+    async def compute(key: str):
+        calls.append(key)
+        await asyncio.sleep(0.01)
+        return len(calls)
+
+    async def run():
+        return await asyncio.gather(*(single_flight.do(key, lambda key=key: compute(key)) for key in ["a", "a", "a", "b"]))
+
+    assert asyncio.run(run()) == [2, 2, 2, 2]
+    assert sorted(calls) == ["a", "b"]
+    assert (single_flight.executions, single_flight.shared) == (2, 2)
+
+    # 完了後の呼び出しは再度実行する
+    asyncio.run(single_flight.do("a", lambda: compute("a")))
+    assert len(calls) == 3
+
+
+def test_async_errors_are_shared():
+    single_flight = AsyncSingleFlight()
+
+    async def fail():
+        await asyncio.sleep(0.01)
+        raise ValueError("failed")
+
+    async def run():
+        return await asyncio.gather(single_flight.do("a", fail), single_flight.do("a", fail), return_exceptions=True)
+
+    results = asyncio.run(run())
+    assert all(isinstance(result, ValueError) for result in results)
+    assert single_flight.executions == 1
+
+
+def test_async_cancelled_caller_does_not_cancel_others():
+    single_flight = AsyncSingleFlight()
+
+    async def compute():
+        await asyncio.sleep(0.05)
+        return 1
+
+    async def run():
+        first = asyncio.ensure_future(single_flight.do("a", compute))
+        second = asyncio.ensure_future(single_flight.do("a", compute))
+        await asyncio.sleep(0.01)
+        first.cancel()
+        return await second
+
+    assert asyncio.run(run()) == 1
+
+
+def test_thread_concurrent_calls_share_one_execution():
+    single_flight = SingleFlight()
+    started = threading.Event()
+    release = threading.Event()
+    calls: list[int] = []
+
+    def compute():
+        calls.append(1)
+        started.set()
+        release.wait(5)
+        return 42
+
+    results: list[int] = []
+    leader = threading.Thread(target=lambda: results.append(single_flight.do("a", compute)))
+    leader.start()
+    started.wait(5)
+    followers = [threading.Thread(target=lambda: results.append(single_flight.do("a", compute))) for _ in range(3)]
+    for follower in followers:
+        follower.start()
+    # フォロワーが待機を始めてから完了させる
+    while single_flight.shared < 3:
+        time.sleep(0.001)
+    release.set()
+    for thread in [leader, *followers]:
+        thread.join(5)
+
+    assert results == [42, 42, 42, 42]
+    assert len(calls) == 1
+
+
+def test_thread_errors_are_shared():
+    single_flight = SingleFlight()
+
+    with pytest.raises(ValueError):
+        single_flight.do("a", lambda: (_ for _ in ()).throw(ValueError("failed")))
+    # 失敗した呼び出しは残らない
+    assert single_flight.do("a", lambda: 1) == 1
+
+
+def test_across_workers_follower_receives_saved_result(single_flight_repository: SingleFlightRepositoryRedis):
+    # 2つのワーカーを、同じRedisを使う2つのインスタンスで模す
+    leader = SingleFlight(single_flight_repository, poll_interval=0.001)
+    follower = SingleFlight(single_flight_repository, poll_interval=0.001)
+    started = threading.Event()
+    release = threading.Event()
+
+    def compute():
+        started.set()
+        release.wait(5)
+        return 42
+
+    results: list[int] = []
+    thread = threading.Thread(target=lambda: results.append(leader.do("a", compute, INT_CODEC)))
+    thread.start()
+    started.wait(5)
+
+    follower_thread = threading.Thread(target=lambda: results.append(follower.do("a", lambda: pytest.fail("follower should not execute"), INT_CODEC)))
+    follower_thread.start()
+    time.sleep(0.01)
+    release.set()
+    thread.join(5)
+    follower_thread.join(5)
+
+    assert results == [42, 42]
+    # ロックは解放される
+    assert single_flight_repository.poll_result("a") == (b"42", False)
+
+
+def test_across_workers_follower_executes_when_leader_fails(single_flight_repository: SingleFlightRepositoryRedis):
+    token = single_flight_repository.acquire("a", 1000)
+    assert token is not None
+    follower = AsyncSingleFlight(single_flight_repository, poll_interval=0.001)
+
+    async def compute():
+        return 7
+
+    async def run():
+        task = asyncio.ensure_future(follower.do("a", compute, INT_CODEC))
+        await asyncio.sleep(0.02)
+        # 実行中のワーカーが結果を保存せずにロックを解放した
+        single_flight_repository.release("a", token)
+        return await task
+
+    assert asyncio.run(run()) == 7
+
+
+def test_async_across_workers_saves_result(single_flight_repository: SingleFlightRepositoryRedis):
+    single_flight = AsyncSingleFlight(single_flight_repository)
+
+    async def compute():
+        return 5
+
+    assert asyncio.run(single_flight.do("a", compute, INT_CODEC)) == 5
+    assert single_flight_repository.poll_result("a") == (b"5", False)
@@ -1,7 +1,11 @@
 # tests/domain/logics/test_convert_dataframe.py
+import json
+import msgpack
 import pandas as pd
 import numpy as np
-from src.domain.logics.convert_dataframe import dataframe_to_json, to_year_month_format
+import pyarrow as pa
+from datetime import date
+from src.domain.logics.convert_dataframe import dataframe_from_arrow_ipc, dataframe_to_arrow_ipc, dataframe_to_columnar_json, dataframe_to_json, dataframe_to_msgpack, to_year_month_format
 
 def test_dataframe_to_json():
     # テスト用のDataFrameを作成
@@ -40,3 +44,62 @@ def test_to_year_month_format():
 
     # 結果の検証
     assert np.array_equal(result_df['date'], expected_dates), "Column not converted to year-month format as expected."
+
+
+def _make_futures_dataframe() -> pd.DataFrame:
+    return pd.DataFrame({
+        'trade_date': [date(2024, 3, 8), date(2024, 3, 11)],
+        'month': ['2024-04', '2024-05'],
+        'settle': [2165.3, np.nan],
+        'volume': [120000, 0],
+    })
+
+
+def test_dataframe_to_columnar_json():
+    result = json.loads(dataframe_to_columnar_json(_make_futures_dataframe()))
+
+    # 日付はISO 8601の文字列、NaNはnullになる
+    assert result == {
+        'data': {
+            'trade_date': ['2024-03-08', '2024-03-11'],
+            'month': ['2024-04', '2024-05'],
+            'settle': [2165.3, None],
+            'volume': [120000, 0],
+        }
+    }
+
+
+def test_dataframe_to_columnar_json_keeps_float_precision():
+    values = [0.1 + 0.2, 2468 + 16 / 32, -0.0003125]
+    result = json.loads(dataframe_to_columnar_json(pd.DataFrame({'settle': values})))
+
+    assert result['data']['settle'] == values
+
+
+def test_dataframe_to_msgpack():
+    result = msgpack.unpackb(dataframe_to_msgpack(_make_futures_dataframe()))
+
+    # カラム形式のJSONと同じ内容になる
+    assert result == json.loads(dataframe_to_columnar_json(_make_futures_dataframe()))
+
+
+def test_dataframe_to_arrow_ipc():
+    table = pa.ipc.open_stream(dataframe_to_arrow_ipc(_make_futures_dataframe())).read_all()
+
+    assert table.column_names == ['trade_date', 'month', 'settle', 'volume']
+    assert table.schema.field('volume').type == pa.int64()
+    # pandas固有のメタデータは含めない
+    assert table.schema.metadata is None
+    assert table.to_pydict() == {
+        'trade_date': [date(2024, 3, 8), date(2024, 3, 11)],
+        'month': ['2024-04', '2024-05'],
+        'settle': [2165.3, None],
+        'volume': [120000, 0],
+    }
+
+
+def test_dataframe_from_arrow_ipc():
+    df = _make_futures_dataframe().assign(month=pd.to_datetime(['2024-04', '2024-05'], format='%Y-%m'))
+
+    # 日付はdatetime.date、月はdatetime64[ns]のまま復元される
+    pd.testing.assert_frame_equal(dataframe_from_arrow_ipc(dataframe_to_arrow_ipc(df)), df)
@@ -0,0 +1,117 @@
+# tests/domain/logics/test_convert_price_columns.py
+import math
+import numpy as np
+import pandas as pd
+import pytest
+
+import src.domain.logics.convert_price_columns as convert_price_columns_module
+from src.domain.logics.convert_price_columns import coalesce_price_values, convert_price_columns, convert_price_series, raise_for_invalid_prices
+from src.domain.logics.convert_price_format import convert_price_format
+from src.domain.logics.validate_price_format import validate_price_format
+
+
+PRICE_VALUES = [
+    "-'27", "+'27", "-'010", "+'010", "-5'010", "+5'010", "5'010", "-.27", "+.27", "-27", "+27", "0", "5", "-5",
+    "5.25", "-5.25", "0'27", "0'010", "-", "", None, "1,234", "12,345", "123,456", "1,234,567", "-1,234",
+    "100A", "-100B", "1'16", "-1'16", "1,234A", "-1,234B", "2,468'16A", "-2,468'16B", "1,000'16", "-1,000'16",
+    "-0'27", "5'27.5", "1,234'567",
+    # 不正なフォーマット
+    "5'", "-5'", "abc", "1,234'", "1,234.56.78", "ABC", "A", "-A", "+", "'27", "5'010.5", "1,2345", "12,34",
+    "1,23,456", "123,", ",123", " 5", "5'A", "-123,456",
+]
+
+
+def _convert_by_scalar(value: str | None) -> tuple[float, bool]:
+    # スカラー関数による検証と変換の結果を、(値, 不正かどうか) の形式で返す
+    try:
+        if value is not None:
+            validate_price_format(value)
+        price = convert_price_format(value)
+    except ValueError:
+        return math.nan, True
+    return (math.nan if price is None else price), False
+
+
+@pytest.mark.parametrize("vectorize_min_size", [0, 500])
+def test_convert_price_series_matches_scalar_functions(vectorize_min_size: int, monkeypatch: pytest.MonkeyPatch):
+    # 件数が少なくても配列演算で変換する場合と、スカラー関数で変換する場合の両方を確認する
+    monkeypatch.setattr(convert_price_columns_module, '_VECTORIZE_MIN_SIZE', vectorize_min_size)
+    prices, invalid = convert_price_series(PRICE_VALUES)
+
+    for value, price, is_invalid in zip(PRICE_VALUES, prices, invalid):
+        expected_price, expected_invalid = _convert_by_scalar(value)
+        assert is_invalid == expected_invalid, value
+        # 浮動小数点の誤差も含めて完全に一致することを確認
+        assert (math.isnan(price) and math.isnan(expected_price)) or price == expected_price, value
+
+
+@pytest.mark.parametrize("value,expected", [
+    ("2,468'16A", 2468 + 16/32),
+    ("-'010", -0.0003125),
+    ("-", None),
+    (None, None),
+])
+def test_convert_price_series_values(value: str | None, expected: float | None):
+    prices, invalid = convert_price_series([value])
+    assert not invalid[0]
+    if expected is None:
+        assert np.isnan(prices[0])
+    else:
+        assert prices[0] == expected
+
+
+def test_convert_price_series_with_many_values():
+    # 種類が多い場合は配列演算で変換される
+    values = [f"{sign}{whole:,}{fraction}{suffix}" for sign in ["", "-", "+"] for whole in range(0, 300000, 997) for fraction, suffix in [("", ""), (".25", "A"), ("'16", ""), ("'010", "B")]]
+    assert len(values) > convert_price_columns_module._VECTORIZE_MIN_SIZE
+
+    prices, invalid = convert_price_series(values)
+
+    for value, price, is_invalid in zip(values, prices, invalid):
+        expected_price, expected_invalid = _convert_by_scalar(value)
+        assert is_invalid == expected_invalid, value
+        assert (math.isnan(price) and math.isnan(expected_price)) or price == expected_price, value
+
+
+def test_convert_price_series_empty():
+    prices, invalid = convert_price_series([])
+    assert prices.shape == (0,)
+    assert invalid.shape == (0,)
+
+
+def test_convert_price_columns():
+    df = pd.DataFrame({
+        'month': ['APR 24', 'MAY 24'],
+        'settle': ["1,000'16", "abc"],
+        'change': ["-", "+.25"],
+    }, index=[10, 11])
+
+    converted, invalid = convert_price_columns(df, ['settle', 'change', 'open'])
+
+    assert converted['settle'].dtype == np.float64
+    assert converted.at[10, 'settle'] == 1000.5
+    assert np.isnan(converted.at[11, 'settle'])
+    assert np.isnan(converted.at[10, 'change'])
+    assert converted.at[11, 'change'] == 0.25
+    assert list(converted['month']) == ['APR 24', 'MAY 24']
+    # 元のDataFrameは変更されない
+    assert df.at[10, 'settle'] == "1,000'16"
+    assert list(invalid.columns) == ['settle', 'change']
+    assert invalid['settle'].tolist() == [False, True]
+    assert not invalid['change'].any()
+
+    with pytest.raises(ValueError) as excinfo:
+        raise_for_invalid_prices(df, invalid)
+    assert "Invalid price format for settle: abc" in str(excinfo.value)
+
+
+def test_coalesce_price_values():
+    prices = coalesce_price_values([12.5, None, None], ["12'16", "1,000'16", "-"])
+
+    # 数値がある要素は文字列を変換せずにそのまま使用する
+    assert prices[0] == 12.5
+    assert prices[1] == 1000.5
+    assert np.isnan(prices[2])
+
+    with pytest.raises(ValueError):
+        coalesce_price_values([None], ["abc"])
@@ -1,20 +1,22 @@
 # tests/domain/services/test_auth_service.py
 
+import asyncio
 import pytest
 from jose import jwt
-from unittest.mock import Mock, patch
+from unittest.mock import AsyncMock, Mock, patch
 
 from src.domain.entities.user_entity import UserEntity
 from src.domain.exceptions.credentials_error import CredentialsError
 from src.domain.exceptions.invalid_user_input_error import InvalidUserInputError
 from src.domain.exceptions.repository_error import RepositoryError
 from src.domain.exceptions.user_not_found_error import UserNotFoundError
-from src.domain.services.auth_service import AuthService
+from src.domain.services.auth_service import AsyncAuthService, AuthService
 from src.domain.services.email_service import EmailService
-from src.domain.services.user_service import UserService
+from src.domain.services.user_service import AsyncUserService, UserService
 from src.domain.repositories.temp_user_repository import TempUserRepository
 from src.infrastructure.authentication.jwt_token import create_access_token, verify_token, SECRET_KEY, ALGORITHM
 from src.infrastructure.authentication.verification_token import generate_verification_token
+from src.infrastructure.database.models import User as UserModel
 
 
 @pytest.fixture
@@ -255,3 +257,23 @@ def test_confirm_registration_invalid_user_input(auth_service: AuthService, temp
 
     with pytest.raises(RepositoryError):
         auth_service.confirm_registration(token)
+
+
+def test_async_get_current_user():
+    email = "test@example.com"
+    user_repository = AsyncMock()
+    user_repository.fetch_by_email.return_value = UserModel(id=1, email=email, hashed_password="hashed_password", name="Test User")
+    auth_service = AsyncAuthService(AsyncUserService(user_repository))
+
+    user = asyncio.run(auth_service.get_current_user(create_access_token({"sub": email})))
+
+    assert user.email == email
+    assert user.name == "Test User"
+    user_repository.fetch_by_email.assert_awaited_once()
+
+    # トークンが不正な場合と、ユーザーが存在しない場合
+    with pytest.raises(CredentialsError):
+        asyncio.run(auth_service.get_current_user("invalid.token.value"))
+    user_repository.fetch_by_email.side_effect = ValueError(f"User with email {email} not found")
+    with pytest.raises(UserNotFoundError):
+        asyncio.run(auth_service.get_current_user(create_access_token({"sub": email})))
@@ -1,80 +1,61 @@
 # tests/domain/services/test_futures_data_service.py
+import asyncio
 import pytest
+from contextlib import asynccontextmanager
 from datetime import date, datetime
 import pandas as pd
+from sqlalchemy.exc import OperationalError
 
-from src.domain.entities.futures_data_entity import FuturesDataEntity
 from src.domain.exceptions.dataframe_validation_error import DataFrameValidationError
-from src.domain.services.futures_data_service import FuturesDataService, InvalidInputError, RepositoryError
-from src.domain.repositories.futures_data_repository import FuturesDataRepository
-from src.domain.value_objects.trade_date import TradeDate
-from src.domain.value_objects.year_month import YearMonth
+from src.domain.helpers.single_flight import AsyncSingleFlight
+from src.domain.services.futures_data_service import AsyncFuturesDataService, FuturesDataService, InvalidInputError, RepositoryError
+from src.domain.repositories.asset_repository import AssetRepository, AsyncAssetRepository
+from src.domain.repositories.futures_data_repository import AsyncFuturesDataRepository, FuturesDataRepository, FuturesDataVersion
 from unittest.mock import MagicMock, patch
 
 
+# テスト用の資産 (TestAsset) のid
+ASSET_ID = 1
+
+
+def _asset_repository(asset_id: int | None = ASSET_ID) -> MagicMock:
+    asset_repository = MagicMock(spec=AssetRepository)
+    asset_repository.fetch_id_by_name.return_value = asset_id
+    return asset_repository
+
+
+def _async_asset_repository(asset_id: int | None = ASSET_ID) -> MagicMock:
+    asset_repository = MagicMock(spec=AsyncAssetRepository)
+    asset_repository.fetch_id_by_name.return_value = asset_id
+    return asset_repository
+
+
 @pytest.fixture
 def mock_futures_data_repository():
     mock_repo = MagicMock(spec=FuturesDataRepository)
-    mock_entities_day1 = [
-        FuturesDataEntity(
-            asset_id=1,
-            asset_name="TestAsset",
-            trade_date=TradeDate(date(2024, 3, 8)),
-            month=YearMonth(2024, 4),
-            settle=1234.56,
-            volume=1000,
-            open_interest=2000
-        ),
-        FuturesDataEntity(
-            asset_id=1,
-            asset_name="TestAsset",
-            trade_date=TradeDate(date(2024, 3, 8)),
-            month=YearMonth(2024, 5),
-            settle=1230.00,
-            volume=950,
-            open_interest=1950
-        ),
-    ]
-    mock_entities_day2 = [
-        FuturesDataEntity(
-            asset_id=1,
-            asset_name="TestAsset",
-            trade_date=TradeDate(date(2024, 3, 9)),
-            month=YearMonth(2024, 4),
-            settle=2345.56,
-            volume=1500,
-            open_interest=2100
-        ),
-        FuturesDataEntity(
-            asset_id=1,
-            asset_name="TestAsset",
-            trade_date=TradeDate(date(2024, 3, 9)),
-            month=YearMonth(2024, 5),
-            settle=1430.00,
-            volume=750,
-            open_interest=1250
-        )
+    # futures_curveの (trade_date, month_key, settle, volume, open_interest, settle_spread) の行データ
+    mock_rows = [
+        (date(2024, 3, 8), 202404, 1234.56, 1000, 2000, 0.0),
+        (date(2024, 3, 8), 202405, 1230.00, 950, 1950, -4.56),
+        (date(2024, 3, 9), 202404, 2345.56, 1500, 2100, 0.0),
+        # 清算値がない限月はNaNになる
+        (date(2024, 3, 9), 202405, None, 750, 1250, 0.0),
     ]
-    # fetch_by_asset_and_dateの呼び出しに応じて、異なるデータを返すように設定
-    def side_effect_fetch_by_asset_and_date(asset_name: str, trade_date: date):
-        if trade_date == date(2024, 3, 8):
-            return mock_entities_day1
-        elif trade_date == date(2024, 3, 9):
-            return mock_entities_day2
-        else:
-            return []
-    mock_repo.fetch_by_asset_and_date.side_effect = side_effect_fetch_by_asset_and_date
+    # fetch_by_asset_and_datesの呼び出しに応じて、指定された取引日のデータのみを返すように設定
+    def side_effect_fetch_by_asset_and_dates(asset_id: int, trade_dates: list[date]):
+        return [row for row in mock_rows if row[0] in trade_dates]
+    mock_repo.fetch_by_asset_and_dates.side_effect = side_effect_fetch_by_asset_and_dates
     return mock_repo
 
 
 @pytest.fixture
 def mock_service():
-    return FuturesDataService(futures_data_repository=MagicMock(spec=FuturesDataRepository))
+    return FuturesDataService(futures_data_repository=MagicMock(spec=FuturesDataRepository), asset_repository=_asset_repository())
 
 
 # 正常な動作のテスト
 def test_make_dataframe_success(mock_futures_data_repository: MagicMock):
-    service = FuturesDataService(futures_data_repository=mock_futures_data_repository)
+    service = FuturesDataService(futures_data_repository=mock_futures_data_repository, asset_repository=_asset_repository())
     trade_dates = [date(2024, 3, 8), date(2024, 3, 9)]  # 複数の取引日をテスト
     df = service.make_dataframe("TestAsset", trade_dates)
 
@@ -92,12 +73,67 @@ def test_make_dataframe_success(mock_futures_data_repository: MagicMock):
     expected_df = pd.DataFrame({
         'trade_date': [date(2024, 3, 8), date(2024, 3, 8), date(2024, 3, 9), date(2024, 3, 9)],
         'month': [datetime(2024, 4, 1), datetime(2024, 5, 1), datetime(2024, 4, 1), datetime(2024, 5, 1)],
-        'settle': [1234.56, 1230.00, 2345.56, 1430.00],
+        'settle': [1234.56, 1230.00, 2345.56, float('nan')],
         'volume': [1000, 950, 1500, 750],
-        'open_interest': [2000, 1950, 2100, 1250]
+        'open_interest': [2000, 1950, 2100, 1250],
+        'settle_spread': [0.0, -4.56, 0.0, 0.0]
     })
 
     pd.testing.assert_frame_equal(df.reset_index(drop=True), expected_df.reset_index(drop=True))
+    assert df['month'].dtype == 'datetime64[ns]'
+
+    # 取引日の数に関わらず、リポジトリの呼び出しは1回のみ
+    mock_futures_data_repository.fetch_by_asset_and_dates.assert_called_once_with(ASSET_ID, trade_dates)
+    mock_futures_data_repository.fetch_by_asset_and_date.assert_not_called()
+
+
+# データが見つからない場合のテスト
+def test_make_dataframe_no_data(mock_futures_data_repository: MagicMock):
+    service = FuturesDataService(futures_data_repository=mock_futures_data_repository, asset_repository=_asset_repository())
+    df = service.make_dataframe("TestAsset", [date(2024, 3, 10)])
+
+    assert df.empty
+
+
+# 資産が見つからない場合は、データを取得せずに空の結果を返す
+def test_unknown_asset_returns_empty_results():
+    mock_repo = MagicMock(spec=FuturesDataRepository)
+    service = FuturesDataService(futures_data_repository=mock_repo, asset_repository=_asset_repository(None))
+    async_repo = MagicMock(spec=AsyncFuturesDataRepository)
+    async_service = AsyncFuturesDataService(futures_data_repository=async_repo, asset_repository=_async_asset_repository(None))
+
+    assert service.make_dataframe("UnknownAsset", [date(2024, 3, 8)]).empty
+    assert service.fetch_versions("UnknownAsset", [date(2024, 3, 8)]) == []
+    assert list(service.iter_export_frames("UnknownAsset")) == []
+    assert asyncio.run(async_service.make_dataframe("UnknownAsset", [date(2024, 3, 8)])).empty
+    assert asyncio.run(async_service.fetch_versions("UnknownAsset", [date(2024, 3, 8)])) == []
+    mock_repo.fetch_by_asset_and_dates.assert_not_called()
+    mock_repo.stream_by_asset_and_date_range.assert_not_called()
+    async_repo.fetch_by_asset_and_dates.assert_not_called()
+
+
+# 確定済みの判定のテスト
+@pytest.mark.parametrize("versions,expected", [
+    ([FuturesDataVersion(date(2024, 3, 8), 2, 2, datetime(2024, 3, 9, 1, 0), datetime(2024, 3, 9, 1, 0)), FuturesDataVersion(date(2024, 3, 9), 2, 2, datetime(2024, 3, 10, 0, 0), datetime(2024, 3, 10, 1, 0))], True),
+    # 出来高・建玉に速報値の限月がある
+    ([FuturesDataVersion(date(2024, 3, 8), 2, 2, datetime(2024, 3, 9, 1, 0), datetime(2024, 3, 9, 1, 0)), FuturesDataVersion(date(2024, 3, 9), 2, 1, datetime(2024, 3, 10, 1, 0), datetime(2024, 3, 10, 1, 0))], False),
+    # 清算値のlast_updatedが確定値の公表時刻より前の限月がある
+    ([FuturesDataVersion(date(2024, 3, 8), 2, 2, datetime(2024, 3, 9, 1, 0), datetime(2024, 3, 9, 1, 0)), FuturesDataVersion(date(2024, 3, 9), 2, 2, datetime(2024, 3, 9, 20, 0), datetime(2024, 3, 10, 1, 0))], False),
+    # データがない取引日を含む
+    ([FuturesDataVersion(date(2024, 3, 8), 2, 2, datetime(2024, 3, 9, 1, 0), datetime(2024, 3, 9, 1, 0))], False),
+])
+def test_is_finalized(versions: list[FuturesDataVersion], expected: bool):
+    mock_repo = MagicMock(spec=FuturesDataRepository)
+    mock_repo.fetch_versions_by_asset_and_dates.return_value = versions
+    service = FuturesDataService(futures_data_repository=mock_repo, asset_repository=_asset_repository())
+
+    assert service.is_finalized("TestAsset", [date(2024, 3, 8), date(2024, 3, 9)]) is expected
+    mock_repo.fetch_versions_by_asset_and_dates.assert_called_once_with(ASSET_ID, [date(2024, 3, 8), date(2024, 3, 9)])
+
+    # 取得済みのバージョンを指定した場合はDBに問い合わせない
+    mock_repo.reset_mock()
+    assert service.is_finalized("TestAsset", [date(2024, 3, 8), date(2024, 3, 9)], versions) is expected
+    mock_repo.fetch_versions_by_asset_and_dates.assert_not_called()
 
 
 # 無効な入力値に対するテスト
@@ -108,7 +144,7 @@ def test_make_dataframe_success(mock_futures_data_repository: MagicMock):
     ("TestAsset", ""),  # 取引日が空文字（不適切な型）
 ])
 def test_make_dataframe_invalid_input(asset_name: str, trade_dates: list[date]):
-    service = FuturesDataService(futures_data_repository=MagicMock(spec=FuturesDataRepository))
+    service = FuturesDataService(futures_data_repository=MagicMock(spec=FuturesDataRepository), asset_repository=_asset_repository())
 
     with pytest.raises(InvalidInputError):
         service.make_dataframe(asset_name=asset_name, trade_dates=trade_dates)
@@ -118,12 +154,55 @@ def test_make_dataframe_invalid_input(asset_name: str, trade_dates: list[date]):
 @patch("src.domain.services.futures_data_service.FuturesDataService.make_dataframe")
 def test_make_dataframe_repository_error(mock_make_dataframe: MagicMock):
     mock_make_dataframe.side_effect = RepositoryError("データベース操作中にエラーが発生しました。")
-    service = FuturesDataService(futures_data_repository=MagicMock(spec=FuturesDataRepository))
+    service = FuturesDataService(futures_data_repository=MagicMock(spec=FuturesDataRepository), asset_repository=_asset_repository())
 
     with pytest.raises(RepositoryError):
         service.make_dataframe(asset_name="TestAsset", trade_dates=[date(2024, 3, 8)])
 
 
+# エクスポート用のDataFrameのテスト
+def test_iter_export_frames():
+    mock_repo = MagicMock(spec=FuturesDataRepository)
+    mock_repo.stream_by_asset_and_date_range.return_value = iter([
+        [(date(2024, 3, 8), 202404, 1234.56, 1000, 2000, 0.0), (date(2024, 3, 8), 202405, None, 950, 1950, 0.0)],
+        [(date(2024, 3, 9), 202404, 2345.56, 1500, 2100, 0.0)],
+    ])
+    service = FuturesDataService(futures_data_repository=mock_repo, asset_repository=_asset_repository())
+
+    frames = list(service.iter_export_frames("TestAsset", date(2024, 3, 1), date(2024, 3, 31), batch_size=2))
+
+    # リポジトリのバッチごとにDataFrameが作成される
+    assert [len(df) for df in frames] == [2, 1]
+    pd.testing.assert_frame_equal(frames[0], pd.DataFrame({
+        'trade_date': [date(2024, 3, 8), date(2024, 3, 8)],
+        'month': ["2024-04", "2024-05"],
+        'settle': [1234.56, float('nan')],
+        'volume': [1000, 950],
+        'open_interest': [2000, 1950]
+    }))
+    mock_repo.stream_by_asset_and_date_range.assert_called_once_with(ASSET_ID, date(2024, 3, 1), date(2024, 3, 31), 2)
+
+
+@pytest.mark.parametrize("asset_name,start_date,end_date", [
+    ("", None, None),
+    ("TestAsset", date(2024, 3, 9), date(2024, 3, 8)),
+])
+def test_iter_export_frames_invalid_input(asset_name: str, start_date: date | None, end_date: date | None):
+    service = FuturesDataService(futures_data_repository=MagicMock(spec=FuturesDataRepository), asset_repository=_asset_repository())
+
+    with pytest.raises(InvalidInputError):
+        next(service.iter_export_frames(asset_name, start_date, end_date))
+
+
+def test_iter_export_frames_repository_error():
+    mock_repo = MagicMock(spec=FuturesDataRepository)
+    mock_repo.stream_by_asset_and_date_range.side_effect = OperationalError("SELECT", {}, Exception("connection lost"))
+    service = FuturesDataService(futures_data_repository=mock_repo, asset_repository=_asset_repository())
+
+    with pytest.raises(RepositoryError):
+        next(service.iter_export_frames("TestAsset"))
+
+
 # 正常な入力に対するテスト
 def test_add_settlement_spread_normal(mock_service: FuturesDataService):
     df = pd.DataFrame({
@@ -140,6 +219,21 @@ def test_add_settlement_spread_normal(mock_service: FuturesDataService):
     assert result_df.equals(result_df.sort_values(by=['trade_date', 'month'])), "DataFrameがtrade_dateとmonthで正しくソートされていません。"
 
 
+# futures_curveで計算済みのスプレッドは再計算しない
+def test_add_settlement_spread_precomputed(mock_service: FuturesDataService):
+    df = pd.DataFrame({
+        'trade_date': [date(2024, 1, 1), date(2024, 1, 1)],
+        'month': pd.to_datetime(['2021-02', '2021-01']),
+        'settle': [105, 100],
+        'settle_spread': [5.0, 0.0],
+    })
+
+    result_df = mock_service.add_settlement_spread(df)
+
+    assert result_df['settle_spread'].tolist() == [0.0, 5.0]
+    assert result_df['month'].tolist() == list(pd.to_datetime(['2021-01', '2021-02']))
+
+
 # 空のDataFrameに対するテスト
 def test_add_settlement_spread_empty_df(mock_service: FuturesDataService):
     df = pd.DataFrame()
@@ -168,3 +262,129 @@ def test_add_settlement_spread_invalid_month_type(mock_service: FuturesDataServi
     # ここではTypeErrorを想定していますが、実際のエラーハンドリングに応じて変更してください。
     with pytest.raises(DataFrameValidationError):
         mock_service.add_settlement_spread(df)
+
+
+# 非同期版のサービスのテスト。同期版と同じ結果になることを確認する
+def test_async_make_dataframe_matches_sync(mock_futures_data_repository: MagicMock):
+    async_repo = MagicMock(spec=AsyncFuturesDataRepository)
+    async_repo.fetch_by_asset_and_dates.side_effect = mock_futures_data_repository.fetch_by_asset_and_dates.side_effect
+    service = AsyncFuturesDataService(futures_data_repository=async_repo, asset_repository=_async_asset_repository())
+    trade_dates = [date(2024, 3, 8), date(2024, 3, 9)]
+
+    df = asyncio.run(service.make_dataframe("TestAsset", trade_dates))
+
+    expected_df = FuturesDataService(futures_data_repository=mock_futures_data_repository, asset_repository=_asset_repository()).make_dataframe("TestAsset", trade_dates)
+    pd.testing.assert_frame_equal(df, expected_df)
+    async_repo.fetch_by_asset_and_dates.assert_awaited_once_with(ASSET_ID, trade_dates)
+    assert asyncio.run(service.make_dataframe("TestAsset", [date(2024, 3, 10)])).empty
+
+
+def test_async_make_dataframe_coalesces_concurrent_calls(mock_futures_data_repository: MagicMock):
+    async_repo = MagicMock(spec=AsyncFuturesDataRepository)
+    async_repo.fetch_by_asset_and_dates.side_effect = mock_futures_data_repository.fetch_by_asset_and_dates.side_effect
+    single_flight = AsyncSingleFlight()
+    # リクエストごとにサービスは作成されるが、single_flightはワーカー内で共有される
+    services = [AsyncFuturesDataService(futures_data_repository=async_repo, asset_repository=_async_asset_repository(), single_flight=single_flight) for _ in range(3)]
+
+    async def run():
+        return await asyncio.gather(
+            *(service.make_dataframe("TestAsset", [date(2024, 3, 8), date(2024, 3, 9)]) for service in services),
+            # 取引日の順序が異なっても同じ呼び出しとみなす
+            services[0].make_dataframe("TestAsset", [date(2024, 3, 9), date(2024, 3, 8)])
+        )
+
+    frames = asyncio.run(run())
+
+    assert all(df is frames[0] for df in frames)
+    assert len(frames[0]) == 4
+    async_repo.fetch_by_asset_and_dates.assert_awaited_once()
+
+
+def test_async_make_dataframe_coalesces_only_same_versions(mock_futures_data_repository: MagicMock):
+    async_repo = MagicMock(spec=AsyncFuturesDataRepository)
+    async_repo.fetch_by_asset_and_dates.side_effect = mock_futures_data_repository.fetch_by_asset_and_dates.side_effect
+    service = AsyncFuturesDataService(futures_data_repository=async_repo, asset_repository=_async_asset_repository(), single_flight=AsyncSingleFlight())
+    trade_dates = [date(2024, 3, 8)]
+    before_ingest = [FuturesDataVersion(date(2024, 3, 8), 2, 0, datetime(2024, 3, 8, 20, 0), datetime(2024, 3, 8, 20, 0))]
+    after_ingest = [FuturesDataVersion(date(2024, 3, 8), 2, 2, datetime(2024, 3, 9, 1, 0), datetime(2024, 3, 9, 1, 0))]
+
+    async def run():
+        return await asyncio.gather(
+            service.make_dataframe("TestAsset", trade_dates, versions=before_ingest),
+            service.make_dataframe("TestAsset", trade_dates, versions=list(before_ingest)),
+            # 取り込み後にバージョンを確認した呼び出しは、取り込み前に開始した呼び出しの結果を受け取らない
+            service.make_dataframe("TestAsset", trade_dates, versions=after_ingest),
+        )
+
+    frames = asyncio.run(run())
+
+    assert frames[0] is frames[1]
+    assert frames[2] is not frames[0]
+    assert async_repo.fetch_by_asset_and_dates.await_count == 2
+
+
+def test_async_make_dataframe_survives_cancelled_leader(mock_futures_data_repository: MagicMock):
+    # リクエストのリポジトリは使わず、まとめた取得は専用のセッションのリポジトリで実行する
+    request_repo = MagicMock(spec=AsyncFuturesDataRepository)
+    shared_repo = MagicMock(spec=AsyncFuturesDataRepository)
+    scope_events: list[str] = []
+
+    async def fetch_by_asset_and_dates(asset_id: int, trade_dates: list[date]):
+        await asyncio.sleep(0.05)
+        return mock_futures_data_repository.fetch_by_asset_and_dates(asset_id, trade_dates)
+    shared_repo.fetch_by_asset_and_dates.side_effect = fetch_by_asset_and_dates
+
+    @asynccontextmanager
+    async def repository_scope():
+        scope_events.append('open')
+        try:
+            yield shared_repo
+        finally:
+            scope_events.append('close')
+
+    single_flight = AsyncSingleFlight()
+    services = [
+        AsyncFuturesDataService(futures_data_repository=request_repo, asset_repository=_async_asset_repository(), single_flight=single_flight, repository_scope=repository_scope)
+        for _ in range(2)
+    ]
+
+    async def run():
+        leader = asyncio.ensure_future(services[0].make_dataframe("TestAsset", [date(2024, 3, 8)]))
+        await asyncio.sleep(0)
+        follower = asyncio.ensure_future(services[1].make_dataframe("TestAsset", [date(2024, 3, 8)]))
+        await asyncio.sleep(0.01)
+        # 最初のリクエストのクライアントが切断しても、同じ結果を待つリクエストは結果を受け取る
+        leader.cancel()
+        return await follower
+
+    df = asyncio.run(run())
+
+    assert len(df) == 2
+    request_repo.fetch_by_asset_and_dates.assert_not_called()
+    shared_repo.fetch_by_asset_and_dates.assert_awaited_once()
+    assert scope_events == ['open', 'close']
+
+
+def test_async_is_finalized():
+    versions = [FuturesDataVersion(date(2024, 3, 8), 2, 2, datetime(2024, 3, 9, 1, 0), datetime(2024, 3, 9, 1, 0))]
+    async_repo = MagicMock(spec=AsyncFuturesDataRepository)
+    async_repo.fetch_versions_by_asset_and_dates.return_value = versions
+    service = AsyncFuturesDataService(futures_data_repository=async_repo, asset_repository=_async_asset_repository())
+
+    assert asyncio.run(service.is_finalized("TestAsset", [date(2024, 3, 8)])) is True
+    assert asyncio.run(service.is_finalized("TestAsset", [date(2024, 3, 8), date(2024, 3, 9)], versions)) is False
+    async_repo.fetch_versions_by_asset_and_dates.assert_awaited_once_with(ASSET_ID, [date(2024, 3, 8)])
+
+
+def test_async_make_dataframe_errors():
+    async_repo = MagicMock(spec=AsyncFuturesDataRepository)
+    async_repo.fetch_by_asset_and_dates.side_effect = OperationalError("SELECT", {}, Exception("connection lost"))
+    async_repo.fetch_versions_by_asset_and_dates.side_effect = OperationalError("SELECT", {}, Exception("connection lost"))
+    service = AsyncFuturesDataService(futures_data_repository=async_repo, asset_repository=_async_asset_repository())
+
+    with pytest.raises(InvalidInputError):
+        asyncio.run(service.make_dataframe("", [date(2024, 3, 8)]))
+    with pytest.raises(RepositoryError):
+        asyncio.run(service.make_dataframe("TestAsset", [date(2024, 3, 8)]))
+    with pytest.raises(RepositoryError):
+        asyncio.run(service.fetch_versions("TestAsset", [date(2024, 3, 8)]))
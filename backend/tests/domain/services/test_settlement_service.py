@@ -2,10 +2,16 @@
 import pandas as pd
 import pytest
 from datetime import date, datetime
-from unittest.mock import MagicMock
+from unittest.mock import MagicMock, call, patch
 
 from src.domain.entities.settlement_entity import SettlementEntity
+from src.domain.logics.convert_price_columns import convert_price_series
+from src.domain.logics.date_time_utilities import parse_datetime
 from src.domain.services.settlement_service import SettlementService
+from src.domain.repositories.futures_data_cache_repository import FuturesDataCacheRepository
+from src.domain.repositories.futures_curve_repository import FuturesCurveRepository
+from src.domain.repositories.ingest_event_repository import SETTLEMENT_KIND, IngestEvent, IngestEventRepository
+from src.domain.repositories.trade_date_summary_repository import TradeDateSummaryRepository
 from src.domain.repositories.settlement_repository import SettlementRepository
 from src.domain.value_objects.trade_date import TradeDate
 from src.domain.value_objects.year_month import YearMonth
@@ -42,8 +48,11 @@ def test_save_settlements_from_dataframe(settlement_df: pd.DataFrame, mock_settl
     last_updated = datetime(2024, 3, 7, 12, 0, 0)
     settlement_service.save_settlements_from_dataframe(asset_id=asset_id, trade_date=trade_date, df=settlement_df, last_updated=last_updated)
 
-    assert mock_settlement_repository.create.called
-    create_call_args = mock_settlement_repository.create.call_args[0][0]
+    mock_settlement_repository.create_many.assert_called_once()
+    mock_settlement_repository.create.assert_not_called()
+    created_entities = mock_settlement_repository.create_many.call_args[0][0]
+    assert len(created_entities) == 1
+    create_call_args = created_entities[0]
     assert create_call_args.asset_id == asset_id
     assert create_call_args.trade_date == TradeDate(date(2024, 3, 8))
     assert create_call_args.month == YearMonth(2024, 4)
@@ -51,14 +60,34 @@ def test_save_settlements_from_dataframe(settlement_df: pd.DataFrame, mock_settl
     assert create_call_args.last_updated == last_updated
 
 
+def test_save_settlements_from_dataframe_with_invalid_row(settlement_df: pd.DataFrame, mock_settlement_repository: MagicMock, settlement_service: SettlementService):
+    # 2行目だけが不正なデータ
+    settlement_df = pd.concat([settlement_df, settlement_df], ignore_index=True)
+    settlement_df.at[1, 'month'] = "Invalid Month"
+
+    with pytest.raises(ValueError):
+        settlement_service.save_settlements_from_dataframe(asset_id=1, trade_date="Friday, 08 Mar 2024", df=settlement_df, last_updated=datetime(2024, 3, 7, 12, 0, 0))
+    # 正常な1行目も含めて、DBへの書き込みは行われないことを確認
+    mock_settlement_repository.create_many.assert_not_called()
+
+
+def test_save_settlements_from_dataframe_repository_exception(settlement_df: pd.DataFrame, mock_settlement_repository: MagicMock, settlement_service: SettlementService):
+    mock_settlement_repository.create_many.side_effect = Exception("Insert error")
+
+    with pytest.raises(Exception) as excinfo:
+        settlement_service.save_settlements_from_dataframe(asset_id=1, trade_date="Friday, 08 Mar 2024", df=settlement_df, last_updated=datetime(2024, 3, 7, 12, 0, 0))
+    assert "Insert error" in str(excinfo.value)
+
+
 def test_update_settlements_from_dataframe_success(settlement_df: pd.DataFrame, mock_settlement_repository: MagicMock, settlement_service: SettlementService):
     asset_id = 2
     trade_date = "Friday, 08 Mar 2024"
     last_updated = datetime(2024, 3, 6, 12, 0, 0)
     settlement_service.update_settlements_from_dataframe(asset_id=asset_id, trade_date=trade_date, df=settlement_df, last_updated=last_updated)
 
-    assert mock_settlement_repository.update.called
-    update_call_args = mock_settlement_repository.update.call_args[0][0]
+    # 1行ずつのupdateではなく、upsertでまとめて保存されることを確認
+    mock_settlement_repository.update.assert_not_called()
+    update_call_args = mock_settlement_repository.upsert_many.call_args[0][0][0]
     assert update_call_args.asset_id == asset_id
     assert update_call_args.trade_date == TradeDate(date(2024, 3, 8))
     assert update_call_args.month == YearMonth(2024, 4)
@@ -78,7 +107,7 @@ def test_update_settlements_from_dataframe_with_invalid_data(settlement_df: pd.D
 
 
 def test_update_settlements_from_dataframe_repository_exception(settlement_df: pd.DataFrame, mock_settlement_repository: MagicMock, settlement_service: SettlementService):
-    mock_settlement_repository.update.side_effect = Exception("Update error")
+    mock_settlement_repository.upsert_many.side_effect = Exception("Update error")
     asset_id = 4
     trade_date = "Friday, 08 Mar 2024"
     last_updated = datetime(2024, 3, 7, 12, 0, 0)
@@ -88,6 +117,113 @@ def test_update_settlements_from_dataframe_repository_exception(settlement_df: p
     assert "Update error" in str(excinfo.value)
 
 
+def test_ingest_settlements_from_dataframe(settlement_df: pd.DataFrame, mock_settlement_repository: MagicMock, settlement_service: SettlementService):
+    settlement_df = pd.concat([settlement_df, settlement_df], ignore_index=True)
+    settlement_df.at[1, 'month'] = "MAY 24"
+    last_updated = datetime(2024, 3, 7, 12, 0, 0)
+
+    settlement_service.ingest_settlements_from_dataframe(asset_id=1, trade_date="Friday, 08 Mar 2024", df=settlement_df, last_updated=last_updated)
+
+    mock_settlement_repository.upsert_many.assert_called_once()
+    upserted_entities = mock_settlement_repository.upsert_many.call_args[0][0]
+    assert [entity.month for entity in upserted_entities] == [YearMonth(2024, 4), YearMonth(2024, 5)]
+    assert all(entity.last_updated == last_updated for entity in upserted_entities)
+
+
+def test_ingest_settlements_from_dataframe_with_invalid_row(settlement_df: pd.DataFrame, mock_settlement_repository: MagicMock, settlement_service: SettlementService):
+    settlement_df.at[0, 'settle'] = "invalid"
+
+    with pytest.raises(ValueError):
+        settlement_service.ingest_settlements_from_dataframe(asset_id=1, trade_date="Friday, 08 Mar 2024", df=settlement_df, last_updated=datetime(2024, 3, 7, 12, 0, 0))
+    mock_settlement_repository.upsert_many.assert_not_called()
+
+
+def test_ingest_settlements_from_dataframe_invalidates_futures_data_cache(settlement_df: pd.DataFrame, mock_settlement_repository: MagicMock):
+    futures_data_cache = MagicMock(spec=FuturesDataCacheRepository)
+    settlement_service = SettlementService(mock_settlement_repository, futures_data_cache)
+
+    settlement_service.ingest_settlements_from_dataframe(asset_id=1, trade_date="Friday, 08 Mar 2024", df=settlement_df, last_updated=datetime(2024, 3, 7, 12, 0, 0))
+    futures_data_cache.invalidate.assert_called_once_with(date(2024, 3, 8), 1)
+
+    # 保存に失敗した場合はキャッシュを無効化しない
+    futures_data_cache.reset_mock()
+    mock_settlement_repository.upsert_many.side_effect = Exception("Upsert error")
+    with pytest.raises(Exception):
+        settlement_service.ingest_settlements_from_dataframe(asset_id=1, trade_date="Friday, 08 Mar 2024", df=settlement_df, last_updated=datetime(2024, 3, 7, 12, 0, 0))
+    futures_data_cache.invalidate.assert_not_called()
+
+
+def test_ingest_settlements_from_dataframe_publishes_ingest_event(settlement_df: pd.DataFrame, mock_settlement_repository: MagicMock):
+    ingest_event_repository = MagicMock(spec=IngestEventRepository)
+    settlement_service = SettlementService(mock_settlement_repository, ingest_event_repository=ingest_event_repository)
+
+    settlement_service.ingest_settlements_from_dataframe(asset_id=1, trade_date="Friday, 08 Mar 2024", df=settlement_df, last_updated=datetime(2024, 3, 8, 18, 0, 0))
+    ingest_event_repository.publish.assert_called_once_with(IngestEvent(1, date(2024, 3, 8), SETTLEMENT_KIND, False))
+
+    # 確定値の公表時刻以降に更新された清算値は確定済み
+    ingest_event_repository.reset_mock()
+    settlement_service.ingest_settlements_from_dataframe(asset_id=1, trade_date="Friday, 08 Mar 2024", df=settlement_df, last_updated=datetime(2024, 3, 9, 12, 0, 0))
+    ingest_event_repository.publish.assert_called_once_with(IngestEvent(1, date(2024, 3, 8), SETTLEMENT_KIND, True))
+
+    # 保存に失敗した場合は発行しない
+    ingest_event_repository.reset_mock()
+    mock_settlement_repository.upsert_many.side_effect = Exception("Upsert error")
+    with pytest.raises(Exception):
+        settlement_service.ingest_settlements_from_dataframe(asset_id=1, trade_date="Friday, 08 Mar 2024", df=settlement_df, last_updated=datetime(2024, 3, 7, 12, 0, 0))
+    ingest_event_repository.publish.assert_not_called()
+
+
+def test_ingest_settlements_from_dataframe_publishes_ingest_event_with_scraped_last_updated(settlement_df: pd.DataFrame, mock_settlement_repository: MagicMock):
+    ingest_event_repository = MagicMock(spec=IngestEventRepository)
+    settlement_service = SettlementService(mock_settlement_repository, ingest_event_repository=ingest_event_repository)
+
+    # スクレイパーのlast_updatedはUTCのaware datetime。DBのnaiveな値と同じくUTCで判定する
+    settlement_service.ingest_settlements_from_dataframe(asset_id=1, trade_date="Friday, 08 Mar 2024", df=settlement_df, last_updated=parse_datetime("08 Mar 2024 05:00:00 PM CT"))
+    ingest_event_repository.publish.assert_called_once_with(IngestEvent(1, date(2024, 3, 8), SETTLEMENT_KIND, False))
+
+    # 2024-03-09 00:00 (UTC) 以降は確定済み
+    ingest_event_repository.reset_mock()
+    settlement_service.ingest_settlements_from_dataframe(asset_id=1, trade_date="Friday, 08 Mar 2024", df=settlement_df, last_updated=parse_datetime("08 Mar 2024 06:30:00 PM CT"))
+    ingest_event_repository.publish.assert_called_once_with(IngestEvent(1, date(2024, 3, 8), SETTLEMENT_KIND, True))
+
+
+def test_ingest_settlements_from_dataframe_refreshes_trade_date_summary(settlement_df: pd.DataFrame, mock_settlement_repository: MagicMock):
+    trade_date_summary_repository = MagicMock(spec=TradeDateSummaryRepository)
+    settlement_service = SettlementService(mock_settlement_repository, trade_date_summary_repository=trade_date_summary_repository)
+
+    settlement_service.ingest_settlements_from_dataframe(asset_id=1, trade_date="Friday, 08 Mar 2024", df=settlement_df, last_updated=datetime(2024, 3, 7, 12, 0, 0))
+    trade_date_summary_repository.refresh.assert_called_once_with(1, [date(2024, 3, 8)])
+
+    # 保存に失敗した場合はサマリーを更新しない
+    trade_date_summary_repository.reset_mock()
+    mock_settlement_repository.upsert_many.side_effect = Exception("Upsert error")
+    with pytest.raises(Exception):
+        settlement_service.ingest_settlements_from_dataframe(asset_id=1, trade_date="Friday, 08 Mar 2024", df=settlement_df, last_updated=datetime(2024, 3, 7, 12, 0, 0))
+    trade_date_summary_repository.refresh.assert_not_called()
+
+
+def test_ingest_settlements_from_dataframe_refreshes_futures_curve(settlement_df: pd.DataFrame, mock_settlement_repository: MagicMock):
+    manager = MagicMock()
+    manager.attach_mock(MagicMock(spec=FuturesCurveRepository), 'futures_curve_repository')
+    manager.attach_mock(MagicMock(spec=FuturesDataCacheRepository), 'futures_data_cache')
+    settlement_service = SettlementService(mock_settlement_repository, manager.futures_data_cache, futures_curve_repository=manager.futures_curve_repository)
+
+    settlement_service.ingest_settlements_from_dataframe(asset_id=1, trade_date="Friday, 08 Mar 2024", df=settlement_df, last_updated=datetime(2024, 3, 7, 12, 0, 0))
+
+    # キャッシュを削除した後のリクエストが古いfutures_curveを読まないように、先に作り直す
+    assert manager.mock_calls == [
+        call.futures_curve_repository.refresh(1, [date(2024, 3, 8)]),
+        call.futures_data_cache.invalidate(date(2024, 3, 8), 1),
+    ]
+
+    # 保存に失敗した場合は作り直さない
+    manager.reset_mock()
+    mock_settlement_repository.upsert_many.side_effect = Exception("Upsert error")
+    with pytest.raises(Exception):
+        settlement_service.ingest_settlements_from_dataframe(asset_id=1, trade_date="Friday, 08 Mar 2024", df=settlement_df, last_updated=datetime(2024, 3, 7, 12, 0, 0))
+    manager.futures_curve_repository.refresh.assert_not_called()
+
+
 def test_check_data_is_latest_or_not_exsist_with_latest_date(mock_settlement_repository: MagicMock, settlement_service: SettlementService):
     asset_id = 1
     trade_date = "Friday, 08 Mar 2024"
@@ -112,6 +248,19 @@ def test_check_data_is_latest_or_not_exsist_with_not_latest_date(mock_settlement
     assert is_latest_or_none is False
 
 
+def test_check_data_is_latest_or_not_exsist_with_last_updated_map(mock_settlement_repository: MagicMock, settlement_service: SettlementService):
+    mock_settlement_repository.fetch_last_updated_by_asset.return_value = {date(2024, 3, 8): datetime(2024, 3, 7, 12, 0, 0)}
+    last_updated = datetime(2024, 3, 7, 12, 0, 0)
+
+    last_updated_map = settlement_service.fetch_last_updated_map(1)
+
+    # 事前に取得した辞書を参照し、取引日ごとにリポジトリへ問い合わせないことを確認
+    assert settlement_service.check_data_is_latest_or_not_exsist(1, "Friday, 08 Mar 2024", last_updated, last_updated_map) is True
+    assert settlement_service.check_data_is_latest_or_not_exsist(1, "Thursday, 07 Mar 2024", last_updated, last_updated_map) is None
+    mock_settlement_repository.fetch_last_updated_by_asset.assert_called_once_with(1)
+    mock_settlement_repository.check_last_updated_or_none.assert_not_called()
+
+
 def test_check_data_is_latest_or_not_exsist_with_invalid_date(settlement_service: SettlementService):
     asset_id = 2
     trade_date = "Invalid Date Format"
@@ -134,7 +283,7 @@ def test_new_entity_by_scraping_with_fraction(settlement_df: pd.DataFrame, mock_
     # 分数形式の値も正しく処理されるかをテスト
     settlement_service.save_settlements_from_dataframe(asset_id=asset_id, trade_date=trade_date, df=settlement_df, last_updated=last_updated)
 
-    create_call_args = mock_settlement_repository.create.call_args[0][0]
+    create_call_args = mock_settlement_repository.create_many.call_args[0][0][0]
     assert create_call_args.change == "-'27"
     assert create_call_args.settle == "+'010"
 
@@ -183,9 +332,43 @@ def test_make_settlements_dataframe_by_name_and_date(mock_settlement_repository:
     assert df.iloc[0]["open"] == 1000.0
     assert df.iloc[0]["high"] == 1505.0
     assert df.iloc[0]["low"] == 950.0
-    assert df.iloc[0]["last"] == None
+    assert pd.isna(df.iloc[0]["last"])
     assert df.iloc[0]["change"] == 200.8
     assert df.iloc[0]["settle"] == 20.375
     assert df.iloc[0]["est_volume"] == 500
     assert df.iloc[0]["prior_day_oi"] == 1000
     assert df.iloc[0]["last_updated"] == datetime(2024, 3, 7, 12, 0, 0)
+
+
+def test_make_settlements_dataframe_by_name_and_date_with_price_values(mock_settlement_repository: MagicMock, settlement_service: SettlementService):
+    mock_settlement_repository.fetch_settlements_by_name_and_date.return_value = [
+        SettlementEntity(
+            id=1,
+            asset_id=1,
+            trade_date=TradeDate(date(2024, 3, 8)),
+            month=YearMonth(2024, 4),
+            open="1,000",
+            high="1,505A",
+            low="950B",
+            last="-",
+            change="+200.8",
+            settle="20'12",
+            est_volume=500,
+            prior_day_oi=1000,
+            last_updated=datetime(2024, 3, 7, 12, 0, 0),
+            open_value=1000.0,
+            high_value=1505.0,
+            low_value=950.0,
+            last_value=None,
+            change_value=200.8,
+            settle_value=20.375
+        )
+    ]
+
+    # DBの数値カラムの値が使用され、数値がない "-" のみ文字列から変換される
+    with patch('src.domain.logics.convert_price_columns.convert_price_series', wraps=convert_price_series) as mock_convert:
+        df = settlement_service.make_settlements_dataframe_by_name_and_date("DummyAsset", date(2024, 3, 8))
+    assert [call_args[0][0] for call_args in mock_convert.call_args_list] == [["-"]]
+    assert df.iloc[0]["open"] == 1000.0
+    assert df.iloc[0]["settle"] == 20.375
+    assert pd.isna(df.iloc[0]["last"])
@@ -1,6 +1,8 @@
 # tests/domain/services/test_trade_date_service.py
+import asyncio
 import pytest
-from unittest.mock import Mock
+from contextlib import asynccontextmanager
+from unittest.mock import AsyncMock, Mock
 from datetime import date, timedelta
 
 from sqlalchemy.exc import SQLAlchemyError
@@ -8,15 +10,23 @@ from sqlalchemy.exc import SQLAlchemyError
 from src.domain.entities.trade_date_entity import TradeDateEntity
 from src.domain.exceptions.invalid_input_error import InvalidInputError
 from src.domain.exceptions.repository_error import RepositoryError
-from src.domain.services.trade_date_service import TradeDateService
+from src.domain.helpers.single_flight import AsyncSingleFlight
+from src.domain.repositories.trade_date_repository import TradeDatesVersion
+from src.domain.services.trade_date_service import AsyncTradeDateService, TradeDateService
 
 @pytest.fixture
 def mock_trade_date_repository():
     return Mock()
 
 @pytest.fixture
-def trade_date_service(mock_trade_date_repository: Mock):
-    return TradeDateService(trade_date_repository=mock_trade_date_repository)
+def mock_asset_repository():
+    asset_repository = Mock()
+    asset_repository.fetch_id_by_name.return_value = 1
+    return asset_repository
+
+@pytest.fixture
+def trade_date_service(mock_trade_date_repository: Mock, mock_asset_repository: Mock):
+    return TradeDateService(trade_date_repository=mock_trade_date_repository, asset_repository=mock_asset_repository)
 
 def test_fetch_trade_dates_successful(trade_date_service: TradeDateService, mock_trade_date_repository: Mock):
     # テストデータの設定
@@ -29,7 +39,15 @@ def test_fetch_trade_dates_successful(trade_date_service: TradeDateService, mock
     # 検証
     assert len(result) == 1
     assert result[0].trade_date == test_date
-    mock_trade_date_repository.fetch_trade_dates.assert_called_once_with("Gold", test_date, test_date, 0, 10)
+    mock_trade_date_repository.fetch_trade_dates.assert_called_once_with(1, test_date, test_date, 0, 10, None)
+
+def test_fetch_trade_dates_after(trade_date_service: TradeDateService, mock_trade_date_repository: Mock):
+    mock_trade_date_repository.fetch_trade_dates.return_value = [TradeDateEntity(trade_date=date(2023, 1, 3))]
+
+    result = trade_date_service.fetch_trade_dates("Gold", None, None, 0, 10, date(2023, 1, 2))
+
+    assert result == [TradeDateEntity(trade_date=date(2023, 1, 3))]
+    mock_trade_date_repository.fetch_trade_dates.assert_called_once_with(1, None, None, 0, 10, date(2023, 1, 2))
 
 def test_fetch_trade_dates_invalid_asset_name(trade_date_service: TradeDateService, mock_trade_date_repository: Mock):
     with pytest.raises(InvalidInputError):
@@ -50,4 +68,105 @@ def test_fetch_trade_dates_repository_error(trade_date_service: TradeDateService
     with pytest.raises(RepositoryError):
         trade_date_service.fetch_trade_dates("Gold", date.today(), date.today(), 0, 10)
 
-    mock_trade_date_repository.fetch_trade_dates.assert_called_once_with("Gold", date.today(), date.today(), 0, 10)
+    mock_trade_date_repository.fetch_trade_dates.assert_called_once_with(1, date.today(), date.today(), 0, 10, None)
+
+def test_fetch_trade_dates_version(trade_date_service: TradeDateService, mock_trade_date_repository: Mock):
+    version = TradeDatesVersion(2, date(2023, 1, 1), date(2023, 1, 2))
+    mock_trade_date_repository.fetch_trade_dates_version.return_value = version
+
+    assert trade_date_service.fetch_trade_dates_version("Gold", None, None) == version
+    mock_trade_date_repository.fetch_trade_dates_version.assert_called_once_with(1, None, None)
+
+def test_fetch_trade_dates_unknown_asset(trade_date_service: TradeDateService, mock_trade_date_repository: Mock, mock_asset_repository: Mock):
+    mock_asset_repository.fetch_id_by_name.return_value = None
+
+    assert trade_date_service.fetch_trade_dates("Unknown", None, None, 0, 10) == []
+    assert trade_date_service.fetch_trade_dates_version("Unknown", None, None) == TradeDatesVersion(0, None, None)
+    assert not mock_trade_date_repository.fetch_trade_dates.called
+    assert not mock_trade_date_repository.fetch_trade_dates_version.called
+
+def test_fetch_trade_dates_version_repository_error(trade_date_service: TradeDateService, mock_trade_date_repository: Mock):
+    mock_trade_date_repository.fetch_trade_dates_version.side_effect = SQLAlchemyError("DB Error")
+    with pytest.raises(RepositoryError):
+        trade_date_service.fetch_trade_dates_version("Gold", None, None)
+
+
+def test_async_fetch_trade_dates():
+    repository = AsyncMock()
+    repository.fetch_trade_dates.return_value = [TradeDateEntity(trade_date=date(2023, 1, 3))]
+    repository.fetch_trade_dates_version.return_value = TradeDatesVersion(1, date(2023, 1, 3), date(2023, 1, 3))
+    asset_repository = AsyncMock()
+    asset_repository.fetch_id_by_name.return_value = 1
+    service = AsyncTradeDateService(trade_date_repository=repository, asset_repository=asset_repository)
+
+    assert asyncio.run(service.fetch_trade_dates("Gold", None, None, 0, 10, date(2023, 1, 2))) == [TradeDateEntity(trade_date=date(2023, 1, 3))]
+    assert asyncio.run(service.fetch_trade_dates_version("Gold", None, None)) == TradeDatesVersion(1, date(2023, 1, 3), date(2023, 1, 3))
+    repository.fetch_trade_dates.assert_awaited_once_with(1, None, None, 0, 10, date(2023, 1, 2))
+
+def test_async_fetch_trade_dates_errors():
+    repository = AsyncMock()
+    repository.fetch_trade_dates.side_effect = SQLAlchemyError("DB Error")
+    asset_repository = AsyncMock()
+    asset_repository.fetch_id_by_name.return_value = 1
+    service = AsyncTradeDateService(trade_date_repository=repository, asset_repository=asset_repository)
+
+    with pytest.raises(InvalidInputError):
+        asyncio.run(service.fetch_trade_dates_version("Gold", date(2023, 1, 2), date(2023, 1, 1)))
+    with pytest.raises(RepositoryError):
+        asyncio.run(service.fetch_trade_dates("Gold", None, None, 0, 10))
+    repository.fetch_trade_dates_version.assert_not_awaited()
+
+def test_async_fetch_latest_trade_dates():
+    repository = AsyncMock()
+    repository.fetch_latest_trade_dates.return_value = [TradeDateEntity(trade_date=date(2023, 1, 2)), TradeDateEntity(trade_date=date(2023, 1, 3))]
+    asset_repository = AsyncMock()
+    asset_repository.fetch_id_by_name.side_effect = lambda name: 1 if name == "Gold" else None
+    service = AsyncTradeDateService(trade_date_repository=repository, asset_repository=asset_repository)
+
+    result = asyncio.run(service.fetch_latest_trade_dates("Gold", 2))
+
+    assert [entity.trade_date for entity in result] == [date(2023, 1, 2), date(2023, 1, 3)]
+    repository.fetch_latest_trade_dates.assert_awaited_once_with(1, 2)
+    # 資産が見つからない場合はDBに問い合わせない
+    assert asyncio.run(service.fetch_latest_trade_dates("Unknown", 2)) == []
+    repository.fetch_latest_trade_dates.assert_awaited_once()
+
+
+def test_async_fetch_trade_dates_coalesces_concurrent_calls():
+    repository = AsyncMock()
+
+    async def fetch_trade_dates(*args):
+        await asyncio.sleep(0.01)
+        return [TradeDateEntity(trade_date=date(2023, 1, 3))]
+    repository.fetch_trade_dates.side_effect = fetch_trade_dates
+    asset_repository = AsyncMock()
+    asset_repository.fetch_id_by_name.return_value = 1
+    service = AsyncTradeDateService(trade_date_repository=repository, asset_repository=asset_repository, single_flight=AsyncSingleFlight())
+
+    async def run():
+        return await asyncio.gather(*(service.fetch_trade_dates("Gold", None, None, 0, 10) for _ in range(5)), service.fetch_trade_dates("Gold", None, None, 10, 10))
+
+    results = asyncio.run(run())
+
+    assert all(result == [TradeDateEntity(trade_date=date(2023, 1, 3))] for result in results)
+    # ページが異なる呼び出しは別に実行する
+    assert repository.fetch_trade_dates.await_count == 2
+
+
+def test_async_fetch_trade_dates_uses_repository_scope_for_coalesced_calls():
+    request_repository = AsyncMock()
+    shared_repository = AsyncMock()
+    shared_repository.fetch_trade_dates.return_value = [TradeDateEntity(trade_date=date(2023, 1, 3))]
+    asset_repository = AsyncMock()
+    asset_repository.fetch_id_by_name.return_value = 1
+
+    @asynccontextmanager
+    async def repository_scope():
+        yield shared_repository
+
+    service = AsyncTradeDateService(request_repository, asset_repository, AsyncSingleFlight(), repository_scope)
+
+    # まとめた取得は、呼び出し元のリクエストのセッションではなく専用のセッションで実行する
+    assert asyncio.run(service.fetch_trade_dates("Gold", None, None, 0, 10)) == [TradeDateEntity(trade_date=date(2023, 1, 3))]
+    shared_repository.fetch_trade_dates.assert_awaited_once_with(1, None, None, 0, 10, None)
+    request_repository.fetch_trade_dates.assert_not_awaited()
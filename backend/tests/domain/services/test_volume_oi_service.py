@@ -6,6 +6,10 @@ from datetime import date
 from unittest.mock import Mock, call
 from _pytest.logging import LogCaptureFixture
 
+from src.domain.repositories.futures_curve_repository import FuturesCurveRepository
+from src.domain.repositories.futures_data_cache_repository import FuturesDataCacheRepository
+from src.domain.repositories.ingest_event_repository import VOLUME_OI_KIND, IngestEvent, IngestEventRepository
+from src.domain.repositories.trade_date_summary_repository import TradeDateSummaryRepository
 from src.domain.services.volume_oi_service import VolumeOIService
 from src.domain.entities.volume_oi_entity import VolumeOIEntity
 from src.domain.value_objects.trade_date import TradeDate
@@ -104,7 +108,7 @@ def test_update_volume_oi_from_dataframe_success(volume_oi_df: pd.DataFrame, moc
     is_final = False
     service.update_volume_oi_from_dataframe(asset_id, trade_date, volume_oi_df, is_final)
 
-    expected_call = call(VolumeOIEntity(
+    expected_call = call([VolumeOIEntity(
         id=None,
         asset_id=asset_id,
         trade_date=TradeDate(date(2024, 3, 8)),
@@ -121,8 +125,10 @@ def test_update_volume_oi_from_dataframe_success(volume_oi_df: pd.DataFrame, moc
         at_close=2150,
         change=1020,
         is_final=is_final
-    ))
-    mock_volume_oi_repository.update.assert_has_calls([expected_call])
+    )])
+    # 1行ずつのupdateではなく、upsertでまとめて保存されることを確認
+    mock_volume_oi_repository.upsert_many.assert_has_calls([expected_call])
+    mock_volume_oi_repository.update.assert_not_called()
 
 
 def test_update_volume_oi_from_dataframe_with_invalid_data(volume_oi_df: pd.DataFrame, mock_volume_oi_repository: Mock):
@@ -137,7 +143,7 @@ def test_update_volume_oi_from_dataframe_with_invalid_data(volume_oi_df: pd.Data
 
 
 def test_update_volume_oi_from_dataframe_repository_exception(volume_oi_df: pd.DataFrame, mock_volume_oi_repository: Mock):
-    mock_volume_oi_repository.update.side_effect = Exception("Update error")
+    mock_volume_oi_repository.upsert_many.side_effect = Exception("Update error")
     service = VolumeOIService(mock_volume_oi_repository)
     asset_id = 4
     trade_date = "Friday, 08 Mar 2024"
@@ -148,6 +154,70 @@ def test_update_volume_oi_from_dataframe_repository_exception(volume_oi_df: pd.D
     assert "Update error" in str(excinfo.value)
 
 
+def test_ingest_volume_oi_from_dataframe(volume_oi_df: pd.DataFrame, mock_volume_oi_repository: Mock):
+    service = VolumeOIService(mock_volume_oi_repository)
+    volume_oi_df = pd.concat([volume_oi_df, volume_oi_df], ignore_index=True)
+    volume_oi_df.at[1, 'month'] = 'MAY 24'
+
+    service.ingest_volume_oi_from_dataframe(1, "Friday, 08 Mar 2024", volume_oi_df, True)
+
+    mock_volume_oi_repository.upsert_many.assert_called_once()
+    upserted_entities = mock_volume_oi_repository.upsert_many.call_args[0][0]
+    assert [entity.month for entity in upserted_entities] == [YearMonth(2024, 4), YearMonth(2024, 5)]
+    assert all(entity.is_final for entity in upserted_entities)
+
+
+def test_ingest_volume_oi_from_dataframe_with_invalid_row(volume_oi_df: pd.DataFrame, mock_volume_oi_repository: Mock):
+    volume_oi_df.at[0, 'month'] = 'Invalid month'
+    service = VolumeOIService(mock_volume_oi_repository)
+
+    with pytest.raises(ValueError):
+        service.ingest_volume_oi_from_dataframe(1, "Friday, 08 Mar 2024", volume_oi_df, True)
+    mock_volume_oi_repository.upsert_many.assert_not_called()
+
+
+def test_ingest_volume_oi_from_dataframe_invalidates_futures_data_cache(volume_oi_df: pd.DataFrame, mock_volume_oi_repository: Mock):
+    futures_data_cache = Mock(spec=FuturesDataCacheRepository)
+    service = VolumeOIService(mock_volume_oi_repository, futures_data_cache)
+
+    service.ingest_volume_oi_from_dataframe(1, "Friday, 08 Mar 2024", volume_oi_df, True)
+
+    futures_data_cache.invalidate.assert_called_once_with(date(2024, 3, 8), 1)
+
+
+def test_ingest_volume_oi_from_dataframe_publishes_ingest_event(volume_oi_df: pd.DataFrame, mock_volume_oi_repository: Mock):
+    ingest_event_repository = Mock(spec=IngestEventRepository)
+    service = VolumeOIService(mock_volume_oi_repository, ingest_event_repository=ingest_event_repository)
+
+    service.ingest_volume_oi_from_dataframe(1, "Friday, 08 Mar 2024", volume_oi_df, True)
+
+    ingest_event_repository.publish.assert_called_once_with(IngestEvent(1, date(2024, 3, 8), VOLUME_OI_KIND, True))
+
+
+def test_ingest_volume_oi_from_dataframe_refreshes_trade_date_summary(volume_oi_df: pd.DataFrame, mock_volume_oi_repository: Mock):
+    trade_date_summary_repository = Mock(spec=TradeDateSummaryRepository)
+    service = VolumeOIService(mock_volume_oi_repository, trade_date_summary_repository=trade_date_summary_repository)
+
+    service.ingest_volume_oi_from_dataframe(1, "Friday, 08 Mar 2024", volume_oi_df, True)
+
+    trade_date_summary_repository.refresh.assert_called_once_with(1, [date(2024, 3, 8)])
+
+
+def test_ingest_volume_oi_from_dataframe_refreshes_futures_curve(volume_oi_df: pd.DataFrame, mock_volume_oi_repository: Mock):
+    manager = Mock()
+    manager.attach_mock(Mock(spec=FuturesCurveRepository), 'futures_curve_repository')
+    manager.attach_mock(Mock(spec=FuturesDataCacheRepository), 'futures_data_cache')
+    service = VolumeOIService(mock_volume_oi_repository, manager.futures_data_cache, futures_curve_repository=manager.futures_curve_repository)
+
+    service.ingest_volume_oi_from_dataframe(1, "Friday, 08 Mar 2024", volume_oi_df, True)
+
+    # キャッシュを削除する前にfutures_curveを作り直す
+    assert manager.mock_calls == [
+        call.futures_curve_repository.refresh(1, [date(2024, 3, 8)]),
+        call.futures_data_cache.invalidate(date(2024, 3, 8), 1),
+    ]
+
+
 def test_check_data_is_final_or_none_with_valid_date(mock_volume_oi_repository: Mock):
     service = VolumeOIService(mock_volume_oi_repository)
     asset_id = 1
@@ -200,7 +270,7 @@ def test_save_volume_oi_from_dataframe_logging(volume_oi_df: pd.DataFrame, mock_
 
 
 def test_update_volume_oi_from_dataframe_error_logging(volume_oi_df: pd.DataFrame, mock_volume_oi_repository: Mock, caplog: LogCaptureFixture):
-    mock_volume_oi_repository.update.side_effect = Exception("Update error")
+    mock_volume_oi_repository.upsert_many.side_effect = Exception("Update error")
     service = VolumeOIService(mock_volume_oi_repository)
     asset_id = 4
     trade_date = "Friday, 08 Mar 2024"
@@ -210,3 +280,16 @@ def test_update_volume_oi_from_dataframe_error_logging(volume_oi_df: pd.DataFram
         with pytest.raises(Exception):
             service.update_volume_oi_from_dataframe(asset_id, trade_date, volume_oi_df, is_final)
         assert "Update error" in caplog.text
+
+
+def test_check_data_is_final_with_is_final_map(mock_volume_oi_repository: Mock):
+    service = VolumeOIService(mock_volume_oi_repository)
+    mock_volume_oi_repository.fetch_is_final_by_asset.return_value = {date(2024, 3, 8): True}
+
+    is_final_map = service.fetch_is_final_map(1)
+
+    # 事前に取得した辞書を参照し、取引日ごとにリポジトリへ問い合わせないことを確認
+    assert service.check_data_is_final(1, "Friday, 08 Mar 2024", is_final_map) is True
+    assert service.check_data_is_final(1, "Thursday, 07 Mar 2024", is_final_map) is None
+    mock_volume_oi_repository.fetch_is_final_by_asset.assert_called_once_with(1)
+    mock_volume_oi_repository.check_data_is_final_or_none.assert_not_called()
@@ -86,3 +86,14 @@ def test_year_month_to_datetime(year: int, month: int, expected_datetime: dateti
     # 結果の検証
     assert result_datetime == expected_datetime
     assert result_datetime.day == 1  # 月の最初の日であることを確認
+
+
+def test_month_key():
+    ym = YearMonth(2024, 4)
+
+    assert ym.to_month_key() == 202404
+    assert YearMonth.from_month_key(202404) == ym
+    assert YearMonth.from_month_key(YearMonth(2023, 12).to_month_key()) == YearMonth(2023, 12)
+
+    with pytest.raises(ValueError):
+        YearMonth.from_month_key(202413)
@@ -0,0 +1,125 @@
+# tests/infrastructure/cache/test_asset_registry.py
+import asyncio
+import pytest
+from unittest.mock import MagicMock
+
+from src.domain.repositories.asset_registry_version_repository import AssetRegistryVersionRepository
+from src.infrastructure.cache.asset_registry import AssetMap, AssetRegistry
+
+
+@pytest.fixture
+def version_repository():
+    repo = MagicMock(spec=AssetRegistryVersionRepository)
+    repo.fetch_version.return_value = 1
+    return repo
+
+
+def test_asset_map_is_immutable():
+    asset_map = AssetMap.build([(1, "Gold"), (2, "Silver")], 1)
+
+    assert asset_map.ids_by_name == {"Gold": 1, "Silver": 2}
+    assert asset_map.names_by_id == {1: "Gold", 2: "Silver"}
+    with pytest.raises(TypeError):
+        asset_map.ids_by_name["Copper"] = 3 # type: ignore
+
+
+def test_get_loads_once(version_repository: MagicMock):
+    registry = AssetRegistry(version_repository, check_interval=60)
+    load = MagicMock(return_value=[(1, "Gold")])
+
+    assert registry.get(load).ids_by_name == {"Gold": 1}
+    assert registry.get(load).ids_by_name == {"Gold": 1}
+
+    # check_intervalの間はDBにもバージョンにも問い合わせない
+    load.assert_called_once()
+    version_repository.fetch_version.assert_called_once()
+
+
+def test_get_reloads_when_version_changes(version_repository: MagicMock):
+    registry = AssetRegistry(version_repository, check_interval=0)
+    load = MagicMock(return_value=[(1, "Gold")])
+    registry.get(load)
+    registry.get(load)
+    assert load.call_count == 1
+
+    # 他のプロセスで資産が変更された
+    version_repository.fetch_version.return_value = 2
+    load.return_value = [(1, "Gold"), (2, "Silver")]
+
+    assert registry.get(load).ids_by_name == {"Gold": 1, "Silver": 2}
+    assert load.call_count == 2
+
+
+def test_get_reloads_after_max_age_without_version(version_repository: MagicMock):
+    version_repository.fetch_version.return_value = None
+    load = MagicMock(return_value=[(1, "Gold")])
+
+    registry = AssetRegistry(version_repository, check_interval=0, max_age=60)
+    registry.get(load)
+    registry.get(load)
+    assert load.call_count == 1
+
+    # バージョンを取得できない場合は、max_ageを過ぎた時点で読み込み直す
+    registry.max_age = 0
+    registry.get(load)
+    assert load.call_count == 2
+
+
+def test_peek(version_repository: MagicMock):
+    registry = AssetRegistry(version_repository, check_interval=0)
+    assert registry.peek() is None
+
+    registry.get(MagicMock(return_value=[(1, "Gold")]))
+    version_repository.fetch_version.reset_mock()
+
+    # 読み込みもバージョンの確認もしない
+    assert registry.peek().names_by_id == {1: "Gold"} # type: ignore
+    version_repository.fetch_version.assert_not_called()
+
+
+def test_invalidate(version_repository: MagicMock):
+    registry = AssetRegistry(version_repository, check_interval=60)
+    load = MagicMock(return_value=[(1, "Gold")])
+    registry.get(load)
+
+    registry.invalidate()
+    load.return_value = []
+
+    # このプロセスでは次の参照で読み込み直し、他のプロセスにはバージョンで通知する
+    assert registry.get(load).ids_by_name == {}
+    version_repository.increment_version.assert_called_once()
+
+
+def test_invalidate_during_load_is_not_overwritten(version_repository: MagicMock):
+    registry = AssetRegistry(version_repository, check_interval=60)
+
+    def load_and_invalidate():
+        # 読み込み中に資産が変更された
+        registry.invalidate()
+        return [(1, "Gold")]
+
+    assert registry.get(load_and_invalidate).ids_by_name == {"Gold": 1}
+    # 無効化より前に始めた読み込みの結果は保存しない
+    assert registry.get(MagicMock(return_value=[(2, "Silver")])).ids_by_name == {"Silver": 2}
+
+
+def test_get_async(version_repository: MagicMock):
+    registry = AssetRegistry(version_repository, check_interval=60)
+    calls: list[int] = []
+
+    async def load():
+        calls.append(1)
+        return [(1, "Gold")]
+
+    async def run():
+        first = await registry.get_async(load)
+        second = await registry.get_async(load)
+        return first, second
+
+    first, second = asyncio.run(run())
+
+    assert first is second
+    assert first.ids_by_name == {"Gold": 1}
+    assert len(calls) == 1
+    # 同期版と同じキャッシュを共有する
+    assert registry.get(MagicMock()) is first
@@ -0,0 +1,88 @@
+# tests/infrastructure/cache/test_cached_asset_repository.py
+import asyncio
+import pytest
+from unittest.mock import MagicMock
+
+from src.domain.entities.asset_entity import AssetEntity
+from src.domain.exceptions.asset_not_found_error import AssetNotFoundError
+from src.domain.repositories.asset_registry_version_repository import AssetRegistryVersionRepository
+from src.domain.repositories.asset_repository import AssetRepository, AsyncAssetRepository
+from src.domain.value_objects.name import Name
+from src.infrastructure.cache.asset_registry import AssetRegistry
+from src.infrastructure.cache.cached_asset_repository import AsyncCachedAssetRepository, CachedAssetRepository
+from src.infrastructure.database.models import Asset as AssetModel
+
+
+@pytest.fixture
+def asset_registry():
+    version_repository = MagicMock(spec=AssetRegistryVersionRepository)
+    version_repository.fetch_version.return_value = 0
+    return AssetRegistry(version_repository, check_interval=60)
+
+
+@pytest.fixture
+def inner_repository():
+    repo = MagicMock(spec=AssetRepository)
+    repo.fetch_all.return_value = [AssetModel(id=2, name="Silver"), AssetModel(id=1, name="Gold")]
+    return repo
+
+
+def test_reads_from_registry(inner_repository: MagicMock, asset_registry: AssetRegistry):
+    repository = CachedAssetRepository(inner_repository, asset_registry)
+
+    assert [(asset.id, asset.name) for asset in repository.fetch_all()] == [(1, "Gold"), (2, "Silver")]
+    assert repository.fetch_by_name(Name("Gold")).id == 1
+    assert repository.fetch_id_by_name("Silver") == 2
+    assert repository.fetch_id_by_name("Copper") is None
+    with pytest.raises(AssetNotFoundError):
+        repository.fetch_by_name(Name("Copper"))
+
+    # 資産の一覧は1回だけDBから読み込む
+    inner_repository.fetch_all.assert_called_once()
+    inner_repository.fetch_by_name.assert_not_called()
+
+
+def test_fetch_all_empty(inner_repository: MagicMock, asset_registry: AssetRegistry):
+    inner_repository.fetch_all.side_effect = AssetNotFoundError("Assets not found")
+    repository = CachedAssetRepository(inner_repository, asset_registry)
+
+    with pytest.raises(AssetNotFoundError):
+        repository.fetch_all()
+    assert repository.fetch_id_by_name("Gold") is None
+
+
+def test_writes_invalidate_registry(inner_repository: MagicMock, asset_registry: AssetRegistry):
+    repository = CachedAssetRepository(inner_repository, asset_registry)
+    assert repository.fetch_id_by_name("Copper") is None
+
+    repository.create(AssetEntity.new_entity(Name("Copper")))
+    inner_repository.fetch_all.return_value = [AssetModel(id=1, name="Gold"), AssetModel(id=3, name="Copper")]
+
+    assert repository.fetch_id_by_name("Copper") == 3
+    repository.delete(Name("Copper"))
+    inner_repository.fetch_all.return_value = [AssetModel(id=1, name="Gold")]
+
+    assert repository.fetch_id_by_name("Copper") is None
+    assert asset_registry.version_repository.increment_version.call_count == 2 # type: ignore
+    inner_repository.create.assert_called_once()
+    inner_repository.delete.assert_called_once_with(Name("Copper"))
+
+
+def test_exists_by_name_queries_database(inner_repository: MagicMock, asset_registry: AssetRegistry):
+    inner_repository.exists_by_name.return_value = True
+    repository = CachedAssetRepository(inner_repository, asset_registry)
+
+    assert repository.exists_by_name(Name("Copper")) is True
+    inner_repository.exists_by_name.assert_called_once_with(Name("Copper"))
+
+
+def test_async_cached_asset_repository(asset_registry: AssetRegistry):
+    inner_repository = MagicMock(spec=AsyncAssetRepository)
+    inner_repository.fetch_all.return_value = [AssetModel(id=1, name="Gold")]
+    repository = AsyncCachedAssetRepository(inner_repository, asset_registry)
+
+    assert asyncio.run(repository.fetch_id_by_name("Gold")) == 1
+    assert [asset.name for asset in asyncio.run(repository.fetch_all())] == ["Gold"]
+    assert asyncio.run(repository.fetch_id_by_name("Silver")) is None
+    inner_repository.fetch_all.assert_awaited_once()
+    inner_repository.fetch_id_by_name.assert_not_called()
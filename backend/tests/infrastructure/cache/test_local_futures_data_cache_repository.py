@@ -0,0 +1,89 @@
+# tests/infrastructure/cache/test_local_futures_data_cache_repository.py
+import pytest
+from datetime import date
+from unittest.mock import MagicMock
+
+from src.domain.repositories.futures_data_cache_repository import FuturesDataCacheEntry, FuturesDataCacheRepository
+from src.infrastructure.cache.local_futures_data_cache_repository import LocalFuturesDataCacheRepository
+
+
+FINAL_ENTRY = FuturesDataCacheEntry(payload=b'final', is_final=True, etag='"final"')
+PRELIMINARY_ENTRY = FuturesDataCacheEntry(payload=b'preliminary', is_final=False, etag='"preliminary"')
+
+
+@pytest.fixture
+def redis_cache():
+    cache = MagicMock(spec=FuturesDataCacheRepository)
+    cache.fetch.return_value = None
+    cache.fetch_stats.return_value = {'hits': 0, 'misses': 0}
+    return cache
+
+
+@pytest.fixture
+def local_cache(redis_cache: MagicMock):
+    cache = LocalFuturesDataCacheRepository(redis_cache, max_entries=2, final_ttl=60, preliminary_ttl=60)
+    cache.activate()
+    return cache
+
+
+def test_fetch_from_local_cache(local_cache: LocalFuturesDataCacheRepository, redis_cache: MagicMock):
+    local_cache.save("Gold", [date(2024, 3, 8), date(2024, 3, 7)], 'records', FINAL_ENTRY)
+    redis_cache.save.assert_called_once()
+
+    # 取引日の順序が異なっても同じレスポンス。Redisには問い合わせない
+    assert local_cache.fetch("Gold", [date(2024, 3, 7), date(2024, 3, 8)], 'records') == FINAL_ENTRY
+    redis_cache.fetch.assert_not_called()
+    assert local_cache.fetch_stats() == {'hits': 0, 'misses': 0, 'local_hits': 1}
+
+    # Redisのキャッシュにヒットした場合は、プロセス内にも保存する
+    redis_cache.fetch.return_value = PRELIMINARY_ENTRY
+    assert local_cache.fetch("Silver", [date(2024, 3, 8)], 'records') == PRELIMINARY_ENTRY
+    assert local_cache.fetch("Silver", [date(2024, 3, 8)], 'records') == PRELIMINARY_ENTRY
+    redis_cache.fetch.assert_called_once()
+
+
+def test_lru_and_ttl(redis_cache: MagicMock):
+    local_cache = LocalFuturesDataCacheRepository(redis_cache, max_entries=2, final_ttl=60, preliminary_ttl=0)
+    local_cache.activate()
+    local_cache.save("Gold", [date(2024, 3, 6)], 'records', FINAL_ENTRY)
+    local_cache.save("Gold", [date(2024, 3, 7)], 'records', FINAL_ENTRY)
+    local_cache.fetch("Gold", [date(2024, 3, 6)], 'records')
+    local_cache.save("Gold", [date(2024, 3, 8)], 'records', PRELIMINARY_ENTRY)
+
+    # 最も長く参照されていないレスポンスから破棄する
+    assert local_cache.fetch("Gold", [date(2024, 3, 6)], 'records') == FINAL_ENTRY
+    assert local_cache.fetch("Gold", [date(2024, 3, 7)], 'records') is None
+    # 期限切れのレスポンスはRedisから取得し直す
+    assert local_cache.fetch("Gold", [date(2024, 3, 8)], 'records') is None
+    assert redis_cache.fetch.call_count == 2
+
+
+def test_evict(local_cache: LocalFuturesDataCacheRepository, redis_cache: MagicMock):
+    local_cache.max_entries = 10
+    local_cache.save("Gold", [date(2024, 3, 7), date(2024, 3, 8)], 'records', FINAL_ENTRY)
+    local_cache.save("Gold", [date(2024, 3, 8)], 'arrow', FINAL_ENTRY)
+    local_cache.save("Silver", [date(2024, 3, 8)], 'records', FINAL_ENTRY)
+    local_cache.save("Gold", [date(2024, 3, 7)], 'records', FINAL_ENTRY)
+
+    # 資産と取引日が一致するレスポンスのみ削除し、Redisのキャッシュは変更しない
+    assert local_cache.evict(date(2024, 3, 8), "Gold") == 2
+    assert local_cache.fetch("Silver", [date(2024, 3, 8)], 'records') == FINAL_ENTRY
+    assert local_cache.fetch("Gold", [date(2024, 3, 7)], 'records') == FINAL_ENTRY
+    redis_cache.invalidate.assert_not_called()
+
+    # 資産を指定しない場合は、取引日を含む全ての資産のレスポンスを削除する
+    assert local_cache.evict(date(2024, 3, 8)) == 1
+    local_cache.invalidate(date(2024, 3, 7), 1)
+    redis_cache.invalidate.assert_called_once_with(date(2024, 3, 7), 1)
+    assert local_cache.fetch("Gold", [date(2024, 3, 7)], 'records') is None
+
+
+def test_inactive_cache_passes_through(local_cache: LocalFuturesDataCacheRepository, redis_cache: MagicMock):
+    local_cache.save("Gold", [date(2024, 3, 8)], 'records', FINAL_ENTRY)
+
+    # イベントを受信できなくなった場合は、保存済みのレスポンスも破棄してRedisのみを使用する
+    local_cache.deactivate()
+    assert local_cache.fetch("Gold", [date(2024, 3, 8)], 'records') is None
+    local_cache.save("Gold", [date(2024, 3, 8)], 'records', FINAL_ENTRY)
+    assert local_cache.fetch("Gold", [date(2024, 3, 8)], 'records') is None
+    assert redis_cache.fetch.call_count == 2
@@ -0,0 +1,60 @@
+# tests/infrastructure/database/test_database.py
+import asyncio
+import subprocess
+import sys
+from contextlib import asynccontextmanager
+from unittest.mock import MagicMock
+
+from src.infrastructure.database import database
+from src.infrastructure.database.database import async_session_scope, db_session, get_shared_engine, scraper_db_session
+
+
+def test_import_does_not_create_engines():
+    # インポートしただけでは、エンジンを作成しない (DBの接続設定も読み込まない)
+    code = "from src.infrastructure.database import database; assert not database._shared_engines"
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True)
+    assert result.returncode == 0, result.stderr
+
+
+def test_get_shared_engine_is_created_once_per_profile():
+    api_engine = get_shared_engine('api')
+
+    assert get_shared_engine('api') is api_engine
+    assert get_shared_engine('scraper') is not api_engine
+    # 互換性のため、engineもapiのエンジンを返す
+    assert database.engine is api_engine
+
+
+def test_scoped_sessions_bind_shared_engines():
+    try:
+        assert db_session().get_bind() is get_shared_engine('api')
+        assert scraper_db_session().get_bind() is get_shared_engine('scraper')
+    finally:
+        db_session.remove()
+        scraper_db_session.remove()
+
+
+def test_async_session_scope_opens_and_closes_own_session():
+    sessions: list[MagicMock] = []
+
+    @asynccontextmanager
+    async def session_factory():
+        session = MagicMock()
+        sessions.append(session)
+        try:
+            yield session
+        finally:
+            session.closed = True
+
+    scope = async_session_scope(lambda session: ("repository", session), session_factory)
+
+    async def run():
+        async with scope() as first:
+            async with scope() as second:
+                return first, second
+
+    first, second = asyncio.run(run())
+
+    # 呼び出しごとに新しいセッションを開き、終了時に閉じる
+    assert first == ("repository", sessions[0]) and second == ("repository", sessions[1])
+    assert all(session.closed is True for session in sessions)
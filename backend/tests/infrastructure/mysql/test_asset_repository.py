@@ -115,3 +115,10 @@ def test_exists_by_name_false(test_session: Session):
     exists = asset_repository.exists_by_name(Name(nonexistent_asset_name))
 
     assert exists is False
+
+def test_fetch_id_by_name(test_session: Session):
+    asset_repository = AssetRepositoryMysql(session=test_session)
+    asset_db = asset_repository.create(AssetEntity.new_entity(name=Name("Test Asset")))
+
+    assert asset_repository.fetch_id_by_name("Test Asset") == asset_db.id
+    assert asset_repository.fetch_id_by_name("Nonexistent Asset") is None
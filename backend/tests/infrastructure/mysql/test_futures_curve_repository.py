@@ -0,0 +1,73 @@
+# tests/infrastructure/mysql/test_futures_curve_repository.py
+import pytest
+from datetime import date, datetime
+from sqlalchemy.orm import Session
+
+from src.infrastructure.database.models import Asset, FuturesCurve, Settlement, VolumeOI
+from src.infrastructure.mysql.futures_curve_repository_mysql import FuturesCurveRepositoryMysql
+
+
+@pytest.fixture
+def asset_id(db_session: Session) -> int:
+    asset = Asset(name="Gold")
+    db_session.add(asset)
+    db_session.flush()
+    # 2023-01-02: 3限月 (2023-03は清算値なし、2023-04は出来高・建玉なし)
+    # 2023-01-03: 清算値のみ
+    for trade_date, month, settle, settle_value in [
+        (date(2023, 1, 2), "2023-02", "1,000", 1000.0),
+        (date(2023, 1, 2), "2023-03", "-", None),
+        (date(2023, 1, 2), "2023-05", "1,012.5", None),
+        (date(2023, 1, 2), "2023-04", "1,010", 1010.0),
+        (date(2023, 1, 3), "2023-02", "1,001", 1001.0),
+    ]:
+        db_session.add(Settlement(
+            asset_id=asset.id, trade_date=trade_date, month=month, settle=settle, settle_value=settle_value,
+            est_volume=250, prior_day_oi=310, last_updated=datetime(2023, 1, 4, 12, 0, 0)
+        ))
+    for month, is_final in [("2023-02", True), ("2023-03", False), ("2023-05", True)]:
+        db_session.add(VolumeOI(asset_id=asset.id, trade_date=date(2023, 1, 2), month=month, total_volume=200, at_close=300, is_final=is_final))
+    db_session.commit()
+    return asset.id
+
+
+def _fetch_curve(db_session: Session, asset_id: int) -> list[tuple[date, int, float | None, float, bool]]:
+    rows = db_session.query(FuturesCurve).filter(FuturesCurve.asset_id == asset_id).order_by(FuturesCurve.trade_date, FuturesCurve.month_key).all()
+    return [(row.trade_date, row.month_key, row.settle, row.settle_spread, row.is_final) for row in rows]
+
+
+def test_refresh(db_session: Session, asset_id: int):
+    repository = FuturesCurveRepositoryMysql(db_session)
+
+    # 清算値と出来高・建玉の両方がある限月のみ追加される
+    repository.refresh(asset_id, [date(2023, 1, 2), date(2023, 1, 3)])
+
+    # 数値カラムがない清算値は文字列から変換し、清算値がない限月とその次の限月のスプレッドは0
+    assert _fetch_curve(db_session, asset_id) == [
+        (date(2023, 1, 2), 202302, 1000.0, 0.0, True),
+        (date(2023, 1, 2), 202303, None, 0.0, False),
+        (date(2023, 1, 2), 202305, 1012.5, 0.0, True),
+    ]
+
+    # 出来高・建玉が追加された場合は、取引日の全ての限月を作り直す
+    db_session.add(VolumeOI(asset_id=asset_id, trade_date=date(2023, 1, 2), month="2023-04", total_volume=100, at_close=150, is_final=True))
+    db_session.commit()
+    repository.refresh(asset_id, [date(2023, 1, 2)])
+
+    assert _fetch_curve(db_session, asset_id)[2:] == [
+        (date(2023, 1, 2), 202304, 1010.0, 0.0, True),
+        (date(2023, 1, 2), 202305, 1012.5, 2.5, True),
+    ]
+
+
+def test_refresh_deleted_month(db_session: Session, asset_id: int):
+    repository = FuturesCurveRepositoryMysql(db_session)
+    repository.refresh(asset_id, [date(2023, 1, 2)])
+
+    db_session.query(VolumeOI).filter(VolumeOI.asset_id == asset_id, VolumeOI.month != "2023-02").delete()
+    db_session.commit()
+    repository.refresh(asset_id, [date(2023, 1, 2)])
+
+    # 削除された限月はfutures_curveからも削除される
+    assert _fetch_curve(db_session, asset_id) == [(date(2023, 1, 2), 202302, 1000.0, 0.0, True)]
+    repository.refresh(asset_id, [])
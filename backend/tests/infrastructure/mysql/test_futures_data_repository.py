@@ -1,9 +1,14 @@
 # tests/infrastructure/mysql/test_futures_data_repository.py
 import pytest
 from datetime import date, datetime
+from sqlalchemy import Engine, create_engine, event
 from sqlalchemy.orm import Session
 
+from src.infrastructure.database.engine_profiles import apply_statement_timeout, engine_options, get_engine_profile
 from src.infrastructure.database.models import Asset, Settlement, VolumeOI
+from src.domain.repositories.futures_data_repository import FuturesDataVersion
+from src.infrastructure.mysql.async_futures_data_repository_mysql import AsyncFuturesDataRepositoryMysql
+from src.infrastructure.mysql.futures_curve_repository_mysql import FuturesCurveRepositoryMysql
 from src.infrastructure.mysql.futures_data_repository_mysql import FuturesDataRepositoryMysql
 from src.domain.value_objects.trade_date import TradeDate
 from src.domain.value_objects.year_month import YearMonth
@@ -38,6 +43,8 @@ def asset_and_data(db_session: Session):
     )
     db_session.add(volume_oi)
     db_session.commit()
+    # /futures-dataはスクレイパーが保存時に作成するfutures_curveを参照する
+    FuturesCurveRepositoryMysql(db_session).refresh(asset.id, [date(2024, 3, 8)])
 
     return asset.name, date(2024, 3, 8)
 
@@ -54,3 +61,131 @@ def test_fetch_by_asset_and_date(db_session: Session, asset_and_data: tuple[str,
     assert entity.settle == 1000
     assert entity.volume == 200
     assert entity.open_interest == 300
+
+
+def test_fetch_by_asset_and_dates(db_session: Session, asset_and_data: tuple[str, date]):
+    asset_name, trade_date = asset_and_data
+    asset_id = db_session.query(Asset.id).filter(Asset.name == asset_name).scalar()
+    # 2日目のデータを追加
+    for month, settle, total_volume, at_close in [("2024-05", "1,010.25", 150, 250), ("2024-04", "1,005", 180, 280)]:
+        db_session.add(Settlement(
+            asset_id=asset_id,
+            trade_date=date(2024, 3, 11),
+            month=month,
+            settle=settle,
+            est_volume=100,
+            prior_day_oi=200,
+            last_updated=datetime(2024, 3, 12, 12, 0, 0)
+        ))
+        db_session.add(VolumeOI(
+            asset_id=asset_id,
+            trade_date=date(2024, 3, 11),
+            month=month,
+            total_volume=total_volume,
+            at_close=at_close,
+            is_final=False
+        ))
+    db_session.commit()
+    FuturesCurveRepositoryMysql(db_session).refresh(asset_id, [date(2024, 3, 11)])
+
+    repository = FuturesDataRepositoryMysql(session=db_session)
+    rows = repository.fetch_by_asset_and_dates(asset_id, [date(2024, 3, 11), trade_date, date(2024, 3, 12)])
+
+    # trade_date, month_keyの順に並び、清算値は数値、スプレッドは計算済み
+    assert rows == [
+        (trade_date, 202404, 1000.0, 200, 300, 0.0),
+        (date(2024, 3, 11), 202404, 1005.0, 180, 280, 0.0),
+        (date(2024, 3, 11), 202405, 1010.25, 150, 250, 5.25),
+    ]
+
+    assert repository.fetch_by_asset_and_dates(asset_id, []) == []
+    assert repository.fetch_by_asset_and_dates(asset_id + 1, [trade_date]) == []
+
+
+def test_fetch_versions_by_asset_and_dates(db_session: Session, asset_and_data: tuple[str, date]):
+    asset_name, trade_date = asset_and_data
+    asset_id = db_session.query(Asset.id).filter(Asset.name == asset_name).scalar()
+    repository = FuturesDataRepositoryMysql(session=db_session)
+    results = repository.fetch_versions_by_asset_and_dates(asset_id, [trade_date, date(2024, 3, 11)])
+
+    # データがない取引日は含まれない
+    assert results == [FuturesDataVersion(trade_date, 1, 0, datetime(2024, 3, 9, 12, 0, 0), datetime(2024, 3, 9, 12, 0, 0))]
+
+
+def test_stream_by_asset_and_date_range(db_session: Session, asset_and_data: tuple[str, date]):
+    asset_name, trade_date = asset_and_data
+    asset_id = db_session.query(Asset.id).filter(Asset.name == asset_name).scalar()
+    for day in (11, 12):
+        for month in ("2024-04", "2024-05"):
+            db_session.add(Settlement(
+                asset_id=asset_id, trade_date=date(2024, 3, day), month=month, settle="1,005",
+                est_volume=100, prior_day_oi=200, last_updated=datetime(2024, 3, day + 1, 12, 0, 0)
+            ))
+            db_session.add(VolumeOI(
+                asset_id=asset_id, trade_date=date(2024, 3, day), month=month, total_volume=180, at_close=280, is_final=False
+            ))
+    db_session.commit()
+    FuturesCurveRepositoryMysql(db_session).refresh(asset_id, [date(2024, 3, 11), date(2024, 3, 12)])
+
+    repository = FuturesDataRepositoryMysql(session=db_session)
+    batches = list(repository.stream_by_asset_and_date_range(asset_id, None, None, 2))
+
+    # batch_size行ずつ、trade_date, monthの順に取得される
+    assert [len(batch) for batch in batches] == [2, 2, 1]
+    assert [(row[0], row[1]) for batch in batches for row in batch] == [
+        (trade_date, 202404),
+        (date(2024, 3, 11), 202404),
+        (date(2024, 3, 11), 202405),
+        (date(2024, 3, 12), 202404),
+        (date(2024, 3, 12), 202405),
+    ]
+
+    # 期間の指定
+    rows = [row for batch in repository.stream_by_asset_and_date_range(asset_id, date(2024, 3, 9), date(2024, 3, 11), 100) for row in batch]
+    assert [(row[0], row[1]) for row in rows] == [(date(2024, 3, 11), 202404), (date(2024, 3, 11), 202405)]
+    assert list(repository.stream_by_asset_and_date_range(asset_id + 1, None, None, 100)) == []
+
+
+def test_stream_by_asset_and_date_range_runs_without_statement_timeout(db_session: Session, asset_and_data: tuple[str, date], test_engine: Engine):
+    asset_name, trade_date = asset_and_data
+    asset_id = db_session.query(Asset.id).filter(Asset.name == asset_name).scalar()
+    export_profile = get_engine_profile('export')
+    export_engine = create_engine(test_engine.url, **engine_options(export_profile, 'test-export'))
+    apply_statement_timeout(export_engine, export_profile)
+    # エクスポートのSELECTを実行するコネクションの、max_execution_timeを記録する
+    statement_timeouts: list[int] = []
+
+    @event.listens_for(export_engine, "before_cursor_execute")
+    def _record_statement_timeout(conn, cursor, statement, parameters, context, executemany):
+        if "FROM futures_curve" in statement:
+            dbapi_cursor = conn.connection.cursor()
+            try:
+                dbapi_cursor.execute("SELECT @@SESSION.max_execution_time")
+                statement_timeouts.append(int(dbapi_cursor.fetchone()[0]))
+            finally:
+                dbapi_cursor.close()
+
+    try:
+        repository = FuturesDataRepositoryMysql(db_session, lambda: export_engine)
+        rows = [row for batch in repository.stream_by_asset_and_date_range(asset_id, None, None, 100) for row in batch]
+    finally:
+        export_engine.dispose()
+
+    # レスポンスの送信中にSELECTが打ち切られないように、exportプロファイルのエンジンで制限なしで実行される
+    assert [(row[0], row[1]) for row in rows] == [(trade_date, 202404)]
+    assert statement_timeouts == [0]
+
+
+def test_async_repository_matches_sync_repository(db_session: Session, asset_and_data: tuple[str, date], run_with_async_session):
+    asset_name, trade_date = asset_and_data
+    asset_id = db_session.query(Asset.id).filter(Asset.name == asset_name).scalar()
+    repository = FuturesDataRepositoryMysql(session=db_session)
+    trade_dates = [trade_date, date(2024, 3, 11)]
+
+    rows = run_with_async_session(lambda session: AsyncFuturesDataRepositoryMysql(session).fetch_by_asset_and_dates(asset_id, trade_dates))
+    versions = run_with_async_session(lambda session: AsyncFuturesDataRepositoryMysql(session).fetch_versions_by_asset_and_dates(asset_id, trade_dates))
+
+    # 同期のリポジトリと同じクエリのため、結果も一致する
+    assert rows == repository.fetch_by_asset_and_dates(asset_id, trade_dates)
+    assert versions == repository.fetch_versions_by_asset_and_dates(asset_id, trade_dates)
+    assert run_with_async_session(lambda session: AsyncFuturesDataRepositoryMysql(session).fetch_by_asset_and_dates(asset_id, [])) == []
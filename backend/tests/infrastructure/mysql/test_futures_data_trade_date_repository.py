@@ -6,8 +6,11 @@ from sqlalchemy import text
 from sqlalchemy.orm import Session
 
 from src.infrastructure.database.models import Asset, Settlement, VolumeOI
+from src.infrastructure.mysql.async_futures_data_trade_date_repository_mysql import AsyncFuturesDataTradeDateRepositoryMysql
 from src.infrastructure.mysql.futures_data_trade_date_repository_mysql import FuturesDataTradeDateRepositoryMysql
+from src.infrastructure.mysql.trade_date_summary_repository_mysql import TradeDateSummaryRepositoryMysql
 from src.domain.entities.trade_date_entity import TradeDateEntity
+from src.domain.repositories.trade_date_repository import TradeDatesVersion
 
 # テストデータのセットアップ
 @pytest.fixture(scope="function")
@@ -62,23 +65,25 @@ def setup_data(db_session: Session):
         db_session.add(volume_oi)
 
     db_session.commit()
+    # 取引日はサマリーから取得するため、保存時と同じようにサマリーを更新する
+    TradeDateSummaryRepositoryMysql(db_session).refresh(asset.id, [date(2023, 1, 1), date(2023, 1, 2)])
 
-    return asset.name
+    return asset.id
 
 
-def test_fetch_trade_dates_basic(db_session: Session, setup_data: str):
-    asset_name = setup_data
+def test_fetch_trade_dates_basic(db_session: Session, setup_data: int):
+    asset_id = setup_data
     repository = FuturesDataTradeDateRepositoryMysql(session=db_session)
-    result = repository.fetch_trade_dates(asset_name, date(2023, 1, 1), date(2023, 1, 1), 0, 10)
+    result = repository.fetch_trade_dates(asset_id, date(2023, 1, 1), date(2023, 1, 1), 0, 10)
     assert len(result) == 1
     assert isinstance(result[0], TradeDateEntity)
     assert result[0].trade_date == date(2023, 1, 1)
 
 
-def test_fetch_trade_dates_with_none_dates(db_session: Session, setup_data: str):
-    asset_name = setup_data
+def test_fetch_trade_dates_with_none_dates(db_session: Session, setup_data: int):
+    asset_id = setup_data
     repository = FuturesDataTradeDateRepositoryMysql(session=db_session)
-    result = repository.fetch_trade_dates(asset_name, None, None, 0, 10)
+    result = repository.fetch_trade_dates(asset_id, None, None, 0, 10)
     assert len(result) == 2  # すべての日付のデータが返される
     assert isinstance(result[0], TradeDateEntity)
     assert result[0].trade_date == date(2023, 1, 1)
@@ -86,14 +91,69 @@ def test_fetch_trade_dates_with_none_dates(db_session: Session, setup_data: str)
     assert result[1].trade_date == date(2023, 1, 2)
 
 
-def test_fetch_trade_dates_pagination(db_session: Session, setup_data: str):
-    asset_name = setup_data
+def test_fetch_trade_dates_pagination(db_session: Session, setup_data: int):
+    asset_id = setup_data
     repository = FuturesDataTradeDateRepositoryMysql(session=db_session)
     # 初めの1件のみを取得
-    result = repository.fetch_trade_dates(asset_name, date(2023, 1, 1), date(2023, 1, 2), 0, 1)
+    result = repository.fetch_trade_dates(asset_id, date(2023, 1, 1), date(2023, 1, 2), 0, 1)
     assert len(result) == 1
 
 
     # オフセットを設定してデータをスキップ
-    result = repository.fetch_trade_dates(asset_name, date(2023, 1, 1), date(2023, 1, 2), 1, 10)
+    result = repository.fetch_trade_dates(asset_id, date(2023, 1, 1), date(2023, 1, 2), 1, 10)
     assert len(result) == 1  # スキップされるため1件のみ返される
+
+
+def test_fetch_trade_dates_version(db_session: Session, setup_data: int):
+    asset_id = setup_data
+    repository = FuturesDataTradeDateRepositoryMysql(session=db_session)
+
+    assert repository.fetch_trade_dates_version(asset_id, None, None) == TradeDatesVersion(2, date(2023, 1, 1), date(2023, 1, 2))
+    assert repository.fetch_trade_dates_version(asset_id, date(2023, 1, 2), None) == TradeDatesVersion(1, date(2023, 1, 2), date(2023, 1, 2))
+    # 期間内に取引日がない場合
+    assert repository.fetch_trade_dates_version(asset_id, date(2023, 2, 1), date(2023, 2, 28)) == TradeDatesVersion(0, None, None)
+
+
+def test_fetch_trade_dates_after(db_session: Session, setup_data: int):
+    asset_id = setup_data
+    repository = FuturesDataTradeDateRepositoryMysql(session=db_session)
+
+    # afterより後の取引日のみ取得する
+    result = repository.fetch_trade_dates(asset_id, None, None, 0, 10, after=date(2023, 1, 1))
+    assert [entity.trade_date for entity in result] == [date(2023, 1, 2)]
+    assert repository.fetch_trade_dates(asset_id, None, None, 0, 10, after=date(2023, 1, 2)) == []
+
+
+def test_fetch_latest_trade_dates(db_session: Session, setup_data: int):
+    asset_id = setup_data
+    repository = FuturesDataTradeDateRepositoryMysql(session=db_session)
+
+    # 最新の取引日から件数分を、昇順で返す
+    assert [entity.trade_date for entity in repository.fetch_latest_trade_dates(asset_id, 1)] == [date(2023, 1, 2)]
+    assert [entity.trade_date for entity in repository.fetch_latest_trade_dates(asset_id, 5)] == [date(2023, 1, 1), date(2023, 1, 2)]
+
+
+def test_fetch_trade_dates_without_volume_oi(db_session: Session, setup_data: int):
+    asset_id = setup_data
+    # 清算値のみの取引日は含まれない
+    db_session.add(Settlement(
+        asset_id=asset_id, trade_date=date(2023, 1, 3), month="2023-01", settle=1200,
+        est_volume=300, prior_day_oi=320, last_updated=datetime(2023, 1, 4, 12, 0, 0)
+    ))
+    db_session.commit()
+    TradeDateSummaryRepositoryMysql(db_session).refresh(asset_id, [date(2023, 1, 3)])
+
+    repository = FuturesDataTradeDateRepositoryMysql(session=db_session)
+    assert [entity.trade_date for entity in repository.fetch_trade_dates(asset_id, None, None, 0, 10)] == [date(2023, 1, 1), date(2023, 1, 2)]
+
+
+def test_async_fetch_trade_dates(db_session: Session, setup_data: int, run_with_async_session):
+    asset_id = setup_data
+
+    result = run_with_async_session(lambda session: AsyncFuturesDataTradeDateRepositoryMysql(session).fetch_trade_dates(asset_id, None, None, 0, 10, date(2023, 1, 1)))
+    version = run_with_async_session(lambda session: AsyncFuturesDataTradeDateRepositoryMysql(session).fetch_trade_dates_version(asset_id, None, None))
+    latest = run_with_async_session(lambda session: AsyncFuturesDataTradeDateRepositoryMysql(session).fetch_latest_trade_dates(asset_id, 1))
+
+    assert [entity.trade_date for entity in result] == [date(2023, 1, 2)]
+    assert version == TradeDatesVersion(2, date(2023, 1, 1), date(2023, 1, 2))
+    assert [entity.trade_date for entity in latest] == [date(2023, 1, 2)]
@@ -0,0 +1,124 @@
+# tests/infrastructure/mysql/test_query_plans.py
+# リポジトリが発行するSELECTの実行計画をEXPLAINで確認し、インデックスを使わないフルスキャンがないことを検証する
+import pytest
+from contextlib import contextmanager
+from datetime import date, datetime, timedelta
+from sqlalchemy import event, insert, text
+from sqlalchemy.orm import Session
+from typing import Any, Callable, Iterator
+
+from src.domain.value_objects.trade_date import TradeDate
+from src.infrastructure.database.models import Asset, Settlement, VolumeOI
+from src.infrastructure.mysql.futures_curve_repository_mysql import FuturesCurveRepositoryMysql
+from src.infrastructure.mysql.futures_data_repository_mysql import FuturesDataRepositoryMysql
+from src.infrastructure.mysql.futures_data_trade_date_repository_mysql import FuturesDataTradeDateRepositoryMysql
+from src.infrastructure.mysql.settlement_repository_mysql import SettlementRepositoryMysql
+from src.infrastructure.mysql.trade_date_summary_repository_mysql import TradeDateSummaryRepositoryMysql
+from src.infrastructure.mysql.volume_oi_repository_mysql import VolumeOIRepositoryMysql
+
+# 行数が少ないとオプティマイザがインデックスを使わない計画を選ぶため、ある程度の件数を用意する
+ASSET_NAMES = ["Gold", "Silver", "Copper"]
+TRADE_DATES = [date(2024, 1, 2) + timedelta(days=day) for day in range(40)]
+MONTHS = [f"{2024 + month // 12}-{month % 12 + 1:02d}" for month in range(12)]
+
+# テーブルの全行 (ALL) またはインデックスの全体 (index) を読む計画をフルスキャンとみなす
+FULL_SCAN_TYPES = {'ALL', 'index'}
+
+
+@pytest.fixture
+def seeded_assets(db_session: Session) -> dict[str, int]:
+    asset_ids: dict[str, int] = {}
+    for name in ASSET_NAMES:
+        asset = Asset(name=name)
+        db_session.add(asset)
+        db_session.flush()
+        asset_ids[name] = asset.id
+
+    settlements: list[dict[str, Any]] = []
+    volume_ois: list[dict[str, Any]] = []
+    for asset_id in asset_ids.values():
+        for trade_date in TRADE_DATES:
+            for month in MONTHS:
+                settlements.append({
+                    'asset_id': asset_id, 'trade_date': trade_date, 'month': month, 'settle': "2,000.5", 'settle_value': 2000.5,
+                    'est_volume': 100, 'prior_day_oi': 200, 'last_updated': datetime.combine(trade_date, datetime.min.time()) + timedelta(days=1)
+                })
+                volume_ois.append({
+                    'asset_id': asset_id, 'trade_date': trade_date, 'month': month, 'total_volume': 100, 'at_close': 200, 'is_final': True
+                })
+    db_session.execute(insert(Settlement), settlements)
+    db_session.execute(insert(VolumeOI), volume_ois)
+    db_session.commit()
+
+    summary_repository = TradeDateSummaryRepositoryMysql(db_session)
+    curve_repository = FuturesCurveRepositoryMysql(db_session)
+    for asset_id in asset_ids.values():
+        summary_repository.refresh(asset_id, TRADE_DATES)
+        curve_repository.refresh(asset_id, TRADE_DATES)
+    db_session.execute(text("ANALYZE TABLE assets, settlements, volume_oi, trade_date_summaries, futures_curve"))
+    return asset_ids
+
+
+@contextmanager
+def capture_selects(session: Session) -> Iterator[list[tuple[str, Any]]]:
+    # 別のセッションで実行されるクエリも対象にするため、エンジンで発行されたSQLを記録する
+    statements: list[tuple[str, Any]] = []
+    engine = session.get_bind()
+
+    def _before_cursor_execute(conn: Any, cursor: Any, statement: str, parameters: Any, context: Any, executemany: bool):
+        if statement.lstrip().upper().startswith('SELECT'):
+            statements.append((statement, parameters))
+
+    event.listen(engine, 'before_cursor_execute', _before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, 'before_cursor_execute', _before_cursor_execute)
+
+
+def explain_full_scans(session: Session, statement: str, parameters: Any) -> list[dict[str, Any]]:
+    """EXPLAINの結果のうち、フルスキャンになっているテーブルの行を返す。派生テーブル (<derived2>など) は対象外"""
+    rows = session.connection().exec_driver_sql(f"EXPLAIN {statement}", parameters).mappings().all()
+    return [
+        dict(row) for row in rows
+        if row['type'] in FULL_SCAN_TYPES and row['table'] is not None and not row['table'].startswith('<')
+    ]
+
+
+def _repository_queries(session: Session, asset_ids: dict[str, int]) -> list[tuple[str, Callable[[], Any]]]:
+    futures_data_repository = FuturesDataRepositoryMysql(session)
+    trade_date_repository = FuturesDataTradeDateRepositoryMysql(session)
+    settlement_repository = SettlementRepositoryMysql(session)
+    volume_oi_repository = VolumeOIRepositoryMysql(session)
+    summary_repository = TradeDateSummaryRepositoryMysql(session)
+    curve_repository = FuturesCurveRepositoryMysql(session)
+    trade_dates = TRADE_DATES[10:13]
+    return [
+        ("futures_data.fetch_by_asset_and_date", lambda: futures_data_repository.fetch_by_asset_and_date("Gold", trade_dates[0])),
+        ("futures_data.fetch_by_asset_and_dates", lambda: futures_data_repository.fetch_by_asset_and_dates(asset_ids["Gold"], trade_dates)),
+        ("futures_data.fetch_versions_by_asset_and_dates", lambda: futures_data_repository.fetch_versions_by_asset_and_dates(asset_ids["Gold"], trade_dates)),
+        ("futures_data.stream_by_asset_and_date_range", lambda: list(futures_data_repository.stream_by_asset_and_date_range(asset_ids["Gold"], trade_dates[0], trade_dates[-1], 100))),
+        ("trade_date.fetch_trade_dates", lambda: trade_date_repository.fetch_trade_dates(asset_ids["Gold"], None, None, 0, 10, after=trade_dates[0])),
+        ("trade_date.fetch_latest_trade_dates", lambda: trade_date_repository.fetch_latest_trade_dates(asset_ids["Gold"], 5)),
+        ("trade_date.fetch_trade_dates_version", lambda: trade_date_repository.fetch_trade_dates_version(asset_ids["Gold"], trade_dates[0], None)),
+        ("settlement.check_last_updated_or_none", lambda: settlement_repository.check_last_updated_or_none(asset_ids["Gold"], TradeDate(trade_dates[0]))),
+        ("settlement.fetch_last_updated_by_asset", lambda: settlement_repository.fetch_last_updated_by_asset(asset_ids["Gold"])),
+        ("volume_oi.check_data_is_final_or_none", lambda: volume_oi_repository.check_data_is_final_or_none(asset_ids["Gold"], TradeDate(trade_dates[0]))),
+        ("volume_oi.fetch_is_final_by_asset", lambda: volume_oi_repository.fetch_is_final_by_asset(asset_ids["Gold"])),
+        ("trade_date_summary.refresh", lambda: summary_repository.refresh(asset_ids["Gold"], trade_dates)),
+        ("futures_curve.refresh", lambda: curve_repository.refresh(asset_ids["Gold"], trade_dates)),
+    ]
+
+
+def test_repository_queries_do_not_full_scan(db_session: Session, seeded_assets: dict[str, int]):
+    failures: dict[str, list[dict[str, Any]]] = {}
+    for name, run_query in _repository_queries(db_session, seeded_assets):
+        with capture_selects(db_session) as statements:
+            run_query()
+        assert statements, f"{name} did not issue any SELECT"
+        for statement, parameters in statements:
+            full_scans = explain_full_scans(db_session, statement, parameters)
+            if full_scans:
+                failures.setdefault(name, []).extend(full_scans)
+
+    assert not failures, f"Full scans found in query plans: {failures}"
@@ -1,5 +1,6 @@
 # tests/infrastructure/repositories/test_settlement_repository_mysql.py
 import pytest
+from dataclasses import replace
 from datetime import date, datetime
 from pytest_mock import MockerFixture
 from sqlalchemy.orm import Session
@@ -105,6 +106,9 @@ def test_create_settlement(db_session: Session, asset: AssetModel, settlement_en
     assert saved_settlement.month == settlement_entity.month.to_db_format()
     assert saved_settlement.settle == settlement_entity.settle
     assert saved_settlement.last_updated == settlement_entity.last_updated
+    # 価格の数値カラムも保存されることを確認
+    assert saved_settlement.change_value == 2.0
+    assert saved_settlement.settle_value == 12.0
 
 
 def test_create_settlement_invalid_asset_id(db_session: Session, invalid_settlement_entity: SettlementEntity):
@@ -117,6 +121,51 @@ def test_create_settlement_invalid_asset_id(db_session: Session, invalid_settlem
     assert "foreign key constraint fails" in str(excinfo.value)
 
 
+def test_create_many_settlements(db_session: Session, asset: AssetModel, settlement_entity: SettlementEntity):
+    repository = SettlementRepositoryMysql(session=db_session)
+    next_month_entity = replace(settlement_entity, month=YearMonth(2024, 5), settle="13.0")
+
+    assert repository.create_many([settlement_entity, next_month_entity]) == 2
+
+    saved_settlements = db_session.query(SettlementModel).filter_by(asset_id=asset.id).order_by(SettlementModel.month).all()
+    assert [settlement.month for settlement in saved_settlements] == ["2024-04", "2024-05"]
+    assert [settlement.settle for settlement in saved_settlements] == ["12.0", "13.0"]
+    assert [settlement.settle_value for settlement in saved_settlements] == [12.0, 13.0]
+
+
+def test_create_many_settlements_rollback(db_session: Session, asset: AssetModel, settlement_entity: SettlementEntity):
+    repository = SettlementRepositoryMysql(session=db_session)
+    # 同じ(asset_id, trade_date, month)の行が含まれるため、一意制約違反となる
+    with pytest.raises(IntegrityError):
+        repository.create_many([settlement_entity, settlement_entity])
+
+    # 1行目も含めて保存されていないことを確認
+    assert db_session.query(SettlementModel).filter_by(asset_id=asset.id).count() == 0
+
+
+def test_create_many_settlements_empty(db_session: Session):
+    repository = SettlementRepositoryMysql(session=db_session)
+    assert repository.create_many([]) == 0
+
+
+def test_upsert_many_settlements(db_session: Session, asset: AssetModel, settlement_entity: SettlementEntity):
+    repository = SettlementRepositoryMysql(session=db_session)
+    repository.create(settlement_entity)
+
+    # 既存の限月は更新され、新しい限月は追加されることを確認
+    updated_entity = replace(settlement_entity, settle="12.5", last_updated=datetime(2024, 3, 7, 12, 0, 0))
+    new_month_entity = replace(settlement_entity, month=YearMonth(2024, 5), settle="13.0", last_updated=datetime(2024, 3, 7, 12, 0, 0))
+    assert repository.upsert_many([updated_entity, new_month_entity]) == 2
+    # 同じデータで再実行しても結果は変わらない
+    repository.upsert_many([updated_entity, new_month_entity])
+
+    db_session.expire_all()
+    saved_settlements = db_session.query(SettlementModel).filter_by(asset_id=asset.id).order_by(SettlementModel.month).all()
+    assert [(settlement.month, settlement.settle) for settlement in saved_settlements] == [("2024-04", "12.5"), ("2024-05", "13.0")]
+    assert [settlement.settle_value for settlement in saved_settlements] == [12.5, 13.0]
+    assert all(settlement.last_updated == datetime(2024, 3, 7, 12, 0, 0) for settlement in saved_settlements)
+
+
 def test_update_settlement(db_session: Session, asset: AssetModel, settlement_entity: SettlementEntity):
     # まず、SettlementEntityを作成してDBに保存
     repository = SettlementRepositoryMysql(session=db_session)
@@ -268,3 +317,13 @@ def test_fetch_settlements_by_name_and_date(db_session: Session, db_settlements:
         assert settlement.est_volume == expected['est_volume']
         assert settlement.prior_day_oi == expected['prior_day_oi']
         assert settlement.last_updated == expected['last_updated']
+
+
+def test_fetch_last_updated_by_asset(db_session: Session, asset: AssetModel, db_settlements: list[SettlementModel]):
+    repository = SettlementRepositoryMysql(session=db_session)
+
+    last_updated_map = repository.fetch_last_updated_by_asset(asset.id)
+    assert last_updated_map == {date(2024, 3, 11): datetime(2024, 3, 6, 12, 0, 0)}
+
+    # 存在しないasset_idの場合は空の辞書を返す
+    assert repository.fetch_last_updated_by_asset(999) == {}
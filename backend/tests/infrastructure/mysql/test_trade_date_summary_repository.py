@@ -0,0 +1,62 @@
+# tests/infrastructure/mysql/test_trade_date_summary_repository.py
+import pytest
+from datetime import date, datetime
+from sqlalchemy.orm import Session
+
+from src.infrastructure.database.models import Asset, Settlement, TradeDateSummary, VolumeOI
+from src.infrastructure.mysql.trade_date_summary_repository_mysql import TradeDateSummaryRepositoryMysql
+
+
+@pytest.fixture
+def asset_id(db_session: Session) -> int:
+    asset = Asset(name="Gold")
+    db_session.add(asset)
+    db_session.flush()
+    # 2023-01-02: 清算値と出来高・建玉の両方あり (一部の限月のみFinal)
+    # 2023-01-03: 清算値のみ
+    for trade_date, month in [(date(2023, 1, 2), "2023-02"), (date(2023, 1, 2), "2023-03"), (date(2023, 1, 3), "2023-02")]:
+        db_session.add(Settlement(
+            asset_id=asset.id, trade_date=trade_date, month=month, settle="1,000",
+            est_volume=250, prior_day_oi=310, last_updated=datetime(2023, 1, 4, 12, 0, 0)
+        ))
+    for month, is_final in [("2023-02", True), ("2023-03", False)]:
+        db_session.add(VolumeOI(asset_id=asset.id, trade_date=date(2023, 1, 2), month=month, total_volume=200, at_close=300, is_final=is_final))
+    db_session.commit()
+    return asset.id
+
+
+def _fetch_summaries(db_session: Session, asset_id: int) -> list[tuple[date, bool, bool, bool, bool]]:
+    rows = db_session.query(TradeDateSummary).filter(TradeDateSummary.asset_id == asset_id).order_by(TradeDateSummary.trade_date).all()
+    return [(row.trade_date, row.has_settlement, row.has_volume_oi, row.has_futures_data, row.is_final) for row in rows]
+
+
+def test_refresh(db_session: Session, asset_id: int):
+    repository = TradeDateSummaryRepositoryMysql(db_session)
+
+    # データがない取引日は追加されない
+    repository.refresh(asset_id, [date(2023, 1, 2), date(2023, 1, 3), date(2023, 1, 4)])
+
+    assert _fetch_summaries(db_session, asset_id) == [
+        (date(2023, 1, 2), True, True, True, False),
+        (date(2023, 1, 3), True, False, False, False),
+    ]
+
+    # 出来高・建玉が全てFinalになった場合
+    db_session.query(VolumeOI).filter(VolumeOI.asset_id == asset_id).update({VolumeOI.is_final: True})
+    db_session.commit()
+    repository.refresh(asset_id, [date(2023, 1, 2)])
+
+    assert _fetch_summaries(db_session, asset_id)[0] == (date(2023, 1, 2), True, True, True, True)
+
+
+def test_refresh_deleted_trade_date(db_session: Session, asset_id: int):
+    repository = TradeDateSummaryRepositoryMysql(db_session)
+    repository.refresh(asset_id, [date(2023, 1, 3)])
+
+    db_session.query(Settlement).filter(Settlement.asset_id == asset_id, Settlement.trade_date == date(2023, 1, 3)).delete()
+    db_session.commit()
+    repository.refresh(asset_id, [date(2023, 1, 3)])
+
+    # データが削除された取引日はサマリーからも削除される
+    assert _fetch_summaries(db_session, asset_id) == []
+    repository.refresh(asset_id, [])
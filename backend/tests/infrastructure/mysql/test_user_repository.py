@@ -4,6 +4,7 @@ from sqlalchemy.orm import Session
 from sqlalchemy.exc import SQLAlchemyError
 
 from src.settings import logger
+from src.infrastructure.mysql.async_user_repository_mysql import AsyncUserRepositoryMysql
 from src.infrastructure.mysql.user_repository_mysql import UserRepositoryMysql
 from src.infrastructure.database.models import User as UserModel
 from src.domain.entities.user_entity import UserEntity
@@ -86,3 +87,21 @@ def test_create_duplicate_user(user_repository: UserRepositoryMysql):
         user_repository.create(user_entity)
 
     assert "Duplicate entry" in str(excinfo.value)  # エラーメッセージはデータベースによって異なる場合があるので注意
+
+
+def test_async_fetch_user_by_email(user_repository: UserRepositoryMysql, run_with_async_session):
+    user_entity = UserEntity.new_entity(
+        email="async@example.com",
+        password="asyncpassword123",
+        name="Async User"
+    )
+    user_repository.create(user_entity)
+
+    fetched_user = run_with_async_session(lambda session: AsyncUserRepositoryMysql(session).fetch_by_email(Email("async@example.com")))
+
+    assert fetched_user.email == user_entity.email
+    assert fetched_user.name == user_entity.name
+
+    with pytest.raises(ValueError) as excinfo:
+        run_with_async_session(lambda session: AsyncUserRepositoryMysql(session).fetch_by_email(Email("nonexistent@example.com")))
+    assert "User with email nonexistent@example.com not found" in str(excinfo.value)
@@ -1,5 +1,6 @@
 # tests/infrastructure/repositories/test_volume_oi_repository.py
 import pytest
+from dataclasses import replace
 from datetime import date
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import IntegrityError
@@ -160,6 +161,23 @@ def test_update_volume_oi(db_session: Session, volume_oi_entity: VolumeOIEntity,
     assert updated_volume_oi.is_final == updated_entity.is_final
 
 
+def test_upsert_many_volume_oi(db_session: Session, volume_oi_entity: VolumeOIEntity, updated_entity: VolumeOIEntity):
+    repository = VolumeOIRepositoryMysql(db_session)
+    repository.create(volume_oi_entity)
+
+    # 既存の限月は更新され、新しい限月は追加されることを確認
+    new_month_entity = replace(updated_entity, month=YearMonth(2024, 5))
+    assert repository.upsert_many([updated_entity, new_month_entity]) == 2
+    # 同じデータで再実行しても結果は変わらない
+    repository.upsert_many([updated_entity, new_month_entity])
+
+    db_session.expire_all()
+    saved_volume_oi = db_session.query(VolumeOIModel).filter_by(asset_id=volume_oi_entity.asset_id).order_by(VolumeOIModel.month).all()
+    assert [volume_oi.month for volume_oi in saved_volume_oi] == ["2024-04", "2024-05"]
+    assert all(volume_oi.total_volume == updated_entity.total_volume for volume_oi in saved_volume_oi)
+    assert all(volume_oi.is_final for volume_oi in saved_volume_oi)
+
+
 def test_update_volume_oi_not_found(db_session: Session, volume_oi_entity: VolumeOIEntity):
     repository = VolumeOIRepositoryMysql(db_session)
     repository.create(volume_oi_entity)
@@ -224,3 +242,13 @@ def test_check_data_is_final_with_non_existing_data(db_session: Session):
     trade_date = TradeDate.from_string("Saturday, 09 Mar 2024")
     is_final = repository.check_data_is_final_or_none(999, trade_date)
     assert is_final is None
+
+
+def test_fetch_is_final_by_asset(db_session: Session, asset: AssetModel, db_volume_oi: VolumeOIModel):
+    repository = VolumeOIRepositoryMysql(db_session)
+
+    is_final_map = repository.fetch_is_final_by_asset(asset.id)
+    assert is_final_map == {date(2024, 3, 11): False}
+
+    # 存在しないasset_idの場合は空の辞書を返す
+    assert repository.fetch_is_final_by_asset(999) == {}
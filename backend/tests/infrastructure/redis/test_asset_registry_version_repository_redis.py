@@ -0,0 +1,34 @@
+# tests/infrastructure/redis/test_asset_registry_version_repository_redis.py
+import pytest
+import fakeredis
+import redis
+from unittest.mock import MagicMock
+
+from src.infrastructure.redis.asset_registry_version_repository_redis import AssetRegistryVersionRepositoryRedis
+
+
+@pytest.fixture
+def version_repository():
+    repo = AssetRegistryVersionRepositoryRedis()
+    repo.redis_client = fakeredis.FakeStrictRedis(server=fakeredis.FakeServer())
+    return repo
+
+
+def test_fetch_and_increment_version(version_repository: AssetRegistryVersionRepositoryRedis):
+    # 一度も資産が変更されていない場合は0
+    assert version_repository.fetch_version() == 0
+
+    version_repository.increment_version()
+    version_repository.increment_version()
+
+    assert version_repository.fetch_version() == 2
+
+
+def test_redis_error(version_repository: AssetRegistryVersionRepositoryRedis):
+    version_repository.redis_client = MagicMock()
+    version_repository.redis_client.get.side_effect = redis.ConnectionError("connection refused")
+    version_repository.redis_client.incr.side_effect = redis.ConnectionError("connection refused")
+
+    # Redisに接続できない場合もエラーにしない
+    assert version_repository.fetch_version() is None
+    version_repository.increment_version()
@@ -0,0 +1,118 @@
+# tests/infrastructure/redis/test_futures_data_cache_repository_redis.py
+import pytest
+import fakeredis
+import redis
+from datetime import date
+from unittest.mock import MagicMock
+
+from src.domain.repositories.futures_data_cache_repository import FuturesDataCacheEntry
+from src.infrastructure.cache.asset_registry import AssetRegistry
+from src.infrastructure.redis.futures_data_cache_repository_redis import FuturesDataCacheRepositoryRedis, make_cache_key
+
+
+@pytest.fixture
+def futures_data_cache():
+    repo = FuturesDataCacheRepositoryRedis()
+    repo.redis_client = fakeredis.FakeStrictRedis(server=fakeredis.FakeServer())
+    return repo
+
+
+def test_make_cache_key():
+    # 取引日の順序と重複はキーに影響しない
+    assert make_cache_key("gold", [date(2024, 3, 11), date(2024, 3, 8), date(2024, 3, 11)], "records") == "futures-data:payload:records:gold:2024-03-08,2024-03-11"
+
+
+def test_save_and_fetch(futures_data_cache: FuturesDataCacheRepositoryRedis):
+    assert futures_data_cache.fetch("gold", [date(2024, 3, 8)], "records") is None
+
+    futures_data_cache.save("gold", [date(2024, 3, 8), date(2024, 3, 11)], "records", FuturesDataCacheEntry(b'{"data":[]}', False, '"etag"'))
+
+    assert futures_data_cache.fetch("gold", [date(2024, 3, 11), date(2024, 3, 8)], "records") == FuturesDataCacheEntry(b'{"data":[]}', False, '"etag"')
+    assert futures_data_cache.fetch("silver", [date(2024, 3, 8), date(2024, 3, 11)], "records") is None
+    assert futures_data_cache.fetch_stats() == {'hits': 1, 'misses': 2}
+    # 速報値を含むレスポンスは期限付きで保存される
+    assert 0 < futures_data_cache.redis_client.ttl("futures-data:payload:records:gold:2024-03-08,2024-03-11") <= futures_data_cache.expiration
+
+
+def test_save_final(futures_data_cache: FuturesDataCacheRepositoryRedis):
+    futures_data_cache.save("gold", [date(2024, 3, 8)], "records", FuturesDataCacheEntry(b"preliminary", False, '"etag"'))
+    futures_data_cache.save("gold", [date(2024, 3, 8)], "records", FuturesDataCacheEntry(b"final", True, '"etag"'))
+
+    # 確定済みのレスポンスは期限なしで保存される
+    assert futures_data_cache.fetch("gold", [date(2024, 3, 8)], "records") == FuturesDataCacheEntry(b"final", True, '"etag"')
+    assert futures_data_cache.redis_client.ttl("futures-data:payload:records:gold:2024-03-08") == -1
+
+    # 確定済みのキャッシュも、再スクレイピング時には無効化される
+    futures_data_cache.invalidate(date(2024, 3, 8))
+    assert futures_data_cache.fetch("gold", [date(2024, 3, 8)], "records") is None
+
+
+def test_formats_are_cached_separately(futures_data_cache: FuturesDataCacheRepositoryRedis):
+    futures_data_cache.save("gold", [date(2024, 3, 8)], "records", FuturesDataCacheEntry(b'{"data":[]}', True, '"records"'))
+    futures_data_cache.save("gold", [date(2024, 3, 8)], "arrow", FuturesDataCacheEntry(b"\xff\xff\xff\xff\x00", True, '"arrow"'))
+
+    # バイナリのペイロードもそのまま返される
+    assert futures_data_cache.fetch("gold", [date(2024, 3, 8)], "arrow") == FuturesDataCacheEntry(b"\xff\xff\xff\xff\x00", True, '"arrow"')
+    assert futures_data_cache.fetch("gold", [date(2024, 3, 8)], "msgpack") is None
+
+    # 無効化は全てのフォーマットに適用される
+    futures_data_cache.invalidate(date(2024, 3, 8))
+    assert futures_data_cache.fetch("gold", [date(2024, 3, 8)], "records") is None
+    assert futures_data_cache.fetch("gold", [date(2024, 3, 8)], "arrow") is None
+
+
+def test_fetch_legacy_entry(futures_data_cache: FuturesDataCacheRepositoryRedis):
+    # ETagがない古い形式のキャッシュはミスとして扱う
+    futures_data_cache.redis_client.hset("futures-data:payload:records:gold:2024-03-08", mapping={'payload': "old", 'is_final': 1})
+
+    assert futures_data_cache.fetch("gold", [date(2024, 3, 8)], "records") is None
+    assert futures_data_cache.fetch_stats() == {'hits': 0, 'misses': 1}
+
+
+def test_invalidate(futures_data_cache: FuturesDataCacheRepositoryRedis):
+    futures_data_cache.save("gold", [date(2024, 3, 8)], "records", FuturesDataCacheEntry(b"day1", True, '"etag"'))
+    futures_data_cache.save("gold", [date(2024, 3, 8), date(2024, 3, 11)], "records", FuturesDataCacheEntry(b"day1-2", False, '"etag"'))
+    futures_data_cache.save("gold", [date(2024, 3, 11)], "records", FuturesDataCacheEntry(b"day2", False, '"etag"'))
+
+    futures_data_cache.invalidate(date(2024, 3, 8))
+
+    # 無効化した取引日を含むキャッシュのみ削除される
+    assert futures_data_cache.fetch("gold", [date(2024, 3, 8)], "records") is None
+    assert futures_data_cache.fetch("gold", [date(2024, 3, 8), date(2024, 3, 11)], "records") is None
+    assert futures_data_cache.fetch("gold", [date(2024, 3, 11)], "records") == FuturesDataCacheEntry(b"day2", False, '"etag"')
+    # キャッシュがない取引日の無効化は何もしない
+    futures_data_cache.invalidate(date(2024, 3, 12))
+
+
+def test_invalidate_asset(futures_data_cache: FuturesDataCacheRepositoryRedis):
+    asset_registry = AssetRegistry(max_age=60)
+    asset_registry.get(lambda: [(1, "gold"), (2, "silver")])
+    futures_data_cache.asset_registry = asset_registry
+    futures_data_cache.save("gold", [date(2024, 3, 8)], "records", FuturesDataCacheEntry(b"gold", True, '"etag"'))
+    futures_data_cache.save("silver", [date(2024, 3, 8)], "records", FuturesDataCacheEntry(b"silver", True, '"etag"'))
+    futures_data_cache.save("copper", [date(2024, 3, 8)], "records", FuturesDataCacheEntry(b"copper", True, '"etag"'))
+
+    # 資産名に変換できるidの場合は、その資産のキャッシュのみ削除される
+    futures_data_cache.invalidate(date(2024, 3, 8), 1)
+    assert futures_data_cache.fetch("gold", [date(2024, 3, 8)], "records") is None
+    assert futures_data_cache.fetch("silver", [date(2024, 3, 8)], "records") == FuturesDataCacheEntry(b"silver", True, '"etag"')
+
+    # 資産名が分からないidの場合は、取引日を含む全ての資産のキャッシュが削除される
+    futures_data_cache.invalidate(date(2024, 3, 8), 3)
+    assert futures_data_cache.fetch("silver", [date(2024, 3, 8)], "records") is None
+    assert futures_data_cache.fetch("copper", [date(2024, 3, 8)], "records") is None
+    assert futures_data_cache.redis_client.keys("futures-data:index:*") == []
+
+
+def test_redis_error_is_treated_as_miss(futures_data_cache: FuturesDataCacheRepositoryRedis):
+    futures_data_cache.redis_client = MagicMock()
+    futures_data_cache.redis_client.pipeline.return_value.execute.side_effect = redis.ConnectionError("connection refused")
+    futures_data_cache.redis_client.smembers.side_effect = redis.ConnectionError("connection refused")
+    futures_data_cache.redis_client.scan_iter.side_effect = redis.ConnectionError("connection refused")
+    futures_data_cache.redis_client.hgetall.side_effect = redis.ConnectionError("connection refused")
+
+    # Redisに接続できなくても例外は送出しない
+    assert futures_data_cache.fetch("gold", [date(2024, 3, 8)], "records") is None
+    futures_data_cache.save("gold", [date(2024, 3, 8)], "records", FuturesDataCacheEntry(b"payload", False, '"etag"'))
+    futures_data_cache.invalidate(date(2024, 3, 8))
+    assert futures_data_cache.fetch_stats() == {'hits': 0, 'misses': 0}
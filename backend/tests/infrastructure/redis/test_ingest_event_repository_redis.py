@@ -0,0 +1,56 @@
+# tests/infrastructure/redis/test_ingest_event_repository_redis.py
+import pytest
+import fakeredis
+import redis
+from datetime import date
+from unittest.mock import MagicMock
+
+from src.domain.repositories.ingest_event_repository import SETTLEMENT_KIND, VOLUME_OI_KIND, IngestEvent
+from src.infrastructure.redis.ingest_event_repository_redis import FIRST_ID, STREAM_KEY, IngestEventRepositoryRedis
+
+
+@pytest.fixture
+def ingest_event_repository():
+    repo = IngestEventRepositoryRedis(max_length=100)
+    repo.redis_client = fakeredis.FakeStrictRedis(server=fakeredis.FakeServer())
+    return repo
+
+
+def test_publish_and_read(ingest_event_repository: IngestEventRepositoryRedis):
+    # イベントがない場合は先頭から読み込む
+    last_id = ingest_event_repository.fetch_last_id()
+    assert last_id == FIRST_ID
+
+    first = IngestEvent(1, date(2024, 3, 8), SETTLEMENT_KIND, False)
+    second = IngestEvent(2, date(2024, 3, 8), VOLUME_OI_KIND, True)
+    ingest_event_repository.publish(first)
+    ingest_event_repository.publish(second)
+
+    result = ingest_event_repository.read(last_id, 10)
+    assert result is not None
+    next_id, events = result
+    assert events == [first, second]
+    assert next_id == ingest_event_repository.fetch_last_id()
+    # 読み込んだ位置から再開する
+    assert ingest_event_repository.read(next_id, 10) == (next_id, [])
+
+
+def test_read_skips_malformed_events(ingest_event_repository: IngestEventRepositoryRedis):
+    last_id = ingest_event_repository.fetch_last_id()
+    ingest_event_repository.redis_client.xadd(STREAM_KEY, {'asset_id': 'x'})
+    event = IngestEvent(1, date(2024, 3, 8), SETTLEMENT_KIND, True)
+    ingest_event_repository.publish(event)
+
+    assert ingest_event_repository.read(last_id, 10) == (ingest_event_repository.fetch_last_id(), [event])
+
+
+def test_redis_error(ingest_event_repository: IngestEventRepositoryRedis):
+    ingest_event_repository.redis_client = MagicMock()
+    ingest_event_repository.redis_client.xadd.side_effect = redis.ConnectionError("connection refused")
+    ingest_event_repository.redis_client.xrevrange.side_effect = redis.ConnectionError("connection refused")
+    ingest_event_repository.redis_client.xread.side_effect = redis.ConnectionError("connection refused")
+
+    # 発行の失敗でスクレイピングを失敗させない
+    ingest_event_repository.publish(IngestEvent(1, date(2024, 3, 8), SETTLEMENT_KIND, True))
+    assert ingest_event_repository.fetch_last_id() is None
+    assert ingest_event_repository.read(FIRST_ID, 10) is None
@@ -0,0 +1,55 @@
+# tests/infrastructure/redis/test_single_flight_repository_redis.py
+import pytest
+import fakeredis
+import redis
+from unittest.mock import MagicMock
+
+from src.infrastructure.redis.single_flight_repository_redis import SingleFlightRepositoryRedis
+
+
+@pytest.fixture
+def single_flight_repository():
+    repo = SingleFlightRepositoryRedis()
+    repo.redis_client = fakeredis.FakeStrictRedis(server=fakeredis.FakeServer())
+    return repo
+
+
+def test_acquire_and_release(single_flight_repository: SingleFlightRepositoryRedis):
+    token = single_flight_repository.acquire("key", 1000)
+
+    assert token is not None
+    # 他のワーカーは取得できない
+    assert single_flight_repository.acquire("key", 1000) is None
+    assert single_flight_repository.poll_result("key") == (None, True)
+
+    # トークンが異なる場合は解放しない
+    single_flight_repository.release("key", "other")
+    assert single_flight_repository.poll_result("key") == (None, True)
+
+    single_flight_repository.release("key", token)
+    assert single_flight_repository.poll_result("key") == (None, False)
+
+
+def test_save_result(single_flight_repository: SingleFlightRepositoryRedis):
+    token = single_flight_repository.acquire("key", 1000)
+    single_flight_repository.save_result("key", b"payload", 1000)
+    single_flight_repository.release("key", token) # type: ignore
+
+    assert single_flight_repository.poll_result("key") == (b"payload", False)
+    assert 0 < single_flight_repository.redis_client.pttl("single-flight:result:key") <= 1000
+
+    # 次の実行のロックを取得すると、前回の結果は削除される
+    single_flight_repository.acquire("key", 1000)
+    assert single_flight_repository.poll_result("key") == (None, True)
+
+
+def test_redis_error(single_flight_repository: SingleFlightRepositoryRedis):
+    single_flight_repository.redis_client = MagicMock()
+    single_flight_repository.redis_client.set.side_effect = redis.ConnectionError("connection refused")
+    single_flight_repository.redis_client.pipeline.side_effect = redis.ConnectionError("connection refused")
+
+    # Redisに接続できない場合もエラーにせず、ロックなしとして扱う
+    assert single_flight_repository.acquire("key", 1000) is None
+    assert single_flight_repository.poll_result("key") == (None, False)
+    single_flight_repository.save_result("key", b"payload", 1000)
+    single_flight_repository.release("key", "token")
@@ -3,7 +3,6 @@ import pytest
 from datetime import datetime, timezone
 
 import pandas as pd
-from bs4 import BeautifulSoup
 from pandas.testing import assert_frame_equal
 from selenium.webdriver.chrome.webdriver import WebDriver
 from typing import Generator, Any
@@ -12,7 +11,8 @@ from unittest.mock import Mock, MagicMock, patch, mock_open
 from src.domain.services.asset_service import AssetService
 from src.domain.services.settlement_service import SettlementService
 from src.domain.repositories.asset_repository import AssetRepository
-from src.infrastructure.scraping.cme_scraper import scrape_settlements, _fetch_asset_ids_urls, _parse_settlements_table
+from src.infrastructure.scraping.cme_scraper import scrape_settlements, scrape_settlements_with_pool, _fetch_asset_ids_urls
+from src.infrastructure.scraping.table_parser import parse_settlements_table
 
 
 @pytest.fixture
@@ -28,8 +28,7 @@ def settlements_html():
     """
 
 def test_parse_settlements_table(settlements_html: str):
-    soup = BeautifulSoup(settlements_html, 'html.parser')
-    results = list(_parse_settlements_table(soup))
+    results = parse_settlements_table(settlements_html).to_dict('records')
     expected = [{
         'month': 'Jan', 'open': '1', 'high': '2', 'low': '3', 'last': '4',
         'change': '+1', 'settle': '5', 'est_volume': '100', 'prior_day_oi': '200'
@@ -105,7 +104,7 @@ def test_scrape_settlements_integration(mock_webdriver: Generator[tuple[Mock, Mo
 
     # _get_downloadable_dates_from_settlementのテストを模倣するために必要なモックを設定
     last_updated_text = '03 May 2024 10:32:00 PM CT'
-    mock_get_element.css.return_value.text = last_updated_text  # Mock#css()が呼ばれた後の.textで返す値を設定
+    mock_get_element.read_texts.return_value = {'last_updated': [last_updated_text]}  # Mock#read_texts()で返すテキストを設定
     with patch('src.infrastructure.scraping.cme_scraper.GetElement', return_value=mock_get_element):
         with patch('src.infrastructure.scraping.cme_scraper._scrape_settlement_table') as mock_scrape_func:
             mock_scrape_func.return_value = pd.DataFrame({"month": ["Jan"], "open": ["100"]})
@@ -116,8 +115,8 @@ def test_scrape_settlements_integration(mock_webdriver: Generator[tuple[Mock, Mo
         mock_scrape_func.assert_called()
 
         # SettlementServiceのデータ保存関数が呼び出されたことを確認するための別のアプローチ
-        # save_settlements_from_dataframe の呼び出しをキャプチャする
-        args, kwargs = settlement_service.save_settlements_from_dataframe.call_args
+        # ingest_settlements_from_dataframe の呼び出しをキャプチャする
+        args, kwargs = settlement_service.ingest_settlements_from_dataframe.call_args
 
         # 関数呼び出しの引数を確認
         assert args[0] == 1  # asset_id
@@ -143,3 +142,48 @@ def test_skip_scraping_if_data_is_latest(mock_webdriver: Generator[tuple[Mock, M
 
             # _scrape_settlement_table が呼び出されないことを確認
             mock_scrape_table.assert_not_called()
+
+
+def test_scrape_settlements_with_pool_uses_service_per_worker(mock_asset_service: AssetService):
+    scraped: list[tuple[int, str]] = []
+    created_services: list[Mock] = []
+
+    def settlement_service_factory():
+        service = Mock(spec=SettlementService)
+        created_services.append(service)
+        return service
+
+    def fake_scrape_for_asset(driver, get_element, service, asset_id, url):
+        assert service in created_services
+        scraped.append((asset_id, url))
+
+    with patch('src.infrastructure.scraping.cme_scraper._fetch_asset_ids_urls', return_value={1: "url1", 2: "url2", 3: "url3"}), \
+         patch('src.infrastructure.scraping.cme_scraper._scrape_settlements_for_asset', side_effect=fake_scrape_for_asset), \
+         patch('src.infrastructure.scraping.cme_scraper.WebDriverPool') as MockWebDriverPool, \
+         patch('src.infrastructure.scraping.cme_scraper.GetElement'):
+        MockWebDriverPool.return_value.__enter__.return_value.acquire.return_value.__enter__.return_value = Mock(spec=WebDriver)
+        scrape_settlements_with_pool(mock_asset_service, settlement_service_factory, pool_size=2)
+
+    # 全てのアセットが処理され、アセットごとにサービスが生成されることを確認
+    assert sorted(scraped) == [(1, "url1"), (2, "url2"), (3, "url3")]
+    assert len(created_services) == 3
+    MockWebDriverPool.assert_called_once_with(2, headless=False)
+
+
+def test_scrape_settlements_with_pool_raises_after_all_assets(mock_asset_service: AssetService):
+    scraped: list[int] = []
+
+    def fake_scrape_for_asset(driver, get_element, service, asset_id, url):
+        if asset_id == 1:
+            raise ValueError("Scraping error")
+        scraped.append(asset_id)
+
+    with patch('src.infrastructure.scraping.cme_scraper._fetch_asset_ids_urls', return_value={1: "url1", 2: "url2"}), \
+         patch('src.infrastructure.scraping.cme_scraper._scrape_settlements_for_asset', side_effect=fake_scrape_for_asset), \
+         patch('src.infrastructure.scraping.cme_scraper.WebDriverPool'), \
+         patch('src.infrastructure.scraping.cme_scraper.GetElement'):
+        with pytest.raises(ValueError):
+            scrape_settlements_with_pool(mock_asset_service, lambda: Mock(spec=SettlementService), pool_size=2)
+
+    # 失敗したアセット以外は最後まで処理されることを確認
+    assert scraped == [2]
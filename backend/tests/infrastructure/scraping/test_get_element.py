@@ -0,0 +1,89 @@
+# tests/infrastructure/scraping/test_get_element.py
+import pytest
+from selenium.common.exceptions import TimeoutException
+from unittest.mock import MagicMock
+
+from src.infrastructure.scraping.get_element import GetElement, _CONTENT_SIGNATURE_SCRIPT, _READY_STATE_SCRIPT, _RESOURCE_COUNT_SCRIPT
+
+
+def _make_driver(signatures: list[str | None], resource_counts: list[int] | None = None) -> MagicMock:
+    # execute_scriptの呼び出し内容に応じて、シグネチャとリソース数を順番に返すモックを作成
+    driver = MagicMock()
+    signature_iter = iter(signatures)
+    resource_iter = iter(resource_counts or [])
+    last = {'signature': None, 'count': 0}
+
+    def execute_script(script: str, *args: str):
+        if script == _CONTENT_SIGNATURE_SCRIPT:
+            last['signature'] = next(signature_iter, last['signature'])
+            return last['signature']
+        if script == _RESOURCE_COUNT_SCRIPT:
+            last['count'] = next(resource_iter, last['count'])
+            return last['count']
+        if script == _READY_STATE_SCRIPT:
+            return 'complete'
+        return None
+
+    driver.execute_script.side_effect = execute_script
+    return driver
+
+
+def test_wait_for_content_change_returns_when_changed():
+    driver = _make_driver(['01 May 2024', '01 May 2024', '02 May 2024'], resource_counts=[1, 2, 3])
+    get_element = GetElement(driver, wait_second=5)
+
+    elapsed = get_element.wait_for_content_change('.timestamp', '01 May 2024')
+
+    assert elapsed < 1
+    assert get_element.wait_timings[0][0] == 'content_change'
+
+
+def test_wait_for_content_change_accepts_unchanged_content_after_idle():
+    # 既に表示中の日付をクリックした場合など、内容が変化しなくても通信が止まれば待機を終了する
+    driver = _make_driver(['01 May 2024'], resource_counts=[1])
+    get_element = GetElement(driver, wait_second=5)
+
+    elapsed = get_element.wait_for_content_change('.timestamp', '01 May 2024', idle_ms=200)
+
+    assert 0.2 <= elapsed < 2
+
+
+def test_wait_for_document_ready_and_log_wait_timings(caplog: pytest.LogCaptureFixture):
+    driver = _make_driver([])
+    get_element = GetElement(driver, wait_second=5)
+
+    get_element.wait_for_document_ready()
+    get_element.wait_for_network_idle(idle_ms=100)
+    get_element.log_wait_timings()
+
+    assert any('wait document_ready: count=1' in record.message for record in caplog.records)
+    assert any('wait network_idle: count=1' in record.message for record in caplog.records)
+    assert get_element.wait_timings == []
+
+
+def test_read_texts_returns_all_texts_in_single_call():
+    driver = MagicMock()
+    driver.execute_script.return_value = {'trade_dates': ['Friday, 08 Mar 2024', 'Thursday, 07 Mar 2024'], 'last_updated': ['Last Updated 08 Mar 2024']}
+    get_element = GetElement(driver, wait_second=1)
+
+    texts = get_element.read_texts({'trade_dates': '.link', 'last_updated': '.timestamp > div'}, require='trade_dates')
+
+    assert texts['trade_dates'] == ['Friday, 08 Mar 2024', 'Thursday, 07 Mar 2024']
+    assert driver.execute_script.call_count == 1
+
+
+def test_read_texts_raises_when_required_elements_not_found():
+    driver = MagicMock()
+    driver.execute_script.return_value = {'trade_dates': []}
+    get_element = GetElement(driver, wait_second=1, retries_count=0, error_handling=False)
+
+    with pytest.raises(TimeoutException):
+        get_element.read_texts({'trade_dates': '.link'}, require='trade_dates')
+
+
+def test_outer_html_returns_empty_string_when_not_found():
+    driver = MagicMock()
+    driver.execute_script.return_value = None
+    get_element = GetElement(driver)
+
+    assert get_element.outer_html('.main-table-wrapper') == ''
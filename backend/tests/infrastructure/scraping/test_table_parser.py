@@ -0,0 +1,81 @@
+# tests/infrastructure/scraping/test_table_parser.py
+import pandas as pd
+import pytest
+from bs4 import BeautifulSoup
+from pandas.testing import assert_frame_equal
+
+from scripts.benchmark_table_parser import soup_parse_settlements_table, soup_parse_volume_oi_table
+from src.infrastructure.scraping.table_parser import TABLE_FRAGMENT_ROW_XPATH, parse_settlements_table, parse_volume_oi_table
+
+
+@pytest.fixture
+def settlements_html():
+    return """
+    <table class="main-table-wrapper">
+        <tbody>
+            <tr>
+                <td>Jan</td><td>1</td><td>2</td><td>3</td><td>4</td><td>+1</td><td>5</td><td>100</td><td>200</td>
+            </tr>
+        </tbody>
+    </table>
+    """
+
+@pytest.fixture
+def volume_oi_html():
+    return """
+    <html><body>
+    <div class="table-wrapper multiline">
+        <div class="main-table-wrapper">
+            <table>
+                <thead><tr><th>Month</th></tr></thead>
+                <tbody>
+                    <tr>
+                        <td><span>APR 24</span></td><td>1,000</td><td>0</td><td>10</td><td>1,010</td><td>5</td>
+                        <td>0</td><td>0</td><td>20</td><td>0</td><td>123,456</td><td>+1,234</td>
+                    </tr>
+                    <tr>
+                        <td>MAY 24</td><td>900</td><td>0</td><td>0</td><td>900</td><td>0</td>
+                        <td>0</td><td>0</td><td>0</td><td>0</td><td>100</td><td>-10</td>
+                    </tr>
+                </tbody>
+            </table>
+        </div>
+    </div>
+    <div class="main-table-wrapper"><table><tbody><tr><td>ignored</td></tr></tbody></table></div>
+    </body></html>
+    """
+
+
+def test_parse_settlements_table_matches_soup_parser(settlements_html: str):
+    expected = pd.DataFrame(list(soup_parse_settlements_table(BeautifulSoup(settlements_html, 'lxml'))))
+    result = parse_settlements_table(settlements_html)
+
+    assert_frame_equal(result, expected)
+
+
+def test_parse_volume_oi_table_matches_soup_parser(volume_oi_html: str):
+    expected = pd.DataFrame(list(soup_parse_volume_oi_table(BeautifulSoup(volume_oi_html, 'lxml'))))
+    result = parse_volume_oi_table(volume_oi_html)
+
+    assert_frame_equal(result, expected)
+    assert result['month'].tolist() == ['APR 24', 'MAY 24']
+    assert result['change'].tolist() == ['+1,234', '-10']
+
+
+def test_parse_table_without_rows():
+    result = parse_settlements_table('<div class="main-table-wrapper"><table><tbody></tbody></table></div>')
+
+    assert_frame_equal(result, pd.DataFrame())
+
+
+def test_parse_table_fragment(volume_oi_html: str):
+    # GetElement.outer_htmlで取得したテーブル部分のみのHTMLでも、ページ全体と同じ結果になることを確認
+    fragment = volume_oi_html[volume_oi_html.index('<div class="main-table-wrapper">'):volume_oi_html.index('</div>') + len('</div>')]
+    expected = parse_volume_oi_table(volume_oi_html)
+    result = parse_volume_oi_table(fragment, TABLE_FRAGMENT_ROW_XPATH)
+
+    assert_frame_equal(result, expected)
+
+
+def test_parse_empty_fragment():
+    assert_frame_equal(parse_settlements_table('', TABLE_FRAGMENT_ROW_XPATH), pd.DataFrame())
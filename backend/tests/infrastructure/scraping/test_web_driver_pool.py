@@ -0,0 +1,55 @@
+# tests/infrastructure/scraping/test_web_driver_pool.py
+import pytest
+from unittest.mock import MagicMock, patch
+
+from src.infrastructure.scraping.web_driver_pool import WebDriverPool
+
+
+@pytest.fixture
+def mock_web_driver_setup():
+    with patch('src.infrastructure.scraping.web_driver_pool.WebDriverSetup') as MockWebDriverSetup:
+        MockWebDriverSetup.return_value.get_driver.side_effect = lambda: MagicMock()
+        yield MockWebDriverSetup
+
+
+def test_acquire_reuses_released_driver(mock_web_driver_setup: MagicMock):
+    with WebDriverPool(pool_size=2) as pool:
+        with pool.acquire() as first_driver:
+            pass
+        with pool.acquire() as second_driver:
+            pass
+
+    # 返却されたドライバーが再利用され、新しいドライバーは生成されないことを確認
+    assert first_driver is second_driver
+    assert mock_web_driver_setup.return_value.get_driver.call_count == 1
+    first_driver.quit.assert_called_once()
+
+
+def test_acquire_creates_drivers_up_to_pool_size(mock_web_driver_setup: MagicMock):
+    with WebDriverPool(pool_size=2) as pool:
+        with pool.acquire() as first_driver, pool.acquire() as second_driver:
+            assert first_driver is not second_driver
+
+    assert mock_web_driver_setup.return_value.get_driver.call_count == 2
+    first_driver.quit.assert_called_once()
+    second_driver.quit.assert_called_once()
+
+
+def test_acquire_discards_driver_on_error(mock_web_driver_setup: MagicMock):
+    with WebDriverPool(pool_size=1) as pool:
+        with pytest.raises(RuntimeError):
+            with pool.acquire() as broken_driver:
+                raise RuntimeError("Scraping error")
+
+        # 例外が発生したドライバーは破棄され、次の貸し出しでは新しいドライバーが生成されることを確認
+        with pool.acquire() as new_driver:
+            pass
+
+    assert broken_driver is not new_driver
+    broken_driver.quit.assert_called_once()
+    new_driver.quit.assert_called_once()
+
+
+def test_invalid_pool_size():
+    with pytest.raises(ValueError):
+        WebDriverPool(pool_size=0)
@@ -0,0 +1,13 @@
+# tests/scripts/test_benchmark_import_time.py
+import pytest
+
+from scripts.benchmark_import_time import DEFAULT_MODULES, measure_import
+
+
+@pytest.mark.parametrize("module", DEFAULT_MODULES)
+def test_startup_does_not_import_heavy_packages(module: str):
+    # pandas・selenium・bs4などは、APIのワーカーやスクレイパーの起動時には読み込まない
+    total_ms, _, loaded = measure_import(module)
+
+    assert total_ms > 0
+    assert loaded == []